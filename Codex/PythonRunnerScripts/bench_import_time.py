@@ -0,0 +1,163 @@
+# @feature: import-time benchmark for the client modules (fails on cold-start regressions) | keywords: 起動時間, 高速化, ベンチマーク, import
+"""
+Cold-start check for the PythonRunnerScripts client modules.
+
+Each target is imported (or run with --help) in a fresh interpreter under
+`python -X importtime`, several times; the median import time added on top
+of a bare `python -c pass` is compared with the stored baseline for this
+machine. Exit code 1 when
+- a target pulls in a heavy module it should defer (requests, openpyxl,
+  numpy, pandas), or
+- its median exceeds max(baseline * --tolerance, baseline + --slack-ms).
+
+    python bench_import_time.py                 # check (records a baseline on first run)
+    python bench_import_time.py --update        # accept the current numbers
+    python bench_import_time.py --targets revit_mcp_client,tools.mcp_safe --repeat 9
+
+The baseline is per machine (AV scanning dominates on Windows):
+%LOCALAPPDATA%/RevitMCP/import_bench_baseline.json unless --baseline is given.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from typing import Any, Dict, List, Optional, Set, Tuple
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+CODEX_DIR = os.path.abspath(os.path.join(SCRIPT_DIR, ".."))
+HEAVY = ["requests", "openpyxl", "numpy", "pandas"]
+
+TARGETS: List[Dict[str, Any]] = [
+    {"name": "revit_mcp_client", "code": "import revit_mcp_client", "forbid": HEAVY},
+    {"name": "send_revit_command_durable", "code": "import send_revit_command_durable", "forbid": HEAVY},
+    {"name": "rpc_singleflight", "code": "import rpc_singleflight", "forbid": HEAVY},
+    {"name": "id_set_codec", "code": "import id_set_codec", "forbid": HEAVY},
+    {"name": "tools.mcp_safe", "code": "import tools.mcp_safe", "forbid": HEAVY},
+    {"name": "room_finish_compare_to_excel --help", "script": "room_finish_compare_to_excel.py", "argv": ["--help"],
+     "forbid": ["openpyxl"]},
+]
+
+
+def default_baseline_path() -> str:
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("TMPDIR") or "/tmp"
+    return os.path.join(base, "RevitMCP", "import_bench_baseline.json")
+
+
+def parse_importtime(stderr: str) -> Tuple[float, Set[str]]:
+    """(total top-level cumulative ms, imported module names) from -X importtime output."""
+    total_us = 0
+    names: Set[str] = set()
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        parts = line[len("import time:"):].split("|")
+        if len(parts) != 3:
+            continue
+        try:
+            cumulative = int(parts[1].strip())
+        except ValueError:
+            continue  # header row
+        raw = parts[2]
+        name = raw.strip()
+        names.add(name)
+        if len(raw) - len(raw.lstrip(" ")) <= 1:
+            total_us += cumulative
+    return total_us / 1000.0, names
+
+
+def measure_once(target: Optional[Dict[str, Any]]) -> Tuple[float, Set[str]]:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(p for p in (SCRIPT_DIR, CODEX_DIR, env.get("PYTHONPATH")) if p)
+    env.pop("PYTHONSTARTUP", None)
+    cmd = [sys.executable, "-X", "importtime"]
+    if target is None:
+        cmd += ["-c", "pass"]
+    elif "script" in target:
+        cmd += [os.path.join(SCRIPT_DIR, target["script"])] + list(target.get("argv") or [])
+    else:
+        cmd += ["-c", target["code"]]
+    proc = subprocess.run(cmd, cwd=SCRIPT_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE,
+                          text=True, encoding="utf-8", errors="replace")
+    return parse_importtime(proc.stderr)
+
+
+def measure(target: Optional[Dict[str, Any]], repeat: int) -> Tuple[float, Set[str]]:
+    samples: List[float] = []
+    names: Set[str] = set()
+    for _ in range(max(1, repeat)):
+        ms, seen = measure_once(target)
+        samples.append(ms)
+        names |= seen
+    return statistics.median(samples), names
+
+
+def forbidden_hits(names: Set[str], forbid: List[str]) -> List[str]:
+    return sorted(f for f in forbid if any(n == f or n.startswith(f + ".") for n in names))
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Import-time benchmark for the Revit MCP client modules.")
+    ap.add_argument("--targets", default=None, help="Comma-separated target names (default: all)")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--tolerance", type=float, default=1.5, help="Allowed ratio over the baseline")
+    ap.add_argument("--slack-ms", type=float, default=15.0, help="Allowed absolute increase (noise floor)")
+    ap.add_argument("--baseline", default=None, help="Baseline JSON (default: per-machine file under LOCALAPPDATA)")
+    ap.add_argument("--update", action="store_true", help="Store the current numbers as the baseline")
+    args = ap.parse_args()
+
+    wanted = {t.strip() for t in args.targets.split(",")} if args.targets else None
+    targets = [t for t in TARGETS if wanted is None or t["name"] in wanted]
+    if not targets:
+        print(json.dumps({"ok": False, "msg": "no matching targets", "available": [t["name"] for t in TARGETS]}))
+        return 2
+
+    baseline_path = args.baseline or default_baseline_path()
+    baseline: Dict[str, Any] = {}
+    if os.path.exists(baseline_path):
+        with open(baseline_path, "r", encoding="utf-8") as f:
+            baseline = json.load(f).get("targets") or {}
+
+    interp_ms, _ = measure(None, args.repeat)
+    results: Dict[str, Any] = {}
+    failures: List[str] = []
+    for t in targets:
+        total_ms, names = measure(t, args.repeat)
+        added = round(max(0.0, total_ms - interp_ms), 2)
+        row: Dict[str, Any] = {"importMs": added}
+        hits = forbidden_hits(names, list(t.get("forbid") or []))
+        if hits:
+            row["heavyImports"] = hits
+            failures.append(f"{t['name']}: imports {', '.join(hits)} at start-up")
+        base = (baseline.get(t["name"]) or {}).get("importMs")
+        if isinstance(base, (int, float)) and not args.update:
+            limit = max(base * args.tolerance, base + args.slack_ms)
+            row["baselineMs"] = base
+            row["limitMs"] = round(limit, 2)
+            if added > limit:
+                failures.append(f"{t['name']}: {added} ms > {round(limit, 2)} ms (baseline {base} ms)")
+        results[t["name"]] = row
+
+    recorded = False
+    if args.update or not baseline:
+        os.makedirs(os.path.dirname(baseline_path) or ".", exist_ok=True)
+        merged = dict(baseline)
+        merged.update({k: {"importMs": v["importMs"]} for k, v in results.items()})
+        with open(baseline_path, "w", encoding="utf-8") as f:
+            json.dump({"python": sys.version.split()[0], "targets": merged}, f, ensure_ascii=False, indent=2)
+        recorded = True
+
+    print(json.dumps({
+        "ok": not failures,
+        "interpreterMs": round(interp_ms, 2),
+        "results": results,
+        "failures": failures,
+        "baseline": baseline_path,
+        "baselineRecorded": recorded,
+    }, ensure_ascii=False, indent=2))
+    return 0 if not failures else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,12 +1,18 @@
 # @feature: cache revit info | keywords: タグ
 import argparse
+import asyncio
 import json
 import os
+import sys
 import time
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 import requests
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from revit_mcp_async import call_on_ports, parse_ports  # type: ignore  # noqa: E402
+
 
 HEADERS = {
     "Content-Type": "application/json; charset=utf-8",
@@ -89,6 +95,10 @@ def load_json(path: str) -> Any:
         return json.load(f)
 
 
+WHAT_METHODS = {"project": "get_project_info", "documents": "get_open_documents"}
+WHAT_FILES = {"project": "project_info", "documents": "open_documents"}
+
+
 def main():
     script_dir = os.path.dirname(os.path.abspath(__file__))
     repo_root = os.path.abspath(os.path.join(script_dir, "..", ".."))
@@ -96,6 +106,7 @@ def main():
     ap = argparse.ArgumentParser(description="Fetch and cache Revit project/document info via Proxy→Playbook→Revit chain.")
     ap.add_argument("--proxy", type=str, default="http://127.0.0.1:5221", help="Proxy base URL")
     ap.add_argument("--revit-port", type=int, default=5211, help="Target Revit MCP port")
+    ap.add_argument("--revit-ports", type=str, default=None, help="Several ports fetched concurrently, e.g. 5210-5219 (overrides --revit-port)")
     ap.add_argument("--out-dir", type=str, default=default_out_dir, help="Output directory for JSON cache (prefer Projects/<Project>_<Port>/Logs)")
     ap.add_argument("--refresh", action="store_true", help="Force refresh even if cache exists")
     ap.add_argument("--ttl-sec", type=int, default=0, help="Cache TTL (seconds). 0 = no TTL (always reuse if present)")
@@ -104,9 +115,11 @@ def main():
 
     ensure_dir(args.out_dir)
     ts = int(time.time())
-    base_name = f"{args.revit_port}"
-    proj_path = os.path.join(args.out_dir, f"project_info_{base_name}.json")
-    docs_path = os.path.join(args.out_dir, f"open_documents_{base_name}.json")
+    ports: List[int] = parse_ports(args.revit_ports) if args.revit_ports else [args.revit_port]
+    whats = ["project", "documents"] if args.what == "all" else [args.what]
+
+    def cache_path(what: str, port: int) -> str:
+        return os.path.join(args.out_dir, f"{WHAT_FILES[what]}_{port}.json")
 
     def cache_valid(path: str) -> bool:
         if not os.path.exists(path):
@@ -116,30 +129,36 @@ def main():
             return age <= args.ttl_sec
         return True
 
-    results = {}
-
-    if args.what in ("all", "project"):
-        if not args.refresh and cache_valid(proj_path):
-            proj = load_json(proj_path)
-        else:
-            outer = durable_call_via_proxy(args.proxy, args.revit_port, "get_project_info")
+    results: Dict[str, Any] = {}
+    errors: Dict[str, Any] = {}
+    for what in whats:
+        missing = [p for p in ports if args.refresh or not cache_valid(cache_path(what, p))]
+        fetched: Dict[int, Dict[str, Any]] = {}
+        if len(missing) == 1:
+            outer = durable_call_via_proxy(args.proxy, missing[0], WHAT_METHODS[what])
             # expected outer: { jsonrpc, id, result: { jsonrpc, id, method, agentId, result: {...} } }
-            inner = outer.get("result", {}).get("result", outer.get("result", {}))
-            proj = {"ts": ts, "port": args.revit_port, "method": "get_project_info", "result": inner}
-            save_json(proj_path, proj)
-        results["project"] = proj
-
-    if args.what in ("all", "documents"):
-        if not args.refresh and cache_valid(docs_path):
-            docs = load_json(docs_path)
-        else:
-            outer = durable_call_via_proxy(args.proxy, args.revit_port, "get_open_documents")
-            inner = outer.get("result", {}).get("result", outer.get("result", {}))
-            docs = {"ts": ts, "port": args.revit_port, "method": "get_open_documents", "result": inner}
-            save_json(docs_path, docs)
-        results["documents"] = docs
-
-    print(_json({"ok": True, "outDir": args.out_dir, "ports": args.revit_port, "saved": results}))
+            fetched[missing[0]] = {"ok": True, "result": outer.get("result", {}).get("result", outer.get("result", {}))}
+        elif missing:
+            fetched = asyncio.run(call_on_ports(missing, WHAT_METHODS[what], proxy=args.proxy))
+        for p in ports:
+            path = cache_path(what, p)
+            if p in fetched:
+                if not fetched[p].get("ok"):
+                    errors[f"{what}:{p}"] = fetched[p].get("error")
+                    continue
+                rec = {"ts": ts, "port": p, "method": WHAT_METHODS[what], "result": fetched[p].get("result")}
+                save_json(path, rec)
+            else:
+                rec = load_json(path)
+            if len(ports) == 1:
+                results[what] = rec
+            else:
+                results.setdefault(str(p), {})[what] = rec
+
+    out: Dict[str, Any] = {"ok": not errors, "outDir": args.out_dir, "ports": args.revit_port if len(ports) == 1 else ports, "saved": results}
+    if errors:
+        out["errors"] = errors
+    print(_json(out))
 
 
 if __name__ == "__main__":
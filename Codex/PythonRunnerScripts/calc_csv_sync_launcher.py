@@ -0,0 +1,150 @@
+# @feature: 電算CSV同期ラッパー共通（コア起動・複数ラッパーの1回起動への統合） | keywords: CSV, 同期, ラッパー, 一括実行
+# -*- coding: utf-8 -*-
+
+"""
+sync_*_from_calc_csv ラッパーの共通処理。
+
+各ラッパーは core_options() でコア（sync_type_params_from_calc_csv.py）への指定を返し、
+run_core([core_options()], apply=APPLY) で起動する。
+
+    {"kinds": ["columns"], "columnListMode": "rc", "onlyColumnListSync": True}
+
+複数ラッパーの指定を1回の起動にまとめると（sync_calc_csv_chain.py）、
+モデル情報（タイプ一覧・タイプパラメータ・インスタンス・詳細項目タイプ）の取得が
+コア内で1回になり、全ステージで共有される。
+
+まとめ方
+- kinds: 和集合。onlyColumnListSync のラッパーだけが指定した kind は期待値集計のみ
+  （--expected-only-kinds）
+- columnListMode / beamListMode: 指定したラッパーの値だけで both > auto > rc+src(=both) > 単独 > none
+  （どのラッパーも指定しなければ auto）
+- syncFrameInstances: いずれかが True なら True
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+CORE_SCRIPT = "sync_type_params_from_calc_csv.py"
+LIST_MODES = ("auto", "rc", "src", "both", "none")
+
+
+def resolve_port(port_override: Optional[int] = None) -> int:
+    if port_override and int(port_override) > 0:
+        return int(port_override)
+    p = os.environ.get("REVIT_MCP_PORT", "").strip()
+    if p.isdigit():
+        return int(p)
+    ss = Path(os.environ.get("LOCALAPPDATA", "")) / "RevitMCP" / "server_state.json"
+    if ss.exists():
+        try:
+            row = json.loads(ss.read_text(encoding="utf-8"))
+            v = int(row.get("port") or 0)
+            if v > 0:
+                return v
+        except Exception:
+            pass
+    return 5210
+
+
+def _candidate_roots() -> List[Path]:
+    roots: List[Path] = []
+    env_root = os.environ.get("REVIT_MCP_ROOT", "").strip()
+    if env_root:
+        roots.append(Path(env_root))
+    roots.append(Path.home() / "Documents" / "Revit_MCP")
+    roots.append(Path(__file__).resolve().parents[2])
+    return roots
+
+
+def resolve_core_script() -> Path:
+    for root in _candidate_roots():
+        c = root / "Scripts" / "PythonRunnerScripts" / CORE_SCRIPT
+        if c.exists():
+            return c
+    raise FileNotFoundError(f"{CORE_SCRIPT} が見つかりません。")
+
+
+def _list_mode(value: Any, default: str = "auto") -> str:
+    m = str(value or default).strip().lower()
+    return m if m in LIST_MODES else default
+
+
+def _merge_list_modes(modes: List[str]) -> str:
+    ms = {m for m in modes if m != "none"}
+    if not ms:
+        return "none"
+    if "both" in ms or {"rc", "src"} <= ms:
+        return "both"
+    if "auto" in ms:
+        return "auto"
+    return next(iter(ms))
+
+
+def merge_options(options: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """複数ラッパーの core_options() を1回のコア起動分にまとめる。"""
+    kinds: List[str] = []
+    synced: set = set()
+    for o in options:
+        for k in o.get("kinds") or []:
+            if k not in kinds:
+                kinds.append(k)
+            if not o.get("onlyColumnListSync"):
+                synced.add(k)
+    # モードを指定したラッパーだけでまとめる（どれも指定しなければ既定の auto）
+    column_modes = [_list_mode(o["columnListMode"]) for o in options if "columnListMode" in o]
+    beam_modes = [_list_mode(o["beamListMode"]) for o in options if "beamListMode" in o]
+    return {
+        "kinds": kinds,
+        "expectedOnlyKinds": [k for k in kinds if k not in synced],
+        "columnListMode": _merge_list_modes(column_modes) if column_modes else "auto",
+        "beamListMode": _merge_list_modes(beam_modes) if beam_modes else "auto",
+        "syncFrameInstances": any(bool(o.get("syncFrameInstances")) for o in options),
+    }
+
+
+def core_command(options: Dict[str, Any], *, apply: bool, port: int, csv_path: str = "") -> List[str]:
+    kinds = list(options.get("kinds") or [])
+    expected_only = list(options.get("expectedOnlyKinds") or [])
+    cmd = [
+        sys.executable,
+        str(resolve_core_script()),
+        "--port",
+        str(port),
+        "--mode",
+        "apply" if apply else "plan",
+        "--kinds",
+        ",".join(kinds),
+        "--column-list-mode",
+        _list_mode(options.get("columnListMode")),
+        "--beam-list-mode",
+        _list_mode(options.get("beamListMode")),
+    ]
+    if kinds and set(expected_only) >= set(kinds):
+        cmd.append("--only-column-list-sync")
+    elif expected_only:
+        cmd += ["--expected-only-kinds", ",".join(expected_only)]
+    if options.get("syncFrameInstances"):
+        cmd.append("--sync-frame-instances")
+    if str(csv_path or "").strip():
+        cmd += ["--csv-path", str(csv_path).strip()]
+    return cmd
+
+
+def run_core(
+    options: List[Dict[str, Any]],
+    *,
+    apply: bool,
+    csv_path: str = "",
+    port_override: Optional[int] = None,
+) -> int:
+    """options（ラッパーごとの core_options()）をまとめてコアを1回起動し、終了コードを返す。"""
+    cmd = core_command(merge_options(options), apply=apply, port=resolve_port(port_override), csv_path=csv_path)
+    print("RUN:", " ".join(cmd))
+    p = subprocess.run(cmd, check=False)
+    return int(p.returncode)
@@ -15,6 +15,7 @@ def _add_scripts_to_path() -> None:
 _add_scripts_to_path()
 
 from send_revit_command_durable import send_request, RevitMcpError  # type: ignore  # noqa: E402
+from wall_bulk_queries import DEFAULT_FINISH_PAGE, iter_wall_finish_summaries  # type: ignore  # noqa: E402
 
 
 def unwrap(payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -50,9 +51,9 @@ def get_wall_ids_in_view(port: int, view_id: int) -> List[int]:
     return [int(eid) for eid in res.get("elementIds") or []]
 
 
-def classify_wall_finish(port: int, wall_id: int) -> Dict[str, Any]:
-    env = send_request(port, "get_wall_finish_summary", {"elementId": wall_id})
-    res = unwrap(env)
+def classify_wall_finish(res: Dict[str, Any]) -> Dict[str, Any]:
+    """Classify one get_wall_finish_summary item."""
+    wall_id = int(res.get("elementId") or res.get("wallId") or 0)
     if not res.get("ok"):
         return {"wallId": wall_id, "status": "ERROR", "reason": res.get("msg", "")}
 
@@ -125,6 +126,12 @@ def main(argv: List[str]) -> int:
         action="store_true",
         help="ビューにテンプレートが適用されている場合、set_visual_override 実行前にテンプレートを外す試行を許可する",
     )
+    ap.add_argument(
+        "--page-size",
+        type=int,
+        default=DEFAULT_FINISH_PAGE,
+        help="get_wall_finish_summary 1回あたりの壁数（elementIds[] ページング）",
+    )
     args = ap.parse_args(argv)
 
     port = args.port
@@ -150,22 +157,21 @@ def main(argv: List[str]) -> int:
     no_finish_ids: List[int] = []
     errors: List[Dict[str, Any]] = []
 
-    for wid in wall_ids:
-        try:
-            res = classify_wall_finish(port, wid)
-        except RevitMcpError as ex:
-            errors.append({"wallId": wid, "status": "ERROR", "reason": str(ex)})
-            continue
-
-        st = res.get("status")
-        if st == "OK":
-            ok_ids.append(wid)
-        elif st == "SUSPECT":
-            suspect_ids.append(wid)
-        elif st == "NO_FINISH":
-            no_finish_ids.append(wid)
-        elif st == "ERROR":
-            errors.append(res)
+    try:
+        for item in iter_wall_finish_summaries(port, wall_ids, page_size=args.page_size):
+            res = classify_wall_finish(item)
+            wid = int(res.get("wallId") or 0)
+            st = res.get("status")
+            if st == "OK":
+                ok_ids.append(wid)
+            elif st == "SUSPECT":
+                suspect_ids.append(wid)
+            elif st == "NO_FINISH":
+                no_finish_ids.append(wid)
+            elif st == "ERROR":
+                errors.append(res)
+    except RevitMcpError as ex:
+        errors.append({"status": "ERROR", "reason": str(ex)})
 
     color_result: Dict[str, Any] = {}
     if not args.no_colorize:
@@ -22,6 +22,7 @@ except Exception:
     pass
 
 from send_revit_command_durable import send_request, RevitMcpError  # type: ignore  # noqa: E402
+from live_load_pipeline import get_room_labels_bulk, live_load_key  # type: ignore  # noqa: E402
 
 
 def unwrap(payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -78,36 +79,6 @@ def duplicate_view_with_suffix(port: int, base_view_id: int, suffix: str) -> Tup
     return new_vid, new_name
 
 
-def extract_live_load_from_room_params(params_list: List[Dict[str, Any]]) -> Tuple[str, str]:
-    """Room のパラメータ配列から (roomLabel, liveLoadKey) を取得。"""
-    name_val = None
-    number_val = None
-    load_val = None
-
-    for p in params_list:
-        n = (p.get("name") or "").strip()
-        if n == "名前" and name_val is None:
-            name_val = p.get("display") or p.get("value") or p.get("raw")
-        elif n == "番号" and number_val is None:
-            number_val = p.get("display") or p.get("value") or p.get("raw")
-        elif n == "積載荷重" and load_val is None:
-            load_val = p.get("display") or p.get("value") or p.get("raw")
-
-    parts: List[str] = []
-    if name_val:
-        parts.append(str(name_val))
-    if number_val:
-        parts.append(str(number_val))
-    room_label = " ".join(parts) if parts else ""
-
-    if load_val is None or (isinstance(load_val, str) and not load_val.strip()):
-        load_key = "(未設定)"
-    else:
-        load_key = str(load_val)
-
-    return room_label, load_key
-
-
 def apply_override(
     port: int,
     view_id: int,
@@ -235,11 +206,11 @@ def main(argv: List[str]) -> int:
         groups_masses: Dict[str, List[int]] = defaultdict(list)
         room_summaries: List[Dict[str, Any]] = []
 
+        labels = get_room_labels_bulk(port, list(room_to_mass.keys()))
         for room_id, mass_id in room_to_mass.items():
-            rp_outer = send_request(port, "get_room_params", {"roomId": room_id})
-            rp = unwrap(rp_outer)
-            params_list = rp.get("parameters") or []
-        room_label, load_key = extract_live_load_from_room_params(params_list)
+            name_s, number_s, live_s = labels.get(room_id, ("", "", ""))
+            room_label = " ".join(x for x in (name_s, number_s) if x)
+            load_key = live_load_key(live_s, "(未設定)")
 
             groups_masses[load_key].append(mass_id)
             room_summaries.append(
@@ -3,7 +3,6 @@ import argparse
 import json
 import sys
 import os
-from collections import defaultdict
 from typing import Any, Dict, List, Tuple
 
 
@@ -16,6 +15,16 @@ def _add_scripts_to_path() -> None:
 _add_scripts_to_path()
 
 from send_revit_command_durable import send_request, RevitMcpError  # type: ignore  # noqa: E402
+from live_load_pipeline import (  # type: ignore  # noqa: E402
+    DEFAULT_CREATE_CHUNK,
+    apply_group_overrides,
+    build_color_map,
+    create_room_masses_batched,
+    get_room_labels_bulk,
+    group_by_live_load,
+)
+
+UNSET_KEY = "(未設定)"
 
 
 def unwrap(payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -88,142 +97,6 @@ def collect_rooms_in_view(port: int, view_id: int) -> List[int]:
     return [int(x) for x in ids]
 
 
-def extract_room_label_and_load(
-    params_list: List[Dict[str, Any]], room_id: int
-) -> Tuple[str, str]:
-    """Return (roomLabel, liveLoadKey) from get_room_params parameters."""
-    name_val = None
-    number_val = None
-    load_val = None
-
-    for p in params_list:
-        n = (p.get("name") or "").strip()
-        if n == "名前" and name_val is None:
-            name_val = p.get("display") or p.get("value") or p.get("raw")
-        elif n == "番号" and number_val is None:
-            number_val = p.get("display") or p.get("value") or p.get("raw")
-        elif n == "積載荷重" and load_val is None:
-            load_val = p.get("display") or p.get("value") or p.get("raw")
-
-    parts: List[str] = []
-    if name_val:
-        parts.append(str(name_val))
-    if number_val:
-        parts.append(str(number_val))
-    room_name = " ".join(parts) if parts else f"Room_{room_id}"
-
-    if load_val is None or (isinstance(load_val, str) and not load_val.strip()):
-        load_key = "(未設定)"
-    else:
-        load_key = str(load_val)
-
-    return room_name, load_key
-
-
-def choose_outer_loop(loops: List[Dict[str, Any]]) -> Dict[str, Any]:
-    """Choose outer boundary loop (loopIndex==0, fallback largest perimeter)."""
-    if not loops:
-        return {}
-    for lp in loops:
-        if lp.get("loopIndex") == 0:
-            return lp
-    best = None
-    best_perim = -1.0
-    for lp in loops:
-        segs = lp.get("segments") or []
-        perim = 0.0
-        for seg in segs:
-            s = seg.get("start") or {}
-            e = seg.get("end") or {}
-            dx = float(e.get("x", 0.0)) - float(s.get("x", 0.0))
-            dy = float(e.get("y", 0.0)) - float(s.get("y", 0.0))
-            perim += (dx * dx + dy * dy) ** 0.5
-        if perim > best_perim:
-            best_perim = perim
-            best = lp
-    return best or {}
-
-
-def create_mass_for_room(port: int, room_id: int, default_height_mm: float = 2800.0) -> int:
-    """Create a DirectShape mass from room footprint and move it to room's base Z."""
-    rb_outer = send_request(port, "get_room_boundary", {"elementId": room_id})
-    rb = unwrap(rb_outer)
-    loops = rb.get("loops") or []
-    outer = choose_outer_loop(loops)
-    if not outer:
-        return 0
-
-    segs = outer.get("segments") or []
-    if not segs:
-        return 0
-
-    loop_xy: List[Dict[str, float]] = []
-    z0 = None
-    for seg in segs:
-        s = seg.get("start") or {}
-        x = float(s.get("x", 0.0))
-        y = float(s.get("y", 0.0))
-        z = float(s.get("z", 0.0))
-        if z0 is None:
-            z0 = z
-        loop_xy.append({"x": x, "y": y})
-    last_end = segs[-1].get("end") or {}
-    x_end = float(last_end.get("x", 0.0))
-    y_end = float(last_end.get("y", 0.0))
-    loop_xy.append({"x": x_end, "y": y_end})
-
-    if z0 is None:
-        z0 = 0.0
-
-    # For now use fixed height; can be refined via get_room_params if needed.
-    height_mm = float(default_height_mm)
-
-    cdsm_params = {
-        "loops": [loop_xy],
-        "height": height_mm,
-        "useMassCategory": True,
-    }
-    cdsm_outer = send_request(port, "create_direct_shape_mass", cdsm_params)
-    cdsm = unwrap(cdsm_outer)
-    mass_id = int(cdsm.get("elementId") or 0)
-    if mass_id <= 0:
-        return 0
-
-    dz = float(z0)
-    if abs(dz) > 1e-3:
-        try:
-            send_request(
-                port,
-                "move_mass_instance",
-                {"elementId": mass_id, "dx": 0.0, "dy": 0.0, "dz": dz},
-            )
-        except RevitMcpError:
-            # 権限や一時的なエラーは無視して続行
-            pass
-
-    return mass_id
-
-
-def apply_override(
-    port: int, view_id: int, element_ids: List[int], rgb: Tuple[int, int, int], transparency: int
-) -> None:
-    if not element_ids:
-        return
-    r, g, b = rgb
-    params = {
-        "viewId": view_id,
-        "elementIds": element_ids,
-        "autoWorkingView": False,
-        "detachViewTemplate": False,
-        "r": int(r),
-        "g": int(g),
-        "b": int(b),
-        "transparency": int(transparency),
-        "refreshView": True,
-    }
-    send_request(port, "set_visual_override", params)
-
-
 def main(argv: List[str]) -> int:
     ap = argparse.ArgumentParser(
         description=(
@@ -242,6 +115,12 @@ def main(argv: List[str]) -> int:
         default=0,
         help="処理する最大Room数（0以下で全件）。テスト時に制限するためのオプション。",
     )
+    ap.add_argument(
+        "--batch-size",
+        type=int,
+        default=DEFAULT_CREATE_CHUNK,
+        help="create_room_masses 1回（1トランザクション）あたりの Room 数",
+    )
     args = ap.parse_args(argv)
 
     port = args.port
@@ -270,26 +149,16 @@ def main(argv: List[str]) -> int:
         if args.max_rooms > 0:
             room_ids = room_ids[: args.max_rooms]
 
-        groups_masses: Dict[str, List[int]] = defaultdict(list)
-
-        for rid in room_ids:
-            rp_outer = send_request(port, "get_room_params", {"roomId": rid})
-            rp = unwrap(rp_outer)
-            params_list = rp.get("parameters") or []
-
-            _, load_key = extract_room_label_and_load(params_list, rid)
-            mass_id = create_mass_for_room(port, rid)
-            if mass_id > 0:
-                groups_masses[load_key].append(mass_id)
-
-        keys_all = list(groups_masses.keys())
-        special_keys = [k for k in keys_all if k in {"(未設定)", "-"}]
-        normal_keys = [k for k in keys_all if k not in special_keys]
-
-        try:
-            normal_keys_sorted = sorted(normal_keys, key=lambda x: float(x))
-        except Exception:
-            normal_keys_sorted = sorted(normal_keys)
+        # 積載荷重は一括取得、マスは create_room_masses でチャンク単位に作成
+        labels = get_room_labels_bulk(port, room_ids)
+        room_to_mass, item_errors = create_room_masses_batched(
+            port,
+            room_ids,
+            height_mode="fixed",
+            fixed_height_mm=2800.0,
+            chunk_size=args.batch_size,
+        )
+        groups_masses = group_by_live_load(room_to_mass, labels, UNSET_KEY)
 
         palette: List[Tuple[int, int, int]] = [
             (255, 230, 230),
@@ -300,19 +169,8 @@ def main(argv: List[str]) -> int:
             (230, 200, 255),
             (230, 230, 255),
         ]
-
-        color_map: Dict[str, Tuple[int, int, int]] = {}
-        for idx, key in enumerate(normal_keys_sorted):
-            color_map[key] = palette[idx % len(palette)]
-
-        if "-" in special_keys:
-            color_map["-"] = (210, 210, 210)
-        if "(未設定)" in special_keys:
-            color_map["(未設定)"] = (180, 180, 180)
-
-        for key, masses in groups_masses.items():
-            rgb = color_map.get(key, (255, 255, 255))
-            apply_override(port, new_view_id, masses, rgb, transparency=50)
+        color_map = build_color_map(groups_masses.keys(), palette, UNSET_KEY)
+        apply_group_overrides(port, new_view_id, groups_masses, color_map, transparency=50)
 
         result = {
             "ok": True,
@@ -322,6 +180,8 @@ def main(argv: List[str]) -> int:
             "newViewName": new_view_name,
             "groupCount": len(groups_masses),
             "groups": {k: len(v) for k, v in groups_masses.items()},
+            "createdCount": len(room_to_mass),
+            "itemErrors": item_errors,
         }
         print(json.dumps(result, ensure_ascii=False, indent=2))
         return 0
@@ -24,6 +24,7 @@ import json
 import time
 import math
 import statistics
+import sys
 from typing import Any, Dict, List, Optional, Tuple
 
 try:
@@ -78,6 +79,10 @@ except Exception:
     requests = _RequestsCompat()  # type: ignore
 
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from rpc_singleflight import SingleFlight  # type: ignore  # noqa: E402
+
+
 # --------------------------
 # User editable parameters
 # --------------------------
@@ -196,8 +201,13 @@ class RpcClient:
     def __init__(self, port: int):
         self.base_url = f"http://127.0.0.1:{port}"
         self.endpoint = detect_rpc_endpoint(self.base_url)
+        # 同一読み取りの重複排除（書き込みで同カテゴリを破棄）
+        self.reads = SingleFlight()
 
     def call(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        return self.reads.through(method, params, lambda: self._send(method, params))
+
+    def _send(self, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         payload = {
             "jsonrpc": "2.0",
             "id": f"req-{int(time.time() * 1000)}",
@@ -338,15 +348,20 @@ def resolve_view_by_name_or_level_or_active(rpc: RpcClient) -> Dict[str, Any]:
     raise RuntimeError("対象ビューを解決できません。SOURCE_VIEW_NAME / SOURCE_LEVEL_NAME / ActiveView を確認してください。")
 
 
+def get_view_template_names(rpc: RpcClient) -> List[str]:
+    # ビューの複写・縮尺変更ではテンプレート一覧は変わらないので "view_template" カテゴリで保持する
+    def fetch() -> List[str]:
+        resp = rpc.call_any(["view.get_views", "get_views"], {"includeTemplates": True})
+        views = get_list(resp, ["views", "items"])
+        return [(v.get("name") or "").strip().lower() for v in views if bool(v.get("isTemplate"))]
+
+    return rpc.reads.call("view_template_names", {}, fetch, categories=["view_template"])
+
+
 def template_exists(rpc: RpcClient, template_name: str) -> bool:
     if not template_name.strip():
         return False
-    resp = rpc.call_any(["view.get_views", "get_views"], {"includeTemplates": True})
-    views = get_list(resp, ["views", "items"])
-    for v in views:
-        if (v.get("name") or "").strip().lower() == template_name.strip().lower() and bool(v.get("isTemplate")):
-            return True
-    return False
+    return template_name.strip().lower() in get_view_template_names(rpc)
 
 
 def try_apply_template(rpc: RpcClient, view_id: int, template_name: str) -> Dict[str, Any]:
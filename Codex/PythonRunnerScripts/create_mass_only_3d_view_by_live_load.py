@@ -3,7 +3,6 @@ import argparse
 import json
 import os
 import sys
-from collections import defaultdict
 from typing import Any, Dict, List, Tuple
 
 
@@ -22,11 +21,14 @@ except Exception:
     pass
 
 from send_revit_command_durable import send_request, RevitMcpError  # type: ignore  # noqa: E402
+from live_load_pipeline import (  # type: ignore  # noqa: E402
+    apply_group_overrides,
+    build_color_map,
+    get_room_labels_bulk,
+    group_by_live_load,
+)
 
 
-NAME_PARAM = "\u540d\u524d"  # 名前
-NUMBER_PARAM = "\u756a\u53f7"  # 番号
-LIVE_LOAD_PARAM = "\u7a4d\u8f09\u8377\u91cd"  # 積載荷重
 UNSET_KEY = "UNSET"
 
 
@@ -134,23 +136,8 @@ def color_masses_by_live_load(
     view_id: int,
     room_to_mass: Dict[int, int],
 ) -> Dict[str, int]:
-    groups: Dict[str, List[int]] = defaultdict(list)
-
-    for room_id, mass_id in room_to_mass.items():
-        rp_outer = send_request(port, "get_room_params", {"roomId": room_id})
-        rp = unwrap(rp_outer)
-        params = rp.get("parameters") or []
-
-        load_val: Any = None
-        for p in params:
-            n = (p.get("name") or "").strip()
-            if n == LIVE_LOAD_PARAM and load_val is None:
-                load_val = p.get("display") or p.get("value") or p.get("raw")
-        if load_val is None or (isinstance(load_val, str) and not load_val.strip()):
-            key = UNSET_KEY
-        else:
-            key = str(load_val)
-        groups[key].append(mass_id)
+    labels = get_room_labels_bulk(port, list(room_to_mass.keys()))
+    groups = group_by_live_load(room_to_mass, labels, UNSET_KEY)
 
     # Index-style palette
     palette: List[Tuple[int, int, int]] = [
@@ -165,43 +152,15 @@ def color_masses_by_live_load(
         (0, 128, 128),
         (128, 128, 0),
     ]
-
-    keys_all = list(groups.keys())
-    special = [k for k in keys_all if k in {UNSET_KEY, "-"}]
-    normal = [k for k in keys_all if k not in special]
-
-    try:
-        normal_sorted = sorted(normal, key=lambda x: float(x))
-    except Exception:
-        normal_sorted = sorted(normal)
-
-    color_map: Dict[str, Tuple[int, int, int]] = {}
-    for idx, key in enumerate(normal_sorted):
-        color_map[key] = palette[idx % len(palette)]
-
-    if "-" in special:
-        color_map["-"] = (210, 210, 210)
-    if UNSET_KEY in special:
-        color_map[UNSET_KEY] = (180, 180, 180)
-
-    for key, mass_ids in groups.items():
-        rgb = color_map.get(key, (255, 255, 255))
-        send_request(
-            port,
-            "set_visual_override",
-            {
-                "viewId": view_id,
-                "elementIds": list(mass_ids),
-                "autoWorkingView": False,
-                "detachViewTemplate": False,
-                "r": int(rgb[0]),
-                "g": int(rgb[1]),
-                "b": int(rgb[2]),
-                "transparency": 50,
-                "refreshView": True,
-                "__smoke_ok": True,
-            },
-        )
+    color_map = build_color_map(groups.keys(), palette, UNSET_KEY)
+    apply_group_overrides(
+        port,
+        view_id,
+        groups,
+        color_map,
+        transparency=50,
+        extra_params={"__smoke_ok": True},
+    )
 
     return {k: len(v) for k, v in groups.items()}
 
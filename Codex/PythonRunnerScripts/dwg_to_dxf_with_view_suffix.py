@@ -21,6 +21,9 @@
 
 デフォルトではファイル名の stem（拡張子を除いた部分）を
 そのままビュー名サフィックスとして使います。
+
+--merge-to を指定すると、変換できた DXF を merge_dxfs_parallel.py で
+1 つの DXF にまとめます（レイヤは変換時にサフィックス済みなので追加の付け替えはしない）。
 """
 
 from __future__ import annotations
@@ -60,6 +63,17 @@ def parse_args() -> argparse.Namespace:
         default="ja-JP",
         help="CoreConsole のロケール（既定: ja-JP）",
     )
+    p.add_argument(
+        "--merge-to",
+        default=None,
+        help="変換後の DXF をまとめる出力 DXF のパス（省略時はマージしない）",
+    )
+    p.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="--merge-to のワーカープロセス数（既定: CPU 数）",
+    )
     return p.parse_args()
 
 
@@ -258,9 +272,20 @@ def main() -> None:
     results = [process_one(accore, args.locale, dwg, out_dir) for dwg in dwgs]
     ok_all = all(r.get("ok") for r in results) if results else False
 
+    payload = {"ok": ok_all, "results": results}
+    if args.merge_to:
+        from merge_dxfs_parallel import merge_dxfs
+
+        dxfs = [r["dxf"] for r in results if r.get("ok")]
+        try:
+            payload["merge"] = merge_dxfs(dxfs, args.merge_to, suffix="", max_workers=args.jobs)
+        except Exception as ex:
+            payload["merge"] = {"ok": False, "output": args.merge_to, "error": str(ex)}
+        payload["ok"] = ok_all and bool(payload["merge"].get("ok"))
+
     print(
         json.dumps(
-            {"ok": ok_all, "results": results},
+            payload,
             ensure_ascii=False,
         )
     )
@@ -15,6 +15,7 @@ def _add_scripts_to_path() -> None:
 _add_scripts_to_path()
 
 from send_revit_command_durable import send_request, RevitMcpError  # type: ignore  # noqa: E402
+from wall_bulk_queries import DEFAULT_BASELINE_PAGE, iter_wall_baselines  # type: ignore  # noqa: E402
 
 
 def unwrap(payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -63,11 +64,6 @@ def get_candidate_exterior_wall_ids(port: int, view_id: int) -> List[int]:
     return sorted({i for i in ids if i > 0})
 
 
-def get_wall_baseline(port: int, wall_id: int) -> Dict[str, Any]:
-    env = send_request(port, "get_wall_baseline", {"elementId": wall_id})
-    return unwrap(env)
-
-
 def main(argv: List[str]) -> int:
     ap = argparse.ArgumentParser(
         description=(
@@ -82,6 +78,12 @@ def main(argv: List[str]) -> int:
         default="Projects/tmp_exterior_wall_baselines.json",
         help="書き出し先 JSON パス（Codex ルート基準）",
     )
+    ap.add_argument(
+        "--page-size",
+        type=int,
+        default=DEFAULT_BASELINE_PAGE,
+        help="get_wall_baseline 1回あたりの壁数（elementIds[] ページング）",
+    )
     args = ap.parse_args(argv)
 
     try:
@@ -103,21 +105,21 @@ def main(argv: List[str]) -> int:
     baselines: List[Dict[str, Any]] = []
     errors: List[Dict[str, Any]] = []
 
-    for wid in wall_ids:
-        try:
-            base = get_wall_baseline(args.port, wid)
-        except RevitMcpError as ex:
-            errors.append({"wallId": wid, "reason": str(ex)})
-            continue
-        if not base.get("ok"):
-            errors.append({"wallId": wid, "reason": base.get("msg", "")})
-            continue
-        baselines.append(
-            {
-                "wallId": wid,
-                "baseline": base.get("baseline"),
-            }
-        )
+    try:
+        for base in iter_wall_baselines(args.port, wall_ids, page_size=args.page_size):
+            wid = int(base.get("elementId") or 0)
+            if not base.get("ok"):
+                errors.append({"wallId": wid, "reason": base.get("msg", "")})
+                continue
+            baselines.append(
+                {
+                    "wallId": wid,
+                    "baseline": base.get("baseline"),
+                }
+            )
+    except RevitMcpError as ex:
+        print(json.dumps({"ok": False, "code": "MCP_ERROR", "msg": str(ex)}, ensure_ascii=False, indent=2))
+        return 1
 
     out_obj = {
         "ok": True,
@@ -25,12 +25,10 @@ from set_room_mass_comments_from_live_load import (  # type: ignore  # noqa: E40
     find_latest_mapping_json,
     load_room_mass_mapping,
 )
-
-
-NAME_PARAM = "\u540d\u524d"  # 名前
-NUMBER_PARAM = "\u756a\u53f7"  # 番号
-LIVE_LOAD_PARAM = "\u7a4d\u8f09\u8377\u91cd"  # 積載荷重
-COMMENT_PARAM = "\u30b3\u30e1\u30f3\u30c8"  # コメント
+from live_load_pipeline import (  # type: ignore  # noqa: E402
+    get_mass_comments_bulk,
+    get_room_labels_bulk,
+)
 
 
 def unwrap(payload: Dict[str, Any]) -> Dict[str, Any]:
@@ -53,34 +51,6 @@ def get_current_view(port: int) -> Tuple[int, str]:
     return vid, name
 
 
-def get_room_labels_and_live_load(
-    port: int, room_id: int
-) -> Tuple[str, str, str]:
-    """Return (name, number, liveLoad) for a Room."""
-    rp_outer = send_request(port, "get_room_params", {"roomId": int(room_id)})
-    rp = unwrap(rp_outer)
-    params = rp.get("parameters") or []
-
-    name_val: Any = None
-    number_val: Any = None
-    load_val: Any = None
-
-    for p in params:
-        n = (p.get("name") or "").strip()
-        if n == NAME_PARAM and name_val is None:
-            name_val = p.get("display") or p.get("value") or p.get("raw")
-        elif n == NUMBER_PARAM and number_val is None:
-            number_val = p.get("display") or p.get("value") or p.get("raw")
-        elif n == LIVE_LOAD_PARAM and load_val is None:
-            load_val = p.get("display") or p.get("value") or p.get("raw")
-
-    name_s = str(name_val).strip() if name_val is not None else ""
-    number_s = str(number_val).strip() if number_val is not None else ""
-    live_s = str(load_val).strip() if load_val is not None else ""
-
-    return name_s, number_s, live_s
-
-
 def get_room_boundaries_for_rooms(
     port: int, room_ids: List[int]
 ) -> Dict[int, Dict[str, Any]]:
@@ -110,21 +80,6 @@ def get_room_boundaries_for_rooms(
     return by_id
 
 
-def get_mass_comment(port: int, mass_id: int) -> str:
-    mp_outer = send_request(
-        port, "get_mass_instance_parameters", {"elementId": int(mass_id)}
-    )
-    mp = unwrap(mp_outer)
-    params = mp.get("parameters") or []
-    comment_val: Any = None
-    for p in params:
-        n = (p.get("name") or "").strip()
-        if n == COMMENT_PARAM:
-            comment_val = p.get("value") or p.get("display") or p.get("raw")
-            break
-    return str(comment_val).strip() if comment_val is not None else ""
-
-
 def get_mass_instances_map(port: int) -> Dict[int, Dict[str, Any]]:
     """Get all mass instances and index by elementId."""
     mi_outer = send_request(
@@ -226,6 +181,8 @@ def main(argv: List[str]) -> int:
         boundaries_by_room = get_room_boundaries_for_rooms(port, room_ids)
         mass_instances = get_mass_instances_map(port)
         overrides_by_elem = get_view_overrides_map(port, view_id)
+        labels_by_room = get_room_labels_bulk(port, room_ids)
+        comments_by_mass = get_mass_comments_bulk(port, mass_ids)
 
         # Build per-mass entries
         entries: List[Dict[str, Any]] = []
@@ -234,7 +191,7 @@ def main(argv: List[str]) -> int:
             mass_id = int(pair["massId"])
 
             # Room labels and live load
-            name_s, number_s, live_s = get_room_labels_and_live_load(port, room_id)
+            name_s, number_s, live_s = labels_by_room.get(room_id, ("", "", ""))
 
             # Room boundaries (mm, including z)
             boundary = boundaries_by_room.get(room_id, {})
@@ -243,7 +200,7 @@ def main(argv: List[str]) -> int:
             mass_info = mass_instances.get(mass_id, {})
 
             # Mass comment
-            comment_s = get_mass_comment(port, mass_id)
+            comment_s = comments_by_mass.get(mass_id, "")
 
             # Visual overrides in current view
             vis = overrides_by_elem.get(mass_id, {})
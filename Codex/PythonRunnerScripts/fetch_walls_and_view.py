@@ -123,9 +123,13 @@ def get_current_view_id(proxy: str, port: int) -> Optional[int]:
     return None
 
 
-def fetch_elements_in_view(proxy: str, port: int, view_id: int, limit: int = 200000) -> Dict[str, Any]:
-    # Ask for idsOnly to reduce payload size
-    shape = {"idsOnly": True, "page": {"limit": int(limit)}}
+def fetch_elements_in_view(proxy: str, port: int, view_id: int, limit: int = 200000,
+                           ids_encoding: Optional[str] = "auto") -> Dict[str, Any]:
+    # Ask for idsOnly to reduce payload size; idsEncoding packs the ids as ranges / delta-varint
+    # (see id_set_codec.py) so a 400k-element view is not tens of MB of JSON.
+    shape: Dict[str, Any] = {"idsOnly": True, "page": {"limit": int(limit)}}
+    if ids_encoding and ids_encoding != "none":
+        shape["idsEncoding"] = ids_encoding
     params = {"viewId": int(view_id), "_shape": shape}
     outer = durable_call_via_proxy(proxy, port, "get_elements_in_view", params)
     return unwrap_result(outer)
@@ -139,6 +143,8 @@ def main():
                     "Documents", "VS2022", "Ver431", "Codex", "Manuals", "Logs"))
     ap.add_argument("--page-size", type=int, default=500)
     ap.add_argument("--ids-limit", type=int, default=200000)
+    ap.add_argument("--ids-encoding", choices=["auto", "ranges", "delta-varint", "none"], default="auto",
+                    help="Compact id-set encoding for the view snapshot ('none' = plain elementIds list)")
     args = ap.parse_args()
 
     ensure_dir(args.out_dir)
@@ -159,7 +165,7 @@ def main():
     view_id = get_current_view_id(args.proxy, args.revit_port)
     if view_id is None:
         raise RuntimeError("Failed to resolve current view id (get_current_view)")
-    view_res = fetch_elements_in_view(args.proxy, args.revit_port, view_id, args.ids_limit)
+    view_res = fetch_elements_in_view(args.proxy, args.revit_port, view_id, args.ids_limit, args.ids_encoding)
     save_json(view_ids_path, {
         "ok": True,
         "port": args.revit_port,
@@ -176,7 +182,7 @@ def main():
         },
         "counts": {
             "walls": len(walls),
-            "elementsInView": (len(view_res.get("elementIds", [])) if isinstance(view_res, dict) else None)
+            "elementsInView": (view_res.get("count", len(view_res.get("elementIds", []))) if isinstance(view_res, dict) else None)
         },
         "viewId": view_id
     }, ensure_ascii=False))
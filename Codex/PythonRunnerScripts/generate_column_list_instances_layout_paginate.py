@@ -21,12 +21,18 @@
 import json
 import os
 import re
+import sys
 import time
 from collections import defaultdict
+from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 import requests
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from list_cursor import iter_pages  # type: ignore  # noqa: E402
+from revit_records import InstanceRecord, StringTable  # type: ignore  # noqa: E402
+
 
 # ----------------------------
 # User Config (Python Runner向け)
@@ -88,6 +94,12 @@ TYPE_PARAM_POLL_TIMEOUT = 120
 LEVEL_FETCH_POLL_TIMEOUT = 60
 
 
+# 構造柱・タイプパラメータで繰り返し現れる文字列（レベル名・ファミリ名・パラメータ名/値）を1実体に
+_STRINGS = StringTable()
+# 符号の推定（_extract_symbol_from_column / _is_target_rc_src_column）で参照するインスタンス項目
+_COLUMN_KEEP_FIELDS = ("symbol", "mark", "typeMark", "tag", "code")
+
+
 def _log(msg: str) -> None:
     if VERBOSE:
         print(msg)
@@ -500,6 +512,90 @@ def _duplicate_family_type(base_url: str, source_type_id: int, new_name: str) ->
     return {"ok": False, "msg": f"duplicate_family_type failed: {last_err}"}
 
 
+def _duplicate_family_types_bulk(
+    base_url: str,
+    items: List[Dict[str, Any]],
+    batch_size: int = 100,
+    max_millis_per_tx: int = 2500,
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    duplicate_family_types_bulk で複製＋パラメータ設定をまとめて実行し、items と同じ順の結果を返す。
+    items: [{"sourceTypeId", "newName", "params": {...}, "copyParams": {...}}]
+    コマンドが無い（UNKNOWN_COMMAND: 旧アドイン）場合だけ None（呼び出し側で1タイプずつの処理に戻す）。
+    タイムアウト等その他の失敗はアドイン側で反映済みのことがあるため、1タイプずつやり直さず
+    未完了の項目を失敗として返す（再実行すれば同名タイプは reused として拾われる）。
+    """
+    results: List[Dict[str, Any]] = [{"ok": False, "msg": "not processed"} for _ in items]
+    if not items:
+        return results
+
+    start_index = 0
+    rounds = 0
+    while start_index < len(items):
+        rounds += 1
+        payload = {
+            "items": items,
+            "startIndex": int(start_index),
+            "batchSize": int(batch_size),
+            "maxMillisPerTx": int(max_millis_per_tx),
+            "returnValues": True,
+        }
+        ret = None
+        last_err = None
+        unknown = True
+        for m in ("element.duplicate_family_types_bulk", "duplicate_family_types_bulk"):
+            try:
+                ret = rpc(base_url, m, payload, poll_timeout_sec=TYPE_PARAM_POLL_TIMEOUT)
+                last_err = None
+            except Exception as ex:
+                ret, last_err = None, ex
+            unknown = _is_unknown_command(ret, last_err)
+            if not unknown:
+                break  # 別名で送り直すのはコマンドが無いときだけ（二重実行しない）
+        if unknown and start_index == 0:
+            _log(f"[WARN] duplicate_family_types_bulk unavailable; fallback to per-type: {last_err or (ret or {}).get('msg')}")
+            return None
+        if not isinstance(ret, dict) or not ret.get("ok", False):
+            msg = (
+                f"duplicate_family_types_bulk failed (may be partly applied; re-run to reuse created types): "
+                f"{last_err or (ret or {}).get('msg')}"
+            )
+            for i in range(start_index, len(items)):
+                results[i] = {"ok": False, "msg": msg}
+            return results
+
+        for r in ret.get("items") or []:
+            if not isinstance(r, dict):
+                continue
+            i = int(r.get("index", -1))
+            if 0 <= i < len(items):
+                results[i] = r
+        _log(
+            f"[INFO] duplicate_family_types_bulk start={start_index} created={int(ret.get('createdCount') or 0)} "
+            f"reused={int(ret.get('reusedCount') or 0)} failed={int(ret.get('failedCount') or 0)}"
+        )
+        next_index = ret.get("nextIndex")
+        if bool(ret.get("completed", False)):
+            break
+        if next_index is None or int(next_index) <= start_index:
+            start_index += int(batch_size)
+        else:
+            start_index = int(next_index)
+        if rounds > 10000:
+            break
+    return results
+
+
+def _is_unknown_command(ret: Any, err: Optional[BaseException]) -> bool:
+    """アドインにコマンドが無い応答か（UNKNOWN_COMMAND / JSON-RPC method not found）。"""
+    if isinstance(ret, dict) and str(ret.get("code") or "").upper() == "UNKNOWN_COMMAND":
+        return True
+    if err is None:
+        return False
+    txt = str(err)
+    return any(s in txt for s in ("UNKNOWN_COMMAND", "Unknown command", "-32601", "Method not found"))
+
+
 def _is_circle_type_record(rec: Dict[str, Any]) -> bool:
     fam = str(rec.get("familyName") or "")
     tname = str(rec.get("typeName") or "")
@@ -587,16 +683,8 @@ def _pick_template_type(
     return cands[0] if cands else None
 
 
-def _copy_common_type_params(
-    base_url: str,
-    src_values: Dict[str, Any],
-    dst_type_id: int,
-    dst_values: Dict[str, Any],
-) -> Dict[str, int]:
-    if not COPY_COMMON_TYPE_PARAMS:
-        return {"attempted": 0, "applied": 0}
-
-    skip = {
+_COMMON_PARAM_SKIP = frozenset(
+    {
         "タイプ名",
         "Type Name",
         "レベル名",
@@ -614,19 +702,42 @@ def _copy_common_type_params(
         "枠H",
         "コメント",
     }
-    attempted = 0
-    param_values: Dict[str, Any] = {}
-    for name in sorted(set(src_values.keys()) & set(dst_values.keys())):
-        if name in skip:
+)
+
+
+def _common_type_param_candidates(src_values: Dict[str, Any]) -> Dict[str, Any]:
+    """複製元の柱から新タイプへ写す値（タイプ名・符号・表示系などを除く、空でないもの）。名前順。"""
+    if not COPY_COMMON_TYPE_PARAMS:
+        return {}
+    out: Dict[str, Any] = {}
+    for name in sorted(src_values.keys()):
+        if name in _COMMON_PARAM_SKIP:
             continue
         sval = src_values.get(name)
         if sval in (None, ""):
             continue
-        dval = dst_values.get(name)
-        if _eq(sval, dval):
+        out[str(name)] = sval
+    return out
+
+
+def _copy_common_type_params(
+    base_url: str,
+    src_values: Dict[str, Any],
+    dst_type_id: int,
+    dst_values: Dict[str, Any],
+) -> Dict[str, int]:
+    if not COPY_COMMON_TYPE_PARAMS:
+        return {"attempted": 0, "applied": 0}
+
+    attempted = 0
+    param_values: Dict[str, Any] = {}
+    for name, sval in _common_type_param_candidates(src_values).items():
+        if name not in dst_values:
+            continue
+        if _eq(sval, dst_values.get(name)):
             continue
         attempted += 1
-        param_values[str(name)] = sval
+        param_values[name] = sval
     if attempted == 0:
         return {"attempted": 0, "applied": 0}
     res = _set_type_params_bulk(base_url, int(dst_type_id), param_values)
@@ -707,14 +818,9 @@ def _infer_src_steel_shape_mode(source_family_name: str, source_type_values: Dic
     return "unknown"
 
 
-def _apply_src_pipe_box_flags(
-    base_url: str,
-    dst_type_id: int,
-    source_family_name: str,
-    source_type_values: Dict[str, Any],
-) -> Dict[str, Any]:
+def _src_pipe_box_write_map(source_family_name: str, source_type_values: Dict[str, Any]) -> Tuple[str, Dict[str, Any]]:
     """
-    Dynamoの表示フラグに寄せて設定。
+    Dynamoの表示フラグに寄せた設定値（鋼形状モード, パラメータ名 -> 値）。
     対象:
       鉄骨「ボックス」, 鉄骨「パイプ」, 鉄骨「HX」, 鉄骨「HY」, 鉄骨「┻」, 鉄骨「┣」, 鉄骨「┳」, 鉄骨「┫」
     """
@@ -752,8 +858,16 @@ def _apply_src_pipe_box_flags(
         write_map["鉄骨X方向記号（H形のみ）"] = "〇"
     elif mode in ("brx", "bry"):
         write_map["鉄骨X方向記号（H形のみ）"] = "□"
-    res = _set_type_params_bulk(base_url, int(dst_type_id), write_map)
+    return mode, write_map
+
 
+def _src_pipe_box_report(
+    mode: str,
+    write_map: Dict[str, Any],
+    res: Dict[str, Any],
+    source_family_name: str,
+    source_type_values: Dict[str, Any],
+) -> Dict[str, Any]:
     return {
         "mode": mode,
         "values": write_map,
@@ -767,6 +881,94 @@ def _apply_src_pipe_box_flags(
     }
 
 
+def _apply_src_pipe_box_flags(
+    base_url: str,
+    dst_type_id: int,
+    source_family_name: str,
+    source_type_values: Dict[str, Any],
+) -> Dict[str, Any]:
+    """Dynamoの表示フラグに寄せて設定（_src_pipe_box_write_map の値を書き込む）。"""
+    mode, write_map = _src_pipe_box_write_map(source_family_name, source_type_values)
+    res = _set_type_params_bulk(base_url, int(dst_type_id), write_map)
+    return _src_pipe_box_report(mode, write_map, res, source_family_name, source_type_values)
+
+
+def _list_type_header_params(new_type_name: str, level_raw: str, symbol_raw: str, zone: str) -> Dict[str, Any]:
+    """新タイプの重要パラメータ（タイプ名・レベル名・符号・柱頭/柱脚断面フラグ）。"""
+    header_params: Dict[str, Any] = {
+        "タイプ名": new_type_name,
+        "レベル名": str(level_raw).replace("L", ""),
+        "符号": symbol_raw,
+    }
+    if zone == "柱頭":
+        header_params["柱頭断面"] = 1
+        header_params["柱脚断面"] = 0
+    elif zone == "柱脚":
+        header_params["柱頭断面"] = 0
+        header_params["柱脚断面"] = 1
+    elif zone == "全断面":
+        header_params["柱頭断面"] = 1
+        header_params["柱脚断面"] = 1
+    elif zone == "同上":
+        header_params["柱頭断面"] = 0
+        header_params["柱脚断面"] = 1
+    return header_params
+
+
+def _create_list_type_single(base_url: str, mode: str, spec: Dict[str, Any]) -> Dict[str, Any]:
+    """1タイプずつの作成（duplicate_family_types_bulk が使えない場合）。結果は bulk の項目と同じ形。"""
+    dup = _duplicate_family_type(base_url, int(spec["sourceTypeId"]), spec["newName"])
+    new_tid = int(dup.get("typeId") or 0)
+    if new_tid <= 0:
+        return {"ok": False, "msg": str(dup.get("msg") or "duplicate failed")}
+
+    _set_type_params_bulk(base_url, new_tid, spec["headerParams"])
+
+    new_vals = _get_type_params(base_url, new_tid)
+    copy_stat = _copy_common_type_params(base_url, spec["srcValues"], new_tid, new_vals)
+
+    # Dynamo移植補正: SRCの鋼表示フラグ（特に「鉄骨「パイプ」」誤ON防止）
+    src_pipe_box = None
+    if mode == "src":
+        src_pipe_box = _apply_src_pipe_box_flags(
+            base_url=base_url,
+            dst_type_id=new_tid,
+            source_family_name=spec["srcFamilyName"],
+            source_type_values=spec["srcValues"],
+        )
+
+    return {
+        "ok": True,
+        "typeId": new_tid,
+        "familyName": str(dup.get("familyName") or ""),
+        "values": _get_type_params(base_url, new_tid),
+        "copiedParams": copy_stat,
+        "srcPipeBox": src_pipe_box,
+    }
+
+
+def _bulk_item_outcome(spec: Dict[str, Any], item: Dict[str, Any]) -> Dict[str, Any]:
+    """duplicate_family_types_bulk の項目結果を _create_list_type_single と同じ形へ。"""
+    if not item.get("ok", False) or int(item.get("typeId") or 0) <= 0:
+        return {"ok": False, "msg": str(item.get("msg") or "duplicate failed")}
+    failed = [f for f in (item.get("failedParams") or []) if isinstance(f, dict)]
+    src_pipe_box = None
+    if spec.get("steelFlags") is not None:
+        steel_mode, write_map = spec["steelFlags"]
+        flag_failed = sum(1 for f in failed if not f.get("copy") and str(f.get("param") or "") in write_map)
+        res = {"ok": True, "updatedCount": len(write_map) - flag_failed, "failedCount": flag_failed}
+        src_pipe_box = _src_pipe_box_report(steel_mode, write_map, res, spec["srcFamilyName"], spec["srcValues"])
+    values = item.get("values") if isinstance(item.get("values"), dict) else {}
+    return {
+        "ok": True,
+        "typeId": int(item.get("typeId") or 0),
+        "familyName": str(item.get("familyName") or ""),
+        "values": _STRINGS.values(values),
+        "copiedParams": {"attempted": int(item.get("copyAttempted") or 0), "applied": int(item.get("copiedCount") or 0)},
+        "srcPipeBox": src_pipe_box,
+    }
+
+
 def _ensure_missing_types_from_columns(
     base_url: str,
     mode: str,
@@ -774,8 +976,14 @@ def _ensure_missing_types_from_columns(
     type_by_key_zone: Dict[Tuple[str, str, str], Dict[str, Any]],
     cell_seed: Dict[Tuple[str, str], Dict[str, Any]],
 ) -> Dict[str, Any]:
+    """
+    不足タイプを作成する。作成するタイプを先に全て決め（テンプレートは作成前の一覧から選ぶ）、
+    複製・パラメータ設定は duplicate_family_types_bulk の1要求（内部でチャンク分割）で行う。
+    """
     created = []
     errors = []
+    templates = list(list_type_records)
+    specs: List[Dict[str, Any]] = []
 
     def _required_zones(split: bool) -> List[str]:
         return ["全断面", "柱頭", "柱脚"] if split else ["全断面", "同上"]
@@ -801,7 +1009,7 @@ def _ensure_missing_types_from_columns(
                 if not (mode == "src" and zone == "同上" and not _is_preferred_src_doujou_family_name(str(existing.get("familyName") or ""))):
                     continue
 
-            tpl = _pick_template_type(list_type_records, mode=mode, zone=zone, want_circle=want_circle)
+            tpl = _pick_template_type(templates, mode=mode, zone=zone, want_circle=want_circle)
             if not tpl:
                 errors.append(
                     {
@@ -814,80 +1022,90 @@ def _ensure_missing_types_from_columns(
                 continue
 
             new_type_name = f"{level_raw}_{symbol_raw}_{zone}"
-            dup = _duplicate_family_type(base_url, int(tpl.get("typeId") or 0), new_type_name)
-            new_tid = int(dup.get("typeId") or 0)
-            if new_tid <= 0:
-                errors.append(
-                    {
-                        "level": level_raw,
-                        "symbol": symbol_raw,
-                        "zone": zone,
-                        "templateTypeId": int(tpl.get("typeId") or 0),
-                        "msg": str(dup.get("msg") or "duplicate failed"),
-                    }
-                )
-                continue
-
-            # 重要パラメータを整形
-            header_params = {
-                "タイプ名": new_type_name,
-                "レベル名": str(level_raw).replace("L", ""),
-                "符号": symbol_raw,
-            }
-            if zone == "柱頭":
-                header_params["柱頭断面"] = 1
-                header_params["柱脚断面"] = 0
-            elif zone == "柱脚":
-                header_params["柱頭断面"] = 0
-                header_params["柱脚断面"] = 1
-            elif zone == "全断面":
-                header_params["柱頭断面"] = 1
-                header_params["柱脚断面"] = 1
-            elif zone == "同上":
-                header_params["柱頭断面"] = 0
-                header_params["柱脚断面"] = 1
-            _set_type_params_bulk(base_url, new_tid, header_params)
-
-            new_vals = _get_type_params(base_url, new_tid)
-            copy_stat = _copy_common_type_params(base_url, src_vals, new_tid, new_vals)
-
-            # Dynamo移植補正: SRCの鋼表示フラグ（特に「鉄骨「パイプ」」誤ON防止）
-            src_pipe_box = None
-            if mode == "src":
-                src_pipe_box = _apply_src_pipe_box_flags(
-                    base_url=base_url,
-                    dst_type_id=new_tid,
-                    source_family_name=src_fam,
-                    source_type_values=src_vals,
-                )
-
-            new_vals = _get_type_params(base_url, new_tid)
-
-            rec = {
-                "typeId": new_tid,
-                "typeName": new_type_name,
-                "displayTypeName": str(_pick_value(new_vals, ["タイプ名", "Type Name"], new_type_name) or new_type_name),
-                "familyName": str(dup.get("familyName") or tpl.get("familyName") or ""),
-                "levelNorm": level_norm,
-                "symbolNorm": symbol_norm,
-                "zone": zone,
-                "typeValues": new_vals,
-            }
-            type_by_key_zone[k] = rec
-            list_type_records.append(rec)
-            created.append(
+            header_params = _list_type_header_params(new_type_name, level_raw, symbol_raw, zone)
+            steel_flags = _src_pipe_box_write_map(src_fam, src_vals) if mode == "src" else None
+            params = dict(header_params)
+            if steel_flags is not None:
+                params.update(steel_flags[1])
+            specs.append(
                 {
+                    "key": k,
                     "level": level_raw,
                     "symbol": symbol_raw,
+                    "levelNorm": level_norm,
+                    "symbolNorm": symbol_norm,
                     "zone": zone,
-                    "typeId": new_tid,
-                    "typeName": new_type_name,
-                    "familyName": rec["familyName"],
-                    "templateTypeId": int(tpl.get("typeId") or 0),
-                    "copiedParams": copy_stat,
-                    "srcPipeBox": src_pipe_box,
+                    "template": tpl,
+                    "sourceTypeId": int(tpl.get("typeId") or 0),
+                    "newName": new_type_name,
+                    "headerParams": header_params,
+                    "params": params,
+                    "srcValues": src_vals,
+                    "srcFamilyName": src_fam,
+                    "steelFlags": steel_flags,
+                }
+            )
+
+    if not specs:
+        return {"created": created, "errors": errors}
+
+    bulk_items = [
+        {
+            "sourceTypeId": sp["sourceTypeId"],
+            "newName": sp["newName"],
+            "allowExisting": True,
+            "params": sp["params"],
+            "copyParams": _common_type_param_candidates(sp["srcValues"]),
+        }
+        for sp in specs
+    ]
+    bulk = _duplicate_family_types_bulk(base_url, bulk_items)
+    for i, sp in enumerate(specs):
+        if bulk is None:
+            out = _create_list_type_single(base_url, mode, sp)
+        else:
+            out = _bulk_item_outcome(sp, bulk[i])
+        tpl = sp["template"]
+        if not out.get("ok", False):
+            errors.append(
+                {
+                    "level": sp["level"],
+                    "symbol": sp["symbol"],
+                    "zone": sp["zone"],
+                    "templateTypeId": sp["sourceTypeId"],
+                    "msg": str(out.get("msg") or "duplicate failed"),
                 }
             )
+            continue
+
+        new_tid = int(out["typeId"])
+        new_type_name = sp["newName"]
+        new_vals = out["values"]
+        rec = {
+            "typeId": new_tid,
+            "typeName": new_type_name,
+            "displayTypeName": str(_pick_value(new_vals, ["タイプ名", "Type Name"], new_type_name) or new_type_name),
+            "familyName": str(out.get("familyName") or tpl.get("familyName") or ""),
+            "levelNorm": sp["levelNorm"],
+            "symbolNorm": sp["symbolNorm"],
+            "zone": sp["zone"],
+            "typeValues": new_vals,
+        }
+        type_by_key_zone[sp["key"]] = rec
+        list_type_records.append(rec)
+        created.append(
+            {
+                "level": sp["level"],
+                "symbol": sp["symbol"],
+                "zone": sp["zone"],
+                "typeId": new_tid,
+                "typeName": new_type_name,
+                "familyName": rec["familyName"],
+                "templateTypeId": sp["sourceTypeId"],
+                "copiedParams": out.get("copiedParams"),
+                "srcPipeBox": out.get("srcPipeBox"),
+            }
+        )
 
     return {"created": created, "errors": errors}
 
@@ -917,45 +1135,29 @@ def _fetch_levels(base_url: str) -> Dict[str, float]:
     return out
 
 
-def _fetch_structural_columns(base_url: str, ref_view_id: Optional[int]) -> List[Dict[str, Any]]:
-    items: List[Dict[str, Any]] = []
-    skip = 0
-    count = 2000
-    seen_ids = set()
-    max_pages = 200
-    page_no = 0
-    while True:
-        page_no += 1
-        if page_no > max_pages:
-            _log(f"[WARN] structuralColumns paging reached max_pages={max_pages}; stop.")
-            break
-        params = {"skip": skip, "count": count}
-        if isinstance(ref_view_id, int) and ref_view_id > 0:
-            params["viewId"] = int(ref_view_id)
-        env = rpc(base_url, "element.get_structural_columns", params)
-        page = _extract_list(env, ["structuralColumns", "items", "elements"])
-        if not page:
-            break
-        page_items = [x for x in page if isinstance(x, dict)]
-        new_items = []
-        for x in page_items:
-            eid = int(x.get("elementId") or x.get("id") or 0)
-            if eid <= 0:
-                continue
-            if eid in seen_ids:
-                continue
-            seen_ids.add(eid)
-            new_items.append(x)
+def _fetch_structural_columns(base_url: str, ref_view_id: Optional[int]) -> List[InstanceRecord]:
+    items: List[InstanceRecord] = []
+    params: Dict[str, Any] = {}
+    if isinstance(ref_view_id, int) and ref_view_id > 0:
+        params["viewId"] = int(ref_view_id)
+    # サーバ側カーソル（初回のスナップショットから順に取得）。旧アドインは skip/count + 重複除外
+    # 次ページは変換中に先読み
+    pages = iter_pages(
+        lambda p: rpc(base_url, "element.get_structural_columns", p),
+        ["structuralColumns", "items", "elements"],
+        params,
+        page_size=2000,
+        max_pages=200,
+        prefetch_pages=1,
+    )
+    for page_no, page in enumerate(pages, start=1):
+        new_items = [
+            InstanceRecord.from_item(x, _STRINGS, keep=_COLUMN_KEEP_FIELDS)
+            for x in page
+            if int(x.get("elementId") or x.get("id") or 0) > 0
+        ]
         items.extend(new_items)
-        _log(
-            f"[INFO] structuralColumns page={page_no} raw={len(page_items)} new={len(new_items)} total={len(items)} skip={skip}"
-        )
-        if len(new_items) == 0:
-            _log("[WARN] structuralColumns pagination returned no new ids; stop.")
-            break
-        if len(page) < count:
-            break
-        skip += len(page)
+        _log(f"[INFO] structuralColumns page={page_no} new={len(new_items)} total={len(items)}")
     return items
 
 
@@ -985,7 +1187,7 @@ def _get_type_params(base_url: str, type_id: int) -> Dict[str, Any]:
             continue
         if n not in values or values[n] in ("", None):
             values[n] = p.get("value")
-    return values
+    return _STRINGS.values(values)
 
 
 def _pick_mode_from_families(list_types: List[Dict[str, Any]], override: str) -> str:
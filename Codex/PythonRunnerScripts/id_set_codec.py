@@ -0,0 +1,186 @@
+# @feature: compact element id sets (ranges / delta-varint) | keywords: ビュー, 要素ID, スナップショット, 差分
+"""
+Compact element-id sets, mirroring RevitMCPAddin/Core/IdSetCodec.cs.
+
+    { "encoding": "ranges" | "delta-varint", "count": n, "data": ... }
+
+- ranges       : data = [start0, length0, start1, length1, ...]
+- delta-varint : data = base64 of unsigned LEB128 deltas between sorted ids
+
+get_elements_in_view returns this as elementIdsEncoded when called with
+_shape { idsOnly: true, idsEncoding: "auto" }, and hide_elements_in_view
+accepts it as elementIdsEncoded. Snapshot files may hold either form.
+
+Set operations work on sorted (start, length) runs, so the difference of two
+400k-id views with long contiguous runs never expands into Python ints.
+"""
+import base64
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+Run = Tuple[int, int]  # (start, length)
+
+RANGES = "ranges"
+DELTA_VARINT = "delta-varint"
+AUTO = "auto"
+
+
+def runs_from_ids(ids: Iterable[int]) -> List[Run]:
+    """Sorted, de-duplicated runs for any iterable of ids."""
+    out: List[Run] = []
+    start = prev = None
+    for i in sorted(set(int(x) for x in ids)):
+        if prev is not None and i == prev + 1:
+            prev = i
+            continue
+        if start is not None:
+            out.append((start, prev - start + 1))
+        start = prev = i
+    if start is not None:
+        out.append((start, prev - start + 1))
+    return out
+
+
+def iter_ids(runs: Sequence[Run]) -> Iterator[int]:
+    for start, length in runs:
+        yield from range(start, start + length)
+
+
+def count_ids(runs: Sequence[Run]) -> int:
+    return sum(length for _, length in runs)
+
+
+def runs_difference(a: Sequence[Run], b: Sequence[Run]) -> List[Run]:
+    """Ids in a but not in b; both sorted and non-overlapping. Linear in the number of runs."""
+    out: List[Run] = []
+    j = 0
+    nb = len(b)
+    for start, length in a:
+        lo, hi = start, start + length  # half-open
+        while j < nb and b[j][0] + b[j][1] <= lo:
+            j += 1
+        k = j
+        while lo < hi and k < nb and b[k][0] < hi:
+            bs, be = b[k][0], b[k][0] + b[k][1]
+            if bs > lo:
+                out.append((lo, bs - lo))
+            lo = max(lo, be)
+            k += 1
+        if lo < hi:
+            out.append((lo, hi - lo))
+    return out
+
+
+def split_runs(runs: Sequence[Run], max_ids: int) -> Iterator[List[Run]]:
+    """Chunks of runs holding at most max_ids ids each (runs are cut when needed)."""
+    max_ids = max(1, int(max_ids))
+    chunk: List[Run] = []
+    room = max_ids
+    for start, length in runs:
+        while length > 0:
+            take = min(length, room)
+            chunk.append((start, take))
+            start += take
+            length -= take
+            room -= take
+            if room == 0:
+                yield chunk
+                chunk, room = [], max_ids
+    if chunk:
+        yield chunk
+
+
+def _varint_bytes(runs: Sequence[Run]) -> bytes:
+    buf = bytearray()
+    prev = 0
+    for i in iter_ids(runs):
+        if i < 0:
+            raise ValueError("negative ids are not supported")
+        v = i - prev
+        prev = i
+        while v >= 0x80:
+            buf.append((v & 0x7F) | 0x80)
+            v >>= 7
+        buf.append(v)
+    return bytes(buf)
+
+
+def encode_runs(runs: Sequence[Run], encoding: str = AUTO) -> Dict[str, Any]:
+    enc = (encoding or AUTO).strip().lower()
+    total = count_ids(runs)
+    if enc == AUTO:
+        # Same size estimate as the add-in: ~16 chars per run vs base64 varints.
+        varint = _varint_bytes(runs)
+        enc = RANGES if len(runs) * 16 <= (len(varint) + 2) // 3 * 4 else DELTA_VARINT
+        if enc == DELTA_VARINT:
+            return {"encoding": enc, "count": total, "data": base64.b64encode(varint).decode("ascii")}
+    if enc == RANGES:
+        data: List[int] = []
+        for start, length in runs:
+            data.extend((start, length))
+        return {"encoding": enc, "count": total, "data": data}
+    if enc == DELTA_VARINT:
+        return {"encoding": enc, "count": total, "data": base64.b64encode(_varint_bytes(runs)).decode("ascii")}
+    raise ValueError(f"unsupported encoding: {encoding}")
+
+
+def encode_ids(ids: Iterable[int], encoding: str = AUTO) -> Dict[str, Any]:
+    return encode_runs(runs_from_ids(ids), encoding)
+
+
+def decode_runs(obj: Dict[str, Any]) -> List[Run]:
+    enc = str(obj.get("encoding") or "").strip().lower()
+    if enc == RANGES:
+        data = list(obj.get("data") or [])
+        pairs = sorted((int(data[i]), int(data[i + 1])) for i in range(0, len(data) - 1, 2))
+        # normalise (merge adjacent/overlapping runs)
+        out: List[Run] = []
+        for start, length in pairs:
+            if length <= 0:
+                continue
+            if out and start <= out[-1][0] + out[-1][1]:
+                ps, pl = out[-1]
+                out[-1] = (ps, max(pl, start + length - ps))
+            else:
+                out.append((start, length))
+        return out
+    if enc == DELTA_VARINT:
+        raw = base64.b64decode(obj.get("data") or "")
+        out = []
+        prev = 0
+        v = shift = 0
+        run_start = run_end = None
+        for b in raw:
+            v |= (b & 0x7F) << shift
+            if b & 0x80:
+                shift += 7
+                continue
+            prev += v
+            v = shift = 0
+            if run_end is not None and prev == run_end:
+                run_end += 1
+                continue
+            if run_start is not None:
+                out.append((run_start, run_end - run_start))
+            run_start, run_end = prev, prev + 1
+        if run_start is not None:
+            out.append((run_start, run_end - run_start))
+        return out
+    raise ValueError(f"unsupported encoding: {enc}")
+
+
+def runs_from_payload(payload: Any) -> Optional[List[Run]]:
+    """
+    Runs from a get_elements_in_view result or a snapshot file: looks for
+    elementIdsEncoded or elementIds at the top level and under "result".
+    Returns None when neither is present.
+    """
+    obj = payload
+    for _ in range(3):
+        if not isinstance(obj, dict):
+            return None
+        if isinstance(obj.get("elementIdsEncoded"), dict):
+            return decode_runs(obj["elementIdsEncoded"])
+        if isinstance(obj.get("elementIds"), list):
+            return runs_from_ids(obj["elementIds"])
+        obj = obj.get("result")
+    return None
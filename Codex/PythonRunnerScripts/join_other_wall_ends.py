@@ -1,9 +1,12 @@
 # @feature: join other wall ends | keywords: 壁, ビュー
+import argparse
 import json
-import math
+import sys
 from typing import Any, Dict, List, Tuple
 
 from send_revit_command_durable import send_request, RevitMcpError
+from wall_bulk_queries import get_wall_baselines
+from wall_endpoint_index import apply_join_plan, build_join_plan, build_wall_index, dist_mm
 
 PORT = 5210
 
@@ -12,152 +15,116 @@ def _unwrap(result: Dict[str, Any]) -> Dict[str, Any]:
     return (result.get("result") or {}).get("result") or {}
 
 
-def _dist_mm(a: Dict[str, float], b: Dict[str, float]) -> float:
-    dx = a["x"] - b["x"]
-    dy = a["y"] - b["y"]
-    dz = a.get("z", 0.0) - b.get("z", 0.0)
-    return math.sqrt(dx * dx + dy * dy + dz * dz)
-
-
-def _dist_point_to_segment_mm(p: Dict[str, float], a: Dict[str, float], b: Dict[str, float]) -> float:
-    """点 p と線分 a-b の最短距離（mm）"""
-    ax, ay, az = a["x"], a["y"], a.get("z", 0.0)
-    bx, by, bz = b["x"], b["y"], b.get("z", 0.0)
-    px, py, pz = p["x"], p["y"], p.get("z", 0.0)
-
-    vx, vy, vz = bx - ax, by - ay, bz - az
-    wx, wy, wz = px - ax, py - ay, pz - az
-
-    vv = vx * vx + vy * vy + vz * vz
-    if vv <= 1e-9:
-        # a と b が同一点（退化）なら距離は点同士
-        return _dist_mm(p, a)
-
-    t = (wx * vx + wy * vy + wz * vz) / vv
-    if t < 0.0:
-        cx, cy, cz = ax, ay, az
-    elif t > 1.0:
-        cx, cy, cz = bx, by, bz
-    else:
-        cx, cy, cz = ax + t * vx, ay + t * vy, az + t * vz
-
-    dx, dy, dz = px - cx, py - cy, pz - cz
-    return math.sqrt(dx * dx + dy * dy + dz * dz)
-
-
-def main() -> None:
-    # 選択中の 2 枚の壁について、交点とは反対側の端点が
+def _walls_in_view(port: int, view_id: int) -> List[Dict[str, Any]]:
+    # ビュー内の全壁を取得（start/end/thickness mm 付き）
+    res_walls = send_request(port, "get_walls", {"viewId": view_id})
+    walls_payload = _unwrap(res_walls)
+    if not walls_payload.get("ok"):
+        raise RevitMcpError("get_walls", f"result not ok: {walls_payload!r}")
+    return walls_payload.get("walls") or []
+
+
+def _selected_other_ends(port: int, wall_ids: List[int]) -> Tuple[List[Tuple[int, Dict[str, float]]], str]:
+    """選択 2 壁の交点とは反対側の端点を返す。失敗時は ([], msg)。"""
+    # 対象 2 枚の壁の基線（両端座標）を取得
+    endpoints: Dict[int, Tuple[Dict[str, float], Dict[str, float]]] = {}
+    baselines = get_wall_baselines(port, wall_ids)
+    for wid in wall_ids:
+        bl = baselines.get(int(wid))
+        if not bl:
+            raise RevitMcpError("get_wall_baseline", f"baseline not available for {wid}")
+        endpoints[wid] = (bl["start"], bl["end"])
+
+    # 2 枚の壁で共通している端部（交点側）を特定
+    a0, a1 = endpoints[wall_ids[0]]
+    b0, b1 = endpoints[wall_ids[1]]
+    tol_endpoint = 1.0  # mm
+
+    common_pairs = []
+    for ai, a_pt in enumerate((a0, a1)):
+        for bi, b_pt in enumerate((b0, b1)):
+            if dist_mm(a_pt, b_pt) < tol_endpoint:
+                common_pairs.append((ai, bi))
+
+    if not common_pairs:
+        return [], "Two walls do not share a common endpoint; cannot infer 'other ends'."
+
+    # 共通端は 1 箇所と仮定し、残りを他端とする
+    common_a_idx, common_b_idx = common_pairs[0]
+    return [
+        (wall_ids[0], endpoints[wall_ids[0]][1 - common_a_idx]),
+        (wall_ids[1], endpoints[wall_ids[1]][1 - common_b_idx]),
+    ], ""
+
+
+def main(argv: List[str]) -> int:
+    # 既定: 選択中の 2 枚の壁について、交点とは反対側の端点が
     # 「他の壁の基準線セグメント（壁厚範囲内）」に当たっている場合は、その壁同士を join_elements で結合します。
+    # --all-in-view: ビュー内の全壁の両端について同じ判定を行い、重複を除いた結合計画をまとめて適用します。
+    ap = argparse.ArgumentParser(description="Join wall ends that touch another wall baseline (within thickness/2 + margin).")
+    ap.add_argument("--port", type=int, default=PORT)
+    ap.add_argument("--all-in-view", action="store_true", help="ビュー内の全壁端点を対象にする")
+    ap.add_argument("--margin-mm", type=float, default=5.0, help="壁厚/2 に加える許容量 (mm)")
+    ap.add_argument("--batch-size", type=int, default=100, help="revit.batch 1回あたりの join 数")
+    ap.add_argument("--dry-run", action="store_true", help="結合計画のみ出力し、join_elements を実行しない")
+    args = ap.parse_args(argv)
+    port = args.port
+
     try:
-        # 1) 選択中の要素 ID を取得
-        res_sel = send_request(PORT, "get_selected_element_ids", {})
-        sel_payload = _unwrap(res_sel)
-        if not sel_payload.get("ok"):
-            raise RevitMcpError("get_selected_element_ids", f"result not ok: {sel_payload!r}")
-        sel_ids: List[int] = sel_payload.get("elementIds") or []
-        if len(sel_ids) != 2:
-            print(json.dumps({"ok": False, "msg": f"Expecting exactly 2 selected elements, got {len(sel_ids)}."}, ensure_ascii=False))
-            return
-
-        wall_ids = sel_ids
-
-        # 2) 現在ビュー ID を取得
-        res_view = send_request(PORT, "get_current_view", {})
+        # 現在ビュー ID を取得
+        res_view = send_request(port, "get_current_view", {})
         view_payload = _unwrap(res_view)
         if not view_payload.get("ok"):
             raise RevitMcpError("get_current_view", f"result not ok: {view_payload!r}")
         view_id = int(view_payload["viewId"])
 
-        # 3) ビュー内の全壁を取得（start/end/thickness mm 付き）
-        res_walls = send_request(PORT, "get_walls", {"viewId": view_id})
-        walls_payload = _unwrap(res_walls)
-        if not walls_payload.get("ok"):
-            raise RevitMcpError("get_walls", f"result not ok: {walls_payload!r}")
-        walls = walls_payload.get("walls") or []
-
-        # 4) 対象 2 枚の壁の基線（両端座標）を取得
-        endpoints: Dict[int, Tuple[Dict[str, float], Dict[str, float]]] = {}
-        for wid in wall_ids:
-            res_base = send_request(PORT, "get_wall_baseline", {"elementId": wid})
-            base_payload = _unwrap(res_base)
-            if not base_payload.get("ok"):
-                raise RevitMcpError("get_wall_baseline", f"result not ok for {wid}: {base_payload!r}")
-            bl = base_payload["baseline"]
-            endpoints[wid] = (bl["start"], bl["end"])
-
-        # 5) 2 枚の壁で共通している端部（交点側）を特定
-        a0, a1 = endpoints[wall_ids[0]]
-        b0, b1 = endpoints[wall_ids[1]]
-        tol_endpoint = 1.0  # mm
-
-        common_pairs = []
-        for ai, a_pt in enumerate((a0, a1)):
-            for bi, b_pt in enumerate((b0, b1)):
-                if _dist_mm(a_pt, b_pt) < tol_endpoint:
-                    common_pairs.append((ai, bi))
-
-        if not common_pairs:
-            print(json.dumps({"ok": False, "msg": "Two walls do not share a common endpoint; cannot infer 'other ends'."}, ensure_ascii=False))
-            return
-
-        # 共通端は 1 箇所と仮定し、残りを他端とする
-        common_a_idx, common_b_idx = common_pairs[0]
-        other_a_idx = 1 - common_a_idx
-        other_b_idx = 1 - common_b_idx
-
-        other_ends = [
-            (wall_ids[0], endpoints[wall_ids[0]][other_a_idx]),
-            (wall_ids[1], endpoints[wall_ids[1]][other_b_idx]),
-        ]
-
-        # 6) 他端ごとに、ビュー内の他の壁の「基準線セグメント」との距離が
-        #    壁厚/2 + 5mm 以内のものを探して join_elements
-        joins_done = []
-        for wid, pt in other_ends:
-            best_id = None
-            best_dist = None
+        walls = _walls_in_view(port, view_id)
+        index = build_wall_index(walls, margin_mm=args.margin_mm)
 
+        selected: List[int] = []
+        if args.all_in_view:
+            ends: List[Tuple[int, Dict[str, float]]] = []
             for w in walls:
-                cid = int(w["elementId"])
-                if cid == wid:
-                    continue
-                s = w.get("start")
-                e = w.get("end")
-                if not s or not e:
-                    continue
-
-                thickness = float(w.get("thickness") or 0.0)
-                # 壁厚が取得できない場合は 300mm 程度を仮置き
-                if thickness <= 0.0:
-                    thickness = 300.0
-
-                d_seg = _dist_point_to_segment_mm(pt, s, e)
-                # 壁厚の半分 + 少し余裕
-                threshold = thickness * 0.5 + 5.0
-
-                if d_seg <= threshold and (best_dist is None or d_seg < best_dist):
-                    best_dist = d_seg
-                    best_id = cid
-
-            if best_id is not None and best_dist is not None:
-                try:
-                    send_request(PORT, "join_elements", {"elementIdA": wid, "elementIdB": best_id})
-                    joins_done.append({"a": wid, "b": best_id, "distanceMm": best_dist})
-                except RevitMcpError as e:
-                    joins_done.append({"a": wid, "b": best_id, "error": str(e)})
+                if w.get("start") and w.get("end"):
+                    wid = int(w["elementId"])
+                    ends.append((wid, w["start"]))
+                    ends.append((wid, w["end"]))
+        else:
+            # 選択中の要素 ID を取得
+            res_sel = send_request(port, "get_selected_element_ids", {})
+            sel_payload = _unwrap(res_sel)
+            if not sel_payload.get("ok"):
+                raise RevitMcpError("get_selected_element_ids", f"result not ok: {sel_payload!r}")
+            selected = sel_payload.get("elementIds") or []
+            if len(selected) != 2:
+                print(json.dumps({"ok": False, "msg": f"Expecting exactly 2 selected elements, got {len(selected)}."}, ensure_ascii=False))
+                return 1
+            ends, msg = _selected_other_ends(port, selected)
+            if not ends:
+                print(json.dumps({"ok": False, "msg": msg}, ensure_ascii=False))
+                return 1
+
+        # 端点ごとにグリッド索引から近傍の壁基準線だけを調べ、重複除去した結合計画を作る
+        plan = build_join_plan(index, ends)
+        joins_done = plan if args.dry_run else apply_join_plan(port, plan, batch_size=args.batch_size)
 
         print(
             json.dumps(
                 {
                     "ok": True,
-                    "selectedWalls": wall_ids,
+                    "mode": "view" if args.all_in_view else "selection",
+                    "selectedWalls": selected,
+                    "wallCount": len(walls),
+                    "endCount": len(ends),
+                    "dryRun": bool(args.dry_run),
                     "joins": joins_done,
-                    "note": "Endpoints whose distance to another wall baseline segment is within (thickness/2 + 5mm) were joined via join_elements."
+                    "note": f"Endpoints whose distance to another wall baseline segment is within (thickness/2 + {args.margin_mm}mm) were joined via join_elements."
                 },
                 ensure_ascii=False,
                 indent=2,
             )
         )
+        return 0
     except RevitMcpError as e:
         print(
             json.dumps(
@@ -171,8 +138,8 @@ def main() -> None:
                 indent=2,
             )
         )
+        return 1
 
 
 if __name__ == "__main__":
-    main()
-
+    raise SystemExit(main(sys.argv[1:]))
@@ -0,0 +1,208 @@
+# @feature: cursor paging for large element listings | keywords: ページング, カーソル, 一覧, 大規模, 高速化
+"""
+Paging over get_* element listings with server-side cursors.
+
+    fetch = lambda p: rpc(base_url, "element.get_structural_columns", p)
+    for page in iter_pages(fetch, "structuralColumns", page_size=2000):
+        ...
+    walls = list(iter_items(fetch_walls, "walls", page_size=1000))
+
+fetch(params) sends the listing command and returns its unwrapped
+{ ok, ... } result (whatever the script's own rpc helper returns).
+
+The first request carries useCursor=true: the add-in snapshots the ordered,
+filtered element ids and returns the first page plus nextCursor. Every
+further page is { cursor, count } served from that snapshot, so deep pages
+cost the same as the first one and the listing does not shift or repeat
+while the model changes (get_structural_columns, get_structural_frames,
+get_walls, get_rooms).
+
+Older add-ins answer without a nextCursor key; paging then falls back to
+skip/count (stop on an empty or short page, at totalCount, or when a page
+brings no new ids). An expired or rejected cursor resumes the same way at
+the current offset. Items already yielded are never yielded again.
+
+prefetch_pages=k keeps up to k further pages in flight on a background thread
+while the caller works on the current one (durable pages take 1-2 s on big
+models). Requests stay sequential — each cursor comes from the previous
+response — only the waiting overlaps with the caller's processing.
+Use it only when pages are consumed as they arrive; list(iter_items(...))
+waits for the last page either way and gains nothing from it.
+"""
+import queue
+import threading
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, TypeVar, Union
+
+Fetch = Callable[[Dict[str, Any]], Any]
+
+ID_KEYS = ("elementId", "id")
+
+T = TypeVar("T")
+
+_DONE = object()
+
+
+def _page_items(env: Any, list_key: Union[str, Sequence[str]]) -> List[Any]:
+    """The first list found under list_key (or one of several candidate keys)."""
+    if not isinstance(env, dict):
+        return []
+    for k in (list_key,) if isinstance(list_key, str) else list_key:
+        page = env.get(k)
+        if isinstance(page, list):
+            return page
+    return []
+
+
+def _to_int(v: Any) -> Optional[int]:
+    try:
+        return int(v)
+    except (TypeError, ValueError):
+        return None
+
+
+def prefetch(source: Iterable[T], depth: int = 1) -> Iterator[T]:
+    """
+    Iterate source on a background thread, up to depth items ahead of the caller.
+    Exceptions from source are re-raised here; leaving the loop early stops the thread.
+    """
+    q: "queue.Queue[Any]" = queue.Queue(maxsize=max(1, int(depth)))
+    stop = threading.Event()
+
+    def put(x: Any) -> bool:
+        while not stop.is_set():
+            try:
+                q.put(x, timeout=0.2)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def pump() -> None:
+        it = iter(source)
+        try:
+            for x in it:
+                if not put((x, None)):
+                    return
+            put((_DONE, None))
+        except BaseException as e:  # noqa: BLE001 - handed to the consumer
+            put((_DONE, e))
+        finally:
+            close = getattr(it, "close", None)
+            if close is not None:
+                try:
+                    close()
+                except Exception:
+                    pass
+
+    threading.Thread(target=pump, name="list-prefetch", daemon=True).start()
+    try:
+        while True:
+            x, err = q.get()
+            if x is _DONE:
+                if err is not None:
+                    raise err
+                return
+            yield x
+    finally:
+        stop.set()
+
+
+def iter_pages(
+    fetch: Fetch,
+    list_key: Union[str, Sequence[str]],
+    params: Optional[Dict[str, Any]] = None,
+    page_size: int = 1000,
+    max_pages: int = 10000,
+    id_keys: Sequence[str] = ID_KEYS,
+    prefetch_pages: int = 0,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Pages (lists of item dicts) of a listing, each item once."""
+    pages = _pages(fetch, list_key, params, page_size, max_pages, id_keys)
+    return prefetch(pages, prefetch_pages) if prefetch_pages > 0 else pages
+
+
+def _pages(
+    fetch: Fetch,
+    list_key: Union[str, Sequence[str]],
+    params: Optional[Dict[str, Any]],
+    page_size: int,
+    max_pages: int,
+    id_keys: Sequence[str],
+) -> Iterator[List[Dict[str, Any]]]:
+    base = dict(params or {})
+    count = max(1, int(page_size))
+    seen: set = set()
+
+    def fresh(page: List[Any]) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        for x in page:
+            if not isinstance(x, dict):
+                continue
+            eid = next((x.get(k) for k in id_keys if x.get(k)), None)
+            if eid is not None:
+                if eid in seen:
+                    continue
+                seen.add(eid)
+            out.append(x)
+        return out
+
+    env = fetch({**base, "skip": 0, "count": count, "useCursor": True})
+    page = _page_items(env, list_key)
+    offset = len(page)
+    yield fresh(page)
+    if not page:
+        return
+    cursor = env.get("nextCursor") if "nextCursor" in env else None
+    if "nextCursor" in env and not cursor:
+        return  # cursor listing completed in one page
+
+    pages = 1
+    while cursor and pages < max_pages:
+        try:
+            env = fetch({**base, "cursor": cursor, "count": count})
+        except Exception:
+            env = None
+        if not isinstance(env, dict) or env.get("ok") is False:
+            break  # expired / rejected: continue below with skip/count
+        page = _page_items(env, list_key)
+        offset += len(page)
+        pages += 1
+        yield fresh(page)
+        cursor = env.get("nextCursor")
+        if not cursor:
+            return
+
+    # skip/count (add-in without cursors, or the cursor was lost mid-way)
+    if cursor is None:
+        total = _to_int(env.get("totalCount"))
+        if len(page) < count or (total is not None and offset >= total):
+            return
+    while pages < max_pages:
+        env = fetch({**base, "skip": offset, "count": count})
+        page = _page_items(env, list_key)
+        if not page:
+            return
+        pages += 1
+        new_items = fresh(page)
+        yield new_items
+        offset += len(page)
+        if not new_items or len(page) < count:
+            return
+        total = _to_int(env.get("totalCount"))
+        if total is not None and offset >= total:
+            return
+
+
+def iter_items(
+    fetch: Fetch,
+    list_key: Union[str, Sequence[str]],
+    params: Optional[Dict[str, Any]] = None,
+    page_size: int = 1000,
+    max_pages: int = 10000,
+    id_keys: Sequence[str] = ID_KEYS,
+    prefetch_pages: int = 0,
+) -> Iterator[Dict[str, Any]]:
+    """Items of a listing, flattened from iter_pages."""
+    pages = iter_pages(fetch, list_key, params, page_size=page_size, max_pages=max_pages, id_keys=id_keys, prefetch_pages=prefetch_pages)
+    for page in pages:
+        yield from page
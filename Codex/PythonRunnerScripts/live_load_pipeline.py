@@ -0,0 +1,304 @@
+# @feature: shared bulk pipeline for room live-load masses | keywords: 部屋, マス, 積載荷重, 一括
+"""
+Shared helpers for the live-load room/mass scripts.
+
+All reads go through the bulk parameter commands (get_spatial_params_bulk /
+get_instance_parameters_bulk) and all writes are chunked (create_room_masses /
+set_visual_override), so the number of durable jobs grows with
+len(ids) / chunk size instead of len(ids).
+"""
+import os
+import sys
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+
+def _add_scripts_to_path() -> None:
+    here = os.path.dirname(os.path.abspath(__file__))
+    if here not in sys.path:
+        sys.path.insert(0, here)
+
+
+_add_scripts_to_path()
+
+from send_revit_command_durable import send_request, RevitMcpError  # type: ignore  # noqa: E402
+
+
+NAME_PARAM = "\u540d\u524d"  # 名前
+NUMBER_PARAM = "\u756a\u53f7"  # 番号
+LIVE_LOAD_PARAM = "\u7a4d\u8f09\u8377\u91cd"  # 積載荷重
+COMMENT_PARAM = "\u30b3\u30e1\u30f3\u30c8"  # コメント
+
+# Elements per bulk read. get_spatial_params_bulk returns every parameter of
+# each room, so keep this moderate to bound the response size.
+DEFAULT_READ_CHUNK = 500
+# create_room_masses runs one transaction per call and rejects > maxRooms.
+DEFAULT_CREATE_CHUNK = 200
+DEFAULT_OVERRIDE_CHUNK = 2000
+
+
+def unwrap(payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Unwrap JSON-RPC envelope down to { ok, ... }."""
+    obj: Any = payload
+    if isinstance(obj, dict) and "result" in obj:
+        obj = obj["result"]
+    if isinstance(obj, dict) and "result" in obj:
+        obj = obj["result"]
+    if isinstance(obj, dict):
+        return obj
+    return {}
+
+
+def chunked(ids: Iterable[int], size: int) -> Iterable[List[int]]:
+    buf: List[int] = []
+    for x in ids:
+        buf.append(int(x))
+        if len(buf) >= size:
+            yield buf
+            buf = []
+    if buf:
+        yield buf
+
+
+def _unique_ids(ids: Iterable[Any]) -> List[int]:
+    seen = set()
+    out: List[int] = []
+    for x in ids:
+        try:
+            i = int(x)
+        except Exception:
+            continue
+        if i > 0 and i not in seen:
+            seen.add(i)
+            out.append(i)
+    return out
+
+
+def _param_text(p: Dict[str, Any]) -> Any:
+    return p.get("display") or p.get("value") or p.get("raw")
+
+
+def get_room_labels_bulk(
+    port: int, room_ids: Sequence[int], *, chunk_size: int = DEFAULT_READ_CHUNK
+) -> Dict[int, Tuple[str, str, str]]:
+    """
+    Return {roomId: (name, number, liveLoad)} using get_spatial_params_bulk.
+    Missing values are returned as "" (callers decide the unset key).
+    """
+    out: Dict[int, Tuple[str, str, str]] = {}
+    for chunk in chunked(_unique_ids(room_ids), max(1, int(chunk_size))):
+        res = unwrap(
+            send_request(
+                port,
+                "get_spatial_params_bulk",
+                {
+                    "kind": "room",
+                    "elementIds": chunk,
+                    "elementSkip": 0,
+                    "elementCount": len(chunk),
+                },
+            )
+        )
+        if res.get("ok") is False:
+            raise RevitMcpError("get_spatial_params_bulk", str(res.get("message") or res.get("msg") or res), payload=res)
+
+        for item in res.get("items") or []:
+            try:
+                rid = int(item.get("elementId"))
+            except Exception:
+                continue
+
+            name_val: Any = None
+            number_val: Any = None
+            load_val: Any = None
+            for p in item.get("parameters") or []:
+                n = (p.get("name") or "").strip()
+                if n == NAME_PARAM and name_val is None:
+                    name_val = _param_text(p)
+                elif n == NUMBER_PARAM and number_val is None:
+                    number_val = _param_text(p)
+                elif n == LIVE_LOAD_PARAM and load_val is None:
+                    load_val = _param_text(p)
+
+            out[rid] = (
+                str(name_val).strip() if name_val is not None else "",
+                str(number_val).strip() if number_val is not None else "",
+                str(load_val).strip() if load_val is not None else "",
+            )
+    return out
+
+
+def get_instance_param_bulk(
+    port: int,
+    element_ids: Sequence[int],
+    param_name: str,
+    *,
+    chunk_size: int = DEFAULT_READ_CHUNK,
+) -> Dict[int, str]:
+    """Return {elementId: valueText} for one instance parameter via get_instance_parameters_bulk."""
+    out: Dict[int, str] = {}
+    for chunk in chunked(_unique_ids(element_ids), max(1, int(chunk_size))):
+        start = 0
+        while True:
+            res = unwrap(
+                send_request(
+                    port,
+                    "get_instance_parameters_bulk",
+                    {
+                        "elementIds": chunk,
+                        "paramKeys": [param_name],
+                        "page": {"startIndex": start, "batchSize": len(chunk)},
+                    },
+                )
+            )
+            if res.get("ok") is False:
+                raise RevitMcpError("get_instance_parameters_bulk", str(res.get("msg") or res), payload=res)
+
+            for item in res.get("items") or []:
+                if not item.get("ok"):
+                    continue
+                try:
+                    eid = int(item.get("elementId"))
+                except Exception:
+                    continue
+                params = item.get("params") or {}
+                display = item.get("display") or {}
+                val = params.get(param_name)
+                if val is None or val == "":
+                    val = display.get(param_name)
+                out[eid] = str(val).strip() if val is not None else ""
+
+            nxt = res.get("nextIndex")
+            if res.get("completed", True) or nxt is None:
+                break
+            start = int(nxt)
+    return out
+
+
+def get_mass_comments_bulk(
+    port: int, mass_ids: Sequence[int], *, chunk_size: int = DEFAULT_READ_CHUNK
+) -> Dict[int, str]:
+    return get_instance_param_bulk(port, mass_ids, COMMENT_PARAM, chunk_size=chunk_size)
+
+
+def create_room_masses_batched(
+    port: int,
+    room_ids: Sequence[int],
+    *,
+    height_mode: str = "bbox",
+    fixed_height_mm: float = 2800.0,
+    chunk_size: int = DEFAULT_CREATE_CHUNK,
+) -> Tuple[Dict[int, int], List[Dict[str, Any]]]:
+    """
+    Create DirectShape masses for rooms with create_room_masses, one
+    transaction per chunk. Returns ({roomId: massId}, itemErrors).
+    """
+    room_to_mass: Dict[int, int] = {}
+    item_errors: List[Dict[str, Any]] = []
+    for chunk in chunked(_unique_ids(room_ids), max(1, int(chunk_size))):
+        res = unwrap(
+            send_request(
+                port,
+                "create_room_masses",
+                {
+                    "roomIds": chunk,
+                    "maxRooms": len(chunk),
+                    "heightMode": height_mode,
+                    "fixedHeightMm": float(fixed_height_mm),
+                    "useMassCategory": True,
+                },
+            )
+        )
+        if res.get("ok") is False:
+            item_errors.append({"roomIds": chunk, "error": res})
+            continue
+
+        for row in res.get("created") or []:
+            try:
+                rid = int(row.get("roomId"))
+                mid = int(row.get("massId"))
+            except Exception:
+                continue
+            if rid > 0 and mid > 0:
+                room_to_mass[rid] = mid
+
+        issues = res.get("issues") or {}
+        item_errors.extend(issues.get("itemErrors") or [])
+    return room_to_mass, item_errors
+
+
+def live_load_key(value: str, unset_key: str) -> str:
+    s = (value or "").strip()
+    return s if s else unset_key
+
+
+def group_by_live_load(
+    room_to_mass: Dict[int, int],
+    labels: Dict[int, Tuple[str, str, str]],
+    unset_key: str,
+) -> Dict[str, List[int]]:
+    """Group mass ids by their room's live-load value."""
+    groups: Dict[str, List[int]] = defaultdict(list)
+    for room_id, mass_id in room_to_mass.items():
+        _, _, live = labels.get(room_id, ("", "", ""))
+        groups[live_load_key(live, unset_key)].append(mass_id)
+    return groups
+
+
+def build_color_map(
+    keys: Iterable[str],
+    palette: Sequence[Tuple[int, int, int]],
+    unset_key: str,
+) -> Dict[str, Tuple[int, int, int]]:
+    """Assign palette colors in ascending live-load order; '-' and unset_key are grey."""
+    keys_all = list(keys)
+    special = [k for k in keys_all if k in {unset_key, "-"}]
+    normal = [k for k in keys_all if k not in special]
+
+    try:
+        normal_sorted = sorted(normal, key=lambda x: float(x))
+    except Exception:
+        normal_sorted = sorted(normal)
+
+    color_map: Dict[str, Tuple[int, int, int]] = {}
+    for idx, key in enumerate(normal_sorted):
+        color_map[key] = palette[idx % len(palette)]
+
+    if "-" in special:
+        color_map["-"] = (210, 210, 210)
+    if unset_key in special:
+        color_map[unset_key] = (180, 180, 180)
+    return color_map
+
+
+def apply_group_overrides(
+    port: int,
+    view_id: int,
+    groups: Dict[str, List[int]],
+    color_map: Dict[str, Tuple[int, int, int]],
+    *,
+    transparency: int = 50,
+    chunk_size: int = DEFAULT_OVERRIDE_CHUNK,
+    extra_params: Optional[Dict[str, Any]] = None,
+) -> int:
+    """Apply one set_visual_override per (group, chunk). Returns the number of jobs sent."""
+    jobs = 0
+    for key, element_ids in groups.items():
+        r, g, b = color_map.get(key, (255, 255, 255))
+        for chunk in chunked(element_ids, max(1, int(chunk_size))):
+            params: Dict[str, Any] = {
+                "viewId": view_id,
+                "elementIds": chunk,
+                "autoWorkingView": False,
+                "detachViewTemplate": False,
+                "r": int(r),
+                "g": int(g),
+                "b": int(b),
+                "transparency": int(transparency),
+                "refreshView": True,
+            }
+            if extra_params:
+                params.update(extra_params)
+            send_request(port, "set_visual_override", params)
+            jobs += 1
+    return jobs
@@ -0,0 +1,674 @@
+# @feature: 複数 DXF を AutoCAD なしで並列マージ（per-file レイヤサフィックス） | keywords: DWG, DXF, マージ, レイヤ, 並列
+"""
+複数の ASCII DXF を AutoCAD なしで 1 つの DXF にマージします。
+
+merge_dwgs_perfile_safe.py（accoreconsole で INSERT+EXPLODE を 1 ファイルずつ）や
+merge_dwgs_by_map_com.py（COM）の代替で、`dwg_to_dxf_with_view_suffix.py` などで
+出力済みの DXF をまとめる用途向けです。
+
+処理の流れ:
+    1) 走査（プロセス並列）: 各 DXF の HEADER / CLASSES / TABLES / BLOCKS 名 / OBJECTS の
+       ハンドルを読み取る
+    2) 計画（メイン）:
+       - レイヤ名に `_{stem}` を付加（0 / DEFPOINTS は除く。--suffix "" で無効）
+       - LAYER / LTYPE / STYLE / DIMSTYLE / APPID / BLOCK_RECORD を名前で重複排除（先勝ち）
+       - ファイルごとにハンドルをずらし（$HANDSEED の累積）、重複排除した要素への
+         参照は残った側のハンドルへ付け替え
+       - 匿名ブロック（*U / *D / *X ...）は 2 ファイル目以降で番号を振り直す
+    3) 書き出し（プロセス並列）: ファイルごとに BLOCKS / ENTITIES の断片を一時ファイルへ
+    4) 連結（メイン）: 先頭ファイルの HEADER + 統合 CLASSES/TABLES + 断片 + 先頭ファイルの
+       OBJECTS をバイト列のまま順に連結（図面全体をメモリに載せない）
+
+制限:
+    - 2 ファイル目以降はモデル空間のみ（ペーパー空間・レイアウトは先頭ファイルのもの）
+    - 2 ファイル目以降の OBJECTS（辞書・グループ・マルチラインスタイル等）は取り込まない。
+      それらへの参照（リアクタ / 拡張辞書 / マテリアル / 印刷スタイル）は外すか、
+      先頭ファイルのレイヤ 0 の値に置き換える。残る参照は AUDIT で解消される前提
+    - 同名の名前付きブロックは先に現れた定義を採用
+
+使い方の例:
+
+    python merge_dxfs_parallel.py ^
+        --input-dir Projects/DWG_4F_Walls/DXF ^
+        --pattern *.dxf ^
+        --output Projects/DWG_4F_Walls/merged.dxf
+"""
+
+from __future__ import annotations
+
+import argparse
+import codecs
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Iterator
+
+INVALID_LAYER_CHARS = '<>/\\":;?*|,=`'
+
+OWN_HANDLE_CODES = frozenset({"5", "105"})
+POINTER_CODES = frozenset(
+    [str(c) for c in range(320, 370)] + [str(c) for c in range(390, 400)] + ["480", "481", "1005"]
+)
+# 取り込まない OBJECTS を指していたら外してよい（省略可能な）参照
+OPTIONAL_OBJECT_POINTERS = frozenset({"347", "348", "390"})
+# 2 ファイル目以降では取り込まないテーブル（表示状態は先頭ファイルのもの）
+BASE_ONLY_TABLES = frozenset({"VPORT", "VIEW", "UCS"})
+
+ANON_BLOCK_RE = re.compile(r"^(\*[A-Za-z])(\d+)$")
+# グループコード 2 / 3 がブロック名を指すエンティティ（それ以外の 3 は MTEXT 本文などの自由文字列）
+BLOCK_REF_RECORDS = frozenset({"BLOCK", "INSERT", "DIMENSION", "ARC_DIMENSION", "ACAD_TABLE"})
+
+
+def _dxf_encode_error(exc: UnicodeEncodeError):
+    # surrogateescape で読んだ生バイトはそのまま戻し、出力エンコーディングに無い文字は
+    # DXF の \U+XXXX 表記にする
+    chunk = exc.object[exc.start:exc.end]
+    if all(0xDC80 <= ord(ch) <= 0xDCFF for ch in chunk):
+        return bytes(ord(ch) - 0xDC00 for ch in chunk), exc.end
+    units = []
+    for ch in chunk:
+        code = ord(ch)
+        if code > 0xFFFF:
+            code -= 0x10000
+            units += [0xD800 + (code >> 10), 0xDC00 + (code & 0x3FF)]
+        else:
+            units.append(code)
+    return "".join(f"\\U+{u:04X}" for u in units), exc.end
+
+
+codecs.register_error("dxfunicode", _dxf_encode_error)
+
+
+def parse_args() -> argparse.Namespace:
+    p = argparse.ArgumentParser()
+    p.add_argument(
+        "--inputs",
+        nargs="+",
+        default=None,
+        help="入力 DXF のパス（複数指定可。先頭が HEADER / レイアウトの基準）",
+    )
+    p.add_argument(
+        "--input-dir",
+        default=None,
+        help="DXF が置いてあるフォルダ（--inputs の代わり）",
+    )
+    p.add_argument(
+        "--pattern",
+        default="*.dxf",
+        help="--input-dir 内の対象パターン（既定: *.dxf）",
+    )
+    p.add_argument(
+        "--output",
+        required=True,
+        help="出力 DXF のパス",
+    )
+    p.add_argument(
+        "--suffix",
+        default="_{stem}",
+        help='レイヤ名に付けるサフィックス（既定: _{stem}。"" で付けない）',
+    )
+    p.add_argument(
+        "--jobs",
+        type=int,
+        default=None,
+        help="ワーカープロセス数（既定: CPU 数）",
+    )
+    return p.parse_args()
+
+
+def layer_suffix(template: str, stem: str) -> str:
+    if not template:
+        return ""
+    text = template.replace("{stem}", stem)
+    for ch in INVALID_LAYER_CHARS:
+        text = text.replace(ch, "_")
+    return text
+
+
+# ----------------------------------------------------------------------
+# 読み込み
+# ----------------------------------------------------------------------
+
+def _detect_encoding(data: bytes) -> str:
+    lines = data[:65536].decode("latin-1").split("\n")
+    acadver, codepage = "", ""
+    for i in range(1, len(lines) - 2, 2):
+        name = lines[i].strip()
+        if name == "$ACADVER":
+            acadver = lines[i + 2].strip()
+        elif name == "$DWGCODEPAGE":
+            codepage = lines[i + 2].strip()
+        elif name == "ENDSEC" or (acadver and codepage):
+            break
+    if acadver >= "AC1021":
+        return "utf-8"
+    cp = codepage.upper()
+    if cp.startswith("ANSI_"):
+        try:
+            return codecs.lookup("cp" + cp[5:]).name
+        except LookupError:
+            pass
+    return "cp932"
+
+
+def _read_pairs(path: str) -> tuple[list[tuple[str, str]], str]:
+    with open(path, "rb") as fp:
+        data = fp.read()
+    if data.startswith(b"AutoCAD Binary DXF"):
+        raise ValueError("binary DXF is not supported; re-export as ASCII DXF")
+    encoding = _detect_encoding(data)
+    text = data.decode(encoding, errors="surrogateescape")
+    if text.startswith("\ufeff"):
+        text = text[1:]
+    lines = text.replace("\r\n", "\n").split("\n")
+    if len(lines) % 2:
+        lines.pop()
+    codes = [c.strip() for c in lines[0::2]]
+    return list(zip(codes, lines[1::2])), encoding
+
+
+def _sections(pairs: list[tuple[str, str]]) -> dict[str, tuple[int, int]]:
+    """セクション名 -> (0/SECTION の位置, 0/ENDSEC の位置)"""
+    out: dict[str, tuple[int, int]] = {}
+    i, n = 0, len(pairs)
+    while i < n:
+        code, value = pairs[i]
+        if code == "0" and value.strip() == "SECTION" and i + 1 < n:
+            name = pairs[i + 1][1].strip()
+            j = i + 2
+            while j < n and not (pairs[j][0] == "0" and pairs[j][1].strip() == "ENDSEC"):
+                j += 1
+            out[name] = (i, j)
+            i = j
+        i += 1
+    return out
+
+
+def _records(pairs: list[tuple[str, str]], lo: int, hi: int) -> Iterator[list[tuple[str, str]]]:
+    """pairs[lo:hi] をグループコード 0 ごとのレコードに分割する。"""
+    start = lo
+    for i in range(lo + 1, hi):
+        if pairs[i][0] == "0":
+            yield pairs[start:i]
+            start = i
+    if start < hi:
+        yield pairs[start:hi]
+
+
+def _body(span: tuple[int, int]) -> tuple[int, int]:
+    # "0 SECTION" / "2 <name>" を除いた中身
+    return span[0] + 2, span[1]
+
+
+def _value(rec: list[tuple[str, str]], code: str, default: str = "") -> str:
+    for c, v in rec:
+        if c == code:
+            return v.strip()
+    return default
+
+
+def _own_handle(rec: list[tuple[str, str]]) -> str:
+    for c, v in rec:
+        if c in OWN_HANDLE_CODES:
+            return v.strip().upper()
+    return ""
+
+
+def _parse_tables(pairs, span) -> dict:
+    tables: dict = {}
+    current = None
+    for rec in _records(pairs, *_body(span)):
+        kind = rec[0][1].strip()
+        if kind == "TABLE":
+            current = {"head": rec, "entries": []}
+            tables[_value(rec, "2")] = current
+        elif kind == "ENDTAB":
+            current = None
+        elif current is not None:
+            current["entries"].append(rec)
+    return tables
+
+
+def _iter_blocks(pairs, span) -> Iterator[list[list[tuple[str, str]]]]:
+    block: list = []
+    for rec in _records(pairs, *_body(span)):
+        block.append(rec)
+        if rec[0][1].strip() == "ENDBLK":
+            yield block
+            block = []
+
+
+def _scan_file(path: str) -> dict:
+    """第 1 段: テーブル類と、ハンドル計画に必要な情報だけを返す。"""
+    pairs, encoding = _read_pairs(path)
+    secs = _sections(pairs)
+
+    handseed = 0
+    if "HEADER" in secs:
+        lo, hi = secs["HEADER"]
+        for i in range(lo, hi - 1):
+            if pairs[i][0] == "9" and pairs[i][1].strip() == "$HANDSEED":
+                try:
+                    handseed = int(pairs[i + 1][1].strip(), 16)
+                except ValueError:
+                    handseed = 0
+                break
+    if handseed <= 0:
+        for code, value in pairs:
+            if code in OWN_HANDLE_CODES:
+                try:
+                    handseed = max(handseed, int(value.strip(), 16) + 1)
+                except ValueError:
+                    continue
+
+    classes = []
+    if "CLASSES" in secs:
+        classes = [rec for rec in _records(pairs, *_body(secs["CLASSES"])) if rec[0][1].strip() == "CLASS"]
+
+    block_names = []
+    if "BLOCKS" in secs:
+        block_names = [_value(block[0], "2") for block in _iter_blocks(pairs, secs["BLOCKS"])]
+
+    objects = set()
+    if "OBJECTS" in secs:
+        for rec in _records(pairs, *_body(secs["OBJECTS"])):
+            h = _own_handle(rec)
+            if h:
+                objects.add(h)
+
+    return {
+        "path": path,
+        "encoding": encoding,
+        "handseed": handseed,
+        "tables": _parse_tables(pairs, secs["TABLES"]) if "TABLES" in secs else {},
+        "classes": classes,
+        "blocks": block_names,
+        "objects": objects,
+        "hasHeader": "HEADER" in secs,
+        "hasObjects": "OBJECTS" in secs,
+    }
+
+
+# ----------------------------------------------------------------------
+# 書き換え
+# ----------------------------------------------------------------------
+
+class _Rewriter:
+    """1 ファイル分のレイヤ名 / ハンドル / 匿名ブロック名の書き換え規則。"""
+
+    def __init__(self, plan: dict):
+        self.base = plan["base"]
+        self.offset = plan["offset"]
+        self.translate = plan["translate"]
+        self.anon = plan["anon"]
+        self.suffix = plan["suffix"]
+        self.dropped = plan["dropped"]
+        self.layer_defaults = plan["layerDefaults"]
+        self._layers: dict[str, str] = {}
+
+    def layer(self, name: str) -> str:
+        got = self._layers.get(name)
+        if got is None:
+            if not self.suffix or name.upper() in ("0", "DEFPOINTS"):
+                got = name
+            else:
+                got = name + self.suffix
+            self._layers[name] = got
+        return got
+
+    def block(self, name: str) -> str:
+        return self.anon.get(name, name)
+
+    def handle(self, value: str) -> str:
+        h = value.strip().upper()
+        if not self.offset:
+            return h
+        try:
+            return format(int(h, 16) + self.offset, "X")
+        except ValueError:
+            return value
+
+    def pointer(self, value: str) -> str:
+        h = value.strip().upper()
+        if h in ("", "0"):
+            return value
+        got = self.translate.get(h)
+        if got is not None:
+            return got
+        return self.handle(h)
+
+    def record(self, rec, table: str | None = None) -> list[tuple[str, str]]:
+        out = []
+        in_group = False
+        block_refs = bool(self.anon) and (table is not None or rec[0][1].strip().upper() in BLOCK_REF_RECORDS)
+        for code, value in rec:
+            if in_group:
+                if code == "102" and value.strip() == "}":
+                    in_group = False
+                continue
+            if code == "102" and not self.base and value.strip().startswith("{"):
+                # {ACAD_REACTORS / {ACAD_XDICTIONARY / {BLKREFS は取り込まない OBJECTS を指す
+                in_group = True
+                continue
+            if code == "8":
+                value = self.layer(value.strip())
+            elif code in OWN_HANDLE_CODES:
+                value = self.handle(value)
+            elif code in POINTER_CODES:
+                if value.strip().upper() in self.dropped:
+                    if table == "LAYER" and code in self.layer_defaults:
+                        out.append((code, self.layer_defaults[code]))
+                        continue
+                    if code in OPTIONAL_OBJECT_POINTERS:
+                        continue
+                value = self.pointer(value)
+            elif code == "2" and table == "LAYER":
+                value = self.layer(value.strip())
+            elif code in ("2", "3") and block_refs:
+                value = self.anon.get(value.strip(), value)
+            out.append((code, value))
+        return out
+
+
+def _format(rec) -> str:
+    return "".join(f"{code}\n{value}\n" for code, value in rec)
+
+
+def _open_part(path: str, encoding: str):
+    return open(path, "w", encoding=encoding, errors="dxfunicode", newline="\r\n")
+
+
+def _entry_key(table: str, rec, rew: _Rewriter) -> tuple[str, str]:
+    name = _value(rec, "2")
+    if table == "LAYER":
+        name = rew.layer(name)
+    elif table == "BLOCK_RECORD":
+        name = rew.block(name)
+    elif table == "STYLE":
+        # 形状ファイル用の STYLE は名前が空なのでフォントファイル名も含める
+        name = name + "|" + _value(rec, "3")
+    return table, name.lower()
+
+
+def build_plan(scans: list[dict], suffix_template: str) -> tuple[list[dict], dict, list]:
+    """
+    ファイルごとの書き換え計画と、統合後の TABLES / CLASSES を組み立てる。
+    戻り値: (plans, tables{name: {"head": (i, rec), "entries": [(i, rec)]}}, classes[(i, rec)])
+    """
+    base = scans[0]
+    tables = {name: {"head": (0, tbl["head"]), "entries": []} for name, tbl in base["tables"].items()}
+    table_handles = {name: _own_handle(tbl["head"]) for name, tbl in base["tables"].items()}
+
+    layer_defaults: dict[str, str] = {}
+    for rec in base["tables"].get("LAYER", {}).get("entries", []):
+        if _value(rec, "2") == "0":
+            layer_defaults = {c: v for c, v in rec if c in OPTIONAL_OBJECT_POINTERS}
+            break
+
+    anon_next: dict[str, int] = {}
+    for name in base["blocks"]:
+        m = ANON_BLOCK_RE.match(name)
+        if m:
+            prefix = m.group(1).upper()
+            anon_next[prefix] = max(anon_next.get(prefix, 0), int(m.group(2)) + 1)
+
+    seen: dict[tuple[str, str], str] = {}
+    classes: list = []
+    class_names: set = set()
+    plans: list[dict] = []
+    offset = 0
+
+    for index, scan in enumerate(scans):
+        is_base = index == 0
+        stem = Path(scan["path"]).stem
+        anon: dict[str, str] = {}
+        if not is_base:
+            for name in scan["blocks"]:
+                m = ANON_BLOCK_RE.match(name)
+                if m:
+                    prefix = m.group(1).upper()
+                    number = anon_next.get(prefix, 1)
+                    anon_next[prefix] = number + 1
+                    anon[name] = f"{prefix}{number}"
+
+        plan = {
+            "base": is_base,
+            "offset": offset,
+            "translate": {},
+            "anon": anon,
+            "suffix": layer_suffix(suffix_template, stem),
+            "dropped": set() if is_base else scan["objects"],
+            "layerDefaults": {} if is_base else layer_defaults,
+            "skipBlocks": set(),
+            "handseed": 0,
+        }
+        rew = _Rewriter(plan)
+
+        for table, tbl in scan["tables"].items():
+            if table not in tables:
+                continue
+            if not is_base:
+                head_handle = _own_handle(tbl["head"])
+                if head_handle and table_handles.get(table):
+                    plan["translate"][head_handle] = table_handles[table]
+                if table in BASE_ONLY_TABLES:
+                    continue
+            for rec in tbl["entries"]:
+                key = _entry_key(table, rec, rew)
+                handle = _own_handle(rec)
+                if table == "BLOCK_RECORD" and not is_base and key[1].startswith("*paper_space"):
+                    # レイアウトは先頭ファイルのものを使う
+                    plan["skipBlocks"].add(key[1])
+                    key = (table, "*paper_space")
+                kept = seen.get(key)
+                if kept is None:
+                    seen[key] = rew.handle(handle) if handle else ""
+                    tables[table]["entries"].append((index, rec))
+                    continue
+                if handle and kept:
+                    plan["translate"][handle] = kept
+                if table == "BLOCK_RECORD":
+                    plan["skipBlocks"].add(key[1])
+
+        for rec in scan["classes"]:
+            name = _value(rec, "1")
+            if name not in class_names:
+                class_names.add(name)
+                classes.append((index, rec))
+
+        plans.append(plan)
+        offset += scan["handseed"]
+
+    plans[0]["handseed"] = format(max(offset, 1), "X")
+    return plans, tables, classes
+
+
+# ----------------------------------------------------------------------
+# 書き出し
+# ----------------------------------------------------------------------
+
+def _emit_file(job: tuple) -> dict:
+    """第 2 段: 1 ファイル分の BLOCKS / ENTITIES（先頭ファイルは HEADER / OBJECTS も）を断片に書く。"""
+    index, path, plan, encoding, work_dir = job
+    pairs, _ = _read_pairs(path)
+    secs = _sections(pairs)
+    rew = _Rewriter(plan)
+    parts: dict[str, str] = {}
+    stats = {"blocks": 0, "blocksSkipped": 0, "entities": 0, "entitiesSkipped": 0}
+
+    if plan["base"]:
+        if "HEADER" in secs:
+            lo, hi = secs["HEADER"]
+            parts["header"] = os.path.join(work_dir, "header.part")
+            with _open_part(parts["header"], encoding) as fp:
+                header = list(pairs[lo:hi + 1])
+                for i in range(len(header) - 1):
+                    code, value = header[i]
+                    if code == "9" and value.strip() == "$HANDSEED":
+                        header[i + 1] = (header[i + 1][0], plan["handseed"])
+                    elif code == "8":
+                        header[i] = (code, rew.layer(value.strip()))
+                fp.write(_format(header))
+        if "OBJECTS" in secs:
+            lo, hi = secs["OBJECTS"]
+            parts["objects"] = os.path.join(work_dir, "objects.part")
+            with _open_part(parts["objects"], encoding) as fp:
+                fp.write(_format(pairs[lo:hi + 1]))
+
+    parts["blocks"] = os.path.join(work_dir, f"{index:05d}_blocks.part")
+    with _open_part(parts["blocks"], encoding) as fp:
+        if "BLOCKS" in secs:
+            for block in _iter_blocks(pairs, secs["BLOCKS"]):
+                name = rew.block(_value(block[0], "2")).lower()
+                if not plan["base"] and (
+                    name in plan["skipBlocks"] or name == "*model_space" or name.startswith("*paper_space")
+                ):
+                    stats["blocksSkipped"] += 1
+                    continue
+                stats["blocks"] += 1
+                fp.write("".join(_format(rew.record(rec)) for rec in block))
+
+    parts["entities"] = os.path.join(work_dir, f"{index:05d}_entities.part")
+    with _open_part(parts["entities"], encoding) as fp:
+        if "ENTITIES" in secs:
+            chunk = []
+            for rec in _records(pairs, *_body(secs["ENTITIES"])):
+                if not plan["base"] and _value(rec, "67") == "1":
+                    stats["entitiesSkipped"] += 1
+                    continue
+                stats["entities"] += 1
+                chunk.append(_format(rew.record(rec)))
+                if len(chunk) >= 4096:
+                    fp.write("".join(chunk))
+                    chunk = []
+            fp.write("".join(chunk))
+
+    return {"path": path, "parts": parts, **stats}
+
+
+def _write_tables(path: str, encoding: str, plans, tables, classes) -> None:
+    rewriters = [_Rewriter(plan) for plan in plans]
+    with _open_part(path, encoding) as fp:
+        if classes:
+            fp.write("0\nSECTION\n2\nCLASSES\n")
+            for index, rec in classes:
+                fp.write(_format(rec))
+            fp.write("0\nENDSEC\n")
+        fp.write("0\nSECTION\n2\nTABLES\n")
+        for table, tbl in tables.items():
+            head_index, head = tbl["head"]
+            head = [(c, str(len(tbl["entries"])) if c == "70" else v) for c, v in rewriters[head_index].record(head)]
+            fp.write(_format(head))
+            for index, rec in tbl["entries"]:
+                fp.write(_format(rewriters[index].record(rec, table)))
+            fp.write("0\nENDTAB\n")
+        fp.write("0\nENDSEC\n")
+
+
+def _run(func, jobs, max_workers):
+    if max_workers == 1 or len(jobs) == 1:
+        return [func(job) for job in jobs]
+    with ProcessPoolExecutor(max_workers=max_workers) as ex:
+        return list(ex.map(func, jobs))
+
+
+def merge_dxfs(inputs: list[str], output: str, suffix: str = "_{stem}", max_workers: int | None = None) -> dict:
+    """inputs を 1 つの DXF にマージして output に書く。先頭の入力が基準図面。"""
+    started = time.perf_counter()
+    inputs = [str(Path(p).resolve()) for p in inputs]
+    output = str(Path(output).resolve())
+    if not inputs:
+        return {"ok": False, "msg": "No input DXF."}
+
+    scans = _run(_scan_file, inputs, max_workers)
+    plans, tables, classes = build_plan(scans, suffix)
+    encoding = scans[0]["encoding"]
+
+    out_dir = os.path.dirname(output)
+    os.makedirs(out_dir, exist_ok=True)
+    work_dir = tempfile.mkdtemp(prefix="dxfmerge_", dir=out_dir)
+    try:
+        emitted = _run(
+            _emit_file,
+            [(i, path, plan, encoding, work_dir) for i, (path, plan) in enumerate(zip(inputs, plans))],
+            max_workers,
+        )
+        tables_part = os.path.join(work_dir, "tables.part")
+        _write_tables(tables_part, encoding, plans, tables, classes)
+
+        def marker(text: str) -> bytes:
+            return text.replace("\n", "\r\n").encode("ascii")
+
+        tmp_out = os.path.join(work_dir, "merged.dxf")
+        with open(tmp_out, "wb") as out:
+
+            def copy(path: str) -> None:
+                with open(path, "rb") as src:
+                    shutil.copyfileobj(src, out, 1024 * 1024)
+
+            if "header" in emitted[0]["parts"]:
+                copy(emitted[0]["parts"]["header"])
+            copy(tables_part)
+            out.write(marker("0\nSECTION\n2\nBLOCKS\n"))
+            for item in emitted:
+                copy(item["parts"]["blocks"])
+            out.write(marker("0\nENDSEC\n0\nSECTION\n2\nENTITIES\n"))
+            for item in emitted:
+                copy(item["parts"]["entities"])
+            out.write(marker("0\nENDSEC\n"))
+            if "objects" in emitted[0]["parts"]:
+                copy(emitted[0]["parts"]["objects"])
+            out.write(marker("0\nEOF\n"))
+        os.replace(tmp_out, output)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    return {
+        "ok": True,
+        "output": output,
+        "files": len(inputs),
+        "encoding": encoding,
+        "layers": len(tables.get("LAYER", {}).get("entries", [])),
+        "blocks": sum(item["blocks"] for item in emitted),
+        "entities": sum(item["entities"] for item in emitted),
+        "entitiesSkipped": sum(item["entitiesSkipped"] for item in emitted),
+        "elapsedSec": round(time.perf_counter() - started, 3),
+    }
+
+
+def main() -> None:
+    args = parse_args()
+    if args.inputs:
+        inputs = [Path(p) for p in args.inputs]
+    elif args.input_dir:
+        inputs = sorted(Path(args.input_dir).glob(args.pattern))
+    else:
+        print(json.dumps({"ok": False, "msg": "Specify --inputs or --input-dir."}, ensure_ascii=False))
+        return
+
+    output = Path(args.output).resolve()
+    inputs = [p for p in inputs if p.resolve() != output]
+    missing = [str(p) for p in inputs if not p.is_file()]
+    if missing or not inputs:
+        print(
+            json.dumps(
+                {"ok": False, "msg": "Missing files." if missing else "No input DXF.", "missing": missing},
+                ensure_ascii=False,
+            )
+        )
+        return
+
+    try:
+        result = merge_dxfs([str(p) for p in inputs], str(output), suffix=args.suffix, max_workers=args.jobs)
+    except Exception as ex:
+        result = {"ok": False, "output": str(output), "error": str(ex)}
+    print(json.dumps(result, ensure_ascii=False))
+
+
+if __name__ == "__main__":
+    main()
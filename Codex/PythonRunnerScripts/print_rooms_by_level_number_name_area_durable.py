@@ -11,12 +11,17 @@ Python Script Runner 用:
 
 import argparse
 import json
+import sys
 import time
+from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple
 
 from urllib.error import HTTPError, URLError
 from urllib.request import Request, urlopen
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from list_cursor import iter_items  # type: ignore  # noqa: E402
+
 
 DEFAULT_PORT = 5210
 REQUEST_TIMEOUT = 120.0
@@ -145,30 +150,16 @@ def _safe_str(v: Any) -> str:
     return "" if v is None else str(v).strip()
 
 
-def _as_rooms(payload: Any) -> List[Dict[str, Any]]:
-    if isinstance(payload, dict):
-        rooms = payload.get("rooms")
-        if isinstance(rooms, list):
-            return [r for r in rooms if isinstance(r, dict)]
-    return []
-
-
 def _collect_all_rooms(base_url: str, method: str, page_size: int = 200) -> List[Dict[str, Any]]:
-    rooms: List[Dict[str, Any]] = []
-    skip = 0
-    max_pages = 200
-
-    for _ in range(max_pages):
-        payload = _rpc_durable(base_url, method, {"skip": skip, "count": page_size})
-        batch = _as_rooms(payload)
-        if not batch:
-            break
-        rooms.extend(batch)
-        got = len(batch)
-        if got < page_size:
-            break
-        skip += got
-    return rooms
+    # サーバ側カーソルで全件（旧アドインは skip/count にフォールバック）
+    return list(
+        iter_items(
+            lambda p: _rpc_durable(base_url, method, p),
+            "rooms",
+            page_size=page_size,
+            max_pages=200,
+        )
+    )
 
 
 def _extract_number_area_from_params(params_payload: Any) -> Tuple[str, str]:
@@ -13,10 +13,16 @@
 - 変更したい場合は DRY_RUN を True にしてください。
 """
 import json
+import sys
 import time
-import requests
+from pathlib import Path
 from typing import Any, Dict, List
 
+import requests
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from list_cursor import iter_items  # type: ignore  # noqa: E402
+
 DEFAULT_PORT = 5210
 DEFAULT_TIMEOUT = 30
 POLL_INTERVAL = 0.5
@@ -91,34 +97,17 @@ def rpc(base_url: str, method: str, params=None) -> Any:
 
 def try_get_rooms(base_url: str) -> List[Dict[str, Any]]:
     """element.get_rooms (paged) を優先。ダメなら get_rooms を試す。"""
-    rooms = []
+    rooms: List[Dict[str, Any]] = []
     for method in ("element.get_rooms", "get_rooms"):
         try:
-            # try paging
-            first = rpc(base_url, method, {"skip": 0, "count": 0})
-            total = None
-            if isinstance(first, dict):
-                total = first.get("totalCount") or first.get("count")
-            if total is None:
-                # fallback: try without paging
-                data = rpc(base_url, method, {})
-                if isinstance(data, dict):
-                    rooms = data.get("rooms") or data.get("elements") or []
-                if rooms:
-                    return rooms
-                continue
-            total = int(total)
-            skip = 0
-            batch = 200
-            while skip < total:
-                data = rpc(base_url, method, {"skip": skip, "count": batch})
-                if not isinstance(data, dict):
-                    break
-                chunk = data.get("rooms") or data.get("elements") or []
-                if not chunk:
-                    break
-                rooms.extend(chunk)
-                skip += batch
+            # カーソル/skip/count で全件（短いページ or totalCount で終了）
+            rooms = list(
+                iter_items(
+                    lambda p, m=method: rpc(base_url, m, p),
+                    ["rooms", "elements"],
+                    page_size=200,
+                )
+            )
             if rooms:
                 return rooms
         except Exception:
@@ -2,11 +2,19 @@
 import argparse
 import json
 import os
+import sys
 import time
-from typing import Any, Dict, List, Optional, Set
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
 
 import requests
 
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from id_set_codec import (  # type: ignore  # noqa: E402
+    count_ids, encode_runs, runs_difference, runs_from_payload, split_runs,
+)
+
 
 HEADERS = {
     "Content-Type": "application/json; charset=utf-8",
@@ -19,23 +27,24 @@ def load_json(path: str) -> Any:
         return json.load(f)
 
 
-def durable_call(proxy_base: str, revit_port: int, method: str, params: Dict[str, Any], timeout: float = 60.0) -> Dict[str, Any]:
-    s = requests.Session(); s.headers.update(HEADERS)
+def enqueue(s: requests.Session, proxy_base: str, revit_port: int, method: str, params: Dict[str, Any], timeout: float = 60.0) -> Tuple[Optional[str], Dict[str, Any]]:
     enq = f"{proxy_base}/t/{revit_port}/enqueue"
     body = {"jsonrpc": "2.0", "id": int(time.time()*1000), "method": method, "params": params}
     r = s.post(enq, params={"force": 1}, json=body, timeout=timeout); r.raise_for_status()
     data = r.json(); job = data.get("jobId") or data.get("job_id")
-    if not job:
-        return data
+    return job, data
+
+
+def wait_job(s: requests.Session, proxy_base: str, revit_port: int, job: str, timeout: float = 60.0, max_wait_sec: float = 180.0) -> Dict[str, Any]:
     job_url = f"{proxy_base}/t/{revit_port}/job/{job}"
     etag = None; start = time.time()
     while True:
-        h = dict(HEADERS); 
+        h = dict(HEADERS)
         if etag: h["If-None-Match"] = etag
         jr = s.get(job_url, headers=h, timeout=timeout)
-        if jr.status_code == 304: 
-            time.sleep(0.2); 
-            if time.time()-start > 180: raise TimeoutError("Timeout waiting job")
+        if jr.status_code == 304:
+            time.sleep(0.2)
+            if time.time()-start > max_wait_sec: raise TimeoutError("Timeout waiting job")
             continue
         jr.raise_for_status(); etag = jr.headers.get("ETag") or etag
         o = jr.json(); st = o.get("state")
@@ -47,10 +56,18 @@ def durable_call(proxy_base: str, revit_port: int, method: str, params: Dict[str
             return {"ok": True}
         if st in ("FAILED","TIMEOUT","DEAD"):
             raise RuntimeError(f"Job failed: {o.get('error_msg')}")
-        if time.time()-start > 180: raise TimeoutError("Timeout waiting job")
+        if time.time()-start > max_wait_sec: raise TimeoutError("Timeout waiting job")
         time.sleep(0.25)
 
 
+def durable_call(proxy_base: str, revit_port: int, method: str, params: Dict[str, Any], timeout: float = 60.0) -> Dict[str, Any]:
+    s = requests.Session(); s.headers.update(HEADERS)
+    job, data = enqueue(s, proxy_base, revit_port, method, params, timeout)
+    if not job:
+        return data
+    return wait_job(s, proxy_base, revit_port, job, timeout)
+
+
 def unwrap(outer: Dict[str, Any]) -> Dict[str, Any]:
     r = outer.get("result")
     if isinstance(r, dict) and "result" in r: return r.get("result") or {}
@@ -58,17 +75,61 @@ def unwrap(outer: Dict[str, Any]) -> Dict[str, Any]:
     return outer
 
 
+def hide_pipelined(proxy_base: str, revit_port: int, view_id: int, chunks: List[Dict[str, Any]],
+                   in_flight: int, max_millis_per_tx: int) -> Dict[str, Any]:
+    """
+    Keep up to in_flight hide jobs queued so Revit never idles between chunks.
+    A chunk that comes back time-sliced (completed=false) is re-queued from nextIndex.
+    Only the last chunk refreshes the view.
+    """
+    s = requests.Session(); s.headers.update(HEADERS)
+    todo: Deque[Tuple[int, int]] = deque((i, 0) for i in range(len(chunks)))
+    pending: Deque[Tuple[int, int, Optional[str], Dict[str, Any]]] = deque()
+    last = len(chunks) - 1
+    hidden = 0; jobs = 0; skipped = 0; errors: List[Any] = []
+
+    while todo or pending:
+        while todo and len(pending) < max(1, in_flight):
+            idx, start = todo.popleft()
+            params = {
+                "viewId": view_id,
+                "elementIdsEncoded": chunks[idx],
+                "batchSize": 5000,
+                "maxMillisPerTx": max_millis_per_tx,
+                "startIndex": start,
+                "refreshView": idx == last,
+            }
+            job, data = enqueue(s, proxy_base, revit_port, "hide_elements_in_view", params)
+            pending.append((idx, start, job, data)); jobs += 1
+
+        idx, start, job, data = pending.popleft()
+        res = unwrap(wait_job(s, proxy_base, revit_port, job) if job else data)
+        if res.get("ok") is False:
+            raise RuntimeError(f"hide_elements_in_view failed: {res.get('msg') or res}")
+        hidden += int(res.get("hiddenCount") or 0)
+        skipped += len(res.get("skipped") or [])
+        errors.extend(res.get("errors") or [])
+        nxt = res.get("nextIndex")
+        if not res.get("completed", True) and isinstance(nxt, int) and nxt > start:
+            todo.appendleft((idx, nxt))
+
+    return {"hidden": hidden, "jobs": jobs, "skipped": skipped, "errors": errors[:50], "errorCount": len(errors)}
+
+
 def main():
     ap = argparse.ArgumentParser(description="Restore visible set in active view from a prior snapshot of elementIds by hiding everything else.")
     ap.add_argument("--proxy", default="http://127.0.0.1:5221")
     ap.add_argument("--revit-port", type=int, default=5211)
-    ap.add_argument("--snapshot", required=True, help="Path to elements_in_view_active_<port>.json saved earlier")
-    ap.add_argument("--batch", type=int, default=5000)
+    ap.add_argument("--snapshot", required=True, help="Path to elements_in_view_active_<port>.json saved earlier (elementIds or elementIdsEncoded)")
+    ap.add_argument("--batch", type=int, default=20000, help="Ids per hide job (the add-in time-slices inside a job)")
+    ap.add_argument("--in-flight", type=int, default=3, help="Hide jobs kept queued at once")
+    ap.add_argument("--max-millis-per-tx", type=int, default=8000)
+    ap.add_argument("--ids-limit", type=int, default=500000)
     args = ap.parse_args()
 
     snap = load_json(args.snapshot)
-    prev_ids = set(snap.get("result", {}).get("elementIds", [])) if isinstance(snap, dict) else set()
-    if not prev_ids:
+    prev_runs = runs_from_payload(snap)
+    if not prev_runs:
         raise SystemExit("Snapshot missing or empty elementIds")
 
     # Resolve current view and its visible IDs now
@@ -77,24 +138,19 @@ def main():
     if not isinstance(view_id, int):
         raise SystemExit("Failed to get current viewId")
 
-    shape = {"idsOnly": True, "page": {"limit": 500000}}
+    shape = {"idsOnly": True, "idsEncoding": "auto", "page": {"limit": int(args.ids_limit)}}
     outer_now = durable_call(args.proxy, args.revit_port, "get_elements_in_view", {"viewId": view_id, "_shape": shape})
-    now_ids = set(unwrap(outer_now).get("elementIds", []))
+    now_runs = runs_from_payload(unwrap(outer_now)) or []
 
-    to_hide = list(now_ids - prev_ids)
+    to_hide = runs_difference(now_runs, prev_runs)
     if not to_hide:
         print(json.dumps({"ok": True, "msg": "No difference; nothing to hide", "viewId": view_id}))
         return
 
-    # Hide in batches
-    total = 0; b = max(1, int(args.batch))
-    for i in range(0, len(to_hide), b):
-        chunk = to_hide[i:i+b]
-        _ = durable_call(args.proxy, args.revit_port, "hide_elements_in_view", {"viewId": view_id, "elementIds": chunk})
-        total += len(chunk)
-    print(json.dumps({"ok": True, "viewId": view_id, "hidden": total}))
+    chunks = [encode_runs(c, "auto") for c in split_runs(to_hide, args.batch)]
+    stats = hide_pipelined(args.proxy, args.revit_port, view_id, chunks, args.in_flight, args.max_millis_per_tx)
+    print(json.dumps({"ok": True, "viewId": view_id, "toHide": count_ids(to_hide), **stats}, ensure_ascii=False))
 
 
 if __name__ == "__main__":
     main()
-
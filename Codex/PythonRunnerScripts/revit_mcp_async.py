@@ -0,0 +1,313 @@
+# @feature: asyncio durable client with multi-port fan-out | keywords: 非同期, 複数ポート, 並列, スナップショット
+"""
+asyncio client for the durable queue (POST /enqueue + GET /job/{id}).
+
+One AsyncRevitClient per port (or per proxy target /t/{port}); requests on
+different ports run concurrently, so N open Revit instances are read in
+roughly the time of the slowest one instead of the sum.
+
+    async with AsyncRevitClient(5210) as c:
+        info = unwrap(await c.call("get_project_info"))
+
+    results = asyncio.run(call_on_ports([5210, 5211], "get_project_info"))
+    # {5210: {"ok": True, "result": {...}}, 5211: {"ok": False, "error": "..."}}
+
+Stdlib only: a small keep-alive HTTP/1.1 client on asyncio streams
+(Content-Length and chunked bodies), enough for the local server / proxy.
+"""
+import asyncio
+import json
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+from urllib.parse import urlsplit
+
+DEFAULT_PORTS = list(range(5210, 5220))
+DEFAULT_MAX_WAIT_SECONDS = 600.0
+
+
+class AsyncRevitMcpError(Exception):
+    def __init__(self, where: str, message: str, *, http_status: Optional[int] = None, payload: Optional[dict] = None):
+        super().__init__(f"[{where}] {message}")
+        self.where = where
+        self.http_status = http_status
+        self.payload = payload or {}
+
+
+def _poll_interval(attempt: int) -> float:
+    # same curve as send_revit_command_durable._poll_interval
+    if attempt < 6:
+        return 0.15
+    if attempt < 20:
+        return 0.5
+    if attempt < 100:
+        return 1.0
+    return 2.0
+
+
+def unwrap(payload: Any) -> Dict[str, Any]:
+    obj = payload
+    if isinstance(obj, dict) and isinstance(obj.get("result"), dict):
+        obj = obj["result"]
+    if isinstance(obj, dict) and isinstance(obj.get("result"), dict):
+        obj = obj["result"]
+    return obj if isinstance(obj, dict) else {}
+
+
+def parse_ports(spec: str) -> List[int]:
+    """'5210-5219', '5210,5212' or a mix -> sorted unique ports."""
+    out: List[int] = []
+    for part in str(spec or "").split(","):
+        part = part.strip()
+        if not part:
+            continue
+        if "-" in part:
+            a, b = part.split("-", 1)
+            out.extend(range(int(a), int(b) + 1))
+        else:
+            out.append(int(part))
+    return sorted(set(out))
+
+
+class _Conn:
+    __slots__ = ("reader", "writer")
+
+    def __init__(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        self.reader = reader
+        self.writer = writer
+
+    def close(self) -> None:
+        try:
+            self.writer.close()
+        except Exception:
+            pass
+
+
+class AsyncRevitClient:
+    """Durable-queue client for one Revit port, direct or via a proxy (/t/{port})."""
+
+    def __init__(self, port: int, *, host: str = "127.0.0.1", proxy: Optional[str] = None,
+                 timeout: float = 120.0, max_wait_seconds: float = DEFAULT_MAX_WAIT_SECONDS):
+        self.port = int(port)
+        if proxy:
+            u = urlsplit(proxy)
+            self._host = u.hostname or "127.0.0.1"
+            self._port = u.port or 80
+            self._prefix = (u.path or "").rstrip("/") + f"/t/{self.port}"
+        else:
+            self._host = host
+            self._port = self.port
+            self._prefix = ""
+        self.timeout = timeout
+        self.max_wait_seconds = max_wait_seconds
+        self._idle: List[_Conn] = []
+
+    async def __aenter__(self) -> "AsyncRevitClient":
+        return self
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    async def close(self) -> None:
+        while self._idle:
+            self._idle.pop().close()
+
+    # ---- HTTP --------------------------------------------------------
+    async def _open(self) -> _Conn:
+        r, w = await asyncio.wait_for(asyncio.open_connection(self._host, self._port), timeout=min(10.0, self.timeout))
+        return _Conn(r, w)
+
+    async def _roundtrip(self, conn: _Conn, method: str, path: str, body: Optional[bytes],
+                         headers: Dict[str, str]) -> Tuple[int, Dict[str, str], bytes]:
+        lines = [f"{method} {path} HTTP/1.1", f"Host: {self._host}:{self._port}",
+                 "Accept: application/json", "Connection: keep-alive"]
+        for k, v in headers.items():
+            lines.append(f"{k}: {v}")
+        if body is not None:
+            lines.append("Content-Type: application/json; charset=utf-8")
+            lines.append(f"Content-Length: {len(body)}")
+        conn.writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + (body or b""))
+        await conn.writer.drain()
+
+        status_line = await conn.reader.readline()
+        if not status_line:
+            raise ConnectionResetError("connection closed by server")
+        parts = status_line.decode("latin-1").split(" ", 2)
+        status = int(parts[1])
+        resp_headers: Dict[str, str] = {}
+        while True:
+            line = await conn.reader.readline()
+            if line in (b"\r\n", b"\n", b""):
+                break
+            k, _, v = line.decode("latin-1").partition(":")
+            resp_headers[k.strip().lower()] = v.strip()
+
+        data = b""
+        if method == "HEAD" or status in (204, 304) or 100 <= status < 200:
+            pass
+        elif "chunked" in resp_headers.get("transfer-encoding", "").lower():
+            chunks = []
+            while True:
+                size_line = await conn.reader.readline()
+                size = int(size_line.split(b";", 1)[0].strip() or b"0", 16)
+                if size == 0:
+                    while (await conn.reader.readline()) not in (b"\r\n", b"\n", b""):
+                        pass
+                    break
+                chunks.append(await conn.reader.readexactly(size))
+                await conn.reader.readexactly(2)
+            data = b"".join(chunks)
+        elif "content-length" in resp_headers:
+            data = await conn.reader.readexactly(int(resp_headers["content-length"]))
+        else:
+            data = await conn.reader.read()
+            resp_headers["connection"] = "close"
+        return status, resp_headers, data
+
+    async def _http(self, method: str, path: str, *, json_body: Any = None,
+                    headers: Optional[Dict[str, str]] = None) -> Tuple[int, Dict[str, str], Any]:
+        body = None if json_body is None else json.dumps(json_body, ensure_ascii=False).encode("utf-8")
+        for attempt in (0, 1):
+            reused = bool(self._idle)
+            conn = self._idle.pop() if reused else await self._open()
+            try:
+                status, h, raw = await asyncio.wait_for(
+                    self._roundtrip(conn, method, self._prefix + path, body, headers or {}), timeout=self.timeout)
+            except (ConnectionError, asyncio.IncompleteReadError) as ex:
+                conn.close()
+                if reused and attempt == 0:
+                    continue  # stale keep-alive socket; retry once on a fresh one
+                raise AsyncRevitMcpError(path, f"HTTP request failed: {ex}")
+            except BaseException:
+                conn.close()
+                raise
+            if h.get("connection", "").lower() == "close":
+                conn.close()
+            else:
+                self._idle.append(conn)
+            obj: Any = None
+            if raw:
+                try:
+                    obj = json.loads(raw.decode("utf-8"))
+                except ValueError:
+                    obj = raw.decode("utf-8", "replace")
+            return status, h, obj
+        raise AsyncRevitMcpError(path, "HTTP request failed")
+
+    # ---- durable RPC -------------------------------------------------
+    async def enqueue(self, method: str, params: Optional[Dict[str, Any]] = None, *, force: bool = False,
+                      job_timeout_sec: Optional[int] = None) -> Dict[str, Any]:
+        qs = []
+        if force:
+            qs.append("force=1")
+        if job_timeout_sec and job_timeout_sec > 0:
+            qs.append(f"timeout={int(job_timeout_sec)}")
+        path = "/enqueue" + ("?" + "&".join(qs) if qs else "")
+        payload = {"jsonrpc": "2.0", "method": method, "params": params or {}, "id": int(time.time() * 1000)}
+        status, _, data = await self._http("POST", path, json_body=payload)
+        if status >= 400:
+            raise AsyncRevitMcpError("enqueue", f"HTTP {status}", http_status=status,
+                                     payload=data if isinstance(data, dict) else {"body": data})
+        if isinstance(data, dict) and data.get("error"):
+            raise AsyncRevitMcpError("enqueue", f"JSON-RPC error: {data['error']!r}", payload=data)
+        if isinstance(data, dict) and data.get("ok") is False:
+            raise AsyncRevitMcpError("enqueue", str(data.get("error") or data.get("msg") or "enqueue failed"), payload=data)
+        return data if isinstance(data, dict) else {}
+
+    async def wait_job(self, job_id: str, *, max_wait_seconds: Optional[float] = None) -> Dict[str, Any]:
+        deadline = time.monotonic() + (max_wait_seconds or self.max_wait_seconds)
+        etag: Optional[str] = None
+        attempt = 0
+        while time.monotonic() < deadline:
+            status, h, row = await self._http("GET", f"/job/{job_id}", headers={"If-None-Match": etag} if etag else None)
+            try:
+                nap = float(h["retry-after"]) if "retry-after" in h else _poll_interval(attempt)
+            except ValueError:
+                nap = _poll_interval(attempt)
+            if status in (202, 204, 304):
+                attempt += 1
+                await asyncio.sleep(nap)
+                continue
+            if status >= 400:
+                raise AsyncRevitMcpError("get_result", f"HTTP {status}", http_status=status,
+                                         payload=row if isinstance(row, dict) else {"body": row})
+            etag = h.get("etag") or etag
+            st = str((row or {}).get("state") or "").upper() if isinstance(row, dict) else ""
+            if st == "SUCCEEDED":
+                rj = row.get("result_json")
+                if isinstance(rj, str) and rj.strip():
+                    try:
+                        return json.loads(rj)
+                    except ValueError:
+                        return {"ok": True, "result": rj}
+                return {"ok": True}
+            if st in ("FAILED", "TIMEOUT", "DEAD"):
+                raise AsyncRevitMcpError("get_result", str(row.get("error_msg") or st), payload=row)
+            attempt += 1
+            await asyncio.sleep(nap)
+        raise AsyncRevitMcpError("get_result", f"Polling timed out for job {job_id}")
+
+    async def call(self, method: str, params: Optional[Dict[str, Any]] = None, *, force: bool = False,
+                   job_timeout_sec: Optional[int] = None, max_wait_seconds: Optional[float] = None) -> Dict[str, Any]:
+        data = await self.enqueue(method, params, force=force, job_timeout_sec=job_timeout_sec)
+        job_id = data.get("jobId") or data.get("job_id")
+        if not job_id:
+            return data  # immediate (server-local) methods
+        return await self.wait_job(str(job_id), max_wait_seconds=max_wait_seconds)
+
+    async def health(self, timeout: float = 2.0) -> bool:
+        try:
+            status, _, body = await asyncio.wait_for(self._http("GET", "/health"), timeout=timeout)
+        except Exception:
+            return False
+        return status == 200 and isinstance(body, dict) and (body.get("ok") is True or body.get("status") == "ok")
+
+
+# ---- fan-out helpers -------------------------------------------------
+async def live_ports(ports: Iterable[int] = DEFAULT_PORTS, *, proxy: Optional[str] = None, timeout: float = 2.0) -> List[int]:
+    """Ports whose server answers /health, probed concurrently."""
+    ports = list(ports)
+
+    async def probe(p: int) -> bool:
+        async with AsyncRevitClient(p, proxy=proxy) as c:
+            return await c.health(timeout)
+
+    flags = await asyncio.gather(*(probe(p) for p in ports))
+    return [p for p, ok in zip(ports, flags) if ok]
+
+
+async def run_on_ports(ports: Sequence[int], fn: Callable[[AsyncRevitClient], Awaitable[Any]], *,
+                       proxy: Optional[str] = None, **client_kw: Any) -> Dict[int, Dict[str, Any]]:
+    """Run fn(client) for every port concurrently; one port's failure does not stop the others."""
+
+    async def one(p: int) -> Tuple[int, Dict[str, Any]]:
+        t0 = time.monotonic()
+        async with AsyncRevitClient(p, proxy=proxy, **client_kw) as c:
+            try:
+                res = await fn(c)
+                return p, {"ok": True, "result": res, "elapsedSec": round(time.monotonic() - t0, 3)}
+            except Exception as ex:
+                return p, {"ok": False, "error": str(ex), "elapsedSec": round(time.monotonic() - t0, 3)}
+
+    pairs = await asyncio.gather(*(one(p) for p in ports))
+    return dict(pairs)
+
+
+async def call_on_ports(ports: Sequence[int], method: str, params: Optional[Dict[str, Any]] = None, *,
+                        proxy: Optional[str] = None, **call_kw: Any) -> Dict[int, Dict[str, Any]]:
+    """The same command on every port concurrently; results are unwrapped."""
+
+    async def fn(c: AsyncRevitClient) -> Dict[str, Any]:
+        return unwrap(await c.call(method, params, **call_kw))
+
+    return await run_on_ports(ports, fn, proxy=proxy)
+
+
+async def gather_limited(coros: Iterable[Awaitable[Any]], limit: int) -> List[Any]:
+    """asyncio.gather with at most `limit` awaitables running (keeps a port's queue fed without flooding it)."""
+    sem = asyncio.Semaphore(max(1, int(limit)))
+
+    async def run(c: Awaitable[Any]) -> Any:
+        async with sem:
+            return await c
+
+    return await asyncio.gather(*(run(c) for c in coros))
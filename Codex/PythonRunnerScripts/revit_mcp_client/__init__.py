@@ -0,0 +1,81 @@
+"""
+Importable client for the Revit MCP durable queue.
+
+    from revit_mcp_client import send_request, RevitMcpError, unwrap
+    from revit_mcp_client import SingleFlight, AsyncRevitClient, encode_ids
+
+Names are resolved on first use (PEP 562), so `import revit_mcp_client`
+costs almost nothing: requests is loaded by the first send_request, asyncio
+by the first AsyncRevitClient, and so on. Heavy optional libraries used by
+individual scripts (openpyxl, numpy, ...) go through lazy_import:
+
+    openpyxl = lazy_import("openpyxl")   # imported on first attribute access
+
+The implementations stay in the PythonRunnerScripts modules next to this
+package (send_revit_command_durable, rpc_singleflight, revit_mcp_async,
+id_set_codec); existing `from send_revit_command_durable import ...` code
+keeps working. Put Codex/PythonRunnerScripts on PYTHONPATH to use the
+package from elsewhere (tools/, Scripts/, project python_script folders).
+"""
+import importlib
+import os
+import sys
+from typing import Any, Dict, List, Tuple
+
+from .lazy import lazy_import
+
+_SCRIPTS_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _SCRIPTS_DIR not in sys.path:
+    # loaded by path (tools/mcp_safe): the implementation modules are siblings
+    sys.path.append(_SCRIPTS_DIR)
+
+_EXPORTS: Dict[str, Tuple[str, str]] = {
+    # blocking durable client (requests)
+    "send_request": ("send_revit_command_durable", "send_request"),
+    "RevitMcpError": ("send_revit_command_durable", "RevitMcpError"),
+    # single-flight read coalescing
+    "SingleFlight": ("rpc_singleflight", "SingleFlight"),
+    "is_read_method": ("rpc_singleflight", "is_read_method"),
+    "category_of": ("rpc_singleflight", "category_of"),
+    # asyncio client / multi-port fan-out
+    "AsyncRevitClient": ("revit_mcp_async", "AsyncRevitClient"),
+    "AsyncRevitMcpError": ("revit_mcp_async", "AsyncRevitMcpError"),
+    "call_on_ports": ("revit_mcp_async", "call_on_ports"),
+    "run_on_ports": ("revit_mcp_async", "run_on_ports"),
+    "live_ports": ("revit_mcp_async", "live_ports"),
+    "parse_ports": ("revit_mcp_async", "parse_ports"),
+    # compact id sets
+    "encode_ids": ("id_set_codec", "encode_ids"),
+    "encode_runs": ("id_set_codec", "encode_runs"),
+    "decode_runs": ("id_set_codec", "decode_runs"),
+    "runs_from_ids": ("id_set_codec", "runs_from_ids"),
+    "runs_from_payload": ("id_set_codec", "runs_from_payload"),
+    "iter_ids": ("id_set_codec", "iter_ids"),
+    # cursor paging for large listings
+    "iter_pages": ("list_cursor", "iter_pages"),
+    "iter_items": ("list_cursor", "iter_items"),
+}
+
+__all__: List[str] = sorted(list(_EXPORTS) + ["lazy_import", "unwrap"])
+
+
+def unwrap(payload: Any) -> Dict[str, Any]:
+    """Strip the JSON-RPC wrapper(s) and return the command's { ok, ... } object."""
+    obj = payload
+    for _ in range(2):
+        if isinstance(obj, dict) and isinstance(obj.get("result"), dict):
+            obj = obj["result"]
+    return obj if isinstance(obj, dict) else {}
+
+
+def __getattr__(name: str) -> Any:
+    target = _EXPORTS.get(name)
+    if target is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(target[0]), target[1])
+    globals()[name] = value  # later lookups skip __getattr__
+    return value
+
+
+def __dir__() -> List[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -0,0 +1,30 @@
+"""Deferred imports for heavy optional libraries (openpyxl, numpy, pandas, ...)."""
+import importlib
+import importlib.util
+import sys
+from types import ModuleType
+from typing import Optional
+
+
+def lazy_import(name: str, *, install_hint: Optional[str] = None) -> ModuleType:
+    """
+    Module object for `name` that is executed on first attribute access.
+
+    Already-imported modules are returned as is. A missing package raises
+    ImportError here (the finder runs eagerly; only execution is deferred),
+    with install_hint appended when given. For dotted names the parent
+    package is imported right away (only the submodule itself is deferred).
+    """
+    mod = sys.modules.get(name)
+    if mod is not None:
+        return mod
+    spec = importlib.util.find_spec(name)
+    if spec is None or spec.loader is None:
+        hint = f" ({install_hint})" if install_hint else ""
+        raise ImportError(f"No module named {name!r}{hint}", name=name)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    mod = importlib.util.module_from_spec(spec)
+    sys.modules[name] = mod
+    loader.exec_module(mod)
+    return mod
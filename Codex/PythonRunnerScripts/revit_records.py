@@ -0,0 +1,263 @@
+# @feature: compact in-memory records for CSV rows, Revit types and instances | keywords: メモリ, 省メモリ, レコード, 文字列共有
+"""
+Compact record layer for the sync / list-generation scripts.
+
+    strings = StringTable()                       # one per run
+    row = CsvRow.from_cells(layout, cells, strings)
+    rec = row.with_meta({"__symbol": "C1"})       # no copy of the cells
+    t = TypeRecord(tid, name, fam, values=strings.values(values))
+    inst = InstanceRecord.from_item(item, strings, keep=("mark",))
+
+- StringTable keeps one object per distinct string (parameter names and the
+  many repeated short values: "0", "D25", "SD390", ...).
+- CsvRow stores a section row as a tuple of cells plus a layout (header ->
+  index) shared by the whole section; with_meta() adds fields without copying.
+- TypeRecord / InstanceRecord are __slots__ classes holding only the fields the
+  scripts read.
+
+All records are read through get()/[] with the original JSON key names
+("typeId", "values", "__symbol", ...), so code written against the raw dicts
+keeps working. CsvRow is a Mapping (not a dict): check with
+isinstance(x, Mapping).
+"""
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+
+class StringTable:
+    """Canonical instance per distinct string (sys.intern without the global, per-run lifetime)."""
+
+    __slots__ = ("_table",)
+
+    def __init__(self) -> None:
+        self._table: Dict[str, str] = {}
+
+    def __call__(self, s: Any) -> Any:
+        if type(s) is not str:
+            return s
+        t = self._table.get(s)
+        if t is None:
+            t = self._table[s] = s
+        return t
+
+    def values(self, d: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        """Copy of d with shared key and str value objects."""
+        if not d:
+            return {}
+        get = self._table.setdefault
+        out: Dict[str, Any] = {}
+        for k, v in d.items():
+            out[get(k, k) if type(k) is str else k] = get(v, v) if type(v) is str else v
+        return out
+
+    def __len__(self) -> int:
+        return len(self._table)
+
+
+class RowLayout:
+    """Column positions of one CSV section, shared by all its rows."""
+
+    __slots__ = ("index", "keys", "_key_tuples")
+
+    def __init__(self, headers: Sequence[str]):
+        self.keys: Tuple[str, ...] = tuple(headers)
+        self.index: Dict[str, int] = {h: i for i, h in enumerate(self.keys)}
+        self._key_tuples: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+
+    def key_tuple(self, meta_keys: Tuple[str, ...]) -> Tuple[str, ...]:
+        t = self._key_tuples.get(meta_keys)
+        if t is None:
+            t = self._key_tuples[meta_keys] = self.keys + tuple(k for k in meta_keys if k not in self.index)
+        return t
+
+
+class CsvRow(Mapping):
+    """
+    Read-only row: cells by header plus optional meta fields (meta wins on a
+    name clash, like assigning into a dict copy). Iteration order is headers,
+    then meta keys, the same as dict(row) followed by the meta assignments.
+    """
+
+    __slots__ = ("_layout", "_cells", "_meta")
+
+    def __init__(self, layout: RowLayout, cells: Tuple[Any, ...], meta: Optional[Dict[str, Any]] = None):
+        self._layout = layout
+        self._cells = cells
+        self._meta = meta
+
+    @classmethod
+    def from_cells(cls, layout: RowLayout, cells: Sequence[Any], strings: Optional[StringTable] = None) -> "CsvRow":
+        vals = list(cells[: len(layout.keys)])
+        if len(vals) < len(layout.keys):
+            vals.extend([""] * (len(layout.keys) - len(vals)))
+        if strings is not None:
+            vals = list(map(strings, vals))
+        return cls(layout, tuple(vals))
+
+    def with_meta(self, meta: Dict[str, Any]) -> "CsvRow":
+        merged = dict(self._meta) if self._meta else {}
+        merged.update(meta)
+        return CsvRow(self._layout, self._cells, merged)
+
+    def key_tuple(self) -> Tuple[str, ...]:
+        """tuple(row), cached per layout and meta key set."""
+        return self._layout.key_tuple(tuple(self._meta) if self._meta else ())
+
+    def __getitem__(self, key: str) -> Any:
+        meta = self._meta
+        if meta is not None and key in meta:
+            return meta[key]
+        i = self._layout.index.get(key)
+        if i is None:
+            raise KeyError(key)
+        return self._cells[i]
+
+    def get(self, key: str, default: Any = None) -> Any:
+        meta = self._meta
+        if meta is not None and key in meta:
+            return meta[key]
+        i = self._layout.index.get(key)
+        return default if i is None else self._cells[i]
+
+    def __contains__(self, key: object) -> bool:
+        return (self._meta is not None and key in self._meta) or key in self._layout.index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.key_tuple())
+
+    def __len__(self) -> int:
+        return len(self.key_tuple())
+
+    def __repr__(self) -> str:
+        return f"CsvRow({dict(self)!r})"
+
+
+class _Record:
+    """get()/[] over the slots by their JSON key names (FIELDS), for code written against dicts."""
+
+    __slots__ = ()
+    FIELDS: Dict[str, str] = {}
+
+    def get(self, key: str, default: Any = None) -> Any:
+        attr = self.FIELDS.get(key)
+        if attr is None:
+            return default
+        v = getattr(self, attr)
+        return default if v is None else v
+
+    def __getitem__(self, key: str) -> Any:
+        attr = self.FIELDS.get(key)
+        if attr is None:
+            raise KeyError(key)
+        return getattr(self, attr)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.FIELDS and getattr(self, self.FIELDS[str(key)]) is not None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {k: getattr(self, a) for k, a in self.FIELDS.items() if getattr(self, a) is not None}
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({self.to_dict()!r})"
+
+
+class TypeRecord(_Record):
+    """Revit type: id/name/family plus parameter maps (values: name -> value; params/display as returned by the bulk read)."""
+
+    __slots__ = ("type_id", "type_name", "family_name", "values", "params", "display", "ok")
+    FIELDS = {
+        "typeId": "type_id",
+        "typeName": "type_name",
+        "familyName": "family_name",
+        "values": "values",
+        "params": "params",
+        "display": "display",
+        "ok": "ok",
+    }
+
+    def __init__(
+        self,
+        type_id: int = 0,
+        type_name: str = "",
+        family_name: str = "",
+        values: Optional[Dict[str, Any]] = None,
+        params: Optional[Dict[str, Any]] = None,
+        display: Optional[Dict[str, Any]] = None,
+        ok: Optional[bool] = None,
+    ):
+        self.type_id = type_id
+        self.type_name = type_name
+        self.family_name = family_name
+        self.values = values
+        self.params = params
+        self.display = display
+        self.ok = ok
+
+
+class InstanceRecord(_Record):
+    """Element from a get_* listing, reduced to id/type/level plus the extra fields named in keep."""
+
+    __slots__ = ("element_id", "type_id", "type_name", "family_name", "level", "extra")
+    FIELDS = {
+        "elementId": "element_id",
+        "id": "element_id",
+        "typeId": "type_id",
+        "typeName": "type_name",
+        "familyName": "family_name",
+        "level": "level",
+        "levelName": "level",
+    }
+
+    def __init__(self, element_id: int, type_id: int, type_name: str = "", family_name: str = "", level: str = "",
+                 extra: Optional[Dict[str, Any]] = None):
+        self.element_id = element_id
+        self.type_id = type_id
+        self.type_name = type_name
+        self.family_name = family_name
+        self.level = level
+        self.extra = extra
+
+    @classmethod
+    def from_item(cls, item: Dict[str, Any], strings: Optional[StringTable] = None,
+                  keep: Iterable[str] = ()) -> "InstanceRecord":
+        s = strings or (lambda x: x)
+        extra = {s(k): s(item[k]) for k in keep if item.get(k) not in (None, "")}
+        return cls(
+            element_id=_to_int(item.get("elementId") or item.get("id")),
+            type_id=_to_int(item.get("typeId")),
+            type_name=s(str(item.get("typeName") or "")),
+            family_name=s(str(item.get("familyName") or "")),
+            level=s(str(item.get("level") or item.get("levelName") or "")),
+            extra=extra or None,
+        )
+
+    def get(self, key: str, default: Any = None) -> Any:
+        if key in self.FIELDS:
+            return super().get(key, default)
+        return self.extra.get(key, default) if self.extra else default
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self.FIELDS:
+            return super().__getitem__(key)
+        if self.extra and key in self.extra:
+            return self.extra[key]
+        raise KeyError(key)
+
+    def to_dict(self) -> Dict[str, Any]:
+        out = {k: v for k, v in super().to_dict().items() if k not in ("id", "levelName")}
+        if self.extra:
+            out.update(self.extra)
+        return out
+
+
+def _to_int(v: Any) -> int:
+    try:
+        return int(v or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def instance_records(items: Iterable[Any], strings: Optional[StringTable] = None,
+                     keep: Iterable[str] = ()) -> List[InstanceRecord]:
+    keep = tuple(keep)
+    return [InstanceRecord.from_item(x, strings, keep) for x in items if isinstance(x, dict)]
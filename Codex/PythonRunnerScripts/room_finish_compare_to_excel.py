@@ -2,10 +2,12 @@
 import argparse
 import json
 import os
-from typing import Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 
-import openpyxl
-from openpyxl.styles import Alignment, Font
+if TYPE_CHECKING:
+    import openpyxl
+    from openpyxl.worksheet.worksheet import Worksheet
+# openpyxl is imported only once the input JSON checks out (it is slow to load)
 
 
 def _safe_float(v: Any) -> Optional[float]:
@@ -33,7 +35,7 @@ def _unwrap_cmd_result(resp: Any) -> Dict[str, Any]:
     return {}
 
 
-def _ensure_sheet(wb: openpyxl.Workbook, name: str) -> openpyxl.worksheet.worksheet.Worksheet:
+def _ensure_sheet(wb: "openpyxl.Workbook", name: str) -> "Worksheet":
     if name in wb.sheetnames:
         ws_old = wb[name]
         wb.remove(ws_old)
@@ -41,13 +43,17 @@ def _ensure_sheet(wb: openpyxl.Workbook, name: str) -> openpyxl.worksheet.worksh
     return ws
 
 
-def _write_kv(ws: openpyxl.worksheet.worksheet.Worksheet, row: int, key: str, value: Any) -> int:
+def _write_kv(ws: "Worksheet", row: int, key: str, value: Any) -> int:
+    from openpyxl.styles import Font
+
     ws.cell(row=row, column=1, value=key).font = Font(bold=True)
     ws.cell(row=row, column=2, value=value)
     return row + 1
 
 
-def _format_wrap(ws: openpyxl.worksheet.worksheet.Worksheet) -> None:
+def _format_wrap(ws: "Worksheet") -> None:
+    from openpyxl.styles import Alignment
+
     wrap = Alignment(wrap_text=True, vertical="top")
     for row in ws.iter_rows():
         for c in row:
@@ -187,6 +193,9 @@ def main() -> int:
         raise SystemExit("get_room_finish_takeoff_context is not ok in this JSON.")
     ctx = cmd.get("result") or {}
 
+    import openpyxl
+    from openpyxl.styles import Font
+
     if os.path.exists(xlsx_path):
         wb = openpyxl.load_workbook(xlsx_path)
     else:
@@ -0,0 +1,242 @@
+# @feature: single-flight read coalescing for RPC clients | keywords: キャッシュ, 重複排除, 読み取り, 一括
+"""
+Request coalescing for idempotent reads within one run.
+
+    reads = SingleFlight()
+    levels = reads.call("get_levels", {"skip": 0, "count": 500},
+                        lambda: send_request(port, "get_levels", {...}))
+    ...
+    send_request(port, "create_level", {...})
+    reads.note_write("create_level")          # drops cached "level" reads
+
+Identical (method, canonical params) reads are fetched once per scope;
+callers that ask while the first fetch is still running wait on it instead
+of issuing their own. Failed fetches are not cached (every waiter gets the
+error and the next caller retries).
+
+Writes invalidate by category. The category is the noun of the method name
+(namespace and verb stripped, parameter/bulk suffixes dropped, singular):
+
+    element.get_structural_frames              -> structural_frame
+    update_structural_frame_parameter          -> structural_frame
+    update_structural_frame_type_parameter     -> structural_frame_type
+    update_level_elevation                     -> level_elevation (hits "level")
+
+A write hits a cached read when the categories are equal or one is a more
+specific form of the other (level_elevation vs level, wall vs wall_baseline),
+except that *_type categories are kept apart from their instances; a generic read
+category (type) is hit by every specific one (structural_frame_type).
+Categories that name the same data under another noun are listed in
+_ALIASES (tag_in_view counts as tag, dimension_in_view as dimension).
+
+A write clears the whole scope when its category is generic (element, param,
+...) or bare "type" (change_type / type parameters touch instance reads too),
+when it cannot be classified, or when it hits none of the read categories
+seen in this scope (update_parameters_batch -> parameter_batch): only a write
+that maps onto a known read is narrowed. Generic reads (element info,
+context) drop on any write. Pass categories= explicitly when the name is
+misleading.
+
+Cached results are returned as deep copies, so callers may mutate them.
+"""
+import copy
+import json
+import threading
+import weakref
+from typing import Any, Callable, Dict, Iterable, Optional, Set, Tuple
+
+_READ_PREFIXES = ("get_", "list_", "find_", "search_", "describe_", "summarize_", "query_", "count_")
+_READ_NAMES = {"ping_server", "get_context"}
+_VERBS = (
+    "get_", "list_", "find_", "search_", "describe_", "summarize_", "query_", "count_",
+    "create_", "update_", "set_", "delete_", "remove_", "add_", "move_", "rename_", "duplicate_",
+    "change_", "apply_", "place_", "copy_", "mirror_", "rotate_", "hide_", "unhide_", "show_",
+    "reset_", "clear_", "transform_", "join_", "unjoin_", "attach_", "detach_", "tag_",
+)
+_SUFFIXES = ("_parameters_bulk", "_parameter_bulk", "_parameters", "_parameter", "_params", "_param",
+             "_bulk", "_info", "_by_id", "_by_ids", "_by_name")
+_GENERIC = {"", "element", "param", "parameter", "instance", "selection", "model", "document", "doc", "context"}
+# writes of these categories clear the scope (they change what instance reads report)
+_SCOPE_WIDE = {"type"}
+# category -> the categories it also counts as (applied to reads and writes)
+_ALIASES = {
+    "tag_in_view": ("tag",),
+    "dimension_in_view": ("dimension",),
+}
+
+_IRREGULAR = {"categories": "category", "families": "family", "properties": "property", "boundaries": "boundary",
+              "geometries": "geometry", "entries": "entry", "series": "series", "status": "status",
+              "axes": "axis", "vertices": "vertex", "indices": "index"}
+
+
+def method_name(method: str) -> str:
+    return str(method or "").rsplit(".", 1)[-1].strip().lower()
+
+
+def is_read_method(method: str) -> bool:
+    name = method_name(method)
+    return name in _READ_NAMES or name.startswith(_READ_PREFIXES)
+
+
+def _singular(word: str) -> str:
+    if word in _IRREGULAR:
+        return _IRREGULAR[word]
+    if word.endswith("ies") and len(word) > 4:
+        return word[:-3] + "y"
+    if word.endswith(("sses", "xes", "ches", "shes")):
+        return word[:-2]
+    if word.endswith("s") and not word.endswith("ss") and len(word) > 3:
+        return word[:-1]
+    return word
+
+
+def category_of(method: str) -> str:
+    name = method_name(method)
+    for v in _VERBS:
+        if name.startswith(v):
+            name = name[len(v):]
+            break
+    changed = True
+    while changed:
+        changed = False
+        for s in _SUFFIXES:
+            if name.endswith(s) and len(name) > len(s):
+                name = name[: -len(s)]
+                changed = True
+    parts = [_singular(p) for p in name.split("_") if p]
+    return "_".join(parts)
+
+
+def with_aliases(categories: Iterable[str]) -> Set[str]:
+    out = set(categories)
+    for c in list(out):
+        out.update(_ALIASES.get(c, ()))
+    return out
+
+
+def _hits(write_cat: str, read_cat: str) -> bool:
+    if write_cat == read_cat:
+        return True
+    if write_cat.startswith(read_cat + "_"):
+        rest = write_cat[len(read_cat) + 1:]
+        return not rest.startswith("type")
+    # a general write (move_wall) changes the specific reads of its noun (get_wall_baseline)
+    if read_cat.startswith(write_cat + "_"):
+        rest = read_cat[len(write_cat) + 1:]
+        return not rest.startswith("type")
+    # generic reads of a kind ("type" from get_type_parameters_bulk) see every specific write of it
+    return write_cat.endswith("_" + read_cat)
+
+
+def canonical_key(method: str, params: Optional[Dict[str, Any]]) -> Tuple[str, str]:
+    return (str(method), json.dumps(params or {}, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str))
+
+
+class _Flight:
+    __slots__ = ("done", "result", "error", "categories")
+
+    def __init__(self, categories: Set[str]):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.categories = categories
+
+
+_SCOPES: "weakref.WeakSet[SingleFlight]" = weakref.WeakSet()
+
+
+def reset_run_caches() -> None:
+    """Drop every scope's cached reads (runner_daemon calls this before each run)."""
+    for scope in list(_SCOPES):
+        scope.invalidate(None)
+
+
+class SingleFlight:
+    """One coalescing scope (typically one per run / per port)."""
+
+    def __init__(self, *, enabled: bool = True):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._flights: Dict[Tuple[str, str], _Flight] = {}
+        self._read_cats: Set[str] = set()
+        self.hits = 0
+        self.misses = 0
+        _SCOPES.add(self)
+
+    def call(self, method: str, params: Optional[Dict[str, Any]], fetch: Callable[[], Any], *,
+             categories: Optional[Iterable[str]] = None) -> Any:
+        """Serve an idempotent read once per scope; concurrent duplicates wait on the first."""
+        if not self.enabled:
+            return fetch()
+        key = canonical_key(method, params)
+        with self._lock:
+            flight = self._flights.get(key)
+            leader = flight is None
+            if leader:
+                cats = with_aliases(categories if categories is not None else [category_of(method)])
+                self._read_cats |= cats
+                flight = self._flights[key] = _Flight(cats)
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        if leader:
+            try:
+                flight.result = fetch()
+            except BaseException as ex:
+                flight.error = ex
+                with self._lock:
+                    if self._flights.get(key) is flight:
+                        del self._flights[key]
+                flight.done.set()
+                raise
+            flight.done.set()
+            return copy.deepcopy(flight.result)
+
+        flight.done.wait()
+        if flight.error is not None:
+            raise flight.error
+        return copy.deepcopy(flight.result)
+
+    def invalidate(self, categories: Optional[Iterable[str]] = None) -> int:
+        """Drop cached reads for the given categories (all when None). Returns the number dropped."""
+        with self._lock:
+            if categories is None:
+                n = len(self._flights)
+                self._flights.clear()
+                return n
+            cats = with_aliases(categories)
+            # generic reads (element info, context, ...) can be affected by any write
+            drop = [k for k, f in self._flights.items()
+                    if (f.categories & _GENERIC) or any(_hits(w, r) for w in cats for r in f.categories)]
+            for k in drop:
+                del self._flights[k]
+            return len(drop)
+
+    def note_write(self, method: str, *, categories: Optional[Iterable[str]] = None) -> int:
+        """Invalidate whatever a write could have changed (everything when it cannot be classified)."""
+        if categories is None and not method_name(method).startswith(_VERBS):
+            return self.invalidate(None)
+        explicit = categories is not None
+        cats = with_aliases(categories if explicit else [category_of(method)])
+        if any(c in _GENERIC or c in _SCOPE_WIDE for c in cats):
+            return self.invalidate(None)
+        if not explicit:
+            with self._lock:
+                known = any(_hits(w, r) for w in cats for r in self._read_cats)
+            if not known:
+                return self.invalidate(None)  # no read of this scope maps to it: drop everything
+        return self.invalidate(cats)
+
+    def through(self, method: str, params: Optional[Dict[str, Any]], send: Callable[[], Any]) -> Any:
+        """Route one RPC: coalesce it when it is a read, otherwise send it and invalidate."""
+        if is_read_method(method):
+            return self.call(method, params, send)
+        try:
+            return send()
+        finally:
+            self.note_write(method)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "cached": len(self._flights)}
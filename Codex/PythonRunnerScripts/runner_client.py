@@ -0,0 +1,151 @@
+# @feature: run a script on the warm runner daemon (falls back to a new interpreter) | keywords: 常駐, 高速化, 起動時間, ランナー
+"""
+Run a PythonRunnerScripts script through runner_daemon.py.
+
+    python runner_client.py project_info_show.py
+    python runner_client.py get_element_info_safe.py --port 5210 --ids 123,456
+    python runner_client.py --start-daemon fetch_walls_and_view.py --port 5210
+    python runner_client.py --stop-daemon
+
+Output is streamed as the script prints it and the exit code is the
+script's. When no daemon is running the script is started in a new
+interpreter as usual (--no-fallback makes that an error instead).
+
+Only the standard library is imported here, so the client itself starts fast.
+"""
+import json
+import os
+import socket
+import subprocess
+import sys
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def state_file() -> str:
+    env = os.environ.get("REVIT_MCP_RUNNER_DAEMON_FILE")
+    if env:
+        return env
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("TMPDIR") or "/tmp"
+    return os.path.join(base, "RevitMCP", "runner_daemon.json")
+
+
+def read_state() -> Optional[Dict[str, Any]]:
+    try:
+        with open(state_file(), "r", encoding="utf-8") as f:
+            st = json.load(f)
+        return st if isinstance(st, dict) and st.get("port") else None
+    except (OSError, ValueError):
+        return None
+
+
+def connect(timeout: float = 1.0) -> Optional[Tuple[socket.socket, str]]:
+    """(socket, token) for the running daemon, or None."""
+    st = read_state()
+    if not st:
+        return None
+    try:
+        sock = socket.create_connection((st.get("host") or "127.0.0.1", int(st["port"])), timeout=timeout)
+    except OSError:
+        return None
+    sock.settimeout(None)
+    return sock, str(st.get("token") or "")
+
+
+def start_daemon(wait_seconds: float = 15.0) -> bool:
+    """Start runner_daemon.py detached and wait until it answers."""
+    kwargs: Dict[str, Any] = {"stdin": subprocess.DEVNULL, "stdout": subprocess.DEVNULL, "stderr": subprocess.DEVNULL}
+    if os.name == "nt":
+        kwargs["creationflags"] = subprocess.DETACHED_PROCESS | subprocess.CREATE_NEW_PROCESS_GROUP  # type: ignore[attr-defined]
+    else:
+        kwargs["start_new_session"] = True
+    subprocess.Popen([sys.executable, os.path.join(SCRIPT_DIR, "runner_daemon.py")], **kwargs)
+    deadline = time.time() + wait_seconds
+    while time.time() < deadline:
+        conn = connect(timeout=0.5)
+        if conn is not None:
+            conn[0].close()
+            return True
+        time.sleep(0.2)
+    return False
+
+
+def run_on_daemon(conn: Tuple[socket.socket, str], script: str, argv: List[str], *,
+                  env: Optional[Dict[str, str]] = None) -> int:
+    sock, token = conn
+    req = {
+        "token": token,
+        "script": os.path.abspath(script),
+        "argv": argv,
+        "cwd": os.getcwd(),
+        "env": env if env is not None else {k: v for k, v in os.environ.items() if k.startswith("REVIT_MCP_")},
+    }
+    sock.sendall((json.dumps(req, ensure_ascii=False) + "\n").encode("utf-8"))
+    rf = sock.makefile("rb")
+    try:
+        for raw in rf:
+            msg = json.loads(raw.decode("utf-8"))
+            if "out" in msg:
+                print(msg["out"], flush=True)
+            elif "err" in msg:
+                print(msg["err"], file=sys.stderr, flush=True)
+            if "exit" in msg:
+                if msg.get("error"):
+                    print(f"[runner_client] {msg['error']}", file=sys.stderr)
+                return int(msg["exit"])
+    except KeyboardInterrupt:
+        return -2  # closing the socket stops the run on the daemon
+    finally:
+        sock.close()
+    print("[runner_client] daemon closed the connection", file=sys.stderr)
+    return 1
+
+
+def stop_daemon() -> int:
+    conn = connect()
+    if conn is None:
+        print("[runner_client] no runner daemon is running", file=sys.stderr)
+        return 1
+    sock, token = conn
+    with sock:
+        sock.sendall((json.dumps({"token": token, "op": "shutdown"}) + "\n").encode("utf-8"))
+        sock.makefile("rb").readline()
+    return 0
+
+
+def main() -> int:
+    args = sys.argv[1:]
+    fallback, start = True, False
+    while args and args[0].startswith("--"):
+        opt = args.pop(0)
+        if opt == "--no-fallback":
+            fallback = False
+        elif opt == "--start-daemon":
+            start = True
+        elif opt == "--stop-daemon":
+            return stop_daemon()
+        else:
+            print(f"[runner_client] unknown option {opt}", file=sys.stderr)
+            return 2
+    if not args:
+        print("usage: runner_client.py [--start-daemon] [--no-fallback] script.py [args...] | --stop-daemon", file=sys.stderr)
+        return 2
+    script, argv = args[0], args[1:]
+    if not os.path.isfile(script) and os.path.isfile(os.path.join(SCRIPT_DIR, script)):
+        script = os.path.join(SCRIPT_DIR, script)
+
+    conn = connect()
+    if conn is None and start and start_daemon():
+        conn = connect()
+    if conn is not None:
+        return run_on_daemon(conn, script, argv)
+    if not fallback:
+        print("[runner_client] no runner daemon is running", file=sys.stderr)
+        return 1
+    return subprocess.call([sys.executable, "-u", script] + argv)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
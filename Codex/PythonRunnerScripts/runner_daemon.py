@@ -0,0 +1,544 @@
+# @feature: warm Python runner daemon (scripts run without interpreter start-up) | keywords: 常駐, 高速化, 起動時間, ランナー
+"""
+Long-lived runner for PythonRunnerScripts.
+
+Starting python.exe, importing requests and the client helpers and opening a
+fresh HTTP connection costs more than the Revit call itself for short
+scripts (project_info_show.py, get_element_info_safe.py, ...). This daemon
+keeps one interpreter warm and runs scripts in it on request:
+
+    python runner_daemon.py                 # serve until stopped
+    python runner_client.py project_info_show.py --port 5210
+
+Warm state kept between runs
+- imported modules (requests, send_revit_command_durable, rpc_singleflight,
+  revit_mcp_async, ...); modules outside the Python installation are
+  re-imported when their file changes
+- HTTP keep-alive pools: requests.post/get reuse one session per thread and
+  send_revit_command_durable.send_request keeps its own
+Per-run state (argv, cwd, environment, sys.path, __main__ namespace) is fresh
+for every run. Read caches kept in imported modules are dropped before every
+run, since the model can change between runs: a module opts in by defining
+reset_run_caches() (rpc_singleflight clears every SingleFlight scope).
+
+Protocol (localhost TCP, one JSON object per line)
+  client -> {"token", "script" | "module", "argv": [...] | "argsLine": "...", "cwd", "env": {...},
+             "paths": [...]}   # paths go in front of sys.path for the run
+  daemon -> {"out": line} / {"err": line} ... {"exit": code, "elapsedMs": ms}
+Closing the connection (or sending {"cancel": true}) interrupts the run.
+{"op": "ping"} answers {"ok": true, "pid", "busy"}.
+
+Runs are executed one at a time on the main thread (signal handlers and
+asyncio.run behave as in a normal process); other clients wait their turn.
+Scripts that use multiprocessing are run in a child interpreter instead.
+
+Address and token are written to %LOCALAPPDATA%/RevitMCP/runner_daemon.json
+(REVIT_MCP_RUNNER_DAEMON_FILE overrides) together with the interpreter
+(python = sys.executable, prefix = sys.prefix); clients must echo the token
+and only use a daemon that runs the interpreter they would start.
+"""
+import _thread
+import argparse
+import importlib
+import io
+import json
+import os
+import queue
+import runpy
+import secrets
+import socket
+import subprocess
+import sys
+import threading
+import time
+import traceback
+from typing import Any, Dict, List, Optional
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+TOOLS_PARENT = os.path.abspath(os.path.join(SCRIPT_DIR, ".."))  # Codex (tools.mcp_safe)
+DEFAULT_PRELOAD = ["requests", "send_revit_command_durable", "rpc_singleflight", "id_set_codec", "revit_mcp_async"]
+SUBPROCESS_MARKERS = ("multiprocessing", "ProcessPoolExecutor")
+
+
+def state_file() -> str:
+    env = os.environ.get("REVIT_MCP_RUNNER_DAEMON_FILE")
+    if env:
+        return env
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("TMPDIR") or "/tmp"
+    return os.path.join(base, "RevitMCP", "runner_daemon.json")
+
+
+def split_windows_args(line: str) -> List[str]:
+    """Split a command line the way python.exe (CommandLineToArgvW) would."""
+    out: List[str] = []
+    cur: List[str] = []
+    in_quotes = False
+    has_token = False
+    i, n = 0, len(line or "")
+    while i < n:
+        c = line[i]
+        if c == "\\":
+            j = i
+            while j < n and line[j] == "\\":
+                j += 1
+            count = j - i
+            if j < n and line[j] == '"':
+                cur.append("\\" * (count // 2))
+                if count % 2:
+                    cur.append('"')
+                    i = j + 1
+                else:
+                    i = j
+            else:
+                cur.append("\\" * count)
+                i = j
+            has_token = True
+            continue
+        if c == '"':
+            if in_quotes and i + 1 < n and line[i + 1] == '"':
+                cur.append('"')
+                i += 2
+                continue
+            in_quotes = not in_quotes
+            has_token = True
+        elif c in " \t" and not in_quotes:
+            if has_token:
+                out.append("".join(cur))
+                cur, has_token = [], False
+        else:
+            cur.append(c)
+            has_token = True
+        i += 1
+    if has_token:
+        out.append("".join(cur))
+    return out
+
+
+# ---- shared HTTP pool -------------------------------------------------------
+
+_tls = threading.local()
+
+
+def share_requests_pool() -> None:
+    """Route requests.get/post/... through one keep-alive session per thread."""
+    import requests
+    import requests.api
+
+    def request(method: str, url: str, **kwargs: Any) -> Any:
+        sess = getattr(_tls, "session", None)
+        if sess is None:
+            sess = _tls.session = requests.Session()
+        return sess.request(method=method, url=url, **kwargs)
+
+    requests.api.request = request  # type: ignore[assignment]
+
+
+# ---- per-run output ---------------------------------------------------------
+
+class _Conn:
+    """Line-oriented JSON writer shared by the stdout/stderr proxies of one run."""
+
+    def __init__(self, sock: socket.socket):
+        self.sock = sock
+        self.lock = threading.Lock()
+        self.closed = False
+
+    def send(self, obj: Dict[str, Any]) -> None:
+        if self.closed:
+            return
+        data = (json.dumps(obj, ensure_ascii=False) + "\n").encode("utf-8")
+        with self.lock:
+            try:
+                self.sock.sendall(data)
+            except OSError:
+                self.closed = True
+
+
+class _LineStream(io.TextIOBase):
+    def __init__(self, conn: _Conn, key: str):
+        self._conn = conn
+        self._key = key
+        self._buf = ""
+        self._lock = threading.Lock()
+
+    @property
+    def encoding(self) -> str:  # type: ignore[override]
+        return "utf-8"
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return False
+
+    def write(self, s: str) -> int:
+        if not isinstance(s, str):
+            s = str(s)
+        with self._lock:
+            self._buf += s
+            if "\n" not in self._buf:
+                return len(s)
+            *lines, self._buf = self._buf.split("\n")
+        for ln in lines:
+            self._conn.send({self._key: ln.rstrip("\r")})
+        return len(s)
+
+    def flush(self) -> None:
+        with self._lock:
+            rest, self._buf = self._buf, ""
+        if rest:
+            self._conn.send({self._key: rest})
+
+
+# ---- module freshness -------------------------------------------------------
+
+class _ModuleWatch:
+    """Forget user modules (anything outside the Python installation) whose source changed."""
+
+    def __init__(self) -> None:
+        prefixes = {sys.prefix, sys.base_prefix, sys.exec_prefix}
+        try:
+            import site
+            prefixes.update(site.getsitepackages())
+            prefixes.add(site.getusersitepackages())
+        except Exception:
+            pass
+        self.installed = tuple(os.path.normcase(os.path.abspath(p)) + os.sep for p in prefixes if p)
+        self.mtimes: Dict[str, float] = {}
+
+    def _watched(self) -> Dict[str, str]:
+        out: Dict[str, str] = {}
+        for name, mod in list(sys.modules.items()):
+            f = getattr(mod, "__file__", None)
+            if not f or name == "__main__":
+                continue
+            if not os.path.normcase(os.path.abspath(f)).startswith(self.installed):
+                out[name] = f
+        return out
+
+    def snapshot(self) -> None:
+        for name, f in self._watched().items():
+            if name in self.mtimes:
+                continue  # keep the import-time stamp so an edit during a run is still noticed
+            try:
+                self.mtimes[name] = os.path.getmtime(f)
+            except OSError:
+                pass
+
+    def drop_stale(self) -> List[str]:
+        stale: List[str] = []
+        for name, f in self._watched().items():
+            try:
+                mt = os.path.getmtime(f)
+            except OSError:
+                mt = -1.0
+            if name in self.mtimes and self.mtimes[name] != mt:
+                stale.append(name)
+        for name in stale:
+            sys.modules.pop(name, None)
+            self.mtimes.pop(name, None)
+        if stale:
+            importlib.invalidate_caches()
+        return stale
+
+
+def reset_run_caches() -> List[str]:
+    """Call reset_run_caches() of every loaded module that defines one. Returns their names."""
+    done: List[str] = []
+    for name, mod in list(sys.modules.items()):
+        if name == "__main__" or mod is None:
+            continue
+        fn = getattr(mod, "reset_run_caches", None)
+        if not callable(fn) or getattr(fn, "__module__", None) != name:
+            continue  # skip names merely imported from another module
+        try:
+            fn()
+            done.append(name)
+        except Exception as ex:
+            print(f"[runner_daemon] {name}.reset_run_caches failed: {ex}", file=sys.stderr)
+    return done
+
+
+# ---- daemon -----------------------------------------------------------------
+
+class _Job:
+    def __init__(self, req: Dict[str, Any], conn: _Conn):
+        self.req = req
+        self.conn = conn
+        self.done = threading.Event()
+
+
+class RunnerDaemon:
+    def __init__(self, host: str, port: int, *, preload: List[str], idle_exit: float, share_pool: bool):
+        self.token = secrets.token_hex(16)
+        self.jobs: "queue.Queue[_Job]" = queue.Queue()
+        self.current: Optional[_Job] = None
+        self.cur_lock = threading.Lock()
+        self.idle_exit = idle_exit
+        self.last_activity = time.monotonic()
+        self.watch = _ModuleWatch()
+        self.server = socket.create_server((host, port))
+        self.address = self.server.getsockname()[:2]
+
+        for p in (SCRIPT_DIR, TOOLS_PARENT):
+            if p not in sys.path:
+                sys.path.insert(0, p)
+        for name in preload:
+            try:
+                importlib.import_module(name)
+            except Exception as ex:
+                print(f"[runner_daemon] preload {name} failed: {ex}", file=sys.stderr)
+        if share_pool:
+            try:
+                share_requests_pool()
+            except ImportError:
+                pass
+        self.watch.snapshot()
+
+    # accept / connection threads
+    def serve_forever(self) -> None:
+        threading.Thread(target=self._accept_loop, daemon=True).start()
+        self._write_state()
+        print(f"[runner_daemon] listening on {self.address[0]}:{self.address[1]} pid={os.getpid()}", flush=True)
+        try:
+            self._run_loop()
+        finally:
+            self._remove_state()
+
+    def _accept_loop(self) -> None:
+        while True:
+            try:
+                sock, _ = self.server.accept()
+            except OSError:
+                return
+            threading.Thread(target=self._handle, args=(sock,), daemon=True).start()
+
+    def _handle(self, sock: socket.socket) -> None:
+        conn = _Conn(sock)
+        try:
+            rf = sock.makefile("rb")
+            line = rf.readline()
+            try:
+                req = json.loads(line.decode("utf-8") or "{}")
+            except ValueError:
+                conn.send({"error": "invalid request", "exit": 2})
+                return
+            if req.get("token") != self.token:
+                conn.send({"error": "bad token", "exit": 2})
+                return
+            if req.get("op") == "ping":
+                conn.send({"ok": True, "pid": os.getpid(), "busy": self.current is not None})
+                return
+            if req.get("op") == "shutdown":
+                conn.send({"ok": True})
+                self.jobs.put(None)  # type: ignore[arg-type]
+                return
+
+            job = _Job(req, conn)
+            self.jobs.put(job)
+            # watch the connection: EOF or {"cancel": true} interrupts the run
+            while not job.done.is_set():
+                more = rf.readline()
+                if not more or b'"cancel"' in more:
+                    self._cancel(job)
+                    break
+            job.done.wait()
+        except OSError:
+            pass
+        finally:
+            try:
+                sock.close()
+            except OSError:
+                pass
+
+    def _cancel(self, job: _Job) -> None:
+        job.conn.closed = True
+        with self.cur_lock:
+            if self.current is job:
+                _thread.interrupt_main()
+
+    # main thread: one run at a time
+    def _run_loop(self) -> None:
+        while True:
+            job: Optional[_Job] = None
+            try:
+                try:
+                    job = self.jobs.get(timeout=1.0)
+                except queue.Empty:
+                    if self.idle_exit > 0 and time.monotonic() - self.last_activity > self.idle_exit:
+                        return
+                    continue
+                if job is None:
+                    return
+                if job.conn.closed:
+                    continue
+                with self.cur_lock:
+                    self.current = job
+                t0 = time.monotonic()
+                try:
+                    code = self._run(job)
+                except KeyboardInterrupt:
+                    code = -2
+                with self.cur_lock:
+                    self.current = None
+                self.last_activity = time.monotonic()
+                job.conn.send({"exit": code, "elapsedMs": int((time.monotonic() - t0) * 1000)})
+            except KeyboardInterrupt:
+                # a cancel that landed just after its run ended, or Ctrl+C on the console while idle
+                with self.cur_lock:
+                    self.current = None
+                if job is None and sys.stdin is not None and sys.stdin.isatty():
+                    return
+            finally:
+                if job is not None:
+                    job.done.set()
+
+    def _run(self, job: _Job) -> int:
+        req = job.req
+        script = req.get("script")
+        module = req.get("module")
+        argv = req.get("argv")
+        if argv is None:
+            argv = split_windows_args(str(req.get("argsLine") or ""))
+        argv = [str(a) for a in argv]
+        cwd = req.get("cwd") or (os.path.dirname(os.path.abspath(script)) if script else os.getcwd())
+        env = {str(k): str(v) for k, v in (req.get("env") or {}).items()}
+        paths = [str(p) for p in (req.get("paths") or []) if p]
+
+        out, err = _LineStream(job.conn, "out"), _LineStream(job.conn, "err")
+        saved = (sys.argv[:], sys.path[:], os.getcwd(), dict(os.environ), sys.stdout, sys.stderr, sys.stdin)
+        code = 0
+        try:
+            self.watch.drop_stale()
+            reset_run_caches()
+            os.chdir(cwd)
+            os.environ.update(env)
+            sys.path[:0] = [p for p in paths if p not in sys.path]
+            sys.stdout, sys.stderr, sys.stdin = out, err, io.StringIO("")
+            if script and _needs_subprocess(script):
+                code = _run_subprocess(script, argv, cwd, out, err)
+            elif script:
+                path = os.path.abspath(script)
+                sys.argv = [path] + argv
+                sys.path.insert(0, os.path.dirname(path))
+                runpy.run_path(path, run_name="__main__")
+            elif module:
+                sys.argv = [str(module)] + argv
+                runpy.run_module(str(module), run_name="__main__", alter_sys=True)
+            else:
+                print("request needs script or module", file=err)
+                code = 2
+        except SystemExit as ex:
+            code = _exit_code(ex.code, err)
+        except KeyboardInterrupt:
+            code = -2
+        except BaseException as ex:
+            _print_script_traceback(ex, err)
+            code = 1
+        finally:
+            try:
+                out.flush()
+                err.flush()
+            except Exception:
+                pass
+            argv0, path0, cwd0, env0, so, se, si = saved
+            sys.stdout, sys.stderr, sys.stdin = so, se, si
+            sys.argv[:] = argv0
+            sys.path[:] = path0
+            try:
+                os.chdir(cwd0)
+            except OSError:
+                pass
+            os.environ.clear()
+            os.environ.update(env0)
+            self.watch.snapshot()
+        return code
+
+    def _write_state(self) -> None:
+        path = state_file()
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        tmp = path + f".{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump({"host": self.address[0], "port": self.address[1], "pid": os.getpid(),
+                       "token": self.token, "python": sys.executable, "prefix": sys.prefix,
+                       "scriptsDir": SCRIPT_DIR}, f)
+        os.replace(tmp, path)
+
+    def _remove_state(self) -> None:
+        try:
+            with open(state_file(), "r", encoding="utf-8") as f:
+                if json.load(f).get("pid") == os.getpid():
+                    os.remove(state_file())
+        except (OSError, ValueError):
+            pass
+
+
+def _exit_code(code: Any, err: io.TextIOBase) -> int:
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=err)
+    return 1
+
+
+def _print_script_traceback(ex: BaseException, err: io.TextIOBase) -> None:
+    # drop the daemon/runpy frames so the traceback reads like a normal run
+    tb = ex.__traceback__
+    own = {os.path.abspath(__file__), os.path.abspath(runpy.__file__)}
+    while tb is not None and tb.tb_next is not None and (
+            os.path.abspath(tb.tb_frame.f_code.co_filename) in own
+            or tb.tb_frame.f_code.co_filename.startswith("<frozen")):
+        tb = tb.tb_next
+    traceback.print_exception(type(ex), ex, tb, file=err)
+
+
+def _needs_subprocess(script: str) -> bool:
+    try:
+        with open(script, "r", encoding="utf-8", errors="replace") as f:
+            src = f.read()
+    except OSError:
+        return False
+    return any(m in src for m in SUBPROCESS_MARKERS)
+
+
+def _run_subprocess(script: str, argv: List[str], cwd: str, out: _LineStream, err: _LineStream) -> int:
+    proc = subprocess.Popen([sys.executable, "-u", script] + argv, cwd=cwd, env=dict(os.environ),
+                            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True, encoding="utf-8",
+                            errors="replace")
+
+    def pump(src: Any, dst: _LineStream) -> None:
+        for ln in src:
+            dst.write(ln)
+
+    t = threading.Thread(target=pump, args=(proc.stderr, err), daemon=True)
+    t.start()
+    try:
+        pump(proc.stdout, out)
+        return proc.wait()
+    except KeyboardInterrupt:
+        proc.kill()
+        raise
+    finally:
+        t.join(timeout=5)
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Warm Python runner for PythonRunnerScripts.")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=0, help="0 = pick a free port (written to the state file)")
+    ap.add_argument("--preload", default=",".join(DEFAULT_PRELOAD), help="Comma-separated modules to import up front")
+    ap.add_argument("--idle-exit-minutes", type=float, default=0.0, help="Exit after this long without runs (0 = never)")
+    ap.add_argument("--no-shared-pool", action="store_true", help="Leave requests.get/post on a new session per call")
+    args = ap.parse_args()
+
+    daemon = RunnerDaemon(args.host, args.port,
+                          preload=[m.strip() for m in args.preload.split(",") if m.strip()],
+                          idle_exit=max(0.0, args.idle_exit_minutes) * 60.0,
+                          share_pool=not args.no_shared_pool)
+    daemon.serve_forever()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -1,12 +1,18 @@
 # @feature: Note: effective max attempts is decided dynamically (see decide_max_attempts) | keywords: タグ, キャプチャ
-import requests
 import time
 import json
 import argparse
 import os
 import sys
+import threading
+from contextlib import contextmanager
 from datetime import datetime
-from typing import Any, Dict, Tuple, Optional, Mapping
+from typing import TYPE_CHECKING, Any, Dict, Iterator, Tuple, Optional, Mapping
+
+if TYPE_CHECKING:
+    import requests
+# requests is imported on first use: scripts that fail argument checks (or only
+# import RevitMcpError) do not pay for it at start-up
 
 POLLING_INTERVAL_SECONDS = 0.5
 # Note: effective max attempts is decided dynamically (see decide_max_attempts)
@@ -24,6 +30,18 @@ class RevitMcpError(Exception):
         self.http_status = http_status
         self.payload = payload or {}
 
+_TLS = threading.local()
+
+@contextmanager
+def _keepalive_session() -> Iterator["requests.Session"]:
+    """One keep-alive session per thread, reused across send_request calls."""
+    sess = getattr(_TLS, "session", None)
+    if sess is None:
+        import requests
+        sess = _TLS.session = requests.Session()
+        sess.headers.update(HEADERS)
+    yield sess
+
 def _poll_interval(attempt: int) -> float:
     """
     Adaptive polling interval to reduce perceived latency initially
@@ -37,7 +55,7 @@ def _poll_interval(attempt: int) -> float:
         return 1.0
     return 2.0
 
-def _json_or_raise(resp: requests.Response, where: str) -> Any:
+def _json_or_raise(resp: "requests.Response", where: str) -> Any:
     try:
         return resp.json()
     except Exception:
@@ -83,17 +101,22 @@ def _normalize_params(params: Dict[str, Any]) -> Dict[str, Any]:
 
 def send_request(port: int, method: str, params: Optional[Dict[str, Any]] = None, *, force: bool = False,
                  timeout: Tuple[float, float] = (3.0, 120.0), max_wait_seconds: Optional[float] = None,
-                 job_timeout_sec: Optional[int] = None, max_poll_attempts: int = DEFAULT_MAX_POLLING_ATTEMPTS) -> Dict[str, Any]:
+                 job_timeout_sec: Optional[int] = None, max_poll_attempts: int = DEFAULT_MAX_POLLING_ATTEMPTS,
+                 idempotency_key: Optional[str] = None) -> Dict[str, Any]:
+    import requests
+
     if params is None:
         params = {}
     base = f"http://localhost:{port}"
     enqueue_url = f"{base}/enqueue"
     get_result_url = f"{base}/get_result"
     payload = {"jsonrpc": "2.0", "method": method, "params": _normalize_params(params or {}), "id": int(time.time()*1000)}
+    if idempotency_key:
+        # the durable queue returns the existing job for a key it has already seen
+        payload["idempotencyKey"] = idempotency_key
 
-    # HTTP keep-alive session
-    with requests.Session() as sess:
-        sess.headers.update(HEADERS)
+    # HTTP keep-alive session (per thread, so later calls reuse the connection)
+    with _keepalive_session() as sess:
 
         # enqueue
         post_params = {"force": 1} if force else {}
@@ -0,0 +1,207 @@
+# @feature: parallel snapshots from every open Revit port | keywords: 複数ポート, 並列, スナップショット, 柱, 梁
+"""
+Pull the same snapshot from every open Revit (default ports 5210-5219) in parallel.
+
+Modes
+- commands (default): run --commands on each live port and save
+  <name>_<port>.json as { ts, port, method, result } (same layout as
+  cache_revit_info.py: get_project_info -> project_info_<port>.json).
+- --structural-details: the create_structural_details_snapshot.ps1 snapshot
+  (visible structural framing/columns -> get_element_info rich, types in view,
+  type parameters) saved as structural_details_port<port>_<ts>.json, the
+  input format of strict_crossport_diff.py.
+
+Ports are probed with /health first (not with --proxy); closed ports are skipped.
+
+Examples
+  python snapshot_all_ports.py
+  python snapshot_all_ports.py --ports 5210,5211 --structural-details --delete-old
+"""
+import argparse
+import asyncio
+import json
+import os
+import re
+import sys
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from revit_mcp_async import (  # type: ignore  # noqa: E402
+    AsyncRevitClient, gather_limited, live_ports, parse_ports, run_on_ports, unwrap,
+)
+
+CAT_FRAMING = -2001320
+CAT_COLUMNS = -2001330
+DEFAULT_TYPE_PARAM_KEYS = ["符号", "H", "B", "tw", "tf", "Type Mark", "コメント", "構造用途", "材質"]
+
+
+def save_json(path: str, obj: Any) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = path + ".tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(obj, f, ensure_ascii=False, indent=2)
+    os.replace(tmp, path)
+
+
+def sanitize(name: Any) -> str:
+    s = re.sub(r'[\\/:*?"<>|\x00-\x1f]', "_", str(name or "")).strip()
+    return s or "Unknown"
+
+
+def command_file_name(method: str) -> str:
+    name = method.rsplit(".", 1)[-1]
+    if name.startswith("get_"):
+        name = name[4:]
+    return name
+
+
+async def snapshot_commands(c: AsyncRevitClient, methods: List[str], out_dir: str) -> Dict[str, Any]:
+    ts = int(time.time())
+    saved: Dict[str, Any] = {}
+    for m in methods:
+        res = unwrap(await c.call(m))
+        path = os.path.join(out_dir, f"{command_file_name(m)}_{c.port}.json")
+        save_json(path, {"ts": ts, "port": c.port, "method": m, "result": res})
+        saved[m] = path
+    return saved
+
+
+async def snapshot_structural_details(c: AsyncRevitClient, *, out_dir: Optional[str], repo_root: str,
+                                      chunk_size: int, in_flight: int, delete_old: bool,
+                                      type_param_keys: List[str]) -> Dict[str, Any]:
+    proj = unwrap(await c.call("get_project_info"))
+    project_name = proj.get("projectName")
+    project_number = proj.get("projectNumber") or f"X{c.port}"
+    logs_dir = out_dir or os.path.join(repo_root, "Work", f"{sanitize(project_name)}_{sanitize(project_number)}", "Logs")
+    os.makedirs(logs_dir, exist_ok=True)
+    if delete_old:
+        prefix = f"structural_details_port{c.port}_"
+        for fn in os.listdir(logs_dir):
+            if fn.startswith(prefix) and fn.endswith(".json"):
+                try:
+                    os.remove(os.path.join(logs_dir, fn))
+                except OSError:
+                    pass
+
+    cv = unwrap(await c.call("get_current_view"))
+    view_id = int(cv.get("viewId") or 0)
+    if view_id <= 0:
+        raise RuntimeError(f"Failed to get current view on port {c.port}")
+
+    cats = [CAT_FRAMING, CAT_COLUMNS]
+    iev = unwrap(await c.call("get_elements_in_view", {
+        "viewId": view_id, "categoryIds": cats,
+        "_shape": {"idsOnly": True, "page": {"limit": 20000}},
+        "_filter": {"modelOnly": True, "excludeImports": True},
+    }))
+    ids = [int(x) for x in (iev.get("elementIds") or [])]
+
+    # element info: keep a few chunks queued so the port never idles between them
+    chunks = [ids[i:i + chunk_size] for i in range(0, len(ids), chunk_size)]
+    pages = await gather_limited(
+        (c.call("get_element_info", {"elementIds": ch, "rich": True}) for ch in chunks), in_flight)
+    elements: List[Any] = []
+    for pg in pages:
+        elements.extend(unwrap(pg).get("elements") or [])
+
+    types: List[Any] = []
+    try:
+        gtv = unwrap(await c.call("get_types_in_view", {
+            "viewId": view_id, "categories": cats, "includeCounts": True, "includeTypeInfo": True, "modelOnly": True}))
+        types = list(gtv.get("types") or [])
+    except Exception:
+        types = []
+
+    type_params: Dict[str, Any] = {}
+    type_ids = sorted({int(t["typeId"]) for t in types if isinstance(t, dict) and str(t.get("typeId", "")).lstrip("-").isdigit()})
+    if type_ids and type_param_keys:
+        keys = [{"name": k} for k in type_param_keys if k.strip()]
+        slices = [type_ids[i:i + 200] for i in range(0, len(type_ids), 200)]
+        try:
+            tps = await gather_limited((c.call("get_type_parameters_bulk", {
+                "typeIds": sl, "paramKeys": keys, "page": {"startIndex": 0, "batchSize": 200}}) for sl in slices), in_flight)
+            for tp in tps:
+                for it in unwrap(tp).get("items") or []:
+                    try:
+                        type_params[str(int(it.get("typeId")))] = it
+                    except (TypeError, ValueError):
+                        continue
+        except Exception:
+            pass
+
+    stamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    path = os.path.join(logs_dir, f"structural_details_port{c.port}_{stamp}.json")
+    save_json(path, {
+        "ok": True,
+        "createdAt": datetime.now().astimezone().isoformat(),
+        "port": c.port,
+        "project": {"name": project_name, "number": project_number},
+        "viewId": view_id,
+        "categoryIds": cats,
+        "totalIds": len(ids),
+        "count": len(elements),
+        "elements": elements,
+        "types": types,
+        "typeParameters": type_params,
+    })
+    return {"path": path, "elements": len(elements), "types": len(types)}
+
+
+async def amain(args: argparse.Namespace) -> Dict[str, Any]:
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    repo_root = os.path.abspath(os.path.join(script_dir, "..", ".."))
+    ports = parse_ports(args.ports)
+    alive = ports if (args.no_probe or args.proxy) else await live_ports(ports)
+    if not alive:
+        return {"ok": False, "msg": "No live Revit MCP ports", "probed": ports}
+
+    client_kw = {"max_wait_seconds": float(args.wait_seconds)}
+    if args.structural_details:
+        keys = [k.strip() for k in args.type_param_keys.split(",")] if args.type_param_keys else DEFAULT_TYPE_PARAM_KEYS
+
+        async def fn(c: AsyncRevitClient) -> Any:
+            return await snapshot_structural_details(
+                c, out_dir=args.out_dir, repo_root=repo_root, chunk_size=max(1, args.chunk_size),
+                in_flight=args.in_flight, delete_old=args.delete_old, type_param_keys=keys)
+    else:
+        out_dir = args.out_dir or os.path.join(repo_root, "Work")
+        methods = [m.strip() for m in args.commands.split(",") if m.strip()]
+
+        async def fn(c: AsyncRevitClient) -> Any:
+            return await snapshot_commands(c, methods, out_dir)
+
+    t0 = time.monotonic()
+    per_port = await run_on_ports(alive, fn, proxy=args.proxy, **client_kw)
+    return {
+        "ok": all(r.get("ok") for r in per_port.values()),
+        "ports": alive,
+        "elapsedSec": round(time.monotonic() - t0, 3),
+        "results": {str(p): r for p, r in per_port.items()},
+    }
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Pull snapshots from every open Revit MCP port in parallel.")
+    ap.add_argument("--ports", default="5210-5219", help="e.g. 5210-5219 or 5210,5211")
+    ap.add_argument("--proxy", default=None, help="Go through a proxy (/t/{port}) instead of the ports directly")
+    ap.add_argument("--commands", default="get_project_info,get_open_documents")
+    ap.add_argument("--structural-details", action="store_true", help="Structural framing/column details snapshot (strict_crossport_diff input)")
+    ap.add_argument("--out-dir", default=None, help="Default: <repo>/Work (commands) or Work/<Project>_<Number>/Logs (structural details)")
+    ap.add_argument("--chunk-size", type=int, default=150)
+    ap.add_argument("--in-flight", type=int, default=3, help="Queued jobs per port")
+    ap.add_argument("--type-param-keys", default=None, help="Comma-separated type parameter names")
+    ap.add_argument("--delete-old", action="store_true")
+    ap.add_argument("--wait-seconds", type=float, default=1800.0)
+    ap.add_argument("--no-probe", action="store_true", help="Skip the /health probe (always skipped with --proxy)")
+    args = ap.parse_args()
+
+    summary = asyncio.run(amain(args))
+    print(json.dumps(summary, ensure_ascii=False, indent=2))
+    return 0 if summary.get("ok") else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -15,12 +15,12 @@ CSV同期（梁優先）実行ラッパー。
 
 from __future__ import annotations
 
-import json
-import os
-import subprocess
 import sys
 from pathlib import Path
-from typing import List, Optional
+from typing import Any, Dict, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from calc_csv_sync_launcher import run_core  # type: ignore  # noqa: E402
 
 
 # True: 反映（apply） / False: 差分確認のみ（plan）
@@ -46,69 +46,17 @@ CSV_PATH = ""
 PORT_OVERRIDE: Optional[int] = None
 
 
-def _resolve_port() -> int:
-    if PORT_OVERRIDE and int(PORT_OVERRIDE) > 0:
-        return int(PORT_OVERRIDE)
-    p = os.environ.get("REVIT_MCP_PORT", "").strip()
-    if p.isdigit():
-        return int(p)
-    ss = Path(os.environ.get("LOCALAPPDATA", "")) / "RevitMCP" / "server_state.json"
-    if ss.exists():
-        try:
-            row = json.loads(ss.read_text(encoding="utf-8"))
-            v = int(row.get("port") or 0)
-            if v > 0:
-                return v
-        except Exception:
-            pass
-    return 5210
-
-
-def _candidate_roots() -> List[Path]:
-    roots: List[Path] = []
-    env_root = os.environ.get("REVIT_MCP_ROOT", "").strip()
-    if env_root:
-        roots.append(Path(env_root))
-    roots.append(Path.home() / "Documents" / "Revit_MCP")
-    roots.append(Path(__file__).resolve().parents[2])
-    return roots
-
-
-def _resolve_core_script() -> Path:
-    for root in _candidate_roots():
-        c = root / "Scripts" / "PythonRunnerScripts" / "sync_type_params_from_calc_csv.py"
-        if c.exists():
-            return c
-    raise FileNotFoundError("sync_type_params_from_calc_csv.py が見つかりません。")
+def core_options() -> Dict[str, Any]:
+    return {
+        "kinds": [k.strip() for k in str(KINDS).split(",") if k.strip()],
+        "columnListMode": str(COLUMN_LIST_MODE).strip().lower(),
+        "beamListMode": str(BEAM_LIST_MODE).strip().lower(),
+        "syncFrameInstances": bool(SYNC_FRAME_INSTANCES),
+    }
 
 
 def main() -> int:
-    core = _resolve_core_script()
-    port = _resolve_port()
-    mode = "apply" if APPLY else "plan"
-
-    cmd = [
-        sys.executable,
-        str(core),
-        "--port",
-        str(port),
-        "--mode",
-        mode,
-        "--kinds",
-        str(KINDS),
-        "--column-list-mode",
-        str(COLUMN_LIST_MODE).strip().lower(),
-        "--beam-list-mode",
-        str(BEAM_LIST_MODE).strip().lower(),
-    ]
-    if SYNC_FRAME_INSTANCES:
-        cmd.append("--sync-frame-instances")
-    if str(CSV_PATH or "").strip():
-        cmd += ["--csv-path", str(CSV_PATH).strip()]
-
-    print("RUN:", " ".join(cmd))
-    p = subprocess.run(cmd, check=False)
-    return int(p.returncode)
+    return run_core([core_options()], apply=APPLY, csv_path=CSV_PATH, port_override=PORT_OVERRIDE)
 
 
 if __name__ == "__main__":
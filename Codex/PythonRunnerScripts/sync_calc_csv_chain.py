@@ -0,0 +1,51 @@
+# @feature: 電算CSV同期ラッパーを1回の実行にまとめる（モデル取得を共有） | keywords: CSV, 同期, 一括実行, 柱リスト, 梁リスト, 高速化
+# -*- coding: utf-8 -*-
+
+"""
+CSV同期ラッパーの連続実行を1回にまとめる Python Runner 用スクリプト。
+
+CHAIN に並べたラッパー（sync_*_from_calc_csv.py）の同期内容を合わせて
+sync_type_params_from_calc_csv.py を1回だけ起動する。ラッパーを順に実行すると
+タイプ一覧・タイプパラメータ・インスタンス・詳細項目タイプをラッパーの数だけ
+取得し直すが、まとめて起動すれば取得は1回で全ステージが共有する。
+
+注意
+- 各ラッパーの APPLY / PORT_OVERRIDE / CSV_PATH は使わず、このスクリプトの設定に従う
+- まとめ方は calc_csv_sync_launcher.merge_options を参照
+  （例: rc + src の柱リスト → both、柱リストのみのラッパーの kind はタイプ同期しない）
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+from pathlib import Path
+from typing import Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from calc_csv_sync_launcher import run_core  # type: ignore  # noqa: E402
+
+
+# True: 反映（apply） / False: 差分確認のみ（plan）
+APPLY = True
+
+# まとめて実行するラッパー（モジュール名）
+CHAIN = [
+    "sync_types_and_column_lists_auto_from_calc_csv",
+    "sync_beam_instances_and_lists_from_calc_csv",
+]
+
+# CSVパス（空ならコアスクリプト既定値）
+CSV_PATH = ""
+
+# 空欄なら自動解決（server_state.json -> REVIT_MCP_PORT -> 5210）
+PORT_OVERRIDE: Optional[int] = None
+
+
+def main() -> int:
+    options = [importlib.import_module(name).core_options() for name in CHAIN]
+    return run_core(options, apply=APPLY, csv_path=CSV_PATH, port_override=PORT_OVERRIDE)
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
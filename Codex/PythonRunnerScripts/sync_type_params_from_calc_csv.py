@@ -22,15 +22,21 @@ from __future__ import annotations
 
 import argparse
 import csv
+import functools
 import json
+import math
 import os
 import re
 import sys
+import threading
 import time
 import urllib.error
 import urllib.request
+from collections import deque
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Any, Dict, Iterable, List, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
 
 try:
     import requests  # type: ignore
@@ -40,6 +46,11 @@ except Exception:
     requests = None
     _HAS_REQUESTS = False
 
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from rpc_singleflight import SingleFlight, is_read_method, method_name  # type: ignore  # noqa: E402
+from list_cursor import iter_items  # type: ignore  # noqa: E402
+from revit_records import CsvRow, InstanceRecord, RowLayout, StringTable, TypeRecord, instance_records  # type: ignore  # noqa: E402
+
 
 # -----------------------------
 # Defaults / Config
@@ -215,6 +226,10 @@ DEFAULT_CONFIG: Dict[str, Any] = {
 # -----------------------------
 
 
+_READ_SCOPES: Dict[str, SingleFlight] = {}
+_MODEL_CONTEXTS: Dict[str, "ModelContext"] = {}
+
+
 def _detect_endpoint(base_url: str) -> str:
     for ep in ("/rpc", "/jsonrpc"):
         url = f"{base_url}{ep}"
@@ -261,6 +276,20 @@ def _poll_job(base_url: str, job_id: str, timeout_sec: int = 300) -> Dict[str, A
 
 
 def rpc(base_url: str, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    # 同一 run 内の同一読み取り（method + params）は 1 回だけ送る。書き込みは同カテゴリの読み取りを破棄。
+    scope = _READ_SCOPES.get(base_url)
+    if scope is None:
+        scope = _READ_SCOPES.setdefault(base_url, SingleFlight())  # plan 並列時も scope は1つ
+    try:
+        return scope.through(method, params, lambda: _rpc_send(base_url, method, params))
+    finally:
+        if not is_read_method(method):
+            ctx = _MODEL_CONTEXTS.get(base_url)
+            if ctx is not None:
+                ctx.note_write(method, params)
+
+
+def _rpc_send(base_url: str, method: str, params: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
     endpoint = _detect_endpoint(base_url)
     payload = {
         "jsonrpc": "2.0",
@@ -282,13 +311,150 @@ def rpc(base_url: str, method: str, params: Optional[Dict[str, Any]] = None) ->
     return _unwrap(data)
 
 
+class ModelContext:
+    """
+    1回の実行で各 kind / ステージが読むモデル情報を1度だけ取得して共有する。
+
+    - タイプ一覧（listTypesCommand ごと）、詳細項目タイプ一覧、構造柱/構造フレームの全インスタンス、
+      typeId ごとのタイプパラメータ
+    - 一覧は count / namesOnly の違う呼び出しを1回の全件取得に集約
+    - 書き込み時: タイプパラメータ更新は該当 typeId のパラメータだけ破棄、インスタンスパラメータ更新は
+      何も破棄しない（一覧・タイプ情報は不変）、それ以外は全破棄
+    並列 plan で同時に初回取得した場合も rpc の SingleFlight で送信は1回になる。
+    """
+
+    _INSTANCE_SOURCES = {
+        "columns": ("element.get_structural_columns", "structuralColumns"),
+        "frames": ("element.get_structural_frames", "structuralFrames"),
+    }
+
+    def __init__(self, base_url: str):
+        self.base_url = base_url
+        self._lock = threading.Lock()
+        self._gen = 0
+        self._types: Dict[str, List[Dict[str, Any]]] = {}
+        self._instances: Dict[str, List[Dict[str, Any]]] = {}
+        self._type_params: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        self.pulls = 0
+        self.hits = 0
+
+    def _cached(self, table: Dict[Any, Any], key: Any, load: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in table:
+                self.hits += 1
+                return table[key]
+            gen = self._gen
+        value = load()
+        with self._lock:
+            self.pulls += 1
+            if gen != self._gen:
+                return value  # 取得中に書き込みがあった: 保持しない
+            return table.setdefault(key, value)
+
+    def types(self, command: str) -> List[Dict[str, Any]]:
+        """listTypesCommand（get_structural_column_types 等）の全タイプ。"""
+        return self._cached(
+            self._types,
+            method_name(command),
+            lambda: _extract_types(
+                rpc(
+                    self.base_url,
+                    command,
+                    {"skip": 0, "count": 10000, "namesOnly": False, "failureHandling": {"enabled": True, "mode": "rollback"}},
+                )
+            ),
+        )
+
+    def detail_item_types(self) -> List[Dict[str, Any]]:
+        """詳細項目（柱リスト/梁リスト用ファミリ）の全タイプ。"""
+        return self._cached(
+            self._types,
+            "get_family_types:詳細項目",
+            lambda: _extract_types(
+                rpc(
+                    self.base_url,
+                    "element.get_family_types",
+                    {"categoryName": "詳細項目", "skip": 0, "count": 10000, "namesOnly": False},
+                )
+            ),
+        )
+
+    def instances(self, kind_name: str) -> List[Dict[str, Any]]:
+        """構造柱（"columns"）/ 構造フレーム（"frames"）の全インスタンス。"""
+        method, list_key = self._INSTANCE_SOURCES[kind_name]
+        return self._cached(self._instances, kind_name, lambda: self._page_instances(method, list_key))
+
+    def _page_instances(self, method: str, list_key: str) -> List[Dict[str, Any]]:
+        # サーバ側カーソルで全件（旧アドインは skip/count にフォールバック）
+        return list(
+            iter_items(
+                lambda p: rpc(self.base_url, method, p),
+                list_key,
+                {"failureHandling": {"enabled": True, "mode": "rollback"}},
+                page_size=2000,
+                max_pages=500,
+            )
+        )
+
+    def column_type_parameters(self, type_id: int) -> Dict[str, Any]:
+        """element.get_structural_column_type_parameters の応答。"""
+        tid = int(type_id)
+        return self._cached(
+            self._type_params,
+            ("column", tid),
+            lambda: rpc(self.base_url, "element.get_structural_column_type_parameters", {"typeId": tid}),
+        )
+
+    def family_type_parameters(self, type_id: int) -> Dict[str, Any]:
+        """element.get_family_type_parameters の応答。"""
+        tid = int(type_id)
+        return self._cached(
+            self._type_params,
+            ("family", tid),
+            lambda: rpc(self.base_url, "element.get_family_type_parameters", {"typeId": tid}),
+        )
+
+    def note_write(self, method: str, params: Optional[Dict[str, Any]]) -> None:
+        name = method_name(method)
+        p = params or {}
+        with self._lock:
+            self._gen += 1
+            if name.endswith("_parameter") and "typeId" in p:
+                tid = _to_count(p.get("typeId"))
+                for key in [k for k in self._type_params if k[1] == tid]:
+                    del self._type_params[key]
+            elif name.endswith("_parameter") and "elementId" in p:
+                pass
+            else:
+                self._types.clear()
+                self._instances.clear()
+                self._type_params.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"pulls": self.pulls, "hits": self.hits}
+
+
+def model_context(base_url: str) -> ModelContext:
+    ctx = _MODEL_CONTEXTS.get(base_url)
+    if ctx is None:
+        ctx = _MODEL_CONTEXTS.setdefault(base_url, ModelContext(base_url))
+    return ctx
+
+
 # -----------------------------
 # CSV parsing
 # -----------------------------
 
 
+_WS_RE = re.compile(r"\s+")
+_NUM_RE = re.compile(r"[-+]?\d+(?:\.\d+)?")
+_COUNT_RE = re.compile(r"\s*(\d+)")
+_BAR_DIA_RE = re.compile(r"[dD]\s*(\d+)")
+
+
 def _norm(s: Any) -> str:
-    return re.sub(r"\s+", "", str(s or "").strip())
+    return _WS_RE.sub("", str(s or "").strip())
 
 
 def normalize_symbol_token(s: Any) -> str:
@@ -373,7 +539,7 @@ def to_dia_text(v: Any) -> Optional[str]:
     s = str(v).strip()
     if not s:
         return None
-    m = re.search(r"[dD]\s*(\d+)", s)
+    m = _BAR_DIA_RE.search(s)
     if m:
         return f"D{int(m.group(1))}"
     n = _to_num(s)
@@ -423,6 +589,7 @@ def parse_sections(csv_path: Path, encoding_hint: str = "") -> Dict[str, Dict[st
         raise RuntimeError("CSVを読み込めませんでした。encodingを確認してください。")
 
     sections: Dict[str, Dict[str, Any]] = {}
+    strings = StringTable()
     starts: List[Tuple[str, int]] = []
     for i, row in enumerate(rows):
         if row and str(row[0]).startswith("name="):
@@ -495,17 +662,16 @@ def parse_sections(csv_path: Path, encoding_hint: str = "") -> Dict[str, Dict[st
             used_keys[key] = n + 1
             headers.append(key)
 
-        parsed_rows: List[Dict[str, str]] = []
+        # 行は見出し→列位置を共有するタプル（同じ値の文字列はセクションをまたいで1つに）
+        layout = RowLayout(headers)
+        parsed_rows: List[CsvRow] = []
         for r in data_rows:
             if not any(str(c or "").strip() for c in r):
                 continue
             rr = list(r)
             while rr and _norm(rr[-1]) in ("<RE>", "<END>"):
                 rr.pop()
-            obj: Dict[str, str] = {}
-            for c, h in enumerate(headers):
-                obj[h] = str(rr[c]).strip() if c < len(rr) else ""
-            parsed_rows.append(obj)
+            parsed_rows.append(CsvRow.from_cells(layout, [str(c).strip() for c in rr[: len(headers)]], strings))
 
         sections[name] = {
             "name": name,
@@ -577,7 +743,7 @@ def _to_num(v: Any) -> Optional[float]:
     s = str(v).strip()
     if not s:
         return None
-    m = re.search(r"[-+]?\d+(?:\.\d+)?", s)
+    m = _NUM_RE.search(s)
     if not m:
         return None
     try:
@@ -592,7 +758,7 @@ def _to_count(v: Any) -> Optional[int]:
     s = str(v).strip()
     if not s:
         return None
-    m = re.match(r"\s*(\d+)", s)
+    m = _COUNT_RE.match(s)
     if m:
         return int(m.group(1))
     n = _to_num(s)
@@ -605,7 +771,7 @@ def _to_bar_dia(v: Any) -> Optional[int]:
     s = str(v).strip()
     if not s:
         return None
-    m = re.search(r"[dD]\s*(\d+)", s)
+    m = _BAR_DIA_RE.search(s)
     if m:
         return int(m.group(1))
     n = _to_num(s)
@@ -635,25 +801,35 @@ def _to_shape_rc_column(v: Any) -> Optional[int]:
     return n
 
 
+def _to_str(v: Any) -> Optional[str]:
+    x = str(v or "").strip()
+    return x if x != "" else None
+
+
+def _to_nonneg_num(v: Any) -> Optional[float]:
+    n = _to_num(v)
+    if n is None:
+        return None
+    return 0.0 if n <= 0 else n
+
+
+_CONVERTERS: Dict[str, Callable[[Any], Any]] = {
+    "str": _to_str,
+    "num": _to_num,
+    "nonneg_num": _to_nonneg_num,
+    "count": _to_count,
+    "bar_dia": _to_bar_dia,
+    "shape_rc_column": _to_shape_rc_column,
+}
+
+
+def converter_for(conv: str) -> Callable[[Any], Any]:
+    """convert(v, conv) as a function of v alone (unknown names behave like "str")."""
+    return _CONVERTERS.get((conv or "str").lower(), _to_str)
+
+
 def convert(v: Any, conv: str) -> Any:
-    c = (conv or "str").lower()
-    if c == "str":
-        x = str(v or "").strip()
-        return x if x != "" else None
-    if c == "num":
-        return _to_num(v)
-    if c == "nonneg_num":
-        n = _to_num(v)
-        if n is None:
-            return None
-        return 0.0 if n <= 0 else n
-    if c == "count":
-        return _to_count(v)
-    if c == "bar_dia":
-        return _to_bar_dia(v)
-    if c == "shape_rc_column":
-        return _to_shape_rc_column(v)
-    return str(v or "").strip() or None
+    return converter_for(conv)(v)
 
 
 def almost_equal(a: Any, b: Any, tol: float = 1e-6) -> bool:
@@ -705,13 +881,98 @@ def equal_with_param(param_name: str, a: Any, b: Any) -> bool:
 # -----------------------------
 
 
+ParamRule = Tuple[str, Tuple[str, ...], Callable[[Any], Any], bool]
+
+
+class ColumnResolver:
+    """
+    Key lookup for rows sharing one column list (a CSV section).
+
+    key(candidates) returns what pick_first_key(row, candidates) would, but
+    the column names are normalized once and each candidate list is resolved
+    once per column list instead of once per row.
+    """
+
+    __slots__ = ("_by_norm", "_resolved", "_rules")
+
+    def __init__(self, keys: Iterable[Any]):
+        self._by_norm: Dict[str, Any] = {_norm(k): k for k in keys}
+        self._resolved: Dict[Tuple[str, ...], str] = {}
+        self._rules: Dict[int, Tuple[Any, List[ParamRule]]] = {}
+
+    def key(self, candidates: Iterable[str]) -> str:
+        cands = tuple(candidates)
+        hit = self._resolved.get(cands)
+        if hit is None:
+            hit = ""
+            for k in cands:
+                kk = self._by_norm.get(_norm(k))
+                if kk:
+                    hit = kk
+                    break
+            self._resolved[cands] = hit
+        return hit
+
+    def param_rules(self, param_map: List[Dict[str, Any]]) -> List[ParamRule]:
+        """
+        paramMap compiled against these columns: (revit name, csv columns in
+        priority order, converter, skipped when the core bar count is zero).
+        """
+        entry = self._rules.get(id(param_map))
+        if entry is not None and entry[0] is param_map:
+            return entry[1]
+        skip_prefixes = tuple(_norm(pfx) for pfx in CORE_SKIP_CSV_PREFIXES_WHEN_ZERO)
+        rules: List[ParamRule] = []
+        for m in param_map or []:
+            revit_name = str(m.get("revit") or "").strip()
+            csv_candidates = [str(x) for x in (m.get("csv") or []) if str(x).strip()]
+            if not revit_name or not csv_candidates:
+                continue
+            skip_when_zero = any(_norm(ck).startswith(skip_prefixes) for ck in csv_candidates)
+            cols = tuple(k for k in (self.key([ck]) for ck in csv_candidates) if k)
+            rules.append((revit_name, cols, converter_for(str(m.get("converter") or "str")), skip_when_zero))
+        # param_map is kept referenced so its id cannot be reused by another list
+        self._rules[id(param_map)] = (param_map, rules)
+        return rules
+
+
+@functools.lru_cache(maxsize=64)
+def _resolver_for_keys(keys: Tuple[Any, ...]) -> ColumnResolver:
+    return ColumnResolver(keys)
+
+
+def column_resolver(row: Mapping) -> ColumnResolver:
+    """Resolver for the row's column list (rows of one section share it)."""
+    return _resolver_for_keys(row.key_tuple() if isinstance(row, CsvRow) else tuple(row))
+
+
+def with_row_meta(row: Mapping, meta: Dict[str, Any]) -> Mapping:
+    """row plus meta fields; CSV rows share their cells instead of being copied."""
+    if isinstance(row, CsvRow):
+        return row.with_meta(meta)
+    out = dict(row)
+    out.update(meta)
+    return out
+
+
 def pick_first_key(obj: Dict[str, Any], keys: Iterable[str]) -> str:
-    norm_map = {_norm(k): k for k in obj.keys()}
-    for k in keys:
-        kk = norm_map.get(_norm(k))
-        if kk:
-            return kk
-    return ""
+    return column_resolver(obj).key(keys)
+
+
+def eval_param_rules(row: Dict[str, Any], rules: List[ParamRule], core_zero: bool) -> List[Tuple[str, Any]]:
+    """(revit name, converted value) for each rule whose first non-empty csv column converts, in paramMap order."""
+    out: List[Tuple[str, Any]] = []
+    for revit_name, cols, conv_fn, skip_when_zero in rules:
+        if core_zero and skip_when_zero:
+            continue
+        for col in cols:
+            raw = row.get(col, "")
+            if str(raw).strip() != "":
+                value = conv_fn(raw)
+                if value is not None:
+                    out.append((revit_name, value))
+                break
+    return out
 
 
 CORE_COUNT_CSV_KEYS = [
@@ -738,10 +999,11 @@ CORE_SKIP_CSV_PREFIXES_WHEN_ZERO = (
 )
 
 
-def is_core_count_zero_row(row: Dict[str, Any]) -> bool:
+def is_core_count_zero_row(row: Dict[str, Any], columns: Optional[ColumnResolver] = None) -> bool:
+    cols = columns or column_resolver(row)
     vals: List[Optional[int]] = []
     for k in CORE_COUNT_CSV_KEYS:
-        rk = pick_first_key(row, [k])
+        rk = cols.key([k])
         if not rk:
             return False
         vals.append(_to_count(row.get(rk)))
@@ -750,6 +1012,110 @@ def is_core_count_zero_row(row: Dict[str, Any]) -> bool:
     return all(int(v) == 0 for v in vals if v is not None)
 
 
+def _distinct_values(values: Iterable[Any], tol: float = 1e-6) -> List[Any]:
+    """
+    Same list as the greedy merge `if not any(almost_equal(v, u, tol) for u in uniq): uniq.append(v)`,
+    in one pass: numbers are matched through tol-wide bins, texts (and
+    number/text pairs, which almost_equal compares as str) through sets.
+    None only matches None; inf/nan never match another number (abs() of
+    their difference is nan), so they are kept unless their text was seen.
+    """
+    uniq: List[Any] = []
+    bins: Dict[float, List[float]] = {}
+    num_texts: set = set()  # str() of the numbers kept so far
+    texts: set = set()  # str() of the non-numbers kept so far
+    seen_none = False
+    for v in values:
+        if v is None:
+            if seen_none:
+                continue
+            seen_none = True
+        elif isinstance(v, (int, float)):
+            f = float(v)
+            t = str(v)
+            if t in texts:
+                continue
+            if not math.isfinite(f):
+                num_texts.add(t)
+                uniq.append(v)
+                continue
+            b = math.floor(f / tol) if tol > 0 else f
+            near = False
+            for d in (-2, -1, 0, 1, 2):  # ±1 bin covers tol; ±2 absorbs rounding at bin edges
+                for u in bins.get(b + d, ()):
+                    if abs(f - u) <= tol:
+                        near = True
+                        break
+                if near:
+                    break
+            if near:
+                continue
+            bins.setdefault(b, []).append(f)
+            num_texts.add(t)
+        else:
+            t = str(v)
+            if t in texts or t in num_texts:
+                continue
+            texts.add(t)
+        uniq.append(v)
+    return uniq
+
+
+class ExpectedValueBuckets:
+    """
+    Expected values grouped by key (symbol+param / level+symbol+param) for the
+    conflict check, with per-section counts.
+
+    Keys get dense ids on first sight; values are kept per id and reduced by
+    _distinct_values (linear in the number of values, also for conflicting
+    keys with many distinct values).
+    """
+
+    __slots__ = ("tol", "_ids", "_keys", "_values", "_sections", "_section_values")
+
+    def __init__(self, tol: float = 1e-6):
+        self.tol = tol
+        self._ids: Dict[Any, int] = {}
+        self._keys: List[Any] = []
+        self._values: List[List[Any]] = []
+        self._sections: List[set] = []
+        self._section_values: Dict[str, int] = {}
+
+    def add(self, key: Any, value: Any, section: str = "") -> None:
+        kid = self._ids.get(key)
+        if kid is None:
+            kid = self._ids[key] = len(self._keys)
+            self._keys.append(key)
+            self._values.append([])
+            self._sections.append(set())
+        self._values[kid].append(value)
+        if section:
+            self._sections[kid].add(section)
+            self._section_values[section] = self._section_values.get(section, 0) + 1
+
+    def resolve(self) -> Tuple[List[Tuple[Any, Any]], List[Tuple[Any, List[Any]]], Dict[str, Dict[str, int]]]:
+        """([(key, value)] for consistent keys, [(key, distinct values)] for conflicts, per-section stats), in insertion order."""
+        resolved: List[Tuple[Any, Any]] = []
+        conflicts: List[Tuple[Any, List[Any]]] = []
+        stats: Dict[str, Dict[str, int]] = {
+            sec: {"values": n, "keys": 0, "conflicts": 0} for sec, n in self._section_values.items()
+        }
+        for kid, key in enumerate(self._keys):
+            vals = self._values[kid]
+            uniq = vals[:1] if len(vals) == 1 else _distinct_values(vals, self.tol)
+            conflict = len(uniq) > 1
+            if conflict:
+                conflicts.append((key, uniq))
+            else:
+                resolved.append((key, uniq[0]))
+            for sec in self._sections[kid]:
+                st = stats[sec]
+                st["keys"] += 1
+                if conflict:
+                    st["conflicts"] += 1
+        return resolved, conflicts, stats
+
+
 def aggregate_expected_for_kind(kind_cfg: Dict[str, Any], sections: Dict[str, Dict[str, Any]]) -> Dict[str, Any]:
     placements: List[Tuple[str, str]] = []
     p_level_key_cfg = str(kind_cfg.get("placementLevelKey") or "")
@@ -758,9 +1124,12 @@ def aggregate_expected_for_kind(kind_cfg: Dict[str, Any], sections: Dict[str, Di
         st = sections.get(psec)
         if not st:
             continue
+        p_level_keys = [p_level_key_cfg, "階", "層", "level", "Level"]
+        p_symbol_keys = [p_symbol_key_cfg, "符号", "柱符号", "梁符号", "壁符号", "床符号", "type", "Type"]
         for row in st.get("rows") or []:
-            p_level_key = pick_first_key(row, [p_level_key_cfg, "階", "層", "level", "Level"])
-            p_symbol_key = pick_first_key(row, [p_symbol_key_cfg, "符号", "柱符号", "梁符号", "壁符号", "床符号", "type", "Type"])
+            cols = column_resolver(row)
+            p_level_key = cols.key(p_level_keys)
+            p_symbol_key = cols.key(p_symbol_keys)
             lv = str(row.get(p_level_key, "")).strip() if p_level_key else ""
             sy = str(row.get(p_symbol_key, "")).strip() if p_symbol_key else ""
             if lv and sy:
@@ -778,23 +1147,27 @@ def aggregate_expected_for_kind(kind_cfg: Dict[str, Any], sections: Dict[str, Di
         st = sections.get(sname)
         if not st:
             continue
+        s_symbol_keys = [sec_symbol_cfg, "柱符号", "梁符号", "壁符号", "床符号", "符号"]
+        s_level_keys = [sec_level_cfg, "階", "層", "level", "Level"]
         for row in st.get("rows") or []:
-            k_symbol = pick_first_key(row, [sec_symbol_cfg, "柱符号", "梁符号", "壁符号", "床符号", "符号"]) if sec_symbol_cfg else ""
+            cols = column_resolver(row)
+            k_symbol = cols.key(s_symbol_keys) if sec_symbol_cfg else ""
             if not k_symbol:
                 continue
             symbol = str(row.get(k_symbol, "")).strip()
             if not symbol:
                 continue
 
-            k_level = pick_first_key(row, [sec_level_cfg, "階", "層", "level", "Level"]) if sec_level_cfg else ""
+            k_level = cols.key(s_level_keys) if sec_level_cfg else ""
             level = str(row.get(k_level, "")).strip() if k_level else ""
 
-            rec = dict(row)
-            rec["__section"] = sname
-            rec["__symbol"] = symbol
-            rec["__level"] = level
-            rec["__symbol_norm"] = normalize_symbol_token(symbol)
-            rec["__level_norm"] = normalize_level_token(level) if level else ""
+            rec = with_row_meta(row, {
+                "__section": sname,
+                "__symbol": symbol,
+                "__level": level,
+                "__symbol_norm": normalize_symbol_token(symbol),
+                "__level_norm": normalize_level_token(level) if level else "",
+            })
 
             records_by_symbol.setdefault(symbol, []).append(rec)
             records_by_symbol.setdefault(str(rec["__symbol_norm"]), []).append(rec)
@@ -802,7 +1175,7 @@ def aggregate_expected_for_kind(kind_cfg: Dict[str, Any], sections: Dict[str, Di
                 records_by_level_symbol.setdefault((level, symbol), []).append(rec)
                 records_by_level_symbol.setdefault((str(rec["__level_norm"]), str(rec["__symbol_norm"])), []).append(rec)
 
-    chosen_rows: List[Dict[str, Any]] = []
+    chosen_rows: List[Mapping] = []
     missing_rows: List[Dict[str, Any]] = []
     for lv, sy in placements:
         lvn = normalize_level_token(lv)
@@ -817,12 +1190,12 @@ def aggregate_expected_for_kind(kind_cfg: Dict[str, Any], sections: Dict[str, Di
         if not cands:
             missing_rows.append({"level": lv, "symbol": sy, "reason": "section_row_not_found"})
             continue
-        chosen = dict(cands[0])
-        chosen["__placement_level"] = lv
-        chosen["__placement_symbol"] = sy
-        chosen["__placement_level_norm"] = lvn
-        chosen["__placement_symbol_norm"] = syn
-        chosen_rows.append(chosen)
+        chosen_rows.append(with_row_meta(cands[0], {
+            "__placement_level": lv,
+            "__placement_symbol": sy,
+            "__placement_level_norm": lvn,
+            "__placement_symbol_norm": syn,
+        }))
 
     expected_by_symbol: Dict[str, Dict[str, Any]] = {}
     expected_by_level_symbol: Dict[Tuple[str, str], Dict[str, Any]] = {}
@@ -830,8 +1203,8 @@ def aggregate_expected_for_kind(kind_cfg: Dict[str, Any], sections: Dict[str, Di
     conflicts_by_level_symbol: List[Dict[str, Any]] = []
 
     param_map = kind_cfg.get("paramMap") or []
-    tmp: Dict[Tuple[str, str], List[Any]] = {}
-    tmp_lv: Dict[Tuple[str, str, str], List[Any]] = {}
+    tmp = ExpectedValueBuckets()
+    tmp_lv = ExpectedValueBuckets()
 
     for row in chosen_rows:
         sy = str(row.get("__symbol") or "").strip()
@@ -839,61 +1212,42 @@ def aggregate_expected_for_kind(kind_cfg: Dict[str, Any], sections: Dict[str, Di
         lv_norm = str(row.get("__level_norm") or normalize_level_token(row.get("__level") or ""))
         if not sy:
             continue
-        core_zero = is_core_count_zero_row(row)
-        for m in param_map:
-            revit_name = str(m.get("revit") or "").strip()
-            csv_candidates = [str(x) for x in (m.get("csv") or []) if str(x).strip()]
-            conv = str(m.get("converter") or "str")
-            if not revit_name or not csv_candidates:
-                continue
-            if core_zero:
-                skip_this = False
-                for ck in csv_candidates:
-                    nck = _norm(ck)
-                    if any(nck.startswith(_norm(pfx)) for pfx in CORE_SKIP_CSV_PREFIXES_WHEN_ZERO):
-                        skip_this = True
-                        break
-                if skip_this:
-                    continue
-            value = None
-            for ck in csv_candidates:
-                rk = pick_first_key(row, [ck])
-                if rk and str(row.get(rk, "")).strip() != "":
-                    value = convert(row.get(rk), conv)
-                    break
-            if value is None:
-                continue
-            tmp.setdefault((sy, revit_name), []).append(value)
-            tmp.setdefault((sy_norm, revit_name), []).append(value)
+        sec = str(row.get("__section") or "")
+        # 列の解決・変換器の選択はセクションの列構成ごとに1回（行ごとに見出しを正規化しない）
+        cols = column_resolver(row)
+        core_zero = is_core_count_zero_row(row, cols)
+        for revit_name, value in eval_param_rules(row, cols.param_rules(param_map), core_zero):
+            tmp.add((sy, revit_name), value, sec)
+            tmp.add((sy_norm, revit_name), value, sec)
             if lv_norm:
-                tmp_lv.setdefault((lv_norm, sy_norm, revit_name), []).append(value)
+                tmp_lv.add((lv_norm, sy_norm, revit_name), value, sec)
 
         if core_zero:
             for rp in CORE_ZERO_FORCE_REBAR_PARAMS:
-                tmp.setdefault((sy, rp), []).append(0)
-                tmp.setdefault((sy_norm, rp), []).append(0)
+                tmp.add((sy, rp), 0, sec)
+                tmp.add((sy_norm, rp), 0, sec)
                 if lv_norm:
-                    tmp_lv.setdefault((lv_norm, sy_norm, rp), []).append(0)
-
-    for (sy, rp), vals in tmp.items():
-        uniq: List[Any] = []
-        for v in vals:
-            if not any(almost_equal(v, u) for u in uniq):
-                uniq.append(v)
-        if len(uniq) > 1:
-            conflicts.append({"symbol": sy, "param": rp, "values": uniq})
-            continue
-        expected_by_symbol.setdefault(sy, {})[rp] = uniq[0]
-
-    for (lv, sy, rp), vals in tmp_lv.items():
-        uniq: List[Any] = []
-        for v in vals:
-            if not any(almost_equal(v, u) for u in uniq):
-                uniq.append(v)
-        if len(uniq) > 1:
-            conflicts_by_level_symbol.append({"level": lv, "symbol": sy, "param": rp, "values": uniq})
-            continue
-        expected_by_level_symbol.setdefault((lv, sy), {})[rp] = uniq[0]
+                    tmp_lv.add((lv_norm, sy_norm, rp), 0, sec)
+
+    resolved, conflicted, stats_by_symbol = tmp.resolve()
+    for (sy, rp), value in resolved:
+        expected_by_symbol.setdefault(sy, {})[rp] = value
+    for (sy, rp), uniq in conflicted:
+        conflicts.append({"symbol": sy, "param": rp, "values": uniq})
+
+    resolved_lv, conflicted_lv, stats_by_level_symbol = tmp_lv.resolve()
+    for (lv, sy, rp), value in resolved_lv:
+        expected_by_level_symbol.setdefault((lv, sy), {})[rp] = value
+    for (lv, sy, rp), uniq in conflicted_lv:
+        conflicts_by_level_symbol.append({"level": lv, "symbol": sy, "param": rp, "values": uniq})
+
+    # セクション別の競合統計（symbol+param / level+symbol+param）
+    conflict_stats: Dict[str, Dict[str, Any]] = {}
+    for sec in sorted(set(stats_by_symbol) | set(stats_by_level_symbol)):
+        conflict_stats[sec] = {
+            "bySymbol": stats_by_symbol.get(sec) or {"values": 0, "keys": 0, "conflicts": 0},
+            "byLevelSymbol": stats_by_level_symbol.get(sec) or {"values": 0, "keys": 0, "conflicts": 0},
+        }
 
     return {
         "placements": placements,
@@ -904,6 +1258,7 @@ def aggregate_expected_for_kind(kind_cfg: Dict[str, Any], sections: Dict[str, Di
         "expectedByLevelSymbol": expected_by_level_symbol,
         "conflicts": conflicts,
         "conflictsByLevelSymbol": conflicts_by_level_symbol,
+        "conflictStats": conflict_stats,
     }
 
 
@@ -935,7 +1290,10 @@ def _type_name_of(t: Dict[str, Any]) -> str:
     return ""
 
 
-def get_type_params_bulk(base_url: str, type_id: int, param_names: List[str]) -> Dict[str, Any]:
+def get_type_params_bulk(
+    base_url: str, type_id: int, param_names: List[str], strings: Optional[StringTable] = None
+) -> Dict[str, Any]:
+    """params/display of one type; with strings, names and text values share one object per distinct string (for caches)."""
     if not param_names:
         return {"params": {}, "display": {}}
     env = rpc(
@@ -952,9 +1310,14 @@ def get_type_params_bulk(base_url: str, type_id: int, param_names: List[str]) ->
     if not items:
         return {"params": {}, "display": {}}
     it = items[0] if isinstance(items[0], dict) else {}
+    params = it.get("params") or {}
+    display = it.get("display") or {}
+    if strings is not None:
+        params = strings.values(params) if isinstance(params, dict) else params
+        display = strings.values(display) if isinstance(display, dict) else display
     return {
-        "params": it.get("params") or {},
-        "display": it.get("display") or {},
+        "params": params,
+        "display": display,
         "ok": bool(it.get("ok", True)),
     }
 
@@ -985,7 +1348,7 @@ def update_param(base_url: str, cmd: str, type_id: int, param_name: str, value:
 
 
 def get_family_type_params(base_url: str, type_id: int) -> Dict[str, Any]:
-    env = rpc(base_url, "element.get_family_type_parameters", {"typeId": int(type_id)})
+    env = model_context(base_url).family_type_parameters(type_id)
     items = env.get("parameters") if isinstance(env.get("parameters"), list) else []
     values: Dict[str, Any] = {}
     for p in items:
@@ -1450,22 +1813,18 @@ def _column_expected_row_group(row: Dict[str, Any]) -> str:
     return ""
 
 
-def _collect_column_type_sources_by_level_symbol(base_url: str) -> Dict[str, Dict[Tuple[str, str], Dict[str, Any]]]:
-    out: Dict[str, Dict[Tuple[str, str], Dict[str, Any]]] = {"rc": {}, "steel": {}}
-    env = rpc(
-        base_url,
-        "element.get_structural_column_types",
-        {"skip": 0, "count": 10000, "namesOnly": False, "failureHandling": {"enabled": True, "mode": "rollback"}},
-    )
-    types = _extract_types(env)
-    for t in types:
+def _collect_column_type_sources_by_level_symbol(base_url: str) -> Dict[str, Dict[Tuple[str, str], TypeRecord]]:
+    out: Dict[str, Dict[Tuple[str, str], TypeRecord]] = {"rc": {}, "steel": {}}
+    strings = StringTable()
+    ctx = model_context(base_url)
+    for t in ctx.types("element.get_structural_column_types"):
         tid = _type_id_of(t)
         if tid <= 0:
             continue
         tname = _type_name_of(t)
         fam = str(t.get("familyName") or "")
         try:
-            prm = rpc(base_url, "element.get_structural_column_type_parameters", {"typeId": int(tid)})
+            prm = ctx.column_type_parameters(tid)
         except Exception:
             continue
         plist = prm.get("parameters") if isinstance(prm.get("parameters"), list) else []
@@ -1479,6 +1838,7 @@ def _collect_column_type_sources_by_level_symbol(base_url: str) -> Dict[str, Dic
             v = p.get("value")
             if n not in values or (values.get(n) in ("", None) and v not in ("", None)):
                 values[n] = v
+        values = strings.values(values)
         lv_raw, sy_raw = _infer_level_symbol_from_type_values(tname, values)
         hlv, hsy, _ = _extract_level_symbol_hint_from_type_name(tname)
         if not lv_raw and hlv:
@@ -1493,9 +1853,8 @@ def _collect_column_type_sources_by_level_symbol(base_url: str) -> Dict[str, Dic
         if cls not in ("rc", "steel"):
             continue
         key = (lv, sy)
-        rec = {"typeId": int(tid), "typeName": tname, "familyName": fam, "values": values}
         if key not in out[cls]:
-            out[cls][key] = rec
+            out[cls][key] = TypeRecord(int(tid), strings(tname), strings(fam), values=values)
     return out
 
 
@@ -1570,7 +1929,7 @@ def sync_column_list_families(
     # 期待行（section由来）をRC/SRCへ分ける
     expected_keys_by_group: Dict[str, Dict[Tuple[str, str], Dict[str, Any]]] = {"rc": {}, "src": {}}
     for r in expected_info_columns.get("chosenRows") or []:
-        if not isinstance(r, dict):
+        if not isinstance(r, Mapping):
             continue
         grp = _column_expected_row_group(r)
         if grp not in ("rc", "src"):
@@ -1588,12 +1947,12 @@ def sync_column_list_families(
         used_type_ids = _collect_used_type_ids_for_kind(base_url, "columns") or set()
         key_classes: Dict[Tuple[str, str], set] = {}
         for key, rec in rc_src_map.items():
-            tid = _to_count((rec or {}).get("typeId"))
+            tid = rec.type_id
             if tid is None or int(tid) not in used_type_ids:
                 continue
             key_classes.setdefault((str(key[0]), str(key[1])), set()).add("rc")
         for key, rec in steel_src_map.items():
-            tid = _to_count((rec or {}).get("typeId"))
+            tid = rec.type_id
             if tid is None or int(tid) not in used_type_ids:
                 continue
             key_classes.setdefault((str(key[0]), str(key[1])), set()).add("steel")
@@ -1606,12 +1965,7 @@ def sync_column_list_families(
     except Exception as ex:
         ret["errors"].append({"stage": "collect_used_columns", "msg": str(ex)})
 
-    types_env = rpc(
-        base_url,
-        "element.get_family_types",
-        {"categoryName": "詳細項目", "skip": 0, "count": 10000, "namesOnly": False},
-    )
-    types = _extract_types(types_env)
+    types = model_context(base_url).detail_item_types()
     ret["types"] = len(types)
     existing_keys_by_group: Dict[str, set] = {"rc": set(), "src": set()}
 
@@ -1675,8 +2029,8 @@ def sync_column_list_families(
             symbol_raw=symbol_raw,
             type_name=type_name,
             family_name=family_name,
-            source_rc=(rc_src_rec.get("values") if isinstance(rc_src_rec, dict) else None),
-            source_steel=(steel_src_rec.get("values") if isinstance(steel_src_rec, dict) else None),
+            source_rc=(rc_src_rec.values if rc_src_rec is not None else None),
+            source_steel=(steel_src_rec.values if steel_src_rec is not None else None),
         )
 
         try:
@@ -1753,7 +2107,7 @@ def _build_row_lookup(expected_info: Dict[str, Any]) -> Tuple[Dict[Tuple[str, st
     by_sym: Dict[str, List[Dict[str, Any]]] = {}
     rows = expected_info.get("chosenRows") or []
     for r in rows:
-        if not isinstance(r, dict):
+        if not isinstance(r, Mapping):
             continue
         lv = normalize_level_token(r.get("__placement_level") or r.get("__level") or "")
         sy = normalize_symbol_token(r.get("__placement_symbol") or r.get("__symbol") or "")
@@ -1764,22 +2118,102 @@ def _build_row_lookup(expected_info: Dict[str, Any]) -> Tuple[Dict[Tuple[str, st
     return by_lv_sym, by_sym
 
 
-def _best_contained_symbol_key(candidate_keys: Iterable[str], revit_symbol_norm: str) -> str:
-    rev = normalize_symbol_token(revit_symbol_norm)
-    if not rev:
-        return ""
-    hit: List[str] = []
-    for k in candidate_keys:
-        kk = normalize_symbol_token(k)
-        if kk and kk in rev:
-            hit.append(kk)
-    if not hit:
-        return ""
-    hit = sorted(set(hit), key=lambda x: len(x), reverse=True)
-    if len(hit) >= 2 and len(hit[0]) == len(hit[1]):
+class SymbolContainmentIndex:
+    """
+    Aho-Corasick automaton over normalized CSV symbols.
+
+    best_contained(revit_symbol) returns the longest symbol contained in the
+    Revit symbol (e.g. C1_MIRROR -> C1) in one pass over revit_symbol, or ""
+    when nothing matches or two different symbols tie for the longest.
+    """
+
+    __slots__ = ("_goto", "_fail", "_longest")
+
+    def __init__(self, keys: Iterable[str]):
+        goto: List[Dict[str, int]] = [{}]
+        longest: List[str] = [""]  # longest symbol that is a suffix of the node's path
+        for k in keys:
+            kk = normalize_symbol_token(k)
+            if not kk:
+                continue
+            node = 0
+            for ch in kk:
+                nxt = goto[node].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[node][ch] = nxt
+                    goto.append({})
+                    longest.append("")
+                node = nxt
+            longest[node] = kk
+
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            node = queue.popleft()
+            if not longest[node]:
+                longest[node] = longest[fail[node]]
+            for ch, nxt in goto[node].items():
+                f = fail[node]
+                while f and ch not in goto[f]:
+                    f = fail[f]
+                fail[nxt] = goto[f].get(ch, 0)
+                queue.append(nxt)
+
+        self._goto = goto
+        self._fail = fail
+        self._longest = longest
+
+    def best_contained(self, revit_symbol: str) -> str:
+        goto, fail, longest = self._goto, self._fail, self._longest
+        best = ""
+        tie = False
+        node = 0
+        for ch in normalize_symbol_token(revit_symbol):
+            while node and ch not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(ch, 0)
+            hit = longest[node]
+            if len(hit) > len(best):
+                best, tie = hit, False
+            elif hit and len(hit) == len(best) and hit != best:
+                tie = True
         # 同長候補が複数ある場合は曖昧とみなして無効
-        return ""
-    return hit[0]
+        return "" if tie else best
+
+
+_SYMBOL_INDEX_CACHE: Dict[Tuple[int, str], Tuple[Any, int, Any]] = {}
+
+
+def _cached_symbol_index(source: Dict[Any, Any], kind: str, build: Callable[[], Any]) -> Any:
+    """Index built once per lookup table (the tables are not modified after they are built)."""
+    key = (id(source), kind)
+    ent = _SYMBOL_INDEX_CACHE.get(key)
+    if ent is not None and ent[0] is source and ent[1] == len(source):
+        return ent[2]
+    if len(_SYMBOL_INDEX_CACHE) >= 64:
+        _SYMBOL_INDEX_CACHE.clear()
+    value = build()
+    _SYMBOL_INDEX_CACHE[key] = (source, len(source), value)
+    return value
+
+
+def _symbol_index_by_level(by_level_symbol: Dict[Tuple[str, str], Any]) -> Dict[str, SymbolContainmentIndex]:
+    def build() -> Dict[str, SymbolContainmentIndex]:
+        keys_by_level: Dict[str, List[str]] = {}
+        for lv2, k2 in by_level_symbol.keys():
+            keys_by_level.setdefault(lv2, []).append(k2)
+        return {lv2: SymbolContainmentIndex(keys) for lv2, keys in keys_by_level.items()}
+
+    return _cached_symbol_index(by_level_symbol, "level", build)
+
+
+def _symbol_index(by_symbol: Dict[str, Any]) -> SymbolContainmentIndex:
+    return _cached_symbol_index(by_symbol, "symbol", lambda: SymbolContainmentIndex(by_symbol.keys()))
+
+
+def _best_contained_symbol_key(candidate_keys: Iterable[str], revit_symbol_norm: str) -> str:
+    return SymbolContainmentIndex(candidate_keys).best_contained(revit_symbol_norm)
 
 
 def _lookup_row_by_level_symbol(
@@ -1795,8 +2229,8 @@ def _lookup_row_by_level_symbol(
     if row is not None:
         return row
     # Revit符号にCSV符号が含まれるケース（例: C1_mirror -> C1）
-    keys_same_level = [k2 for (lv2, k2) in row_by_lv_sym.keys() if lv2 == lv]
-    best = _best_contained_symbol_key(keys_same_level, sy)
+    index = _symbol_index_by_level(row_by_lv_sym).get(lv)
+    best = index.best_contained(sy) if index is not None else ""
     if not best:
         return None
     return row_by_lv_sym.get((lv, best))
@@ -1812,7 +2246,7 @@ def _lookup_row_candidates_by_symbol(
     exact = rows_by_sym.get(sy) or []
     if exact:
         return exact
-    best = _best_contained_symbol_key(rows_by_sym.keys(), sy)
+    best = _symbol_index(rows_by_sym).best_contained(sy)
     if not best:
         return []
     return rows_by_sym.get(best) or []
@@ -1830,8 +2264,8 @@ def _lookup_expected_by_level_symbol(
     exp = expected_by_level_symbol.get((lv, sy))
     if exp is not None:
         return exp
-    keys_same_level = [k2 for (lv2, k2) in expected_by_level_symbol.keys() if lv2 == lv]
-    best = _best_contained_symbol_key(keys_same_level, sy)
+    index = _symbol_index_by_level(expected_by_level_symbol).get(lv)
+    best = index.best_contained(sy) if index is not None else ""
     if not best:
         return None
     return expected_by_level_symbol.get((lv, best))
@@ -1847,15 +2281,19 @@ def _lookup_expected_by_symbol(
     sy = normalize_symbol_token(symbol_norm)
     if sy in expected_by_symbol:
         return expected_by_symbol.get(sy)
-    # キーを正規化して再評価
-    norm_map: Dict[str, Dict[str, Any]] = {}
-    for k, v in expected_by_symbol.items():
-        kk = normalize_symbol_token(k)
-        if kk and kk not in norm_map:
-            norm_map[kk] = v
+    # キーを正規化して再評価（正規化マップと包含インデックスは表ごとに1回だけ作る）
+    def build() -> Tuple[Dict[str, Dict[str, Any]], SymbolContainmentIndex]:
+        norm_map: Dict[str, Dict[str, Any]] = {}
+        for k, v in expected_by_symbol.items():
+            kk = normalize_symbol_token(k)
+            if kk and kk not in norm_map:
+                norm_map[kk] = v
+        return norm_map, SymbolContainmentIndex(norm_map.keys())
+
+    norm_map, index = _cached_symbol_index(expected_by_symbol, "normalized", build)
     if sy in norm_map:
         return norm_map.get(sy)
-    best = _best_contained_symbol_key(norm_map.keys(), sy)
+    best = index.best_contained(sy)
     if not best:
         return None
     return norm_map.get(best)
@@ -2194,12 +2632,7 @@ def sync_beam_list_families(
     used_frame_keys_by_group: Dict[str, set] = {"rc": set(), "src": set(), "all": set()}
     try:
         used_type_ids = _collect_used_type_ids_for_kind(base_url, "frames")
-        env_used_types = rpc(
-            base_url,
-            "element.get_structural_frame_types",
-            {"skip": 0, "count": 10000, "failureHandling": {"enabled": True, "mode": "rollback"}},
-        )
-        used_types = _extract_types(env_used_types)
+        used_types = model_context(base_url).types("element.get_structural_frame_types")
         for ut in used_types:
             tid = _type_id_of(ut)
             if tid <= 0 or (used_type_ids is not None and int(tid) not in used_type_ids):
@@ -2217,12 +2650,7 @@ def sync_beam_list_families(
     except Exception as ex:
         ret["errors"].append({"stage": "collect_used_frames", "msg": str(ex)})
 
-    types_env = rpc(
-        base_url,
-        "element.get_family_types",
-        {"categoryName": "詳細項目", "skip": 0, "count": 10000, "namesOnly": False},
-    )
-    types = _extract_types(types_env)
+    types = model_context(base_url).detail_item_types()
     ret["types"] = len(types)
     existing_keys_by_group: Dict[str, set] = {"rc": set(), "src": set(), "all": set()}
 
@@ -2312,7 +2740,7 @@ def sync_beam_list_families(
     # RC/SRC部材が存在するのに、対応する梁リストタイプが無いケースを明示化
     miss_seen: set = set()
     for r in expected_info_frames.get("chosenRows") or []:
-        if not isinstance(r, dict):
+        if not isinstance(r, Mapping):
             continue
         grp = _beam_expected_row_group(r)
         if grp not in ("rc", "src"):
@@ -2380,27 +2808,8 @@ def sync_frame_instances_from_expected(
     row_by_lv_sym, rows_by_sym = _build_row_lookup(expected_info_frames)
     sym_cands = [str(x) for x in (kind_cfg.get("symbolParamCandidates") or []) if str(x).strip()]
 
-    frames: List[Dict[str, Any]] = []
-    skip = 0
-    count = 1000
-    max_pages = 500
-    for _ in range(max_pages):
-        env = rpc(
-            base_url,
-            "element.get_structural_frames",
-            {"skip": int(skip), "count": int(count), "failureHandling": {"enabled": True, "mode": "rollback"}},
-        )
-        page = env.get("structuralFrames") if isinstance(env.get("structuralFrames"), list) else []
-        if not page:
-            break
-        frames.extend([x for x in page if isinstance(x, dict)])
-        got = len(page)
-        total = _to_count(env.get("totalCount"))
-        skip += got
-        if got < count:
-            break
-        if total is not None and skip >= total:
-            break
+    strings = StringTable()
+    frames: List[InstanceRecord] = instance_records(model_context(base_url).instances("frames"), strings)
     ret["instances"] = len(frames)
 
     type_cache: Dict[int, Dict[str, Any]] = {}
@@ -2414,7 +2823,7 @@ def sync_frame_instances_from_expected(
         tvals = type_cache.get(int(tid))
         if tvals is None:
             read_params = sorted(set(sym_cands + [str(m.get("revit") or "") for m in inst_map if str(m.get("revit") or "")]))
-            tvals = get_type_params_bulk(base_url, int(tid), read_params)
+            tvals = get_type_params_bulk(base_url, int(tid), read_params, strings)
             type_cache[int(tid)] = tvals
 
         sym = select_symbol_from_type({"typeName": str(it.get("typeName") or "")}, tvals, sym_cands)
@@ -3007,31 +3416,13 @@ def _build_expected_from_param_map_for_type(
         if isinstance(p, dict) and not bool(p.get("isReadOnly", False)) and str(p.get("name") or "").strip()
     }
     out: Dict[str, Any] = {}
-    core_zero = is_core_count_zero_row(row)
+    cols = column_resolver(row)
+    core_zero = is_core_count_zero_row(row, cols)
 
-    for m in param_map or []:
-        revit_name = str(m.get("revit") or "").strip()
-        csv_candidates = [str(x) for x in (m.get("csv") or []) if str(x).strip()]
-        conv = str(m.get("converter") or "str")
-        if not revit_name or not csv_candidates or revit_name not in writable_names:
-            continue
-        if core_zero:
-            skip_this = False
-            for ck in csv_candidates:
-                nck = _norm(ck)
-                if any(nck.startswith(_norm(pfx)) for pfx in CORE_SKIP_CSV_PREFIXES_WHEN_ZERO):
-                    skip_this = True
-                    break
-            if skip_this:
-                continue
-        value = None
-        for ck in csv_candidates:
-            rk = pick_first_key(row, [ck])
-            if rk and str(row.get(rk, "")).strip() != "":
-                value = convert(row.get(rk), conv)
-                break
-        if value is not None:
-            out[revit_name] = value
+    if param_map:
+        for revit_name, value in eval_param_rules(row, cols.param_rules(param_map), core_zero):
+            if revit_name in writable_names:
+                out[revit_name] = value
 
     if core_zero:
         for rp in CORE_ZERO_FORCE_REBAR_PARAMS:
@@ -3149,48 +3540,17 @@ def _collect_used_type_ids_for_kind(base_url: str, kind_name: str) -> Optional[s
     取得不能時は None を返し、呼び出し側でフィルタなし継続する。
     """
     if kind_name in ("columns", "steel_columns", "src_columns"):
-        method = "element.get_structural_columns"
-        list_key = "structuralColumns"
+        source = "columns"
     elif kind_name == "frames":
-        method = "element.get_structural_frames"
-        list_key = "structuralFrames"
+        source = "frames"
     else:
         return None
 
     used: set = set()
-    skip = 0
-    count = 2000
-    max_pages = 500
-
-    for _ in range(max_pages):
-        env = rpc(
-            base_url,
-            method,
-            {
-                "skip": int(skip),
-                "count": int(count),
-                "failureHandling": {"enabled": True, "mode": "rollback"},
-            },
-        )
-        items = env.get(list_key) if isinstance(env.get(list_key), list) else []
-        if not items:
-            break
-
-        for it in items:
-            if not isinstance(it, dict):
-                continue
-            tid = _to_count(it.get("typeId"))
-            if tid is not None and tid > 0:
-                used.add(int(tid))
-
-        got = len(items)
-        total = _to_count(env.get("totalCount"))
-        skip += got
-        if got < count:
-            break
-        if total is not None and skip >= total:
-            break
-
+    for it in model_context(base_url).instances(source):
+        tid = _to_count(it.get("typeId"))
+        if tid is not None and tid > 0:
+            used.add(int(tid))
     return used
 
 
@@ -3226,7 +3586,7 @@ def sync_steel_column_types(
     row_candidates_by_symbol: Dict[str, List[Dict[str, Any]]] = {}
     row_seen_by_symbol: Dict[str, set] = {}
     for r in rows:
-        if not isinstance(r, dict):
+        if not isinstance(r, Mapping):
             continue
         ln = str(r.get("__placement_level_norm") or "")
         sn = str(r.get("__placement_symbol_norm") or "")
@@ -3250,8 +3610,8 @@ def sync_steel_column_types(
     allow_symbol_fallback_with_level = bool(kind_cfg.get("allowSymbolFallbackWhenLevelPresent", False))
     strict_level_when_type_name_has_level = bool(kind_cfg.get("strictLevelWhenTypeNameHasLevel", True))
 
-    env = rpc(base_url, cmd_list, {"skip": 0, "count": 10000, "failureHandling": {"enabled": True, "mode": "rollback"}})
-    types = _extract_types(env)
+    ctx = model_context(base_url)
+    types = ctx.types(cmd_list)
     ret["types"] = len(types)
 
     for t in types:
@@ -3267,7 +3627,7 @@ def sync_steel_column_types(
         ret["candidateTypes"] += 1
 
         try:
-            prm = rpc(base_url, "element.get_structural_column_type_parameters", {"typeId": int(tid)})
+            prm = ctx.column_type_parameters(tid)
         except Exception as ex:
             ret["errors"].append({"typeId": tid, "op": "get_type_parameters", "msg": str(ex)})
             continue
@@ -3443,7 +3803,7 @@ def sync_src_column_types(
     row_candidates_by_symbol: Dict[str, List[Dict[str, Any]]] = {}
     row_seen_by_symbol: Dict[str, set] = {}
     for r in rows:
-        if not isinstance(r, dict):
+        if not isinstance(r, Mapping):
             continue
         ln = str(r.get("__placement_level_norm") or "")
         sn = str(r.get("__placement_symbol_norm") or "")
@@ -3475,8 +3835,8 @@ def sync_src_column_types(
     allow_symbol_fallback_with_level = bool(kind_cfg.get("allowSymbolFallbackWhenLevelPresent", False))
     strict_level_when_type_name_has_level = bool(kind_cfg.get("strictLevelWhenTypeNameHasLevel", True))
 
-    env = rpc(base_url, cmd_list, {"skip": 0, "count": 10000, "failureHandling": {"enabled": True, "mode": "rollback"}})
-    types = _extract_types(env)
+    ctx = model_context(base_url)
+    types = ctx.types(cmd_list)
     ret["types"] = len(types)
 
     records: List[Dict[str, Any]] = []
@@ -3495,7 +3855,7 @@ def sync_src_column_types(
         ret["candidateTypes"] += 1
 
         try:
-            prm = rpc(base_url, "element.get_structural_column_type_parameters", {"typeId": int(tid)})
+            prm = ctx.column_type_parameters(tid)
         except Exception as ex:
             ret["errors"].append({"typeId": tid, "op": "get_type_parameters", "msg": str(ex)})
             continue
@@ -3597,12 +3957,7 @@ def sync_src_column_types(
     if bool(kind_cfg.get("strictPairRequired", True)):
         pair_keys = set()
         try:
-            inst_env = rpc(
-                base_url,
-                "element.get_structural_columns",
-                {"skip": 0, "count": 10000, "failureHandling": {"enabled": True, "mode": "rollback"}},
-            )
-            insts = inst_env.get("structuralColumns") if isinstance(inst_env.get("structuralColumns"), list) else []
+            insts = ctx.instances("columns")
             key_classes: Dict[Tuple[str, str], set] = {}
             pair_by_location = bool(kind_cfg.get("pairByLocation", True))
             tol_mm = _to_num(kind_cfg.get("pairLocationToleranceMm"))
@@ -3820,76 +4175,113 @@ def _to_report_text(v: Any) -> str:
     return str(v)
 
 
-def _collect_diff_report_rows(result: Dict[str, Any]) -> List[Dict[str, str]]:
-    rows: List[Dict[str, str]] = []
-
-    def _append(scope: str, diff: Dict[str, Any], kind: str = "") -> None:
-        level, symbol = _report_level_symbol(diff)
-        row = {
-            "scope": scope,
-            "kind": kind,
-            "level": level,
-            "symbol": symbol,
-            "familyName": str(diff.get("familyName") or "").strip(),
-            "typeName": str(diff.get("typeName") or "").strip(),
-            "typeId": _to_report_text(diff.get("typeId")),
-            "elementId": _to_report_text(diff.get("elementId")),
-            "paramName": str(diff.get("param") or "").strip(),
-            "actual": _to_report_text(diff.get("actual")),
-            "expected": _to_report_text(diff.get("expected")),
-            "class": str(diff.get("class") or "").strip(),
-        }
-        rows.append(row)
+DIFF_REPORT_COLUMNS = [
+    "scope",
+    "kind",
+    "level",
+    "symbol",
+    "familyName",
+    "typeName",
+    "typeId",
+    "elementId",
+    "paramName",
+    "actual",
+    "expected",
+    "class",
+]
 
-    for kind_name, kret in (result.get("kinds") or {}).items():
-        if not isinstance(kret, dict):
-            continue
-        for d in (kret.get("diffs") or []):
-            if isinstance(d, dict):
-                _append("kind", d, str(kind_name))
+# ステージ結果のうちレポートへ逐次書き出すリスト
+REPORT_LIST_KEYS = (
+    "diffs",
+    "updated",
+    "unapplied",
+    "errors",
+    "missingExpected",
+    "missingListTypes",
+    "conflicts",
+)
 
-    col = result.get("columnListFamilies")
-    if isinstance(col, dict):
-        for d in (col.get("diffs") or []):
-            if isinstance(d, dict):
-                _append("columnListFamilies", d, "columns")
 
-    beam = result.get("beamListFamilies")
-    if isinstance(beam, dict):
-        for d in (beam.get("diffs") or []):
-            if isinstance(d, dict):
-                _append("beamListFamilies", d, "frames")
+def _diff_report_row(scope: str, diff: Dict[str, Any], kind: str = "") -> Dict[str, str]:
+    level, symbol = _report_level_symbol(diff)
+    return {
+        "scope": scope,
+        "kind": kind,
+        "level": level,
+        "symbol": symbol,
+        "familyName": str(diff.get("familyName") or "").strip(),
+        "typeName": str(diff.get("typeName") or "").strip(),
+        "typeId": _to_report_text(diff.get("typeId")),
+        "elementId": _to_report_text(diff.get("elementId")),
+        "paramName": str(diff.get("param") or "").strip(),
+        "actual": _to_report_text(diff.get("actual")),
+        "expected": _to_report_text(diff.get("expected")),
+        "class": str(diff.get("class") or "").strip(),
+    }
 
-    frame_inst = result.get("frameInstances")
-    if isinstance(frame_inst, dict):
-        for d in (frame_inst.get("diffs") or []):
-            if isinstance(d, dict):
-                _append("frameInstances", d, "frames_instance")
 
-    return rows
+class ReportSink:
+    """
+    Streams stage results to disk as each kind/stage finishes.
 
+    - <stem>_records.jsonl: one line per item of the REPORT_LIST_KEYS lists
+      ({"scope", "kind", "list", "item"})
+    - <stem>_diff_report.csv: one row per diff
 
-def _write_diff_report_csv(path: Path, rows: List[Dict[str, str]]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    cols = [
-        "scope",
-        "kind",
-        "level",
-        "symbol",
-        "familyName",
-        "typeName",
-        "typeId",
-        "elementId",
-        "paramName",
-        "actual",
-        "expected",
-        "class",
-    ]
-    with path.open("w", encoding="utf-8-sig", newline="") as f:
-        w = csv.DictWriter(f, fieldnames=cols, extrasaction="ignore")
-        w.writeheader()
-        for r in rows:
-            w.writerow(r)
+    spill() replaces each list in the stage dict with {"count", "offset"},
+    offset being the 0-based line of its first item in the JSONL, so the
+    summary JSON only holds counts and references.
+    """
+
+    def __init__(self, out_path: Path):
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        self.records_path = out_path.with_name(f"{out_path.stem}_records.jsonl")
+        self.diff_report_path = out_path.with_name(f"{out_path.stem}_diff_report.csv")
+        self.records = 0
+        self.diff_rows = 0
+        self._jf = self.records_path.open("w", encoding="utf-8", newline="\n")
+        self._cf = self.diff_report_path.open("w", encoding="utf-8-sig", newline="")
+        self._cw = csv.DictWriter(self._cf, fieldnames=DIFF_REPORT_COLUMNS, extrasaction="ignore")
+        self._cw.writeheader()
+        self.flush()
+
+    def spill(self, scope: str, kind: str, stage: Any) -> Any:
+        if not isinstance(stage, dict):
+            return stage
+        for key in REPORT_LIST_KEYS:
+            items = stage.get(key)
+            if not isinstance(items, list):
+                continue
+            offset = self.records
+            for item in items:
+                self._jf.write(
+                    json.dumps({"scope": scope, "kind": kind, "list": key, "item": item}, ensure_ascii=False, default=str) + "\n"
+                )
+                self.records += 1
+                if key == "diffs" and isinstance(item, dict):
+                    self._cw.writerow(_diff_report_row(scope, item, kind))
+                    self.diff_rows += 1
+            stage[key] = {"count": len(items), "offset": offset}
+        self.flush()
+        return stage
+
+    def flush(self) -> None:
+        self._jf.flush()
+        self._cf.flush()
+
+    def close(self) -> None:
+        for f in (self._jf, self._cf):
+            try:
+                f.close()
+            except Exception:
+                pass
+
+
+def _report_count(stage: Any, key: str) -> int:
+    v = stage.get(key) if isinstance(stage, dict) else None
+    if isinstance(v, dict):
+        return int(v.get("count") or 0)
+    return len(v) if isinstance(v, list) else 0
 
 
 # -----------------------------
@@ -3897,6 +4289,293 @@ def _write_diff_report_csv(path: Path, rows: List[Dict[str, str]]) -> None:
 # -----------------------------
 
 
+def run_kind(
+    base_url: str,
+    kind_name: str,
+    kind_cfg: Dict[str, Any],
+    sections: Dict[str, Dict[str, Any]],
+    config: Dict[str, Any],
+    mode_apply: bool,
+    only_column_list_sync: bool = False,
+) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+    """1 kind 分の同期（CSV集計 -> タイプ照合 -> 差分[ -> 更新]）。(kind結果, 集計結果) を返す。"""
+    kret: Dict[str, Any] = {
+        "ok": True,
+        "label": kind_cfg.get("label") or kind_name,
+        "placements": 0,
+        "expectedSymbols": 0,
+        "types": 0,
+        "usedTypeIdsCount": 0,
+        "filteredOutUnused": 0,
+        "skippedNoTargetParams": 0,
+        "matchedTypes": 0,
+        "resolvedByLevelSymbol": 0,
+        "resolvedBySymbolFallback": 0,
+        "strictLevelBlockedFallback": 0,
+        "unresolvedTypes": 0,
+        "missingExpected": [],
+        "conflicts": [],
+        "diffs": [],
+        "updated": [],
+        "errors": [],
+    }
+    expected_info: Optional[Dict[str, Any]] = None
+
+    try:
+        expected_info = aggregate_expected_for_kind(kind_cfg, sections)
+        expected_by_symbol = expected_info.get("expectedBySymbol") or {}
+        expected_by_level_symbol = expected_info.get("expectedByLevelSymbol") or {}
+        chosen_rows = expected_info.get("chosenRows") or []
+        row_candidates_by_symbol: Dict[str, List[Dict[str, Any]]] = {}
+        row_seen_by_symbol: Dict[str, set] = {}
+        for rr in chosen_rows:
+            if not isinstance(rr, Mapping):
+                continue
+            sn = normalize_symbol_token(rr.get("__placement_symbol") or rr.get("__symbol") or "")
+            if not sn:
+                continue
+            sig = (
+                str(rr.get("__placement_level_norm") or rr.get("__level_norm") or ""),
+                sn,
+                str(rr.get("__section") or ""),
+            )
+            seen = row_seen_by_symbol.setdefault(sn, set())
+            if sig in seen:
+                continue
+            seen.add(sig)
+            row_candidates_by_symbol.setdefault(sn, []).append(rr)
+        kret["placements"] = len(expected_info.get("placements") or [])
+        kret["expectedSymbols"] = len(expected_by_symbol)
+        kret["missingExpected"] = expected_info.get("missingRows") or []
+        kret["conflicts"] = expected_info.get("conflicts") or []
+        kret["conflictStats"] = expected_info.get("conflictStats") or {}
+
+        if only_column_list_sync:
+            kret["skipped"] = True
+            kret["reason"] = "only_column_list_sync"
+            return kret, expected_info
+
+        used_type_ids: Optional[set] = None
+        if bool(kind_cfg.get("onlyUsedTypes", True)):
+            try:
+                used_type_ids = _collect_used_type_ids_for_kind(base_url, kind_name)
+                if used_type_ids is not None:
+                    kret["usedTypeIdsCount"] = len(used_type_ids)
+            except Exception as ex:
+                used_type_ids = None
+                kret["errors"].append(
+                    {"stage": "collect_used_type_ids", "msg": str(ex), "kind": kind_name}
+                )
+
+        if kind_name == "steel_columns":
+            steel_ret = sync_steel_column_types(
+                base_url=base_url,
+                kind_cfg=kind_cfg,
+                expected_info=expected_info,
+                mode_apply=mode_apply,
+                used_type_ids=used_type_ids,
+            )
+            for kk in (
+                "types",
+                "candidateTypes",
+                "usedTypeIdsCount",
+                "filteredOutUnused",
+                "matchedTypes",
+                "missingExpected",
+                "diffs",
+                "updated",
+                "errors",
+                "label",
+                "resolvedByLevelSymbol",
+                "resolvedBySymbolSingle",
+                "resolvedBySymbolBestMatch",
+                "unresolvedTypes",
+            ):
+                if kk in steel_ret:
+                    if kk == "errors":
+                        kret["errors"] = (kret.get("errors") or []) + (steel_ret.get("errors") or [])
+                    else:
+                        kret[kk] = steel_ret[kk]
+            return kret, expected_info
+
+        if kind_name == "src_columns":
+            src_ret = sync_src_column_types(
+                base_url=base_url,
+                kind_cfg=kind_cfg,
+                expected_info=expected_info,
+                mode_apply=mode_apply,
+                config=config,
+                used_type_ids=used_type_ids,
+            )
+            for kk in (
+                "types",
+                "candidateTypes",
+                "usedTypeIdsCount",
+                "filteredOutUnused",
+                "filteredOutUnknownClass",
+                "filteredOutNoPair",
+                "strictPairRequired",
+                "pairKeysCount",
+                "matchedTypes",
+                "missingExpected",
+                "diffs",
+                "updated",
+                "errors",
+                "label",
+                "resolvedByLevelSymbol",
+                "resolvedBySymbolSingle",
+                "resolvedBySymbolBestMatch",
+                "unresolvedTypes",
+                "rcCandidates",
+                "steelCandidates",
+            ):
+                if kk in src_ret:
+                    if kk == "errors":
+                        kret["errors"] = (kret.get("errors") or []) + (src_ret.get("errors") or [])
+                    else:
+                        kret[kk] = src_ret[kk]
+            return kret, expected_info
+
+        types = model_context(base_url).types(str(kind_cfg.get("listTypesCommand") or ""))
+        kret["types"] = len(types)
+
+        symbol_params = [str(x) for x in (kind_cfg.get("symbolParamCandidates") or []) if str(x).strip()]
+        param_map = kind_cfg.get("paramMap") or []
+        target_params = [str(m.get("revit") or "").strip() for m in param_map if str(m.get("revit") or "").strip()]
+        level_infer_params = ["階1", "階2", "レベル", "階", "層", "階層", "フロア", "Level", "level"]
+        read_params = sorted(set(symbol_params + target_params + level_infer_params))
+        allow_symbol_fallback_with_level = bool(kind_cfg.get("allowSymbolFallbackWhenLevelPresent", True))
+        strict_level_when_type_name_has_level = bool(kind_cfg.get("strictLevelWhenTypeNameHasLevel", True))
+        kind_logic = _normalize_kind_name_for_logic(kind_name)
+
+        for t in types:
+            tid = _type_id_of(t)
+            if tid <= 0:
+                continue
+            if used_type_ids is not None and int(tid) not in used_type_ids:
+                kret["filteredOutUnused"] += 1
+                continue
+            tname = _type_name_of(t)
+
+            type_vals = get_type_params_bulk(base_url, tid, read_params)
+            params_map = type_vals.get("params") if isinstance(type_vals.get("params"), dict) else {}
+            display_map = type_vals.get("display") if isinstance(type_vals.get("display"), dict) else {}
+            available_param_names = set(params_map.keys()) | set(display_map.keys())
+            plist_for_match: List[Dict[str, Any]] = []
+            for pn in sorted(available_param_names):
+                if not pn:
+                    continue
+                pv = params_map.get(pn, display_map.get(pn))
+                plist_for_match.append({"name": pn, "value": pv, "isReadOnly": False})
+            params_for_infer = type_vals.get("params") if isinstance(type_vals.get("params"), dict) else {}
+            lv_raw, sy_raw = _infer_level_symbol_from_type_values(tname, params_for_infer)
+            hint_lv_raw, hint_sy_raw, has_level_hint = _extract_level_symbol_hint_from_type_name(tname)
+            if not lv_raw and hint_lv_raw:
+                lv_raw = hint_lv_raw
+            if not sy_raw and hint_sy_raw:
+                sy_raw = hint_sy_raw
+            sym = str(sy_raw or "").strip()
+            if not sym:
+                sym = select_symbol_from_type(t, type_vals, symbol_params)
+
+            lv_norm = normalize_level_token(lv_raw)
+            sym_norm = normalize_symbol_token(sym)
+
+            exp = None
+            if lv_norm and sym_norm:
+                exp = _lookup_expected_by_level_symbol(expected_by_level_symbol, lv_norm, sym_norm)
+                if exp:
+                    kret["resolvedByLevelSymbol"] += 1
+            if not exp:
+                can_fallback = ((not lv_norm) or allow_symbol_fallback_with_level)
+                if strict_level_when_type_name_has_level and has_level_hint and lv_norm and sym_norm:
+                    can_fallback = False
+                    kret["strictLevelBlockedFallback"] += 1
+                if can_fallback:
+                    cands = _lookup_row_candidates_by_symbol(row_candidates_by_symbol, sym_norm)
+                    if len(cands) == 1:
+                        exp = _build_expected_from_param_map_for_type(plist_for_match, cands[0], param_map)
+                    elif len(cands) > 1:
+                        best_row, _diag = _choose_best_row_for_param_map_type(plist_for_match, cands, param_map)
+                        if best_row is not None:
+                            exp = _build_expected_from_param_map_for_type(plist_for_match, best_row, param_map)
+                    if not exp:
+                        exp = _lookup_expected_by_symbol(expected_by_symbol, sym, sym_norm)
+                    if exp:
+                        kret["resolvedBySymbolFallback"] += 1
+            if not exp:
+                kret["unresolvedTypes"] += 1
+                continue
+
+            # 異種ファミリ混在（例: SRCでRC/S同名タイプ）時、
+            # 対象パラメータが1つも存在しない型は差分対象外にする。
+            if target_params and not any(tp in available_param_names for tp in target_params):
+                kret["skippedNoTargetParams"] += 1
+                continue
+            # 梁: SRCの鉄骨側タイプ（B等のみ保持で鉄筋系を持たない型）は除外。
+            if kind_logic == "frames":
+                rebar_targets = [tp for tp in target_params if ("主筋" in tp) or ("あばら" in tp)]
+                if rebar_targets and not any(tp in available_param_names for tp in rebar_targets):
+                    kret["skippedNoTargetParams"] += 1
+                    continue
+
+            kret["matchedTypes"] += 1
+
+            for m in param_map:
+                rname = str(m.get("revit") or "").strip()
+                conv = str(m.get("converter") or "str")
+                if not rname or rname not in exp:
+                    continue
+                # 任意パラメータ（例: 左B/右B）が型に無い場合はスキップ
+                if rname not in available_param_names:
+                    continue
+                expected_val = exp.get(rname)
+                if kind_logic == "frames":
+                    expected_val = _frame_adjust_expected_by_counts(rname, expected_val, exp)
+                actual_val = read_actual_param(type_vals, rname, conv)
+
+                if equal_with_param(rname, actual_val, expected_val):
+                    continue
+
+                diff = {
+                    "typeId": tid,
+                    "typeName": tname,
+                    "familyName": str(t.get("familyName") or ""),
+                    "symbol": sym_norm or sym,
+                    "level": lv_norm,
+                    "param": rname,
+                    "actual": actual_val,
+                    "expected": expected_val,
+                }
+                kret["diffs"].append(diff)
+
+                if mode_apply:
+                    try:
+                        u = update_param(base_url, str(kind_cfg.get("updateCommand") or ""), tid, rname, expected_val)
+                        if bool(u.get("ok", True)):
+                            kret["updated"].append(diff)
+                        else:
+                            kret["errors"].append({"op": "update", "diff": diff, "msg": u.get("msg", "update failed")})
+                    except Exception as ex:
+                        kret["errors"].append({"op": "update", "diff": diff, "msg": str(ex)})
+
+    except Exception as ex:
+        kret["ok"] = False
+        kret["errors"].append({"stage": "kind", "msg": str(ex)})
+
+    return kret, expected_info
+
+def _run_ordered(fn: Callable[[Any], Any], items: List[Any], workers: int) -> Iterable[Any]:
+    """fn(item) for each item, yielded in item order; with workers > 1 the items run on a thread pool."""
+    if workers <= 1 or len(items) <= 1:
+        for item in items:
+            yield fn(item)
+        return
+    with ThreadPoolExecutor(max_workers=min(workers, len(items))) as ex:
+        for value in ex.map(fn, items):
+            yield value
+
+
 def merge_defaults(current: Any, default: Any) -> Any:
     if isinstance(default, dict):
         cur = current if isinstance(current, dict) else {}
@@ -3950,6 +4629,12 @@ def main() -> int:
         action="store_true",
         help="構造部材タイプの同期は行わず、柱リスト用ファミリ同期のみ実行",
     )
+    ap.add_argument(
+        "--expected-only-kinds",
+        type=str,
+        default="",
+        help="CSV期待値の集計（リスト同期用）だけ行い、タイプ同期はしないkind（カンマ区切り）",
+    )
     ap.add_argument(
         "--column-list-mode",
         choices=["auto", "rc", "src", "both", "none"],
@@ -3964,6 +4649,12 @@ def main() -> int:
         default="auto",
         help="梁リスト用ファミリ同期の対象: auto|rc|src|both|none",
     )
+    ap.add_argument(
+        "--plan-workers",
+        type=int,
+        default=4,
+        help="planモードで kind / リスト同期を並列実行するスレッド数（1で逐次。applyは常に逐次）",
+    )
     args = ap.parse_args()
 
     base_url = f"http://127.0.0.1:{args.port}"
@@ -3993,6 +4684,7 @@ def main() -> int:
     sections = parse_sections(csv_path, encoding_hint=args.encoding)
 
     enabled_kind_names = [k.strip() for k in str(args.kinds).split(",") if k.strip()]
+    expected_only_kinds = {k.strip() for k in str(args.expected_only_kinds).split(",") if k.strip()}
     mode_apply = args.mode == "apply"
 
     result: Dict[str, Any] = {
@@ -4003,368 +4695,140 @@ def main() -> int:
         "kinds": {},
         "sectionsCount": len(sections),
     }
+    # 差分・更新・エラーはkind/ステージごとにレポートへ逐次書き出し、resultには件数と位置だけ残す
+    out_path = _default_output_path(base_url, args.output)
+    sink = ReportSink(out_path)
+    result["recordsPath"] = str(sink.records_path)
+    # 後段（柱/梁リスト・梁インスタンス同期）で使うkindの集計結果のみ保持
     expected_cache: Dict[str, Dict[str, Any]] = {}
 
+    kinds_to_run: List[Tuple[str, Dict[str, Any]]] = []
     for kind_name, kind_cfg in (config.get("kinds") or {}).items():
         if kind_name not in enabled_kind_names:
             continue
         if not bool(kind_cfg.get("enabled", True)):
             result["kinds"][kind_name] = {"ok": True, "skipped": True, "reason": "disabled_in_config"}
             continue
+        result["kinds"][kind_name] = {}  # 設定順を保つための枠（結果は下で差し替え）
+        kinds_to_run.append((kind_name, kind_cfg))
 
-        kret: Dict[str, Any] = {
-            "ok": True,
-            "label": kind_cfg.get("label") or kind_name,
-            "placements": 0,
-            "expectedSymbols": 0,
-            "types": 0,
-            "usedTypeIdsCount": 0,
-            "filteredOutUnused": 0,
-            "skippedNoTargetParams": 0,
-            "matchedTypes": 0,
-            "resolvedByLevelSymbol": 0,
-            "resolvedBySymbolFallback": 0,
-            "strictLevelBlockedFallback": 0,
-            "unresolvedTypes": 0,
-            "missingExpected": [],
-            "conflicts": [],
-            "diffs": [],
-            "updated": [],
-            "errors": [],
-        }
-
-        try:
-            expected_info = aggregate_expected_for_kind(kind_cfg, sections)
-            expected_cache[kind_name] = expected_info
-            expected_by_symbol = expected_info.get("expectedBySymbol") or {}
-            expected_by_level_symbol = expected_info.get("expectedByLevelSymbol") or {}
-            chosen_rows = expected_info.get("chosenRows") or []
-            row_candidates_by_symbol: Dict[str, List[Dict[str, Any]]] = {}
-            row_seen_by_symbol: Dict[str, set] = {}
-            for rr in chosen_rows:
-                if not isinstance(rr, dict):
-                    continue
-                sn = normalize_symbol_token(rr.get("__placement_symbol") or rr.get("__symbol") or "")
-                if not sn:
-                    continue
-                sig = (
-                    str(rr.get("__placement_level_norm") or rr.get("__level_norm") or ""),
-                    sn,
-                    str(rr.get("__section") or ""),
-                )
-                seen = row_seen_by_symbol.setdefault(sn, set())
-                if sig in seen:
-                    continue
-                seen.add(sig)
-                row_candidates_by_symbol.setdefault(sn, []).append(rr)
-            kret["placements"] = len(expected_info.get("placements") or [])
-            kret["expectedSymbols"] = len(expected_by_symbol)
-            kret["missingExpected"] = expected_info.get("missingRows") or []
-            kret["conflicts"] = expected_info.get("conflicts") or []
-
-            if args.only_column_list_sync:
-                kret["skipped"] = True
-                kret["reason"] = "only_column_list_sync"
-                result["kinds"][kind_name] = kret
-                continue
-
-            used_type_ids: Optional[set] = None
-            if bool(kind_cfg.get("onlyUsedTypes", True)):
-                try:
-                    used_type_ids = _collect_used_type_ids_for_kind(base_url, kind_name)
-                    if used_type_ids is not None:
-                        kret["usedTypeIdsCount"] = len(used_type_ids)
-                except Exception as ex:
-                    used_type_ids = None
-                    kret["errors"].append(
-                        {"stage": "collect_used_type_ids", "msg": str(ex), "kind": kind_name}
-                    )
-
-            if kind_name == "steel_columns":
-                steel_ret = sync_steel_column_types(
-                    base_url=base_url,
-                    kind_cfg=kind_cfg,
-                    expected_info=expected_info,
-                    mode_apply=mode_apply,
-                    used_type_ids=used_type_ids,
-                )
-                for kk in (
-                    "types",
-                    "candidateTypes",
-                    "usedTypeIdsCount",
-                    "filteredOutUnused",
-                    "matchedTypes",
-                    "missingExpected",
-                    "diffs",
-                    "updated",
-                    "errors",
-                    "label",
-                    "resolvedByLevelSymbol",
-                    "resolvedBySymbolSingle",
-                    "resolvedBySymbolBestMatch",
-                    "unresolvedTypes",
-                ):
-                    if kk in steel_ret:
-                        if kk == "errors":
-                            kret["errors"] = (kret.get("errors") or []) + (steel_ret.get("errors") or [])
-                        else:
-                            kret[kk] = steel_ret[kk]
-                result["kinds"][kind_name] = kret
-                continue
-
-            if kind_name == "src_columns":
-                src_ret = sync_src_column_types(
-                    base_url=base_url,
-                    kind_cfg=kind_cfg,
-                    expected_info=expected_info,
-                    mode_apply=mode_apply,
-                    config=config,
-                    used_type_ids=used_type_ids,
-                )
-                for kk in (
-                    "types",
-                    "candidateTypes",
-                    "usedTypeIdsCount",
-                    "filteredOutUnused",
-                    "filteredOutUnknownClass",
-                    "filteredOutNoPair",
-                    "strictPairRequired",
-                    "pairKeysCount",
-                    "matchedTypes",
-                    "missingExpected",
-                    "diffs",
-                    "updated",
-                    "errors",
-                    "label",
-                    "resolvedByLevelSymbol",
-                    "resolvedBySymbolSingle",
-                    "resolvedBySymbolBestMatch",
-                    "unresolvedTypes",
-                    "rcCandidates",
-                    "steelCandidates",
-                ):
-                    if kk in src_ret:
-                        if kk == "errors":
-                            kret["errors"] = (kret.get("errors") or []) + (src_ret.get("errors") or [])
-                        else:
-                            kret[kk] = src_ret[kk]
-                result["kinds"][kind_name] = kret
-                continue
-
-            types_env = rpc(base_url, str(kind_cfg.get("listTypesCommand") or ""), {"skip": 0, "count": 5000, "namesOnly": False})
-            types = _extract_types(types_env)
-            kret["types"] = len(types)
-
-            symbol_params = [str(x) for x in (kind_cfg.get("symbolParamCandidates") or []) if str(x).strip()]
-            param_map = kind_cfg.get("paramMap") or []
-            target_params = [str(m.get("revit") or "").strip() for m in param_map if str(m.get("revit") or "").strip()]
-            level_infer_params = ["階1", "階2", "レベル", "階", "層", "階層", "フロア", "Level", "level"]
-            read_params = sorted(set(symbol_params + target_params + level_infer_params))
-            allow_symbol_fallback_with_level = bool(kind_cfg.get("allowSymbolFallbackWhenLevelPresent", True))
-            strict_level_when_type_name_has_level = bool(kind_cfg.get("strictLevelWhenTypeNameHasLevel", True))
-            kind_logic = _normalize_kind_name_for_logic(kind_name)
-
-            for t in types:
-                tid = _type_id_of(t)
-                if tid <= 0:
-                    continue
-                if used_type_ids is not None and int(tid) not in used_type_ids:
-                    kret["filteredOutUnused"] += 1
-                    continue
-                tname = _type_name_of(t)
-
-                type_vals = get_type_params_bulk(base_url, tid, read_params)
-                params_map = type_vals.get("params") if isinstance(type_vals.get("params"), dict) else {}
-                display_map = type_vals.get("display") if isinstance(type_vals.get("display"), dict) else {}
-                available_param_names = set(params_map.keys()) | set(display_map.keys())
-                plist_for_match: List[Dict[str, Any]] = []
-                for pn in sorted(available_param_names):
-                    if not pn:
-                        continue
-                    pv = params_map.get(pn, display_map.get(pn))
-                    plist_for_match.append({"name": pn, "value": pv, "isReadOnly": False})
-                params_for_infer = type_vals.get("params") if isinstance(type_vals.get("params"), dict) else {}
-                lv_raw, sy_raw = _infer_level_symbol_from_type_values(tname, params_for_infer)
-                hint_lv_raw, hint_sy_raw, has_level_hint = _extract_level_symbol_hint_from_type_name(tname)
-                if not lv_raw and hint_lv_raw:
-                    lv_raw = hint_lv_raw
-                if not sy_raw and hint_sy_raw:
-                    sy_raw = hint_sy_raw
-                sym = str(sy_raw or "").strip()
-                if not sym:
-                    sym = select_symbol_from_type(t, type_vals, symbol_params)
-
-                lv_norm = normalize_level_token(lv_raw)
-                sym_norm = normalize_symbol_token(sym)
-
-                exp = None
-                if lv_norm and sym_norm:
-                    exp = _lookup_expected_by_level_symbol(expected_by_level_symbol, lv_norm, sym_norm)
-                    if exp:
-                        kret["resolvedByLevelSymbol"] += 1
-                if not exp:
-                    can_fallback = ((not lv_norm) or allow_symbol_fallback_with_level)
-                    if strict_level_when_type_name_has_level and has_level_hint and lv_norm and sym_norm:
-                        can_fallback = False
-                        kret["strictLevelBlockedFallback"] += 1
-                    if can_fallback:
-                        cands = _lookup_row_candidates_by_symbol(row_candidates_by_symbol, sym_norm)
-                        if len(cands) == 1:
-                            exp = _build_expected_from_param_map_for_type(plist_for_match, cands[0], param_map)
-                        elif len(cands) > 1:
-                            best_row, _diag = _choose_best_row_for_param_map_type(plist_for_match, cands, param_map)
-                            if best_row is not None:
-                                exp = _build_expected_from_param_map_for_type(plist_for_match, best_row, param_map)
-                        if not exp:
-                            exp = _lookup_expected_by_symbol(expected_by_symbol, sym, sym_norm)
-                        if exp:
-                            kret["resolvedBySymbolFallback"] += 1
-                if not exp:
-                    kret["unresolvedTypes"] += 1
-                    continue
-
-                # 異種ファミリ混在（例: SRCでRC/S同名タイプ）時、
-                # 対象パラメータが1つも存在しない型は差分対象外にする。
-                if target_params and not any(tp in available_param_names for tp in target_params):
-                    kret["skippedNoTargetParams"] += 1
-                    continue
-                # 梁: SRCの鉄骨側タイプ（B等のみ保持で鉄筋系を持たない型）は除外。
-                if kind_logic == "frames":
-                    rebar_targets = [tp for tp in target_params if ("主筋" in tp) or ("あばら" in tp)]
-                    if rebar_targets and not any(tp in available_param_names for tp in rebar_targets):
-                        kret["skippedNoTargetParams"] += 1
-                        continue
-
-                kret["matchedTypes"] += 1
-
-                for m in param_map:
-                    rname = str(m.get("revit") or "").strip()
-                    conv = str(m.get("converter") or "str")
-                    if not rname or rname not in exp:
-                        continue
-                    # 任意パラメータ（例: 左B/右B）が型に無い場合はスキップ
-                    if rname not in available_param_names:
-                        continue
-                    expected_val = exp.get(rname)
-                    if kind_logic == "frames":
-                        expected_val = _frame_adjust_expected_by_counts(rname, expected_val, exp)
-                    actual_val = read_actual_param(type_vals, rname, conv)
-
-                    if equal_with_param(rname, actual_val, expected_val):
-                        continue
-
-                    diff = {
-                        "typeId": tid,
-                        "typeName": tname,
-                        "familyName": str(t.get("familyName") or ""),
-                        "symbol": sym_norm or sym,
-                        "level": lv_norm,
-                        "param": rname,
-                        "actual": actual_val,
-                        "expected": expected_val,
-                    }
-                    kret["diffs"].append(diff)
-
-                    if mode_apply:
-                        try:
-                            u = update_param(base_url, str(kind_cfg.get("updateCommand") or ""), tid, rname, expected_val)
-                            if bool(u.get("ok", True)):
-                                kret["updated"].append(diff)
-                            else:
-                                kret["errors"].append({"op": "update", "diff": diff, "msg": u.get("msg", "update failed")})
-                        except Exception as ex:
-                            kret["errors"].append({"op": "update", "diff": diff, "msg": str(ex)})
+    # plan は読み取りのみなので kind / リスト同期を並列実行（読み取りは SingleFlight で共有）。
+    # 結果は完了順ではなく設定順に受け取り、レポートへの書き出し順を固定する。
+    workers = 1 if mode_apply else max(1, int(args.plan_workers))
+    result["planWorkers"] = workers
 
-        except Exception as ex:
-            kret["ok"] = False
-            kret["errors"].append({"stage": "kind", "msg": str(ex)})
+    def _kind_job(item: Tuple[str, Dict[str, Any]]) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]]]:
+        only_expected = bool(args.only_column_list_sync) or item[0] in expected_only_kinds
+        return run_kind(base_url, item[0], item[1], sections, config, mode_apply, only_expected)
 
-        result["kinds"][kind_name] = kret
+    for (kind_name, _), (kret, expected_info) in zip(kinds_to_run, _run_ordered(_kind_job, kinds_to_run, workers)):
+        if expected_info is not None and kind_name in ("columns", "frames"):
+            expected_cache[kind_name] = expected_info
+        result["kinds"][kind_name] = sink.spill("kind", kind_name, kret)
 
+    stages: List[Tuple[str, str, str, Callable[[], Dict[str, Any]]]] = []
     if not args.skip_column_list_sync and str(args.column_list_mode).lower() != "none":
         col_info = expected_cache.get("columns")
         if col_info:
-            try:
-                result["columnListFamilies"] = sync_column_list_families(
+            stages.append((
+                "columnListFamilies",
+                "columns",
+                "column_list_sync",
+                functools.partial(
+                    sync_column_list_families,
                     base_url=base_url,
                     expected_info_columns=col_info,
                     mode_apply=mode_apply,
                     family_mode=str(args.column_list_mode).lower(),
-                )
-            except Exception as ex:
-                result["columnListFamilies"] = {"ok": False, "errors": [{"stage": "column_list_sync", "msg": str(ex)}]}
+                ),
+            ))
 
     if bool(args.sync_frame_instances):
         frame_info = expected_cache.get("frames")
         frame_kind = (config.get("kinds") or {}).get("frames") if isinstance(config.get("kinds"), dict) else {}
         if frame_info and isinstance(frame_kind, dict):
-            try:
-                result["frameInstances"] = sync_frame_instances_from_expected(
+            stages.append((
+                "frameInstances",
+                "frames_instance",
+                "frame_instance_sync",
+                functools.partial(
+                    sync_frame_instances_from_expected,
                     base_url=base_url,
                     kind_cfg=frame_kind,
                     expected_info_frames=frame_info,
                     mode_apply=mode_apply,
-                )
-            except Exception as ex:
-                result["frameInstances"] = {"ok": False, "errors": [{"stage": "frame_instance_sync", "msg": str(ex)}]}
+                ),
+            ))
 
     if not args.skip_beam_list_sync and str(args.beam_list_mode).lower() != "none":
         frame_info = expected_cache.get("frames")
         if frame_info:
-            try:
-                result["beamListFamilies"] = sync_beam_list_families(
+            stages.append((
+                "beamListFamilies",
+                "frames",
+                "beam_list_sync",
+                functools.partial(
+                    sync_beam_list_families,
                     base_url=base_url,
                     expected_info_frames=frame_info,
                     mode_apply=mode_apply,
                     family_mode=str(args.beam_list_mode).lower(),
-                )
-            except Exception as ex:
-                result["beamListFamilies"] = {"ok": False, "errors": [{"stage": "beam_list_sync", "msg": str(ex)}]}
+                ),
+            ))
 
-    out_path = _default_output_path(base_url, args.output)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
+    def _stage_job(stage: Tuple[str, str, str, Callable[[], Dict[str, Any]]]) -> Dict[str, Any]:
+        try:
+            return stage[3]()
+        except Exception as ex:
+            return {"ok": False, "errors": [{"stage": stage[2], "msg": str(ex)}]}
+
+    for (key, report_kind, _, _), stage_ret in zip(stages, _run_ordered(_stage_job, stages, workers)):
+        result[key] = sink.spill(key, report_kind, stage_ret)
+    expected_cache.clear()
+    result["modelContext"] = model_context(base_url).stats()
+
+    sink.close()
+    result["records"] = sink.records
+    result["diffReportRows"] = sink.diff_rows
     with out_path.open("w", encoding="utf-8") as f:
         json.dump(result, f, ensure_ascii=False, indent=2)
 
-    diff_report_rows = _collect_diff_report_rows(result)
-    diff_report_path = out_path.with_name(f"{out_path.stem}_diff_report.csv")
-    _write_diff_report_csv(diff_report_path, diff_report_rows)
-
     print(
         json.dumps(
             {
                 "ok": True,
                 "mode": args.mode,
                 "savedTo": str(out_path),
-                "diffReportPath": str(diff_report_path),
-                "diffReportRows": len(diff_report_rows),
+                "diffReportPath": str(sink.diff_report_path),
+                "diffReportRows": sink.diff_rows,
+                "recordsPath": str(sink.records_path),
                 "summary": {
                     k: {
                         "placements": v.get("placements", 0),
                         "expectedSymbols": v.get("expectedSymbols", 0),
                         "matchedTypes": v.get("matchedTypes", 0),
-                        "diffs": len(v.get("diffs") or []),
-                        "updated": len(v.get("updated") or []),
-                        "unapplied": len(v.get("unapplied") or []),
-                        "errors": len(v.get("errors") or []),
+                        "diffs": _report_count(v, "diffs"),
+                        "updated": _report_count(v, "updated"),
+                        "unapplied": _report_count(v, "unapplied"),
+                        "errors": _report_count(v, "errors"),
                     }
                     for k, v in (result.get("kinds") or {}).items()
                 },
                 "columnListFamilies": {
                     "matchedTypes": (result.get("columnListFamilies") or {}).get("matchedTypes", 0),
-                    "diffs": len(((result.get("columnListFamilies") or {}).get("diffs") or [])),
-                    "updated": len(((result.get("columnListFamilies") or {}).get("updated") or [])),
+                    "diffs": _report_count(result.get("columnListFamilies"), "diffs"),
+                    "updated": _report_count(result.get("columnListFamilies"), "updated"),
                     "missingListTypeCount": (result.get("columnListFamilies") or {}).get("missingListTypeCount", 0),
-                    "errors": len(((result.get("columnListFamilies") or {}).get("errors") or [])),
+                    "errors": _report_count(result.get("columnListFamilies"), "errors"),
                 }
                 if isinstance(result.get("columnListFamilies"), dict)
                 else {},
                 "beamListFamilies": {
                     "matchedTypes": (result.get("beamListFamilies") or {}).get("matchedTypes", 0),
-                    "diffs": len(((result.get("beamListFamilies") or {}).get("diffs") or [])),
-                    "updated": len(((result.get("beamListFamilies") or {}).get("updated") or [])),
+                    "diffs": _report_count(result.get("beamListFamilies"), "diffs"),
+                    "updated": _report_count(result.get("beamListFamilies"), "updated"),
                     "missingListTypeCount": (result.get("beamListFamilies") or {}).get("missingListTypeCount", 0),
-                    "errors": len(((result.get("beamListFamilies") or {}).get("errors") or [])),
+                    "errors": _report_count(result.get("beamListFamilies"), "errors"),
                 }
                 if isinstance(result.get("beamListFamilies"), dict)
                 else {},
@@ -4372,9 +4836,9 @@ def main() -> int:
                     "instances": (result.get("frameInstances") or {}).get("instances", 0),
                     "resolvedInstances": (result.get("frameInstances") or {}).get("resolvedInstances", 0),
                     "matchedInstances": (result.get("frameInstances") or {}).get("matchedInstances", 0),
-                    "diffs": len(((result.get("frameInstances") or {}).get("diffs") or [])),
-                    "updated": len(((result.get("frameInstances") or {}).get("updated") or [])),
-                    "errors": len(((result.get("frameInstances") or {}).get("errors") or [])),
+                    "diffs": _report_count(result.get("frameInstances"), "diffs"),
+                    "updated": _report_count(result.get("frameInstances"), "updated"),
+                    "errors": _report_count(result.get("frameInstances"), "errors"),
                 }
                 if isinstance(result.get("frameInstances"), dict)
                 else {},
@@ -0,0 +1,138 @@
+# @feature: paged bulk wall baseline / finish summary reads | keywords: 壁, 基準線, 仕上, 一括
+"""
+Paged multi-id reads for walls.
+
+get_wall_baseline and get_wall_finish_summary accept elementIds[] plus
+page { startIndex, batchSize } and return items[] with nextIndex/completed
+(same paging contract as get_instance_parameters_bulk). The iterators below
+walk those pages and yield one item per wall as soon as its page arrives, so
+callers can stream thousands of walls without holding every response.
+
+Older add-ins that do not understand elementIds[] are detected (no items[] in
+the response) and served with the per-wall call instead.
+"""
+import os
+import sys
+from typing import Any, Dict, Iterable, Iterator, List, Sequence
+
+
+def _add_scripts_to_path() -> None:
+    here = os.path.dirname(os.path.abspath(__file__))
+    if here not in sys.path:
+        sys.path.insert(0, here)
+
+
+_add_scripts_to_path()
+
+from send_revit_command_durable import send_request, RevitMcpError  # type: ignore  # noqa: E402
+
+
+DEFAULT_BASELINE_PAGE = 1000
+DEFAULT_FINISH_PAGE = 200
+
+
+def unwrap(payload: Dict[str, Any]) -> Dict[str, Any]:
+    obj: Any = payload
+    if isinstance(obj, dict) and "result" in obj:
+        obj = obj["result"]
+    if isinstance(obj, dict) and "result" in obj:
+        obj = obj["result"]
+    if isinstance(obj, dict):
+        return obj
+    return {}
+
+
+def _clean_ids(ids: Iterable[Any]) -> List[int]:
+    seen = set()
+    out: List[int] = []
+    for x in ids:
+        try:
+            i = int(x)
+        except Exception:
+            continue
+        if i > 0 and i not in seen:
+            seen.add(i)
+            out.append(i)
+    return out
+
+
+def _iter_single(port: int, method: str, ids: Sequence[int]) -> Iterator[Dict[str, Any]]:
+    for wid in ids:
+        try:
+            res = unwrap(send_request(port, method, {"elementId": int(wid)}))
+        except RevitMcpError as ex:
+            yield {"ok": False, "elementId": int(wid), "msg": str(ex)}
+            continue
+        item = dict(res)
+        item.setdefault("elementId", int(wid))
+        if "ok" not in item:
+            item["ok"] = True
+        yield item
+
+
+def iter_wall_items(
+    port: int,
+    method: str,
+    wall_ids: Iterable[Any],
+    *,
+    page_size: int,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Yield per-wall result items for a multi-id wall read command.
+    Each item carries at least { ok, elementId } plus the command payload.
+    """
+    ids = _clean_ids(wall_ids)
+    if not ids:
+        return
+
+    size = max(1, int(page_size))
+    # Send ids one page at a time so request bodies stay bounded too.
+    for offset in range(0, len(ids), size):
+        chunk = ids[offset:offset + size]
+        start = 0
+        while True:
+            res = unwrap(
+                send_request(
+                    port,
+                    method,
+                    {"elementIds": chunk, "page": {"startIndex": start, "batchSize": len(chunk)}},
+                )
+            )
+            if "items" not in res:
+                # Add-in without multi-id support: serve this chunk one by one.
+                for item in _iter_single(port, method, chunk[start:]):
+                    yield item
+                break
+
+            for item in res.get("items") or []:
+                yield item
+
+            nxt = res.get("nextIndex")
+            if res.get("completed", True) or nxt is None:
+                break
+            start = int(nxt)
+
+
+def iter_wall_baselines(
+    port: int, wall_ids: Iterable[Any], *, page_size: int = DEFAULT_BASELINE_PAGE
+) -> Iterator[Dict[str, Any]]:
+    """Yield { ok, elementId, baseline:{start,end,...} } per wall."""
+    return iter_wall_items(port, "get_wall_baseline", wall_ids, page_size=page_size)
+
+
+def iter_wall_finish_summaries(
+    port: int, wall_ids: Iterable[Any], *, page_size: int = DEFAULT_FINISH_PAGE
+) -> Iterator[Dict[str, Any]]:
+    """Yield { ok, elementId, summary:[...] } per wall."""
+    return iter_wall_items(port, "get_wall_finish_summary", wall_ids, page_size=page_size)
+
+
+def get_wall_baselines(
+    port: int, wall_ids: Iterable[Any], *, page_size: int = DEFAULT_BASELINE_PAGE
+) -> Dict[int, Dict[str, Any]]:
+    """Return {wallId: baseline} for walls that resolved; failures are skipped."""
+    out: Dict[int, Dict[str, Any]] = {}
+    for item in iter_wall_baselines(port, wall_ids, page_size=page_size):
+        if item.get("ok") and item.get("baseline"):
+            out[int(item["elementId"])] = item["baseline"]
+    return out
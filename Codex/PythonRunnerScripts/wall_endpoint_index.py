@@ -0,0 +1,227 @@
+# @feature: grid-hash wall endpoint snapping and batched join plan | keywords: 壁, 結合, 端点, 一括
+"""
+Endpoint snapping for wall joins.
+
+SegmentGridIndex hashes wall baselines (mm) into a uniform XY grid so that
+"which wall segments are within reach of this point" is answered by looking
+at a single grid cell instead of scanning every wall in the view.
+
+Cell size is twice the largest reach. Each segment is sampled every half cell
+and registered in the 3x3 block of cells around each sample, so any point
+within reach of the segment is guaranteed to land in a registered cell.
+
+build_join_plan() turns free wall ends into a deduplicated list of
+(wallA, wallB) pairs, and apply_join_plan() executes them through revit.batch
+in chunks (one TransactionGroup per op, so one failed join does not roll
+back the others).
+"""
+import json
+import math
+import os
+import sys
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Set, Tuple
+
+
+def _add_scripts_to_path() -> None:
+    here = os.path.dirname(os.path.abspath(__file__))
+    if here not in sys.path:
+        sys.path.insert(0, here)
+
+
+_add_scripts_to_path()
+
+from send_revit_command_durable import send_request, RevitMcpError  # type: ignore  # noqa: E402
+
+Point = Dict[str, float]
+Cell = Tuple[int, int]
+
+
+def dist_mm(a: Point, b: Point) -> float:
+    dx = a["x"] - b["x"]
+    dy = a["y"] - b["y"]
+    dz = a.get("z", 0.0) - b.get("z", 0.0)
+    return math.sqrt(dx * dx + dy * dy + dz * dz)
+
+
+def dist_point_to_segment_mm(p: Point, a: Point, b: Point) -> float:
+    """点 p と線分 a-b の最短距離（mm）"""
+    ax, ay, az = a["x"], a["y"], a.get("z", 0.0)
+    bx, by, bz = b["x"], b["y"], b.get("z", 0.0)
+    px, py, pz = p["x"], p["y"], p.get("z", 0.0)
+
+    vx, vy, vz = bx - ax, by - ay, bz - az
+    wx, wy, wz = px - ax, py - ay, pz - az
+
+    vv = vx * vx + vy * vy + vz * vz
+    if vv <= 1e-9:
+        # a と b が同一点（退化）なら距離は点同士
+        return dist_mm(p, a)
+
+    t = (wx * vx + wy * vy + wz * vz) / vv
+    if t < 0.0:
+        cx, cy, cz = ax, ay, az
+    elif t > 1.0:
+        cx, cy, cz = bx, by, bz
+    else:
+        cx, cy, cz = ax + t * vx, ay + t * vy, az + t * vz
+
+    dx, dy, dz = px - cx, py - cy, pz - cz
+    return math.sqrt(dx * dx + dy * dy + dz * dz)
+
+
+class SegmentGridIndex:
+    """Uniform XY grid over line segments; query cost is O(segments in one cell)."""
+
+    def __init__(self, max_reach_mm: float, *, min_cell_mm: float = 100.0) -> None:
+        self.cell_mm = max(float(min_cell_mm), 2.0 * float(max_reach_mm))
+        self._cells: Dict[Cell, List[int]] = defaultdict(list)
+        # slot -> (segmentId, start, end, reachMm)
+        self._segs: List[Tuple[int, Point, Point, float]] = []
+
+    def __len__(self) -> int:
+        return len(self._segs)
+
+    def _cell(self, x: float, y: float) -> Cell:
+        return (int(math.floor(x / self.cell_mm)), int(math.floor(y / self.cell_mm)))
+
+    def add(self, seg_id: int, start: Point, end: Point, reach_mm: float) -> None:
+        if reach_mm * 2.0 > self.cell_mm:
+            raise ValueError(f"reach {reach_mm}mm exceeds index max reach {self.cell_mm / 2.0}mm")
+        slot = len(self._segs)
+        self._segs.append((int(seg_id), start, end, float(reach_mm)))
+
+        length = math.hypot(end["x"] - start["x"], end["y"] - start["y"])
+        steps = max(1, int(math.ceil(length / (self.cell_mm * 0.5))))
+        covered: Set[Cell] = set()
+        for i in range(steps + 1):
+            t = i / steps
+            cx, cy = self._cell(
+                start["x"] + (end["x"] - start["x"]) * t,
+                start["y"] + (end["y"] - start["y"]) * t,
+            )
+            for dx in (-1, 0, 1):
+                for dy in (-1, 0, 1):
+                    covered.add((cx + dx, cy + dy))
+        for c in covered:
+            self._cells[c].append(slot)
+
+    def nearest(self, p: Point, *, exclude: Optional[int] = None) -> Optional[Tuple[int, float]]:
+        """Return (segmentId, distanceMm) of the closest segment whose reach covers p."""
+        best: Optional[Tuple[int, float]] = None
+        for slot in self._cells.get(self._cell(p["x"], p["y"]), ()):
+            seg_id, s, e, reach = self._segs[slot]
+            if exclude is not None and seg_id == exclude:
+                continue
+            d = dist_point_to_segment_mm(p, s, e)
+            if d <= reach and (best is None or d < best[1]):
+                best = (seg_id, d)
+        return best
+
+
+def wall_reach_mm(wall: Dict[str, Any], *, default_thickness_mm: float = 300.0, margin_mm: float = 5.0) -> float:
+    """Half the wall thickness plus a small margin (same rule the join scripts used)."""
+    thickness = float(wall.get("thickness") or 0.0)
+    if thickness <= 0.0:
+        # 壁厚が取得できない場合は 300mm 程度を仮置き
+        thickness = default_thickness_mm
+    return thickness * 0.5 + margin_mm
+
+
+def build_wall_index(walls: Iterable[Dict[str, Any]], *, margin_mm: float = 5.0) -> SegmentGridIndex:
+    """Index get_walls rows ({elementId, start, end, thickness} in mm)."""
+    rows = [w for w in walls if w.get("start") and w.get("end")]
+    max_reach = max((wall_reach_mm(w, margin_mm=margin_mm) for w in rows), default=margin_mm)
+    index = SegmentGridIndex(max_reach)
+    for w in rows:
+        index.add(int(w["elementId"]), w["start"], w["end"], wall_reach_mm(w, margin_mm=margin_mm))
+    return index
+
+
+def build_join_plan(
+    index: SegmentGridIndex,
+    ends: Iterable[Tuple[int, Point]],
+) -> List[Dict[str, Any]]:
+    """
+    For each (wallId, endPoint) find the nearest other wall within reach and
+    return a deduplicated plan [{a, b, distanceMm}] (unordered pairs).
+    """
+    plan: List[Dict[str, Any]] = []
+    seen: Set[Tuple[int, int]] = set()
+    for wid, pt in ends:
+        hit = index.nearest(pt, exclude=int(wid))
+        if hit is None:
+            continue
+        other, d = hit
+        key = (min(int(wid), other), max(int(wid), other))
+        if key in seen:
+            continue
+        seen.add(key)
+        plan.append({"a": int(wid), "b": other, "distanceMm": d})
+    return plan
+
+
+def _batch_data(env: Any) -> Dict[str, Any]:
+    obj = env
+    for _ in range(3):
+        if isinstance(obj, dict) and "data" not in obj and isinstance(obj.get("result"), dict):
+            obj = obj["result"]
+    return (obj or {}).get("data") or {} if isinstance(obj, dict) else {}
+
+
+def _batch_payload_from_error(e: RevitMcpError) -> Optional[Dict[str, Any]]:
+    raw = (e.payload or {}).get("result_json")
+    if not isinstance(raw, str) or not raw.strip():
+        return None
+    try:
+        obj = json.loads(raw)
+    except ValueError:
+        return None
+    return obj if _batch_data(obj).get("results") else None
+
+
+def apply_join_plan(
+    port: int,
+    plan: Sequence[Dict[str, Any]],
+    *,
+    batch_size: int = 100,
+) -> List[Dict[str, Any]]:
+    """Run join_elements for every planned pair via revit.batch; returns per-pair results."""
+    results: List[Dict[str, Any]] = []
+    size = max(1, int(batch_size))
+    for offset in range(0, len(plan), size):
+        chunk = plan[offset:offset + size]
+        ops = [
+            {
+                "opId": i,
+                "method": "join_elements",
+                "params": {"elementIdA": int(j["a"]), "elementIdB": int(j["b"])},
+            }
+            for i, j in enumerate(chunk)
+        ]
+        try:
+            env: Any = send_request(
+                port,
+                "revit.batch",
+                {"ops": ops, "transaction": "perOp", "stopOnError": False},
+            )
+        except RevitMcpError as e:
+            # A batch with some failed ops may come back as a failed job;
+            # its result_json still carries the per-op results.
+            env = _batch_payload_from_error(e)
+            if env is None:
+                for j in chunk:
+                    results.append(dict(j, error=str(e)))
+                continue
+
+        data = _batch_data(env)
+        by_index = {int(r.get("index", -1)): (r.get("result") or {}) for r in data.get("results") or []}
+        for i, j in enumerate(chunk):
+            r = by_index.get(i)
+            if r is None:
+                results.append(dict(j, error="not executed"))
+            elif r.get("ok"):
+                results.append(dict(j))
+            else:
+                results.append(dict(j, error=r.get("msg") or r.get("code") or "join failed"))
+    return results
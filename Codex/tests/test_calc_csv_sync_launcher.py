@@ -0,0 +1,35 @@
+"""calc_csv_sync_launcher.merge_options (several wrappers -> one core run).
+
+    python -m unittest discover -s Codex/tests
+"""
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "PythonRunnerScripts"))
+from calc_csv_sync_launcher import merge_options  # type: ignore  # noqa: E402
+
+RC_COLUMN_LIST = {"kinds": ["columns"], "onlyColumnListSync": True, "columnListMode": "rc"}
+SRC_COLUMN_LIST = {"kinds": ["columns"], "onlyColumnListSync": True, "columnListMode": "src"}
+
+
+class MergeListModesTests(unittest.TestCase):
+    def test_unset_mode_does_not_override_explicit_one(self):
+        beam = {"kinds": ["frames"], "beamListMode": "rc"}
+        merged = merge_options([RC_COLUMN_LIST, beam])
+        self.assertEqual(merged["beamListMode"], "rc")
+        self.assertEqual(merged["columnListMode"], "rc")
+
+    def test_default_is_auto_when_no_wrapper_sets_it(self):
+        merged = merge_options([RC_COLUMN_LIST])
+        self.assertEqual(merged["beamListMode"], "auto")
+        self.assertEqual(merge_options([{"kinds": ["frames"]}])["columnListMode"], "auto")
+
+    def test_explicit_modes_still_merge(self):
+        self.assertEqual(merge_options([RC_COLUMN_LIST, SRC_COLUMN_LIST])["columnListMode"], "both")
+        self.assertEqual(merge_options([RC_COLUMN_LIST, {"kinds": ["columns"], "columnListMode": "none"}])["columnListMode"], "rc")
+        self.assertEqual(merge_options([RC_COLUMN_LIST, {"kinds": ["columns"], "columnListMode": "auto"}])["columnListMode"], "auto")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,102 @@
+"""Write -> read invalidation of rpc_singleflight.SingleFlight.
+
+    python -m unittest discover -s Codex/tests
+"""
+import sys
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "PythonRunnerScripts"))
+from rpc_singleflight import SingleFlight, category_of  # type: ignore  # noqa: E402
+
+
+class _Server:
+    """Counts fetches per read method."""
+
+    def __init__(self):
+        self.fetches = {}
+
+    def read(self, sf, method, params=None):
+        def fetch():
+            self.fetches[method] = self.fetches.get(method, 0) + 1
+            return {"ok": True, "method": method}
+        return sf.call(method, params or {}, fetch)
+
+
+class InvalidationTests(unittest.TestCase):
+    def assertDropped(self, write, read, params=None):
+        sf, srv = SingleFlight(), _Server()
+        srv.read(sf, read, params)
+        srv.read(sf, read, params)
+        self.assertEqual(srv.fetches[read], 1, "identical reads are coalesced")
+        sf.note_write(write)
+        srv.read(sf, read, params)
+        self.assertEqual(srv.fetches[read], 2, f"{write} must invalidate {read}")
+
+    def test_tags_in_view(self):
+        self.assertDropped("create_tag", "get_tags_in_view", {"viewId": 1})
+        self.assertDropped("delete_tag", "get_tags_in_view", {"viewId": 1})
+        self.assertDropped("element.create_tag", "element.get_tags_in_view")
+
+    def test_dimensions_in_view(self):
+        self.assertDropped("move_dimension", "get_dimensions_in_view", {"viewId": 1})
+        self.assertDropped("delete_dimension", "get_dimensions_in_view")
+
+    def test_unmapped_writes_clear_the_scope(self):
+        self.assertDropped("update_parameters_batch", "get_structural_frames")
+        self.assertDropped("update_parameters_batch", "get_tags_in_view")
+
+    def test_change_type_clears_instance_reads(self):
+        self.assertDropped("element.change_type", "element.get_structural_frames")
+        self.assertDropped("element.change_type", "get_walls")
+
+    def test_same_category(self):
+        self.assertDropped("update_structural_frame_parameter", "element.get_structural_frames")
+        self.assertDropped("update_level_elevation", "get_levels")
+
+    def test_general_write_drops_specific_reads(self):
+        self.assertDropped("move_wall", "get_wall_baseline", {"elementId": 1})
+        sf, srv = SingleFlight(), _Server()
+        srv.read(sf, "get_walls")
+        srv.read(sf, "get_wall_baseline", {"elementId": 1})
+        sf.note_write("move_wall")
+        srv.read(sf, "get_walls")
+        srv.read(sf, "get_wall_baseline", {"elementId": 1})
+        self.assertEqual(srv.fetches, {"get_walls": 2, "get_wall_baseline": 2})
+
+    def test_instance_writes_keep_type_reads(self):
+        sf, srv = SingleFlight(), _Server()
+        srv.read(sf, "get_structural_frames")
+        srv.read(sf, "get_structural_frame_types")
+        sf.note_write("update_structural_frame_parameter")
+        srv.read(sf, "get_structural_frames")
+        srv.read(sf, "get_structural_frame_types")
+        self.assertEqual(srv.fetches, {"get_structural_frames": 2, "get_structural_frame_types": 1})
+
+    def test_known_unrelated_write_keeps_reads(self):
+        sf, srv = SingleFlight(), _Server()
+        srv.read(sf, "get_levels")
+        srv.read(sf, "get_structural_frames")
+        sf.note_write("update_level_elevation")
+        srv.read(sf, "get_levels")
+        srv.read(sf, "get_structural_frames")
+        self.assertEqual(srv.fetches, {"get_levels": 2, "get_structural_frames": 1})
+
+    def test_type_writes_keep_instance_reads_apart(self):
+        sf, srv = SingleFlight(), _Server()
+        srv.read(sf, "get_structural_frames")
+        srv.read(sf, "get_structural_frame_types")
+        sf.note_write("update_structural_frame_type_parameter")
+        srv.read(sf, "get_structural_frames")
+        srv.read(sf, "get_structural_frame_types")
+        self.assertEqual(srv.fetches, {"get_structural_frames": 1, "get_structural_frame_types": 2})
+
+    def test_categories(self):
+        self.assertEqual(category_of("get_tags_in_view"), "tag_in_view")
+        self.assertEqual(category_of("get_dimensions_in_view"), "dimension_in_view")
+        self.assertEqual(category_of("element.change_type"), "type")
+        self.assertEqual(category_of("update_parameters_batch"), "parameter_batch")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,418 @@
+"""
+COM-free layer remapper for ASCII DXF files.
+
+Streams a DXF once (group code / value line pairs) and applies a
+pattern,targetLayer map to the LAYER table and to every group code 8
+(entity layer, $CLAYER, ...) in the same pass. Only the LAYER table is
+buffered; entities are written as they are read, so memory does not grow
+with the drawing.
+
+Rule semantics follow merge_dwgs_by_map_com.apply_layer_map():
+  - rules are applied in CSV order, case-insensitive fnmatch
+  - layers 0 / DEFPOINTS / *anonymous / xref-dependent (name contains "|")
+    are never moved
+  - several source layers may collapse into one target; the target LAYER
+    entry is kept (or the first source entry is renamed to it) and it is
+    thawed and unlocked like ensure_layer() does
+
+Usage:
+  python dxf_layer_remap.py --dxf a.dxf --map-csv layermap.csv
+  python dxf_layer_remap.py --dir out --pattern "*.dxf" --target A-WALL --out-dir remapped --jobs 8
+"""
+import argparse
+import csv
+import fnmatch
+import glob
+import os
+import sys
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+
+INVALID_LAYER_CHARS = '<>\\/:"?*|='
+
+# LAYER flags (group 70)
+_FLAG_FROZEN = 1
+_FLAG_LOCKED = 4
+_FLAG_XREF_DEPENDENT = 16
+
+
+def sanitize_layer_name(name):
+    text = str(name or "").strip()
+    for ch in INVALID_LAYER_CHARS:
+        text = text.replace(ch, "_")
+    return text if text else "Layer"
+
+
+def read_map_csv(path):
+    for enc in ("utf-8", "cp932"):
+        try:
+            rows = []
+            with open(path, "r", encoding=enc) as f:
+                for row in csv.reader(f):
+                    if not row:
+                        continue
+                    head = row[0].strip()
+                    if not head or head.startswith("#") or head.lower().startswith("pattern"):
+                        continue
+                    if len(row) < 2:
+                        continue
+                    pat = row[0].strip()
+                    tgt = row[1].strip()
+                    if pat and tgt:
+                        rows.append((pat, tgt))
+            if rows:
+                return rows
+        except Exception:
+            continue
+    raise RuntimeError(f"Failed to read map CSV: {path}")
+
+
+def should_skip_layer(name):
+    if not name:
+        return True
+    low = name.lower()
+    if low in ("0", "defpoints"):
+        return True
+    if name.startswith("*") or "|" in name:
+        return True
+    return False
+
+
+class LayerRemapper:
+    """Resolve a source layer name to its target (or None) with a per-name cache."""
+
+    def __init__(self, map_rows):
+        self.rules = [(pat.lower(), sanitize_layer_name(tgt)) for pat, tgt in map_rows]
+        self._cache = {}
+
+    def resolve(self, name):
+        key = (name or "").lower()
+        if key in self._cache:
+            return self._cache[key]
+        result = None
+        if not should_skip_layer(name):
+            current = name
+            for pat, tgt in self.rules:
+                # Same order as the COM version: a layer moved by an earlier
+                # rule can be picked up again by a later one.
+                if current.lower() == tgt.lower():
+                    continue
+                if fnmatch.fnmatchcase(current.lower(), pat):
+                    current = tgt
+            if current != name:
+                result = current
+        self._cache[key] = result
+        return result
+
+
+def _codepage_to_encoding(codepage):
+    cp = (codepage or "").strip().upper()
+    if cp.startswith("ANSI_"):
+        return "cp" + cp[5:]
+    return None
+
+
+def _split_value(line):
+    body = line.rstrip(b"\r\n")
+    return body, line[len(body):]
+
+
+def _iter_pairs(fp):
+    while True:
+        code = fp.readline()
+        if not code:
+            return
+        value = fp.readline()
+        yield code, value
+
+
+class _DxfStream:
+    def __init__(self, remapper):
+        self.remapper = remapper
+        self.encoding = "cp932"
+        self.stats = {"layersMapped": 0, "layerEntriesDropped": 0, "codes8Rewritten": 0}
+
+    def decode(self, body):
+        return body.decode(self.encoding, errors="surrogateescape")
+
+    def encode(self, text):
+        return text.encode(self.encoding, errors="surrogateescape")
+
+    def remap_value(self, value_line):
+        body, eol = _split_value(value_line)
+        target = self.remapper.resolve(self.decode(body).strip())
+        if target is None:
+            return value_line
+        self.stats["codes8Rewritten"] += 1
+        return self.encode(target) + eol
+
+    def write_layer_table(self, out, pairs):
+        """pairs: everything from the TABLE's '2 LAYER' up to (not including) ENDTAB."""
+        head = []
+        entries = []
+        for code, value in pairs:
+            if code.strip() == b"0":
+                entries.append([])
+            (entries[-1] if entries else head).append([code, value])
+
+        def entry_name(entry):
+            for code, value in entry:
+                if code.strip() == b"2":
+                    return self.decode(_split_value(value)[0]).strip()
+            return ""
+
+        def entry_flags(entry):
+            for code, value in entry:
+                if code.strip() == b"70":
+                    try:
+                        return int(_split_value(value)[0].strip() or b"0")
+                    except ValueError:
+                        return 0
+            return 0
+
+        present = set()
+        for entry in entries:
+            name = entry_name(entry)
+            if entry_flags(entry) & _FLAG_XREF_DEPENDENT or self.remapper.resolve(name) is None:
+                present.add(name.lower())
+
+        def thaw_unlock(entry):
+            for pair in entry:
+                if pair[0].strip() != b"70":
+                    continue
+                body, eol = _split_value(pair[1])
+                try:
+                    flags = int(body.strip() or b"0")
+                except ValueError:
+                    return
+                flags &= ~(_FLAG_FROZEN | _FLAG_LOCKED)
+                pair[1] = str(flags).rjust(len(body)).encode("ascii") + eol
+                return
+
+        kept = []
+        targets = set()
+        for entry in entries:
+            name = entry_name(entry)
+            target = None if entry_flags(entry) & _FLAG_XREF_DEPENDENT else self.remapper.resolve(name)
+            if target is None:
+                kept.append(entry)
+                continue
+            self.stats["layersMapped"] += 1
+            targets.add(target.lower())
+            if target.lower() in present:
+                self.stats["layerEntriesDropped"] += 1
+                continue
+            present.add(target.lower())
+            for pair in entry:
+                if pair[0].strip() == b"2":
+                    pair[1] = self.encode(target) + _split_value(pair[1])[1]
+            kept.append(entry)
+
+        # Target layers end up thawed and unlocked (ensure_layer() in the COM tools)
+        for entry in kept:
+            if entry_name(entry).lower() in targets:
+                thaw_unlock(entry)
+
+        for pair in head:
+            if pair[0].strip() == b"70":
+                body, eol = _split_value(pair[1])
+                pair[1] = str(len(kept)).rjust(len(body)).encode("ascii") + eol
+                break
+        for code, value in head:
+            out.write(code)
+            out.write(value)
+        for entry in kept:
+            for code, value in entry:
+                out.write(code)
+                out.write(value)
+
+    def run(self, src_fp, out):
+        header_var = None
+        pending_table = False
+        layer_buf = None
+        for code, value in _iter_pairs(src_fp):
+            c = code.strip()
+
+            if layer_buf is not None:
+                if c == b"0" and value.strip() == b"ENDTAB":
+                    self.write_layer_table(out, layer_buf)
+                    layer_buf = None
+                    out.write(code)
+                    out.write(value)
+                else:
+                    layer_buf.append((code, value))
+                continue
+
+            if c == b"9":
+                header_var = value.strip()
+            elif c == b"1" and header_var == b"$ACADVER":
+                # R2007+ DXF is always UTF-8
+                if value.strip() >= b"AC1021":
+                    self.encoding = "utf-8"
+            elif c == b"3" and header_var == b"$DWGCODEPAGE" and self.encoding != "utf-8":
+                enc = _codepage_to_encoding(value.decode("ascii", errors="ignore"))
+                if enc:
+                    try:
+                        "".encode(enc)
+                        self.encoding = enc
+                    except LookupError:
+                        pass
+            elif c == b"0":
+                header_var = None
+                pending_table = value.strip() == b"TABLE"
+            elif c == b"2" and pending_table:
+                pending_table = False
+                if value.strip() == b"LAYER":
+                    layer_buf = [(code, value)]
+                    continue
+            elif c == b"8":
+                value = self.remap_value(value)
+
+            out.write(code)
+            out.write(value)
+        return self.stats
+
+
+def _check_ascii_dxf(path):
+    with open(path, "rb") as f:
+        if f.read(22).startswith(b"AutoCAD Binary DXF"):
+            raise RuntimeError(f"Binary DXF is not supported: {path}")
+
+
+def remap_dxf(src, dst, map_rows):
+    """Remap layers of one DXF. dst may equal src (written via a temp file)."""
+    _check_ascii_dxf(src)
+    stream = _DxfStream(LayerRemapper(map_rows))
+    out_dir = os.path.dirname(os.path.abspath(dst)) or "."
+    fd, tmp = tempfile.mkstemp(prefix=".remap_", suffix=".dxf", dir=out_dir)
+    try:
+        with open(src, "rb") as fin, os.fdopen(fd, "wb", buffering=1 << 20) as fout:
+            stats = stream.run(fin, fout)
+        os.replace(tmp, dst)
+    except Exception:
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
+        raise
+    return stats
+
+
+def scan_layer_names(path):
+    """Return LAYER table names without writing anything (for --dry-run)."""
+    _check_ascii_dxf(path)
+    names = []
+    in_layer_table = False
+    in_entry = False
+    pending_table = False
+    enc = "cp932"
+    header_var = None
+    with open(path, "rb") as f:
+        for code, value in _iter_pairs(f):
+            c = code.strip()
+            v = value.strip()
+            if c == b"9":
+                header_var = v
+            elif c == b"1" and header_var == b"$ACADVER" and v >= b"AC1021":
+                enc = "utf-8"
+            elif c == b"0":
+                header_var = None
+                if in_layer_table and v == b"ENDTAB":
+                    break
+                pending_table = v == b"TABLE"
+                in_entry = in_layer_table and v == b"LAYER"
+            elif c == b"2" and pending_table:
+                pending_table = False
+                in_layer_table = v == b"LAYER"
+            elif c == b"2" and in_entry:
+                names.append(v.decode(enc, errors="replace"))
+                in_entry = False
+    return names
+
+
+def _remap_job(job):
+    src, dst, map_rows = job
+    try:
+        return src, remap_dxf(src, dst, map_rows), None
+    except Exception as exc:
+        return src, None, str(exc)
+
+
+def remap_many(jobs, max_workers=None):
+    """
+    jobs: iterable of (src, dst, map_rows). Files are processed in a process
+    pool; yields (src, stats, error) as each file finishes.
+    """
+    jobs = list(jobs)
+    if not jobs:
+        return
+    if max_workers == 1 or len(jobs) == 1:
+        for job in jobs:
+            yield _remap_job(job)
+        return
+    with ProcessPoolExecutor(max_workers=max_workers) as ex:
+        for result in ex.map(_remap_job, jobs):
+            yield result
+
+
+def collect_dxfs(args):
+    if args.dxf:
+        return [os.path.abspath(p) for p in args.dxf]
+    return sorted(os.path.abspath(p) for p in glob.glob(os.path.join(args.dir, args.pattern)))
+
+
+def main():
+    ap = argparse.ArgumentParser(description="Stream-remap DXF layers by pattern,targetLayer map (no AutoCAD).")
+    ap.add_argument("--dxf", action="append", help="DXF path (repeatable).")
+    ap.add_argument("--dir", help="Folder containing DXF files.")
+    ap.add_argument("--pattern", default="*.dxf", help="DXF filename pattern (default: *.dxf).")
+    ap.add_argument("--map-csv", help="CSV map: pattern,targetLayer.")
+    ap.add_argument("--target", help="Move every non-system layer to this layer (same as map '*,<target>').")
+    ap.add_argument("--out-dir", help="Write results here (default: overwrite in place).")
+    ap.add_argument("--jobs", type=int, default=0, help="Worker processes (default: CPU count).")
+    ap.add_argument("--dry-run", action="store_true", help="Print the layer mapping only.")
+    args = ap.parse_args()
+
+    if not args.dxf and not args.dir:
+        ap.error("Specify --dxf or --dir.")
+    if bool(args.map_csv) == bool(args.target):
+        ap.error("Specify exactly one of --map-csv or --target.")
+
+    map_rows = read_map_csv(args.map_csv) if args.map_csv else [("*", args.target)]
+    paths = collect_dxfs(args)
+    if not paths:
+        raise SystemExit("No DXF files found.")
+
+    if args.dry_run:
+        remapper = LayerRemapper(map_rows)
+        for path in paths:
+            for name in scan_layer_names(path):
+                target = remapper.resolve(name)
+                if target:
+                    print(f"[DRY] {os.path.basename(path)}: {name} -> {target}")
+        return
+
+    if args.out_dir:
+        os.makedirs(args.out_dir, exist_ok=True)
+    jobs = []
+    for path in paths:
+        dst = os.path.join(os.path.abspath(args.out_dir), os.path.basename(path)) if args.out_dir else path
+        jobs.append((path, dst, map_rows))
+
+    failed = 0
+    for src, stats, err in remap_many(jobs, max_workers=args.jobs or None):
+        if err:
+            failed += 1
+            print(f"[NG] {os.path.basename(src)}: {err}")
+        else:
+            print(
+                f"[OK] {os.path.basename(src)} (layers={stats['layersMapped']}, "
+                f"dropped={stats['layerEntriesDropped']}, moved={stats['codes8Rewritten']})"
+            )
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,10 +1,11 @@
 import argparse
 import csv
-import fnmatch
 import glob
 import os
 import sys
 
+from dxf_layer_remap import LayerRemapper
+
 try:
     import pythoncom
     import win32com.client
@@ -76,13 +77,17 @@ def ensure_layer(doc, name):
     return layer
 
 
-def move_entities_to_layer(doc, from_name, to_name):
+def move_entities_by_map(doc, layer_map):
+    """One pass over every entity: layer_map is {sourceLayer.lower(): targetLayer}."""
     moved = 0
     for blk in doc.Blocks:
         for ent in blk:
             try:
-                if hasattr(ent, "Layer") and ent.Layer.lower() == from_name.lower():
-                    ent.Layer = to_name
+                if not hasattr(ent, "Layer"):
+                    continue
+                target = layer_map.get(ent.Layer.lower())
+                if target is not None:
+                    ent.Layer = target
                     moved += 1
             except Exception:
                 continue
@@ -90,28 +95,30 @@ def move_entities_to_layer(doc, from_name, to_name):
 
 
 def apply_layer_map(doc, map_rows):
-    total_moves = 0
-    total_layers = 0
-    for pat, tgt in map_rows:
-        target = ensure_layer(doc, sanitize_layer_name(tgt)).Name
-        matches = []
-        for i in range(doc.Layers.Count):
-            layer = doc.Layers.Item(i)
-            name = layer.Name
-            if should_skip_layer(name):
-                continue
-            if name.lower() == target.lower():
-                continue
-            if fnmatch.fnmatchcase(name.lower(), pat.lower()):
-                matches.append(name)
-        for name in matches:
-            total_layers += 1
-            total_moves += move_entities_to_layer(doc, name, target)
-            try:
-                doc.Layers.Item(name).Delete()
-            except Exception:
-                pass
-    return total_layers, total_moves
+    # Resolve every layer against the whole map first (same rule order as
+    # dxf_layer_remap), then walk the entities once instead of once per layer.
+    remapper = LayerRemapper(map_rows)
+    layer_map = {}
+    for i in range(doc.Layers.Count):
+        name = doc.Layers.Item(i).Name
+        target = remapper.resolve(name)
+        if target is not None:
+            layer_map[name.lower()] = target
+    if not layer_map:
+        return 0, 0
+
+    targets = {}
+    for target in set(layer_map.values()):
+        targets[target.lower()] = ensure_layer(doc, target).Name
+    layer_map = {src: targets[tgt.lower()] for src, tgt in layer_map.items()}
+
+    total_moves = move_entities_by_map(doc, layer_map)
+    for src in layer_map:
+        try:
+            doc.Layers.Item(src).Delete()
+        except Exception:
+            pass
+    return len(layer_map), total_moves
 
 
 def collect_dwgs(source_dir, pattern, out_name, seed_name):
@@ -5,6 +5,8 @@ import subprocess
 import sys
 import tempfile
 
+from dxf_layer_remap import remap_many
+
 try:
     import win32com.client
 except Exception:
@@ -65,12 +67,13 @@ def ensure_layer(doc, name):
     return layer
 
 
-def move_entities_to_layer(doc, from_name, to_name):
+def move_entities_to_layer(doc, from_names, to_name):
+    """One pass over every entity, moving anything on a layer in from_names (lowercased set)."""
     moved = 0
     for blk in doc.Blocks:
         for ent in blk:
             try:
-                if hasattr(ent, "Layer") and ent.Layer.lower() == from_name.lower():
+                if hasattr(ent, "Layer") and ent.Layer.lower() in from_names:
                     ent.Layer = to_name
                     moved += 1
             except Exception:
@@ -92,16 +95,16 @@ def merge_layers_to_target(doc, target_name, dry_run=False):
         layer_names.append(layer.Name)
 
     total_moved = 0
-    for name in layer_names:
-        if dry_run:
+    if dry_run:
+        for name in layer_names:
             print(f"[DRY] merge {name} -> {target_name}")
-            continue
-        moved = move_entities_to_layer(doc, name, target_name)
-        total_moved += moved
-        try:
-            doc.Layers.Item(name).Delete()
-        except Exception:
-            pass
+    elif layer_names:
+        total_moved = move_entities_to_layer(doc, {n.lower() for n in layer_names}, target_name)
+        for name in layer_names:
+            try:
+                doc.Layers.Item(name).Delete()
+            except Exception:
+                pass
 
     if not dry_run:
         try:
@@ -111,16 +114,16 @@ def merge_layers_to_target(doc, target_name, dry_run=False):
     return total_moved, len(layer_names)
 
 
-def iter_dwg_paths(args):
+def iter_dwg_paths(args, ext=".dwg"):
     if args.dwg:
         yield os.path.abspath(args.dwg)
         return
     prefix = args.file_prefix or ""
-    pattern = args.pattern or f"{prefix}_*.dwg"
+    pattern = args.pattern or f"{prefix}_*{ext}"
     for name in sorted(os.listdir(args.dir)):
-        if not name.lower().endswith(".dwg"):
+        if not name.lower().endswith(ext):
             continue
-        if pattern != "*.dwg" and not fnmatch(name, pattern):
+        if pattern != f"*{ext}" and not fnmatch(name, pattern):
             continue
         yield os.path.abspath(os.path.join(args.dir, name))
 
@@ -233,11 +236,39 @@ def run_accore(path, target, accore_path, locale, timeout_sec, dry_run=False):
     return True
 
 
+def process_dxfs(args):
+    """
+    DXF mode: no AutoCAD needed. Every non-system layer of each file goes to
+    the file's CAT_/PARAM_/VAL_ layer, rewritten in place by dxf_layer_remap
+    (one file per worker process).
+    """
+    jobs = []
+    for path in iter_dwg_paths(args, ext=".dxf"):
+        if not os.path.exists(path):
+            print(f"[SKIP] missing: {path}")
+            continue
+        value = args.param_value or extract_param_value(path, args.file_prefix)
+        target = sanitize_layer_name(f"CAT_{args.category}__PARAM_{args.param_name}__VAL_{value}")
+        if args.dry_run:
+            print(f"[DRY] {os.path.basename(path)}: * -> {target}")
+            continue
+        jobs.append((path, path, [("*", target)]))
+
+    for src, stats, err in remap_many(jobs, max_workers=args.jobs):
+        if err:
+            print(f"[ERR] {os.path.basename(src)}: {err}")
+            continue
+        print(
+            f"[OK] {os.path.basename(src)}: layers={stats['layersMapped']} "
+            f"codes8={stats['codes8Rewritten']}"
+        )
+
+
 def main():
     ap = argparse.ArgumentParser(
         description="Rename/merge layers in DWG files by export_dwg_by_param_groups metadata."
     )
-    ap.add_argument("--dwg", help="Single DWG path.")
+    ap.add_argument("--dwg", help="Single DWG path (or DXF path with --dxf).")
     ap.add_argument("--dir", help="Folder containing DWG files.")
     ap.add_argument("--pattern", help="Filename pattern (default: <prefix>_*.dwg).")
     ap.add_argument("--file-prefix", dest="file_prefix", help="DWG prefix from export_dwg_by_param_groups.")
@@ -249,6 +280,8 @@ def main():
     ap.add_argument("--accore", default=r"C:/Program Files/Autodesk/AutoCAD 2026/accoreconsole.exe", help="accoreconsole.exe path.")
     ap.add_argument("--locale", default="ja-JP", help="accoreconsole locale.")
     ap.add_argument("--timeout-sec", type=int, default=300, help="accoreconsole timeout in seconds.")
+    ap.add_argument("--dxf", action="store_true", help="Process ASCII DXF files directly (no AutoCAD; default pattern <prefix>_*.dxf).")
+    ap.add_argument("--jobs", type=int, default=None, help="Worker processes for --dxf (default: CPU count).")
 
     args = ap.parse_args()
     if not args.dwg and not args.dir:
@@ -256,6 +289,10 @@ def main():
     if args.dir and not args.file_prefix and not args.pattern:
         ap.error("--dir requires --file-prefix or --pattern to identify DWGs.")
 
+    if args.dxf:
+        process_dxfs(args)
+        return
+
     if args.force_accore or win32com is None:
         acad = None
     else:
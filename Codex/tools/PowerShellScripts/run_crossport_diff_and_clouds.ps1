@@ -77,8 +77,8 @@ Write-Host "Creating snapshots for $LeftPort and $RightPort" -ForegroundColor Cy
 # Ensure same base view name is active on both ports before snapshot
 Activate-BaseView -Port $LeftPort -Name $BaseViewName
 Activate-BaseView -Port $RightPort -Name $BaseViewName
-& pwsh -NoProfile -File (Join-Path $SCRIPT_DIR 'create_structural_details_snapshot.ps1') -Port $LeftPort -DeleteOld | Tee-Object -FilePath (Join-Path $ROOT 'Projects\\snap_left.log') | Out-Null
-& pwsh -NoProfile -File (Join-Path $SCRIPT_DIR 'create_structural_details_snapshot.ps1') -Port $RightPort -DeleteOld | Tee-Object -FilePath (Join-Path $ROOT 'Projects\\snap_right.log') | Out-Null
+# Both ports are snapshotted concurrently (same content as create_structural_details_snapshot.ps1)
+python -X utf8 (Join-Path $ROOT 'PythonRunnerScripts\\snapshot_all_ports.py') --ports "$LeftPort,$RightPort" --structural-details --delete-old --out-dir (Join-Path $ROOT 'Work\\crossport_snapshots') --wait-seconds $JobTimeoutSec | Tee-Object -FilePath (Join-Path $ROOT 'Projects\\snap_ports.log') | Out-Null
 
 function Get-LatestSnapshot([int]$Port){
   $pattern = "structural_details_port{0}_*.json" -f $Port
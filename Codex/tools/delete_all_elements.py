@@ -1,5 +1,6 @@
 import argparse
 import json
+from tools.mcp_journal import OpJournal, journaled_call
 from tools.mcp_safe import call_mcp
 
 
@@ -10,70 +11,47 @@ def unwrap(x):
     return top if isinstance(top, dict) else {}
 
 
+# (label, list method, list key, count, delete method)
+TARGETS = [
+    ('rooms', 'get_rooms', 'rooms', 20000, 'delete_room'),
+    ('doors', 'get_doors', 'doors', 20000, 'delete_door'),
+    ('windows', 'get_windows', 'windows', 20000, 'delete_window'),
+    ('walls', 'get_walls', 'walls', 50000, 'delete_wall'),
+    ('grids', 'get_grids', 'grids', 20000, 'delete_grid'),
+]
+
+
 def main():
     ap = argparse.ArgumentParser(description='Delete most elements (rooms, doors, windows, walls, grids); levels are kept')
     ap.add_argument('--port', type=int, required=True)
+    ap.add_argument('--journal', type=str, default=None,
+                    help='Write-ahead journal (JSONL). Re-run with the same path to resume without re-listing the model')
     args = ap.parse_args()
     p = args.port
-
-    # Rooms
-    try:
-        rooms = unwrap(call_mcp(p, 'get_rooms', {'skip':0,'count':20000})).get('rooms', [])
-        for r in rooms:
-            try:
-                call_mcp(p, 'delete_room', {'elementId': int(r.get('elementId'))})
-            except Exception:
-                pass
-    except Exception:
-        pass
-
-    # Doors
-    try:
-        doors = unwrap(call_mcp(p, 'get_doors', {'skip':0,'count':20000})).get('doors', [])
-        for d in doors:
-            try:
-                call_mcp(p, 'delete_door', {'elementId': int(d.get('elementId'))})
-            except Exception:
-                pass
-    except Exception:
-        pass
-
-    # Windows
-    try:
-        wins = unwrap(call_mcp(p, 'get_windows', {'skip':0,'count':20000})).get('windows', [])
-        for w in wins:
-            try:
-                call_mcp(p, 'delete_window', {'elementId': int(w.get('elementId'))})
-            except Exception:
-                pass
-    except Exception:
-        pass
-
-    # Walls
-    try:
-        walls = unwrap(call_mcp(p, 'get_walls', {'skip':0,'count':50000})).get('walls', [])
-        for w in walls:
+    journal = OpJournal(args.journal, tool='delete_all_elements') if args.journal else None
+
+    for label, list_method, list_key, count, delete_method in TARGETS:
+        def list_ids():
+            items = unwrap(call_mcp(p, list_method, {'skip': 0, 'count': count})).get(list_key, [])
+            return [int(v) for v in (x.get('elementId') or x.get('id') for x in items) if v]
+
+        try:
+            # the id list is journaled, so a resumed run deletes what the first run listed
+            ids = journal.memo(label, list_ids) if journal is not None else list_ids()
+        except Exception:
+            continue
+        for eid in ids:
             try:
-                call_mcp(p, 'delete_wall', {'elementId': int(w.get('elementId') or w.get('id'))})
+                journaled_call(journal, f'{delete_method}:{eid}', p, delete_method, {'elementId': eid})
             except Exception:
                 pass
-    except Exception:
-        pass
 
-    # Grids
-    try:
-        grids = unwrap(call_mcp(p, 'get_grids', {'skip':0,'count':20000})).get('grids', [])
-        for g in grids:
-            try:
-                call_mcp(p, 'delete_grid', {'elementId': int(g.get('elementId') or g.get('id'))})
-            except Exception:
-                pass
-    except Exception:
-        pass
-
-    print(json.dumps({'ok': True, 'deleted': True}, ensure_ascii=False))
+    out = {'ok': True, 'deleted': True}
+    if journal is not None:
+        out['journal'] = journal.stats()
+        journal.close()
+    print(json.dumps(out, ensure_ascii=False))
 
 
 if __name__ == '__main__':
     main()
-
@@ -1,8 +1,9 @@
 import argparse
 import json
 from pathlib import Path
-from typing import Any, Dict, List, Tuple
+from typing import Any, Dict, List, Optional, Tuple
 
+from tools.mcp_journal import OpJournal, journaled_call
 from tools.mcp_safe import call_mcp
 
 
@@ -32,6 +33,8 @@ def main() -> None:
     ap.add_argument("--ref-id", type=int, required=True)
     ap.add_argument("--target-length-mm", type=float, default=2300.0)
     ap.add_argument("--out", type=str, default=str(Path("Work")/"大阪ビル"/"Logs"/"fix_scaled_walls_report.json"))
+    ap.add_argument("--journal", type=str, default=None,
+                    help="Write-ahead journal (JSONL). Re-run with the same path to resume without re-reading the model")
     args = ap.parse_args()
 
     port = args.port
@@ -45,10 +48,6 @@ def main() -> None:
         print(json.dumps({"ok": False, "error": "No walls in snapshot"}, ensure_ascii=False))
         return
 
-    # Build levels map
-    lv = unwrap(call_mcp(port, "get_levels", {"skip": 0, "count": 1000}))
-    lvl_by_id = {int(L.get("levelId")): str(L.get("name")) for L in (lv.get("levels") or [])}
-
     # Origin from baseline walls (left-bottom)
     minx = min(float((w.get("start") or {}).get("x", 0.0)) for w in base_walls)
     minx = min(minx, min(float((w.get("end") or {}).get("x", 0.0)) for w in base_walls))
@@ -78,57 +77,65 @@ def main() -> None:
         ny = oy + scale * (y - oy)
         return q10(nx), q10(ny)
 
-    # Expected segments after transform
-    expected: List[Dict[str, Any]] = []
-    for w in base_walls:
-        bs = w.get("start") or {}; be = w.get("end") or {}
-        bx1, by1 = float(bs.get("x", 0)), float(bs.get("y", 0))
-        bx2, by2 = float(be.get("x", 0)), float(be.get("y", 0))
-        ex1, ey1 = transform_xy(bx1, by1)
-        ex2, ey2 = transform_xy(bx2, by2)
-        expected.append({
-            "start": (ex1, ey1),
-            "end": (ex2, ey2),
-            "z": float(bs.get("z", 0)),
-            "levelId": int(w.get("levelId") or 0),
-            "levelName": w.get("levelName") or lvl_by_id.get(int(w.get("levelId") or 0)) or "1FL",
-            "typeName": w.get("typeName") or None,
-            "height": w.get("height") or "level-to-level",
-        })
-
-    exp_keys = [seg_key(t["start"], t["end"]) for t in expected]
-
-    # Current walls
-    cur = unwrap(call_mcp(port, "get_walls", {"skip": 0, "count": 50000}))
-    cur_walls: List[Dict[str, Any]] = list(cur.get("walls") or [])
-    cur_map: Dict[Tuple[float, float, float, float], List[int]] = {}
-    cur_items: Dict[Tuple[float, float, float, float], Dict[str, Any]] = {}
-    for w in cur_walls:
-        s = w.get("start") or {}; e = w.get("end") or {}
-        cx1, cy1 = float(s.get("x", 0)), float(s.get("y", 0))
-        cx2, cy2 = float(e.get("x", 0)), float(e.get("y", 0))
-        k = seg_key((cx1, cy1), (cx2, cy2))
-        cur_map.setdefault(k, []).append(int(w.get("elementId") or w.get("id") or 0))
-        cur_items.setdefault(k, w)
-
-    # Determine duplicates and missing
-    duplicates: List[int] = []
-    for k, ids in cur_map.items():
-        if len(ids) > 1:
-            duplicates.extend(ids[1:])  # keep first, delete the rest
-
-    missing: List[int] = []
-    to_create: List[Dict[str, Any]] = []
-    for idx, k in enumerate(exp_keys):
-        if k not in cur_map:
-            missing.append(idx)
-            to_create.append(expected[idx])
+    def build_plan() -> Dict[str, Any]:
+        # Build levels map
+        lv = unwrap(call_mcp(port, "get_levels", {"skip": 0, "count": 1000}))
+        lvl_by_id = {int(L.get("levelId")): str(L.get("name")) for L in (lv.get("levels") or [])}
+
+        # Expected segments after transform
+        expected: List[Dict[str, Any]] = []
+        for w in base_walls:
+            bs = w.get("start") or {}; be = w.get("end") or {}
+            bx1, by1 = float(bs.get("x", 0)), float(bs.get("y", 0))
+            bx2, by2 = float(be.get("x", 0)), float(be.get("y", 0))
+            ex1, ey1 = transform_xy(bx1, by1)
+            ex2, ey2 = transform_xy(bx2, by2)
+            expected.append({
+                "start": (ex1, ey1),
+                "end": (ex2, ey2),
+                "z": float(bs.get("z", 0)),
+                "levelId": int(w.get("levelId") or 0),
+                "levelName": w.get("levelName") or lvl_by_id.get(int(w.get("levelId") or 0)) or "1FL",
+                "typeName": w.get("typeName") or None,
+                "height": w.get("height") or "level-to-level",
+            })
+
+        exp_keys = [seg_key(t["start"], t["end"]) for t in expected]
+
+        # Current walls
+        cur = unwrap(call_mcp(port, "get_walls", {"skip": 0, "count": 50000}))
+        cur_walls: List[Dict[str, Any]] = list(cur.get("walls") or [])
+        cur_map: Dict[Tuple[float, float, float, float], List[int]] = {}
+        for w in cur_walls:
+            s = w.get("start") or {}; e = w.get("end") or {}
+            cx1, cy1 = float(s.get("x", 0)), float(s.get("y", 0))
+            cx2, cy2 = float(e.get("x", 0)), float(e.get("y", 0))
+            k = seg_key((cx1, cy1), (cx2, cy2))
+            cur_map.setdefault(k, []).append(int(w.get("elementId") or w.get("id") or 0))
+
+        # Determine duplicates and missing
+        duplicates: List[int] = []
+        for k, ids in cur_map.items():
+            if len(ids) > 1:
+                duplicates.extend(ids[1:])  # keep first, delete the rest
+
+        to_create: List[Dict[str, Any]] = []
+        for idx, k in enumerate(exp_keys):
+            if k not in cur_map:
+                to_create.append({"index": idx, **expected[idx]})
+        return {"duplicates": duplicates, "toCreate": to_create}
+
+    # the plan is the only model read; a resumed run takes it from the journal
+    journal: Optional[OpJournal] = OpJournal(args.journal, tool="fix_scaled_walls_from_snapshot") if args.journal else None
+    plan = journal.memo("plan", build_plan) if journal is not None else build_plan()
+    duplicates: List[int] = list(plan["duplicates"])
+    to_create: List[Dict[str, Any]] = list(plan["toCreate"])
 
     # Delete duplicates
     deleted = 0
     for wid in duplicates:
         try:
-            call_mcp(port, "delete_wall", {"elementId": wid})
+            journaled_call(journal, f"delete:{wid}", port, "delete_wall", {"elementId": wid})
             deleted += 1
         except Exception:
             pass
@@ -145,13 +152,16 @@ def main() -> None:
         }
         if t.get("typeName"):
             payload["wallTypeName"] = t["typeName"]
+        key = f"create:{t['index']}"
         try:
-            res = unwrap(call_mcp(port, "create_wall", payload))
+            res = unwrap(journaled_call(journal, key, port, "create_wall", payload))
             nid = int(res.get("elementId") or 0)
             if nid > 0:
                 created.append(nid)
             else:
                 failures.append({"payload": payload, "res": res})
+                if journal is not None:
+                    journal.mark_failed(key, res)
         except Exception as ex:
             failures.append({"payload": payload, "error": str(ex)})
 
@@ -164,6 +174,9 @@ def main() -> None:
         "createdIds": created,
         "failures": failures,
     }
+    if journal is not None:
+        report["journal"] = journal.stats()
+        journal.close()
     out_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
     print(json.dumps(report, ensure_ascii=False))
 
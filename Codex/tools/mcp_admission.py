@@ -0,0 +1,265 @@
+"""Cross-process admission control for one Revit MCP port.
+
+Every script that goes through mcp_safe.call_mcp for the same port shares a
+small state file under %LOCALAPPDATA%/RevitMCP/admission/port_<port>.json,
+guarded by an OS file lock:
+
+- token bucket (rate / burst) so callers queue locally instead of piling
+  onto the durable queue and all getting 409 at once
+- blocked_until: a busy/409 reply (or its Retry-After) pauses the whole port
+  for everyone, not just the process that saw it
+- circuit breaker: after repeated timeouts / connection errors the port is
+  "open"; one process probes GET /health after the cool-down and closes it
+
+Waits are jittered per process so sleepers do not wake in lock-step.
+
+Env overrides: REVIT_MCP_ADMISSION_RATE, REVIT_MCP_ADMISSION_BURST,
+REVIT_MCP_ADMISSION_DIR, REVIT_MCP_ADMISSION=0 (disable).
+"""
+import json
+import os
+import random
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional
+
+if os.name == "nt":
+    import msvcrt
+else:
+    import fcntl
+
+
+DEFAULT_RATE = 4.0          # admitted calls per second (sustained)
+DEFAULT_BURST = 4.0
+BUSY_BASE_WAIT = 0.5        # first busy backoff (s), doubled per consecutive busy
+BUSY_MAX_WAIT = 8.0
+BREAKER_THRESHOLD = 3       # consecutive failures before opening
+BREAKER_COOLDOWN = 5.0      # s before the first /health probe
+BREAKER_MAX_COOLDOWN = 60.0
+PROBE_TIMEOUT = 3.0
+
+
+class AdmissionTimeout(Exception):
+    pass
+
+
+def _state_dir() -> Path:
+    env = os.environ.get("REVIT_MCP_ADMISSION_DIR")
+    if env:
+        return Path(env)
+    base = os.environ.get("LOCALAPPDATA") or os.environ.get("TMPDIR") or "/tmp"
+    return Path(base) / "RevitMCP" / "admission"
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, "") or default)
+    except ValueError:
+        return default
+
+
+@contextmanager
+def _file_lock(path: Path) -> Iterator[None]:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "a+b") as fh:
+        if os.name == "nt":
+            fh.seek(0)
+            while True:
+                try:
+                    msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
+                    break
+                except OSError:
+                    time.sleep(0.01)
+            try:
+                yield
+            finally:
+                fh.seek(0)
+                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
+        else:
+            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
+
+
+def retry_after_seconds(err: Any = None, payload: Optional[Dict[str, Any]] = None) -> Optional[float]:
+    """Retry-After hint from an exception (retry_after / headers) or a JSON payload."""
+    for src in (err, payload):
+        if src is None:
+            continue
+        val: Any = getattr(src, "retry_after", None)
+        headers = getattr(src, "headers", None)
+        if val is None and headers is not None:
+            try:
+                val = headers.get("Retry-After")
+            except Exception:
+                val = None
+        if val is None and isinstance(src, dict):
+            if src.get("retryAfterMs") is not None:
+                try:
+                    return max(0.0, float(src["retryAfterMs"]) / 1000.0)
+                except (TypeError, ValueError):
+                    pass
+            val = src.get("retryAfter") or src.get("retry_after") or src.get("Retry-After")
+        if val is not None:
+            try:
+                return max(0.0, float(val))
+            except (TypeError, ValueError):
+                continue
+    return None
+
+
+class PortAdmission:
+    """Shared token bucket + busy gate + circuit breaker for one port."""
+
+    def __init__(self, port: int, *, rate: Optional[float] = None, burst: Optional[float] = None,
+                 base_url: Optional[str] = None):
+        self.port = int(port)
+        self.rate = max(0.01, rate if rate is not None else _env_float("REVIT_MCP_ADMISSION_RATE", DEFAULT_RATE))
+        self.burst = max(1.0, burst if burst is not None else _env_float("REVIT_MCP_ADMISSION_BURST", DEFAULT_BURST))
+        self.base_url = base_url or f"http://localhost:{self.port}"
+        d = _state_dir()
+        self._state_path = d / f"port_{self.port}.json"
+        self._lock_path = d / f"port_{self.port}.lock"
+
+    # ---- state file -------------------------------------------------
+    def _load(self) -> Dict[str, Any]:
+        try:
+            with open(self._state_path, "r", encoding="utf-8") as f:
+                st = json.load(f)
+            if isinstance(st, dict):
+                return st
+        except (OSError, ValueError):
+            pass
+        return {"tokens": self.burst, "refill_at": time.time(), "blocked_until": 0.0, "busy_streak": 0,
+                "failures": 0, "breaker": "closed", "open_until": 0.0, "cooldown": BREAKER_COOLDOWN}
+
+    def _save(self, st: Dict[str, Any]) -> None:
+        tmp = self._state_path.with_suffix(f".{os.getpid()}.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(st, f)
+        os.replace(tmp, self._state_path)
+
+    @contextmanager
+    def _state(self) -> Iterator[Dict[str, Any]]:
+        with _file_lock(self._lock_path):
+            st = self._load()
+            yield st
+            self._save(st)
+
+    def _refill(self, st: Dict[str, Any], now: float) -> None:
+        # no tokens accrue while the port is paused, so waiters do not stampede when it reopens
+        start = max(float(st.get("refill_at", now)), float(st.get("blocked_until", 0.0)))
+        elapsed = max(0.0, now - start)
+        st["tokens"] = min(self.burst, float(st.get("tokens", self.burst)) + elapsed * self.rate)
+        st["refill_at"] = max(now, start)
+
+    # ---- public -----------------------------------------------------
+    def acquire(self, timeout: Optional[float] = None) -> None:
+        """Block until this process may send one request to the port."""
+        deadline = None if timeout is None else time.time() + timeout
+        while True:
+            probe = False
+            with self._state() as st:
+                now = time.time()
+                self._refill(st, now)
+                wait = 0.0
+                if st.get("breaker") == "open":
+                    if now >= float(st.get("open_until", 0.0)):
+                        # this process owns the probe; others keep waiting
+                        st["breaker"] = "half_open"
+                        st["open_until"] = now + PROBE_TIMEOUT + 1.0
+                        probe = True
+                    else:
+                        wait = float(st["open_until"]) - now
+                elif st.get("breaker") == "half_open":
+                    if now >= float(st.get("open_until", 0.0)):
+                        st["breaker"] = "open"  # the prober died; let someone else try
+                    wait = max(0.2, float(st.get("open_until", 0.0)) - now)
+                elif now < float(st.get("blocked_until", 0.0)):
+                    wait = float(st["blocked_until"]) - now
+                elif st["tokens"] >= 1.0:
+                    st["tokens"] -= 1.0
+                    return
+                else:
+                    wait = (1.0 - st["tokens"]) / self.rate
+
+            if probe:
+                self._probe()
+                continue
+
+            wait = wait + random.uniform(0.0, min(1.0, 0.25 + wait * 0.25))
+            if deadline is not None:
+                left = deadline - time.time()
+                if left <= 0:
+                    raise AdmissionTimeout(f"admission to port {self.port} timed out")
+                wait = min(wait, left)
+            time.sleep(wait)
+
+    def report_success(self) -> None:
+        with self._state() as st:
+            st["busy_streak"] = 0
+            st["failures"] = 0
+            if st.get("breaker") != "closed":
+                st["breaker"] = "closed"
+                st["cooldown"] = BREAKER_COOLDOWN
+
+    def report_busy(self, retry_after: Optional[float] = None) -> float:
+        """409 / REQUEST_IN_PROGRESS: pause the port for every process. Returns the pause."""
+        with self._state() as st:
+            now = time.time()
+            streak = int(st.get("busy_streak", 0)) + 1
+            st["busy_streak"] = streak
+            if retry_after is not None:
+                pause = retry_after
+            else:
+                pause = random.uniform(BUSY_BASE_WAIT, min(BUSY_MAX_WAIT, BUSY_BASE_WAIT * (2 ** streak)))
+            st["blocked_until"] = max(float(st.get("blocked_until", 0.0)), now + pause)
+            st["tokens"] = 0.0
+            return pause
+
+    def report_failure(self) -> None:
+        """Timeout / connection error. Opens the breaker after BREAKER_THRESHOLD in a row."""
+        with self._state() as st:
+            st["failures"] = int(st.get("failures", 0)) + 1
+            if st["failures"] >= BREAKER_THRESHOLD and st.get("breaker") == "closed":
+                st["breaker"] = "open"
+                st["cooldown"] = BREAKER_COOLDOWN
+                st["open_until"] = time.time() + BREAKER_COOLDOWN
+
+    def _probe(self) -> None:
+        import urllib.request  # only needed once the breaker trips; slow to import
+
+        ok = False
+        try:
+            with urllib.request.urlopen(f"{self.base_url}/health", timeout=PROBE_TIMEOUT) as r:
+                body = json.loads(r.read().decode("utf-8") or "{}")
+                ok = r.status == 200 and (body.get("ok") is True or body.get("status") == "ok")
+        except Exception:
+            ok = False
+        with self._state() as st:
+            if ok:
+                st["breaker"] = "closed"
+                st["failures"] = 0
+                st["cooldown"] = BREAKER_COOLDOWN
+            else:
+                cooldown = min(BREAKER_MAX_COOLDOWN, float(st.get("cooldown", BREAKER_COOLDOWN)) * 2)
+                st["breaker"] = "open"
+                st["cooldown"] = cooldown
+                st["open_until"] = time.time() + cooldown
+
+
+_GATES: Dict[int, PortAdmission] = {}
+
+
+def admission_enabled() -> bool:
+    return os.environ.get("REVIT_MCP_ADMISSION", "1").strip().lower() not in ("0", "false", "off", "no")
+
+
+def get_admission(port: int) -> PortAdmission:
+    gate = _GATES.get(int(port))
+    if gate is None:
+        gate = _GATES[int(port)] = PortAdmission(port)
+    return gate
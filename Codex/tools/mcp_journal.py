@@ -0,0 +1,248 @@
+"""Write-ahead journal for mutating batch tools (resume without re-running applied ops).
+
+Every write goes through OpJournal.run(key, method, params, send):
+
+    {"t": "intent", "key": k, "method": ..., "params": ..., "idem": ...}   # fsynced before sending
+    {"t": "done",   "key": k, "result": ...}                              # after the reply
+    {"t": "failed", "key": k, "error": ...}
+
+One JSON object per line, append-only. Re-opening the same file resumes:
+
+- done    -> the recorded result is returned, nothing is sent
+- pending -> (intent without outcome: the process died mid-call) sent again
+             with the same idempotency key, so the durable queue hands back
+             the original job instead of executing it twice
+- failed  -> retried under a new key (<key>#<attempt>)
+
+Keys are chosen by the caller and must identify the op in its input
+(snapshot index, element id, level/circuit, ...); a key recorded with
+different method/params raises JournalConflict. memo(name, fn) records the
+reads a tool needs to build its op list, so a resumed run does not query the
+model again.
+
+A truncated last line (crash while writing) is ignored on replay.
+"""
+import hashlib
+import json
+import os
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+DONE = "done"
+FAILED = "failed"
+PENDING = "pending"
+
+
+class JournalConflict(Exception):
+    pass
+
+
+class JournaledOpFailed(Exception):
+    def __init__(self, key: str, error: Any):
+        super().__init__(f"[{key}] {error}")
+        self.key = key
+        self.error = error
+
+
+def _digest(method: str, params: Optional[Dict[str, Any]]) -> str:
+    blob = json.dumps([method, params or {}], sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+    return hashlib.sha1(blob.encode("utf-8")).hexdigest()
+
+
+def op_key(*parts: Any) -> str:
+    """Stable key from input identifiers, e.g. op_key("wall", index)."""
+    return ":".join(str(p) for p in parts)
+
+
+class _Op:
+    __slots__ = ("state", "digest", "idem", "attempts", "result", "error")
+
+    def __init__(self, digest: str, idem: str):
+        self.state = PENDING
+        self.digest = digest
+        self.idem = idem
+        self.attempts = 1
+        self.result: Any = None
+        self.error: Any = None
+
+
+class OpJournal:
+    """Append-only op log for one tool run (resumable by re-opening the same path)."""
+
+    def __init__(self, path: Union[str, Path], *, tool: str = "", fsync: bool = True):
+        self.path = Path(path)
+        self.fsync = fsync
+        self._lock = threading.Lock()
+        self._ops: Dict[str, _Op] = {}
+        self._memo: Dict[str, Any] = {}
+        self.journal_id = ""
+        self.replayed = 0   # ops skipped this run because they were already done
+        self.sent = 0
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        resumed = self._load()
+        self._fh = open(self.path, "a", encoding="utf-8")
+        if resumed and not self._ends_with_newline():
+            self._fh.write("\n")  # terminate a torn last record before appending
+        if not self.journal_id:
+            self.journal_id = uuid.uuid4().hex
+            self._append({"t": "open", "journalId": self.journal_id, "tool": tool})
+        elif resumed:
+            self._append({"t": "resume", "pending": self.count(PENDING), "failed": self.count(FAILED)})
+
+    # ---- replay -----------------------------------------------------
+    def _load(self) -> bool:
+        if not self.path.exists():
+            return False
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line in f:
+                try:
+                    rec = json.loads(line)
+                except ValueError:
+                    continue  # torn write
+                if isinstance(rec, dict):
+                    self._apply(rec)
+        return True
+
+    def _ends_with_newline(self) -> bool:
+        with open(self.path, "rb") as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return True
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b"\n"
+
+    def _apply(self, rec: Dict[str, Any]) -> None:
+        t = rec.get("t")
+        if t == "open":
+            self.journal_id = str(rec.get("journalId") or "")
+        elif t == "memo":
+            self._memo[str(rec.get("name"))] = rec.get("value")
+        elif t == "intent":
+            key = str(rec.get("key"))
+            op = self._ops.get(key)
+            if op is None:
+                op = self._ops[key] = _Op(str(rec.get("digest") or ""), str(rec.get("idem") or ""))
+            else:
+                op.attempts = int(rec.get("attempt") or op.attempts + 1)
+                op.idem = str(rec.get("idem") or op.idem)
+            op.state = PENDING
+        elif t in (DONE, FAILED):
+            op = self._ops.get(str(rec.get("key")))
+            if op is not None:
+                op.state = t
+                op.result = rec.get("result")
+                op.error = rec.get("error")
+
+    def _append(self, rec: Dict[str, Any]) -> None:
+        rec.setdefault("ts", round(time.time(), 3))
+        self._fh.write(json.dumps(rec, ensure_ascii=False, default=str) + "\n")
+        self._fh.flush()
+        if self.fsync:
+            os.fsync(self._fh.fileno())
+
+    # ---- public -----------------------------------------------------
+    def status(self, key: str) -> Optional[str]:
+        op = self._ops.get(key)
+        return op.state if op is not None else None
+
+    def result(self, key: str) -> Any:
+        op = self._ops.get(key)
+        return op.result if op is not None else None
+
+    def count(self, state: str) -> int:
+        return sum(1 for op in self._ops.values() if op.state == state)
+
+    def memo(self, name: str, compute: Callable[[], Any]) -> Any:
+        """Value recorded under name, or compute() recorded now (JSON-serializable)."""
+        with self._lock:
+            if name in self._memo:
+                return self._memo[name]
+        value = compute()
+        with self._lock:
+            self._memo[name] = value
+            self._append({"t": "memo", "name": name, "value": value})
+        return value
+
+    def run(self, key: str, method: str, params: Optional[Dict[str, Any]],
+            send: Callable[[str, Dict[str, Any], str], Any]) -> Any:
+        """
+        Apply one write at most once across runs. send(method, params, idempotency_key)
+        performs the call; its return value is recorded and returned. Raises
+        JournaledOpFailed (after recording it) when send raises.
+        """
+        params = dict(params or {})
+        digest = _digest(method, params)
+        with self._lock:
+            op = self._ops.get(key)
+            if op is not None and op.digest and op.digest != digest:
+                raise JournalConflict(f"op {key!r} was journaled with different method/params ({self.path})")
+            if op is not None and op.state == DONE:
+                self.replayed += 1
+                return op.result
+            if op is None:
+                op = self._ops[key] = _Op(digest, f"{self.journal_id}:{key}")
+                self._append({"t": "intent", "key": key, "method": method, "params": params,
+                              "digest": digest, "idem": op.idem})
+            elif op.state == FAILED:
+                op.attempts += 1
+                op.idem = f"{self.journal_id}:{key}#{op.attempts}"
+                op.state = PENDING
+                self._append({"t": "intent", "key": key, "method": method, "params": params,
+                              "digest": digest, "idem": op.idem, "attempt": op.attempts})
+            # PENDING from an earlier run: resend under the same key
+            idem = op.idem
+
+        try:
+            res = send(method, params, idem)
+        except Exception as ex:
+            with self._lock:
+                op.state, op.error = FAILED, str(ex)
+                self._append({"t": FAILED, "key": key, "error": str(ex)})
+            raise JournaledOpFailed(key, ex) from ex
+        with self._lock:
+            self.sent += 1
+            op.state, op.result = DONE, res
+            self._append({"t": DONE, "key": key, "result": res})
+        return res
+
+    def mark_failed(self, key: str, error: Any) -> None:
+        """Record a reply that came back but did not do the job (ok:false, no id, ...)."""
+        with self._lock:
+            op = self._ops.get(key)
+            if op is None:
+                return
+            op.state, op.error = FAILED, error
+            self._append({"t": FAILED, "key": key, "error": error})
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"journal": str(self.path), "done": self.count(DONE), "failed": self.count(FAILED),
+                    "pending": self.count(PENDING), "replayed": self.replayed, "sent": self.sent}
+
+    def close(self) -> None:
+        try:
+            self._fh.close()
+        except Exception:
+            pass
+
+    def __enter__(self) -> "OpJournal":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+def journaled_call(journal: Optional[OpJournal], key: str, port: int, method: str,
+                   params: Optional[Dict[str, Any]], **kwargs: Any) -> Dict[str, Any]:
+    """mcp_safe.call_mcp through the journal (plain call_mcp when journal is None)."""
+    try:
+        from .mcp_safe import call_mcp
+    except ImportError:  # loaded as a top-level module
+        from mcp_safe import call_mcp  # type: ignore
+    if journal is None:
+        return call_mcp(port, method, params, **kwargs)
+    return journal.run(key, method, params or {},
+                       lambda m, p, idem: call_mcp(port, m, p, idempotency_key=idem, **kwargs))
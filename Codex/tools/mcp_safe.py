@@ -1,11 +1,19 @@
+import sys
 import time
+from types import SimpleNamespace
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 import importlib.util as _iu
 from pathlib import Path
 
+try:
+    from .mcp_admission import admission_enabled, get_admission, retry_after_seconds
+except ImportError:  # loaded as a top-level module
+    from mcp_admission import admission_enabled, get_admission, retry_after_seconds  # type: ignore
+
 ROOT = Path(__file__).resolve().parents[1]
+_CLIENT_DIR = ROOT / "PythonRunnerScripts"  # revit_mcp_client package
 
-def _resolve_send_revit_command_path() -> Path:
+def _resolve_send_revit_command_path() -> Optional[Path]:
     candidates = [
         ROOT / "send_revit_command.py",
         # Default tool location for local LLM + MCP utilities
@@ -17,15 +25,55 @@ def _resolve_send_revit_command_path() -> Path:
                 return p
         except Exception:
             continue
-    raise SystemExit(f"send_revit_command.py not found. Tried: {[str(p) for p in candidates]}")
-
-
-SEND_PATH = _resolve_send_revit_command_path()
-spec = _iu.spec_from_file_location("send_revit_command", SEND_PATH)
-if spec is None or spec.loader is None:
-    raise SystemExit(f"Failed to load send_revit_command.py from: {SEND_PATH}")
-send_revit_command = _iu.module_from_spec(spec)  # type: ignore
-spec.loader.exec_module(send_revit_command)  # type: ignore
+    return None
+
+
+def _client() -> Any:
+    if str(_CLIENT_DIR) not in sys.path:
+        sys.path.append(str(_CLIENT_DIR))
+    import revit_mcp_client
+    return revit_mcp_client
+
+
+_SEND_MOD: Any = None
+
+
+def _send_module() -> Any:
+    """
+    send_revit_command, loaded on the first call rather than at import time.
+    Falls back to the packaged durable client (same send/RevitMcpError API)
+    when no send_revit_command.py is installed.
+    """
+    global _SEND_MOD
+    if _SEND_MOD is not None:
+        return _SEND_MOD
+    path = _resolve_send_revit_command_path()
+    if path is not None:
+        spec = _iu.spec_from_file_location("send_revit_command", path)
+        if spec is None or spec.loader is None:
+            raise SystemExit(f"Failed to load send_revit_command.py from: {path}")
+        mod = _iu.module_from_spec(spec)  # type: ignore
+        spec.loader.exec_module(mod)  # type: ignore
+        _SEND_MOD = mod
+    else:
+        client = _client()
+        _SEND_MOD = SimpleNamespace(send_revit_request=client.send_request, RevitMcpError=client.RevitMcpError)
+    return _SEND_MOD
+
+
+def __getattr__(name: str) -> Any:
+    # kept for callers of the old eager globals
+    if name == "send_revit_command":
+        return _send_module()
+    if name == "SEND_PATH":
+        return _resolve_send_revit_command_path()
+    if name == "SingleFlight":
+        # single-flight read coalescing shared with the PythonRunnerScripts clients
+        return _client().SingleFlight
+    if name in ("iter_pages", "iter_items"):
+        # cursor paging for large listings (list_cursor)
+        return getattr(_client(), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 class McpBusy(Exception):
@@ -69,40 +117,83 @@ def call_mcp(
     base_wait: float = 1.0,
     max_wait_seconds: Optional[float] = 90.0,
     force_on_retry: bool = False,
+    admission: Optional[bool] = None,
+    admission_timeout: Optional[float] = 600.0,
+    reads: Optional[Any] = None,
+    idempotency_key: Optional[str] = None,
 ) -> Dict[str, Any]:
-    """Resilient MCP call with backoff for 409/busy and timeouts."""
+    """Resilient MCP call with backoff for 409/busy and timeouts.
+
+    With admission (default; REVIT_MCP_ADMISSION=0 disables) every process
+    calling the same port shares one token bucket / busy gate / circuit
+    breaker (see mcp_admission.py), so a 409 pauses all callers for the
+    server's Retry-After or a short jittered backoff instead of each one
+    sleeping base_wait * 2**attempt on its own.
+
+    reads (a SingleFlight scope) serves identical reads once per scope and
+    drops the cached reads a write could have changed.
+
+    idempotency_key is sent as params.idempotencyKey and, when the client
+    supports it, on the durable enqueue, so retries (and journal replays,
+    see mcp_journal.py) return the first execution instead of repeating it.
+    """
     if params is None:
         params = {}
+    if reads is not None:
+        return reads.through(method, params, lambda: call_mcp(
+            port, method, params, retries=retries, base_wait=base_wait, max_wait_seconds=max_wait_seconds,
+            force_on_retry=force_on_retry, admission=admission, admission_timeout=admission_timeout,
+            idempotency_key=idempotency_key))
+    gate = get_admission(port) if (admission if admission is not None else admission_enabled()) else None
+    send_mod = _send_module()
+    send_kw: Dict[str, Any] = {}
+    if idempotency_key:
+        params = dict(params)
+        params.setdefault("idempotencyKey", idempotency_key)
+        if _accepts_kw(send_mod.send_revit_request, "idempotency_key"):
+            send_kw["idempotency_key"] = idempotency_key
     attempt = 0
     last_err: Optional[Exception] = None
     while attempt <= retries:
+        if gate is not None:
+            gate.acquire(timeout=admission_timeout)
         try:
             # On retries, optionally set force and increase wait
             force = force_on_retry and attempt > 0
             wait = None if attempt == 0 else min((max_wait_seconds or 120.0) * 1.5, 180.0)
-            res = send_revit_command.send_revit_request(
-                port, method, params, force=force, max_wait_seconds=wait or max_wait_seconds
+            res = send_mod.send_revit_request(
+                port, method, params, force=force, max_wait_seconds=wait or max_wait_seconds, **send_kw
             )
             # Some APIs return structured error inside payload
             top = res.get("result") or res
             if isinstance(top, dict) and top.get("ok") is False:
                 if _looks_busy(top):
                     raise McpBusy(str(top))
+            if gate is not None:
+                gate.report_success()
             return res
-        except send_revit_command.RevitMcpError as e:  # type: ignore[attr-defined]
+        except send_mod.RevitMcpError as e:  # type: ignore[attr-defined]
             last_err = e
             if _looks_busy(e.payload):
                 # Backoff and retry
-                time.sleep(base_wait * (2 ** attempt))
+                _backoff_busy(gate, base_wait, attempt, retry_after_seconds(e, e.payload))
                 attempt += 1
                 continue
             if _looks_timeout(e, e.payload):
-                time.sleep(base_wait * (2 ** attempt))
+                if gate is not None:
+                    gate.report_failure()
+                    # a hung server: pause every caller of the port before the retry, not just this one
+                    gate.report_busy(base_wait * (2 ** attempt))
+                else:
+                    time.sleep(base_wait * (2 ** attempt))
                 attempt += 1
                 continue
+            if gate is not None and getattr(e, "where", "") == "enqueue" and "request failed" in str(e):
+                gate.report_failure()  # connection refused / reset: counts toward the breaker
             raise
-        except McpBusy:
-            time.sleep(base_wait * (2 ** attempt))
+        except McpBusy as e:
+            last_err = e
+            _backoff_busy(gate, base_wait, attempt, None)
             attempt += 1
             continue
     # Exhausted retries
@@ -111,6 +202,24 @@ def call_mcp(
     raise RuntimeError("MCP call failed without exception but without result as well")
 
 
+def _accepts_kw(fn: Any, name: str) -> bool:
+    import inspect  # not at module level: keeps `import tools.mcp_safe` cheap
+
+    try:
+        ps = inspect.signature(fn).parameters
+    except (TypeError, ValueError):
+        return False
+    return name in ps or any(p.kind is inspect.Parameter.VAR_KEYWORD for p in ps.values())
+
+
+def _backoff_busy(gate: Any, base_wait: float, attempt: int, retry_after: Optional[float]) -> None:
+    if gate is not None:
+        # the shared gate makes the next acquire() wait; no private sleep here
+        gate.report_busy(retry_after)
+    else:
+        time.sleep(retry_after if retry_after is not None else base_wait * (2 ** attempt))
+
+
 def chunked(iterable: Iterable[Any], size: int) -> Iterable[List[Any]]:
     buf: List[Any] = []
     for x in iterable:
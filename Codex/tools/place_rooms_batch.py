@@ -1,8 +1,9 @@
 import argparse
 import json
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
+from tools.mcp_journal import OpJournal, journaled_call
 from tools.mcp_safe import call_mcp
 
 
@@ -22,38 +23,45 @@ def main() -> None:
     ap.add_argument("--start", type=int, default=1)
     ap.add_argument("--max-per-level", type=int, default=0, help="0 = unlimited")
     ap.add_argument("--out-dir", type=str, default=str(Path("Manuals")/"Logs"))
+    ap.add_argument("--journal", type=str, default=None,
+                    help="Write-ahead journal (JSONL). Re-run with the same path to resume without re-reading the model")
     args = ap.parse_args()
 
     out_dir = Path(args.out_dir)
     out_dir.mkdir(parents=True, exist_ok=True)
+    journal: Optional[OpJournal] = OpJournal(args.journal, tool="place_rooms_batch") if args.journal else None
 
-    # 1) levels
-    lv = call_mcp(args.port, "get_levels", {"skip": 0, "count": 200})
-    lvt = unwrap(lv)
-    levels: List[Dict[str, Any]] = list(lvt.get("levels") or [])
-    levels.sort(key=lambda x: str(x.get("name", "")))
+    def find_regions() -> List[Dict[str, Any]]:
+        # 1) levels
+        lv = call_mcp(args.port, "get_levels", {"skip": 0, "count": 200})
+        lvt = unwrap(lv)
+        levels: List[Dict[str, Any]] = list(lvt.get("levels") or [])
+        levels.sort(key=lambda x: str(x.get("name", "")))
 
-    regions_all: List[Dict[str, Any]] = []
+        # 2) find regions per level (onlyEmpty)
+        found: List[Dict[str, Any]] = []
+        for L in levels:
+            lid = int(L.get("levelId"))
+            lname = str(L.get("name"))
+            fr = call_mcp(args.port, "find_room_placeable_regions", {"levelId": lid, "onlyEmpty": True, "includeLabelPoint": True, "includeLoops": False})
+            ft = unwrap(fr)
+            regs: List[Dict[str, Any]] = list(ft.get("regions") or [])
+            for r in regs:
+                found.append({
+                    "levelId": lid,
+                    "levelName": lname,
+                    "circuitIndex": int(r.get("circuitIndex", -1)),
+                    "isClosed": bool(r.get("isClosed", False)),
+                    "hasRoom": bool(r.get("hasRoom", False)),
+                    "area_m2": r.get("area_m2"),
+                })
+        return found
+
+    # a resumed run places into the regions found by the first one (no re-query)
+    regions_all: List[Dict[str, Any]] = journal.memo("regions", find_regions) if journal is not None else find_regions()
     placed: List[Dict[str, Any]] = []
     failures: List[Dict[str, Any]] = []
 
-    # 2) find regions per level (onlyEmpty)
-    for L in levels:
-        lid = int(L.get("levelId"))
-        lname = str(L.get("name"))
-        fr = call_mcp(args.port, "find_room_placeable_regions", {"levelId": lid, "onlyEmpty": True, "includeLabelPoint": True, "includeLoops": False})
-        ft = unwrap(fr)
-        regs: List[Dict[str, Any]] = list(ft.get("regions") or [])
-        for r in regs:
-            regions_all.append({
-                "levelId": lid,
-                "levelName": lname,
-                "circuitIndex": int(r.get("circuitIndex", -1)),
-                "isClosed": bool(r.get("isClosed", False)),
-                "hasRoom": bool(r.get("hasRoom", False)),
-                "area_m2": r.get("area_m2"),
-            })
-
     # 3) place rooms
     counter = int(args.start)
     per_level: Dict[int, int] = {}
@@ -67,8 +75,9 @@ def main() -> None:
         name = f"{args.prefix}-{counter:03d}"
         counter += 1
         payload = {"levelId": lid, "circuitIndex": int(row["circuitIndex"]), "name": name}
+        key = f"room:{lid}:{int(row['circuitIndex'])}"
         try:
-            pr = call_mcp(args.port, "place_room_in_circuit", payload)
+            pr = journaled_call(journal, key, args.port, "place_room_in_circuit", payload)
             pt = unwrap(pr)
             if bool(pt.get("ok")):
                 placed.append({
@@ -82,6 +91,8 @@ def main() -> None:
                 per_level[lid] += 1
             else:
                 failures.append({"ok": False, **payload, "error": pt})
+                if journal is not None:
+                    journal.mark_failed(key, pt)
         except Exception as e:
             failures.append({"ok": False, **payload, "error": str(e)})
 
@@ -98,7 +109,11 @@ def main() -> None:
         }
     }, ensure_ascii=False, indent=2), encoding="utf-8")
 
-    print(json.dumps({"ok": True, "placed": len(placed), "failed": len(failures)}, ensure_ascii=False))
+    out: Dict[str, Any] = {"ok": True, "placed": len(placed), "failed": len(failures)}
+    if journal is not None:
+        out["journal"] = journal.stats()
+        journal.close()
+    print(json.dumps(out, ensure_ascii=False))
 
 
 if __name__ == "__main__":
@@ -1,9 +1,10 @@
 import argparse
 import json
 from pathlib import Path
-from typing import Any, Dict, List
+from typing import Any, Callable, Dict, List, Optional
 
-from tools.mcp_safe import call_mcp
+from tools.mcp_journal import OpJournal
+from tools.mcp_safe import SingleFlight, call_mcp
 
 
 def unwrap(x: Dict[str, Any]) -> Dict[str, Any]:
@@ -18,13 +19,34 @@ def main() -> None:
     ap.add_argument("--port", type=int, required=True)
     ap.add_argument("--snapshot", type=str, default=str(Path("Work")/"snapshot_bundle.json"))
     ap.add_argument("--dry-run", action="store_true")
+    ap.add_argument("--journal", type=str, default=None,
+                    help="Write-ahead journal (JSONL). Re-run with the same path to resume: applied ops are skipped")
     args = ap.parse_args()
 
     bundle = json.loads(Path(args.snapshot).read_text(encoding="utf-8"))
     port = args.port
+    # identical reads (get_levels per room) are sent once; writes drop what they touch
+    reads = SingleFlight()
+
+    journal: Optional[OpJournal] = None
+    if args.journal and not args.dry_run:
+        journal = OpJournal(args.journal, tool="reconstruct_from_snapshot")
+
+    def call(method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        return call_mcp(port, method, params, reads=reads)
+
+    def write(key: str, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        if journal is None:
+            return call(method, params)
+        return journal.run(key, method, params,
+                           lambda m, p, idem: call_mcp(port, m, p, reads=reads, idempotency_key=idem))
+
+    def remember(name: str, compute: Callable[[], Any]) -> Any:
+        # reads that decide the op list are journaled too, so a resume does not query the model
+        return journal.memo(name, compute) if journal is not None else compute()
 
     # 1) Levels: ensure names/elevations
-    existing_levels = unwrap(call_mcp(port, "get_levels", {"skip":0,"count":200})).get("levels", [])
+    existing_levels = remember("levels", lambda: unwrap(call("get_levels", {"skip":0,"count":200})).get("levels", []))
     by_name = { str(l.get("name")): l for l in existing_levels }
     for L in bundle.get("levels", []):
         name = str(L.get("name"))
@@ -34,12 +56,12 @@ def main() -> None:
             lid = int(cur.get("levelId"))
             if not args.dry_run:
                 try:
-                    call_mcp(port, "update_level_elevation", {"levelId": lid, "elevation": elev})
+                    write(f"level:{name}", "update_level_elevation", {"levelId": lid, "elevation": elev})
                 except Exception:
                     pass
         else:
             if not args.dry_run:
-                call_mcp(port, "create_level", {"name": name, "elevation": elev})
+                write(f"level:{name}", "create_level", {"name": name, "elevation": elev})
 
     # 2) Grids: try to recreate by axis/name/position if present
     grids = bundle.get("grids", [])
@@ -62,12 +84,12 @@ def main() -> None:
                 ys.append(y1); names_y.append(name)
         if not args.dry_run:
             if xs:
-                call_mcp(port, "create_grids", {"axis": "X", "positions": xs, "names": names_x})
+                write("grids:X", "create_grids", {"axis": "X", "positions": xs, "names": names_x})
             if ys:
-                call_mcp(port, "create_grids", {"axis": "Y", "positions": ys, "names": names_y})
+                write("grids:Y", "create_grids", {"axis": "Y", "positions": ys, "names": names_y})
 
     # 3) Walls: create by start/end, base level name (if present) and type name
-    for w in bundle.get("walls", []):
+    for wi, w in enumerate(bundle.get("walls", [])):
         start = w.get("start") or {}
         end = w.get("end") or {}
         baseLevelName = w.get("levelName") or "1FL"
@@ -82,12 +104,12 @@ def main() -> None:
             payload["wallTypeName"] = wallTypeName
         if not args.dry_run:
             try:
-                call_mcp(port, "create_wall", payload)
+                write(f"wall:{wi}", "create_wall", payload)
             except Exception:
                 pass
 
     # 4) Doors: create on host wall by location and type
-    for d in bundle.get("doors", []):
+    for di, d in enumerate(bundle.get("doors", [])):
         wid = d.get("hostWallId") or d.get("wallId") or None
         loc = d.get("location") or d.get("center") or {}
         tname = d.get("typeName") or None
@@ -96,23 +118,24 @@ def main() -> None:
         payload = {"wallId": int(wid), "location": {"x": loc.get("x",0), "y": loc.get("y",0), "z": loc.get("z",0)}, "typeName": tname, "opTimeoutMs": 180000}
         if not args.dry_run:
             try:
-                call_mcp(port, "create_door_on_wall", payload)
+                write(f"door:{di}", "create_door_on_wall", payload)
             except Exception:
                 pass
 
     # 5) Rooms: place by level and center, then set name if available
-    for r in bundle.get("rooms", []):
+    level_ids: Optional[Dict[str, int]] = None
+    for ri, r in enumerate(bundle.get("rooms", [])):
         name = r.get("name") or None
         lvl = r.get("levelId") or r.get("level") or None
         center = r.get("center") or {}
         # resolve levelId by name when string
         if isinstance(lvl, str):
             try:
-                levels = unwrap(call_mcp(port, "get_levels", {"skip":0,"count":500})).get("levels", [])
-                for L in levels:
-                    if str(L.get("name")) == lvl:
-                        lvl = int(L.get("levelId"))
-                        break
+                if level_ids is None:
+                    level_ids = remember("level_ids", lambda: {
+                        str(L.get("name")): int(L.get("levelId"))
+                        for L in unwrap(call("get_levels", {"skip":0,"count":500})).get("levels", [])})
+                lvl = level_ids.get(lvl, lvl)
             except Exception:
                 pass
         if not isinstance(lvl, int):
@@ -120,17 +143,21 @@ def main() -> None:
         payload = {"levelId": int(lvl), "x": center.get("x",0), "y": center.get("y",0)}
         if not args.dry_run:
             try:
-                res = unwrap(call_mcp(port, "create_room", payload))
+                res = unwrap(write(f"room:{ri}", "create_room", payload))
                 rid = int(res.get("elementId") or 0)
                 if rid > 0 and name:
                     try:
-                        call_mcp(port, "set_room_param", {"elementId": rid, "paramName": "Name", "value": name})
+                        write(f"room_name:{ri}", "set_room_param", {"elementId": rid, "paramName": "Name", "value": name})
                     except Exception:
                         pass
             except Exception:
                 pass
 
-    print(json.dumps({"ok": True, "reconstructed": True}, ensure_ascii=False))
+    out: Dict[str, Any] = {"ok": True, "reconstructed": True}
+    if journal is not None:
+        out["journal"] = journal.stats()
+        journal.close()
+    print(json.dumps(out, ensure_ascii=False))
 
 
 if __name__ == "__main__":
@@ -2,9 +2,9 @@ import argparse
 import json
 import math
 from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, List, Optional
 
-from tools.mcp_safe import call_mcp
+from tools.mcp_safe import call_mcp, iter_items
 
 
 def unwrap(x: Dict[str, Any]) -> Dict[str, Any]:
@@ -22,17 +22,8 @@ def q10(v: float) -> float:
 
 
 def fetch_walls(port: int) -> List[Dict[str, Any]]:
-    allw: List[Dict[str, Any]] = []
-    skip = 0
-    page = 1000
-    while True:
-        tp = unwrap(call_mcp(port, "get_walls", {"skip": skip, "count": page}))
-        chunk = list((tp.get("walls") or []))
-        allw.extend(chunk)
-        if len(chunk) < page:
-            break
-        skip += page
-    return allw
+    # server-side cursor: one collector run, pages served from its snapshot
+    return list(iter_items(lambda p: unwrap(call_mcp(port, "get_walls", p)), "walls", page_size=1000))
 
 
 def main() -> None:
@@ -43,6 +34,9 @@ def main() -> None:
     ap.add_argument("--snap10", action="store_true", help="Snap endpoints to 10mm grid (default on)")
     ap.add_argument("--no-snap10", dest="snap10", action="store_false")
     ap.set_defaults(snap10=True)
+    ap.add_argument("--batch-size", type=int, default=200, help="Walls per transform_walls call (one transaction each)")
+    ap.add_argument("--no-hosted", dest="include_hosted", action="store_false", help="Do not move hosted doors/windows")
+    ap.add_argument("--dry-run", action="store_true", help="Compute the old->new mapping without modifying the model")
     ap.add_argument("--out", type=str, default=str(Path("Work")/"大阪ビル"/"Logs"/"scale_plan_result.json"))
     args = ap.parse_args()
 
@@ -50,10 +44,6 @@ def main() -> None:
     out_path = Path(args.out)
     out_path.parent.mkdir(parents=True, exist_ok=True)
 
-    # Levels map
-    levels = unwrap(call_mcp(port, "get_levels", {"skip": 0, "count": 500}))
-    lvl_by_id = {int(L.get("levelId")): str(L.get("name")) for L in (levels.get("levels") or [])}
-
     # Fetch walls
     walls = fetch_walls(port)
     if not walls:
@@ -105,67 +95,56 @@ def main() -> None:
     target = q10(target)
     scale = target / L
 
-    def transform_xy(x: float, y: float) -> Tuple[float, float]:
-        ox, oy = origin
-        nx = ox + scale * (x - ox)
-        ny = oy + scale * (y - oy)
-        if args.snap10:
-            nx = q10(nx); ny = q10(ny)
-        return nx, ny
-
-    # Delete all walls first
-    deleted = 0
-    live = fetch_walls(port)
-    for w in live:
-        wid = int(w.get("elementId") or w.get("id") or 0)
-        try:
-            call_mcp(port, "delete_wall", {"elementId": wid})
-            deleted += 1
-        except Exception:
-            pass
-
-    # Recreate scaled walls
-    created: List[int] = []
+    # Move every wall in place (ids, types and hosted inserts are kept).
+    # transform_walls pages over the ids, one transaction per page. Each page
+    # carries the pre-move endpoints fetched above, so walls pulled along by
+    # joins to an earlier page are still transformed from where they started.
+    ids = sorted(by_id)
+    batch = max(1, args.batch_size)
+    params: Dict[str, Any] = {
+        "elementIds": ids,
+        "origin": {"x": origin[0], "y": origin[1]},
+        "scale": scale,
+        "snapMm": 10.0 if args.snap10 else 0.0,
+        "includeHosted": bool(args.include_hosted),
+        "dryRun": bool(args.dry_run),
+    }
+    mapping: List[Dict[str, Any]] = []
+    hosted: List[Dict[str, Any]] = []
     failures: List[Dict[str, Any]] = []
-    for w in walls:
-        s = w.get("start") or {}; e = w.get("end") or {}
-        x1,y1 = float(s.get("x",0)), float(s.get("y",0))
-        x2,y2 = float(e.get("x",0)), float(e.get("y",0))
-        z  = float(s.get("z",0))
-        nx1, ny1 = transform_xy(x1, y1)
-        nx2, ny2 = transform_xy(x2, y2)
-        level_name = w.get("levelName") or lvl_by_id.get(int(w.get("levelId") or 0)) or "1FL"
-        wall_type  = w.get("typeName")
-        height     = w.get("height")
-        if not isinstance(height, (int,float)) or height <= 0:
-            height = "level-to-level"
-        payload = {
-            "start": {"x": nx1, "y": ny1, "z": z},
-            "end":   {"x": nx2, "y": ny2, "z": z},
-            "baseLevelName": level_name,
-            "heightMm": height,
-        }
-        if wall_type:
-            payload["wallTypeName"] = wall_type
-        try:
-            res = unwrap(call_mcp(port, "create_wall", payload))
-            nid = int(res.get("elementId") or 0)
-            if nid > 0:
-                created.append(nid)
-            else:
-                failures.append({"payload": payload, "res": res})
-        except Exception as ex:
-            failures.append({"payload": payload, "error": str(ex)})
+    start = 0
+    while True:
+        params["page"] = {"startIndex": start, "batchSize": batch}
+        params["originals"] = [
+            {"elementId": i, "start": by_id[i].get("start"), "end": by_id[i].get("end")}
+            for i in ids[start:start + batch]
+            if by_id[i].get("start") and by_id[i].get("end")
+        ]
+        res = unwrap(call_mcp(port, "transform_walls", params))
+        if not res.get("ok"):
+            failures.append({"startIndex": start, "error": res.get("msg") or res})
+            break
+        for it in res.get("items") or []:
+            if not it.get("ok"):
+                failures.append(it)
+                continue
+            mapping.append({"elementId": it.get("elementId"), "old": it.get("old"), "new": it.get("new")})
+            hosted.extend(it.get("hosted") or [])
+        if res.get("completed") or res.get("nextIndex") is None:
+            break
+        start = int(res["nextIndex"])
 
     report = {
-        "ok": len(created) > 0 and len(failures) == 0,
+        "ok": len(mapping) > 0 and len(failures) == 0,
+        "dryRun": bool(args.dry_run),
         "refId": ref_id,
         "oldLength": L,
         "targetLength": target,
         "scale": scale,
         "origin": {"x": origin[0], "y": origin[1]},
-        "deletedWalls": deleted,
-        "created": created,
+        "movedWalls": len(mapping),
+        "mapping": mapping,
+        "hosted": hosted,
         "failures": failures,
     }
     out_path.write_text(json.dumps(report, ensure_ascii=False, indent=2), encoding="utf-8")
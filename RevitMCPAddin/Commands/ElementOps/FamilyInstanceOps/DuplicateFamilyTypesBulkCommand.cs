@@ -0,0 +1,271 @@
+// File: Commands/ElementOps/FamilyInstanceOps/DuplicateFamilyTypesBulkCommand.cs
+using System;
+using System.Collections.Generic;
+using System.Globalization;
+using System.Linq;
+using System.Text.RegularExpressions;
+using Autodesk.Revit.DB;
+using Autodesk.Revit.UI;
+using Newtonsoft.Json.Linq;
+using RevitMCPAddin.Core;
+
+namespace RevitMCPAddin.Commands.ElementOps.FamilyInstanceOps
+{
+    /// <summary>
+    /// ファミリタイプの一括複製＋タイプパラメータ設定（duplicate_family_type と update_parameters_batch を1要求に）。
+    /// Input:
+    /// {
+    ///   items: [
+    ///     { sourceTypeId:int, newName:string, allowExisting?:bool(true),
+    ///       params?:{ name:value },      // 必ず設定（失敗は failedParams に記録）
+    ///       copyParams?:{ name:value } } // 複製先に存在し値が異なるものだけ設定（複製先に無い名前は黙ってスキップ）
+    ///   ],
+    ///   startIndex?:int, batchSize?:int, maxMillisPerTx?:int, returnValues?:bool(true)
+    /// }
+    /// 設定順は params → copyParams（params と同名の copyParams は無視）。項目ごとに SubTransaction で、複製失敗はその項目だけ戻す。
+    /// Output: { ok, nextIndex?, completed, total, createdCount, reusedCount, failedCount,
+    ///           items:[{ index, ok, typeId, typeName, familyName, reused, updatedCount, copyAttempted, copiedCount, failedParams, values?, msg? }] }
+    /// values は get_family_type_parameters と同じ名前順・同じ値変換（同名は空でない値を優先）。
+    /// </summary>
+    public class DuplicateFamilyTypesBulkCommand : IRevitCommandHandler
+    {
+        public string CommandName => "duplicate_family_types_bulk";
+
+        public object Execute(UIApplication uiapp, RequestCommand cmd)
+        {
+            var doc = DocumentResolver.ResolveDocument(uiapp, cmd);
+            if (doc == null) return new { ok = false, msg = "アクティブドキュメントがありません。" };
+
+            var p = (JObject)(cmd.Params ?? new JObject());
+            var itemsTok = p["items"] as JArray;
+            if (itemsTok == null || itemsTok.Count == 0) return new { ok = false, msg = "items[] が必要です。" };
+
+            var items = itemsTok.OfType<JObject>().ToList();
+            int total = items.Count;
+            int start = Math.Max(0, p.Value<int?>("startIndex") ?? 0);
+            int batchSize = Math.Max(1, p.Value<int?>("batchSize") ?? Math.Min(100, total));
+            int maxMillis = Math.Max(100, p.Value<int?>("maxMillisPerTx") ?? 2500);
+            bool returnValues = p.Value<bool?>("returnValues") ?? true;
+
+            var slice = items.Skip(start).Take(batchSize).ToList();
+            var results = new List<object>(slice.Count);
+            int createdCount = 0, reusedCount = 0, failCount = 0;
+
+            // 既存タイプ: (familyId, 名前) → タイプ（1回だけ収集し、複製のたびに追加）
+            var byFamilyName = new Dictionary<string, FamilySymbol>(StringComparer.OrdinalIgnoreCase);
+            foreach (var s in new FilteredElementCollector(doc).OfClass(typeof(FamilySymbol)).WhereElementIsElementType()
+                .Cast<FamilySymbol>())
+            {
+                if (s.Family == null || s.Family.IsInPlace) continue;
+                var key = TypeKey(s.Family, s.Name);
+                if (!byFamilyName.ContainsKey(key)) byFamilyName[key] = s;
+            }
+
+            var tx = new Transaction(doc, "Duplicate Family Types (bulk)");
+            var started = false;
+            var startAt = DateTime.UtcNow;
+            try
+            {
+                tx.Start();
+                TxnUtil.ConfigureProceedWithWarnings(tx);
+                started = true;
+
+                for (int i = 0; i < slice.Count; i++)
+                {
+                    var it = slice[i];
+                    int index = start + i;
+                    using (var st = new SubTransaction(doc))
+                    {
+                        try
+                        {
+                            st.Start();
+
+                            int sourceTypeId = it.Value<int?>("sourceTypeId") ?? it.Value<int?>("typeId") ?? 0;
+                            var newName = (it.Value<string>("newName") ?? string.Empty).Trim();
+                            bool allowExisting = it.Value<bool?>("allowExisting") ?? true;
+                            if (string.IsNullOrWhiteSpace(newName)) throw new InvalidOperationException("newName が必要です。");
+
+                            var source = sourceTypeId > 0 ? doc.GetElement(Autodesk.Revit.DB.ElementIdCompat.From(sourceTypeId)) as FamilySymbol : null;
+                            if (source == null || source.Family == null)
+                                throw new InvalidOperationException($"source FamilySymbol が解決できません: {sourceTypeId}");
+
+                            var key = TypeKey(source.Family, newName);
+                            byFamilyName.TryGetValue(key, out var sym);
+                            bool reused = sym != null;
+                            if (reused && !allowExisting) throw new InvalidOperationException($"同名タイプが既に存在します: {newName}");
+                            if (sym == null)
+                            {
+                                sym = source.Duplicate(newName) as FamilySymbol;
+                                if (sym == null) throw new InvalidOperationException("複製後タイプを取得できませんでした。");
+                            }
+
+                            int updated = 0, copyAttempted = 0, copied = 0;
+                            var failedParams = new List<object>();
+
+                            var paramsTok = it["params"] as JObject;
+                            if (paramsTok != null)
+                            {
+                                foreach (var prop in paramsTok.Properties())
+                                {
+                                    var pa = Resolve(sym, prop.Name);
+                                    string reason = null;
+                                    if (pa == null) reason = "Parameter not found (name/builtIn/guid)";
+                                    else if (pa.IsReadOnly) reason = $"Parameter '{pa.Definition?.Name}' is read-only";
+                                    else if (UnitHelper.TrySetParameterByExternalValue(pa, (prop.Value as JValue)?.Value, out reason)) { updated++; continue; }
+                                    failedParams.Add(new { param = prop.Name, msg = reason ?? "Failed to set value" });
+                                }
+                            }
+
+                            var copyTok = it["copyParams"] as JObject;
+                            if (copyTok != null)
+                            {
+                                foreach (var prop in copyTok.Properties())
+                                {
+                                    if (paramsTok != null && paramsTok.Property(prop.Name) != null) continue;
+                                    var pa = Resolve(sym, prop.Name);
+                                    if (pa == null) continue;
+                                    if (SameValue(ReadValue(pa), prop.Value)) continue;
+                                    copyAttempted++;
+                                    string reason = null;
+                                    if (pa.IsReadOnly) reason = $"Parameter '{pa.Definition?.Name}' is read-only";
+                                    else if (UnitHelper.TrySetParameterByExternalValue(pa, (prop.Value as JValue)?.Value, out reason)) { copied++; continue; }
+                                    failedParams.Add(new { param = prop.Name, copy = true, msg = reason ?? "Failed to set value" });
+                                }
+                            }
+
+                            st.Commit();
+                            byFamilyName[key] = sym;
+                            if (reused) reusedCount++; else createdCount++;
+
+                            results.Add(new
+                            {
+                                index,
+                                ok = true,
+                                typeId = sym.Id.IntValue(),
+                                uniqueId = sym.UniqueId,
+                                typeName = sym.Name ?? string.Empty,
+                                familyName = sym.Family?.Name ?? string.Empty,
+                                sourceTypeId = source.Id.IntValue(),
+                                reused,
+                                updatedCount = updated,
+                                copyAttempted,
+                                copiedCount = copied,
+                                failedParams,
+                                values = returnValues ? ReadValues(sym) : null
+                            });
+                        }
+                        catch (Exception ex)
+                        {
+                            try { if (st.HasStarted()) st.RollBack(); } catch { }
+                            failCount++;
+                            results.Add(new { index, ok = false, msg = ex.Message });
+                        }
+                    }
+
+                    // Time-slice: 長時間化したらコミットして再開
+                    if ((DateTime.UtcNow - startAt).TotalMilliseconds > maxMillis && i < slice.Count - 1)
+                    {
+                        tx.Commit();
+                        tx = new Transaction(doc, "Duplicate Family Types (bulk) [cont]");
+                        tx.Start();
+                        TxnUtil.ConfigureProceedWithWarnings(tx);
+                        startAt = DateTime.UtcNow;
+                    }
+                }
+
+                tx.Commit();
+                started = false;
+            }
+            catch (Exception ex)
+            {
+                try { if (started) tx.RollBack(); } catch { }
+                return new { ok = false, msg = ex.Message, createdCount, reusedCount, failedCount = failCount, items = results };
+            }
+
+            int next = start + slice.Count;
+            bool completed = next >= total;
+            return new
+            {
+                ok = true,
+                nextIndex = completed ? (int?)null : next,
+                completed,
+                total,
+                createdCount,
+                reusedCount,
+                failedCount = failCount,
+                items = results,
+                inputUnits = FamUtil.UnitsIn(),
+                internalUnits = FamUtil.UnitsInt()
+            };
+        }
+
+        private static string TypeKey(Family fam, string name)
+            => fam.Id.IntValue().ToString(CultureInfo.InvariantCulture) + "\n" + (name ?? string.Empty);
+
+        private static Parameter Resolve(FamilySymbol sym, string name)
+            => ParamResolver.ResolveByPayload(sym, new JObject { ["paramName"] = name }, out _);
+
+        // get_family_type_parameters と同じ値変換
+        private static object ReadValue(Parameter pa)
+        {
+            try
+            {
+                switch (pa.StorageType)
+                {
+                    case StorageType.Double:
+                        ForgeTypeId fdt = null;
+                        try { fdt = pa.Definition?.GetDataType(); } catch { fdt = null; }
+                        return FamUtil.ConvertDoubleBySpec(pa.AsDouble(), fdt);
+                    case StorageType.Integer: return pa.AsInteger();
+                    case StorageType.String: return pa.AsString() ?? string.Empty;
+                    case StorageType.ElementId: return pa.AsElementId()?.IntValue() ?? -1;
+                }
+            }
+            catch { }
+            return null;
+        }
+
+        private static Dictionary<string, object> ReadValues(FamilySymbol sym)
+        {
+            var values = new Dictionary<string, object>();
+            var ordered = (sym.Parameters?.Cast<Parameter>() ?? Enumerable.Empty<Parameter>())
+                .Select(pa => new { pa, name = pa?.Definition?.Name ?? "", id = pa?.Id.IntValue() ?? -1 })
+                .OrderBy(x => x.name).ThenBy(x => x.id);
+            foreach (var x in ordered)
+            {
+                var n = x.name.Trim();
+                if (n.Length == 0) continue;
+                if (!values.TryGetValue(n, out var cur) || cur == null || (cur is string cs && cs.Length == 0))
+                    values[n] = ReadValue(x.pa);
+            }
+            return values;
+        }
+
+        private static readonly Regex NumRx = new Regex(@"[-+]?\d+(?:\.\d+)?", RegexOptions.Compiled);
+
+        private static double? ToNum(object v)
+        {
+            if (v == null) return null;
+            if (v is double d) return d;
+            if (v is int i) return i;
+            if (v is long l) return l;
+            var s = Convert.ToString(v, CultureInfo.InvariantCulture)?.Trim() ?? string.Empty;
+            if (s.Length == 0) return null;
+            var m = NumRx.Match(s);
+            if (!m.Success) return null;
+            return double.TryParse(m.Value, NumberStyles.Float, CultureInfo.InvariantCulture, out var r) ? r : (double?)null;
+        }
+
+        // スクリプト側の比較（数値は 1e-6、その他は前後空白を除いた文字列）と同じ判定
+        private static bool SameValue(object current, JToken wanted)
+        {
+            var w = (wanted as JValue)?.Value;
+            var na = ToNum(current);
+            var nb = ToNum(w);
+            if (na.HasValue && nb.HasValue) return Math.Abs(na.Value - nb.Value) <= 1e-6;
+            var sa = Convert.ToString(current, CultureInfo.InvariantCulture)?.Trim() ?? string.Empty;
+            var sb = Convert.ToString(w, CultureInfo.InvariantCulture)?.Trim() ?? string.Empty;
+            return sa == sb;
+        }
+    }
+}
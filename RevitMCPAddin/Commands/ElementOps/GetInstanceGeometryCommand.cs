@@ -9,6 +9,7 @@
 //   - Vertex welding with tolerance (reduces duplicates)
 //   - Submeshes per material (if resolvable)
 //   - Returns normals/uvs when available (best-effort; may be null)
+//   - encoding:"packed" → base64 float32 vertices / int32 indices (no normals)
 // Author: O-chan companion 🛠
 // Target: .NET Framework 4.8 / Revit 2023/2024
 // ================================================================
@@ -17,6 +18,7 @@ using Autodesk.Revit.DB;
 using Autodesk.Revit.UI;
 using Newtonsoft.Json.Linq;
 using RevitMCPAddin.Core;
+using RevitMCPAddin.Core.Geometry;
 using System;
 using System.Collections.Generic;
 using System.Linq;
@@ -54,6 +56,7 @@ namespace RevitMCPAddin.Commands.ElementOps
             bool includeNonVisible = p.Value<bool?>("includeNonVisible") ?? false;
             bool weld = p.Value<bool?>("weld") ?? true;
             double weldTol = p.Value<double?>("weldTolerance") ?? 1e-6; // feet
+            bool packed = PackedMeshBuffers.IsPacked(p.Value<string>("encoding"));
 
             var opts = new Options
             {
@@ -89,6 +92,27 @@ namespace RevitMCPAddin.Commands.ElementOps
 
             // Build response object
             var matArray = collector.BuildMaterialArray(doc);
+            if (packed)
+            {
+                var vertexBuffer = collector.BuildPackedVertexBuffer(out var origin);
+                return new
+                {
+                    ok = true,
+                    elementId = elem.Id.IntValue(),
+                    uniqueId = elem.UniqueId,
+                    category = elem.Category?.Name,
+                    typeName = elem.Document.GetElement(elem.GetTypeId())?.Name,
+                    units = "feet",
+                    encoding = PackedMeshBuffers.Encoding,
+                    transform = ToArray4x4(rootT),
+                    vertexCount = collector.TotalVertexCount,
+                    vertexBuffer,
+                    vertexOrigin = origin,
+                    submeshes = collector.BuildPackedSubmeshes(),
+                    materials = matArray,
+                };
+            }
+
             var response = new
             {
                 ok = true,
@@ -379,6 +403,27 @@ namespace RevitMCPAddin.Commands.ElementOps
                 return list.ToArray();
             }
 
+            public string BuildPackedVertexBuffer(out double[] origin)
+            {
+                return PackedMeshBuffers.PackPositions(_positions, out origin);
+            }
+
+            public object[] BuildPackedSubmeshes()
+            {
+                // Same grouping as BuildSubmeshIndexArrays, indices packed as int32 LE
+                var list = new List<object>();
+                foreach (var kv in _matToIndices)
+                {
+                    list.Add(new
+                    {
+                        materialKey = kv.Key,
+                        indexCount = kv.Value.Count,
+                        indexBuffer = PackedMeshBuffers.PackIndices(kv.Value)
+                    });
+                }
+                return list.ToArray();
+            }
+
             public object[] BuildMaterialArray(Autodesk.Revit.DB.Document doc)
             {
                 var list = new List<object>();
@@ -8,6 +8,7 @@ using System;
 using System.Collections.Generic;
 using System.Linq;
 using RevitMCPAddin.Core;
+using RevitMCPAddin.Core.Geometry;
 
 namespace RevitMCPAddin.Commands.ElementOps
 {
@@ -16,6 +17,10 @@ namespace RevitMCPAddin.Commands.ElementOps
     /// - Accepts elementIds[], uniqueIds[], or fromSelection=true
     /// - Returns per-element triangulated mesh (same shape as get_instance_geometry)
     /// - Supports paging via page.startIndex/page.batchSize
+    /// - encoding:"packed" returns base64 float32/int32 buffers instead of JSON arrays
+    /// - useOriginalGeometry:true returns FamilyInstance meshes in family (local) space
+    ///   plus the placement transform, so instances of one type share a geomHash
+    /// - includeMesh:false (packed only) returns typeId/geomHash/transform without buffers
     /// </summary>
     public class GetInstancesGeometryCommand : IRevitCommandHandler
     {
@@ -74,6 +79,9 @@ namespace RevitMCPAddin.Commands.ElementOps
             double tolMm = p.Value<double?>("weldToleranceMm") ?? -1;
             if (tolMm > 0) tolFt = tolMm / 304.8; // mm -> ft
             bool includeAnalytic = p.Value<bool?>("includeAnalytic") ?? false;
+            bool packed = PackedMeshBuffers.IsPacked(p.Value<string>("encoding"));
+            bool useOriginal = p.Value<bool?>("useOriginalGeometry") ?? false;
+            bool includeMesh = p.Value<bool?>("includeMesh") ?? true;
 
             var opts = new Options
             {
@@ -101,7 +109,15 @@ namespace RevitMCPAddin.Commands.ElementOps
                         analytic = BuildAnalytic(doc, e);
                     }
 
-                    var ge = e.get_Geometry(opts);
+                    // Family space geometry (no cuts/joins) so identical instances hash the same
+                    var fiLocal = useOriginal ? e as FamilyInstance : null;
+                    GeometryElement ge = null;
+                    if (fiLocal != null)
+                    {
+                        try { ge = fiLocal.GetOriginalGeometry(opts); } catch { ge = null; }
+                        if (ge == null) fiLocal = null;
+                    }
+                    if (ge == null) ge = e.get_Geometry(opts);
                     bool hasGeom = ge != null;
                     if (!hasGeom && analytic != null)
                     {
@@ -131,7 +147,7 @@ namespace RevitMCPAddin.Commands.ElementOps
                     }
 
                     var collector = new MeshCollector(weld, tolFt);
-                    var rootT = GetElementRootTransform(e);
+                    var rootT = fiLocal != null ? Transform.Identity : GetElementRootTransform(e);
                     try { TraverseGeometry(ge, rootT, doc, collector); }
                     catch (Exception ex)
                     {
@@ -146,6 +162,36 @@ namespace RevitMCPAddin.Commands.ElementOps
                     }
 
                     var et = doc.GetElement(e.GetTypeId()) as ElementType;
+                    if (packed)
+                    {
+                        var vertexBuffer = collector.BuildPackedVertexBuffer(out var origin);
+                        var indexBuffers = collector.BuildPackedIndexBuffers();
+                        // world 空間（GetOriginalGeometry 不使用/失敗）は頂点に配置済み: 恒等変換を返す
+                        var placement = fiLocal != null ? fiLocal.GetTotalTransform() : Transform.Identity;
+                        items.Add(new
+                        {
+                            ok = true,
+                            elementId = e.Id.IntValue(),
+                            uniqueId = e.UniqueId,
+                            category = e.Category?.Name,
+                            typeId = e.GetTypeId()?.IntValue() ?? -1,
+                            typeName = et?.Name,
+                            units = "feet",
+                            encoding = PackedMeshBuffers.Encoding,
+                            space = fiLocal != null ? "local" : "world",
+                            transform = ToArray4x4(placement),
+                            geomHash = PackedMeshBuffers.ComputeHash(vertexBuffer, origin, indexBuffers),
+                            vertexCount = collector.TotalVertexCount,
+                            vertexBuffer = includeMesh ? vertexBuffer : null,
+                            vertexOrigin = origin,
+                            submeshes = includeMesh
+                                ? indexBuffers.Select(kv => (object)new { materialId = kv.Key, indexCount = collector.IndexCount(kv.Key), indexBuffer = kv.Value }).ToList()
+                                : null,
+                            materials = collector.BuildMaterialArray(doc),
+                            analytic = analytic
+                        });
+                        continue;
+                    }
                     items.Add(new
                     {
                         ok = true,
@@ -459,6 +505,21 @@ namespace RevitMCPAddin.Commands.ElementOps
                 return groups;
             }
 
+            public string BuildPackedVertexBuffer(out double[] origin)
+            {
+                return PackedMeshBuffers.PackPositions(_positions, out origin);
+            }
+
+            public List<KeyValuePair<int, string>> BuildPackedIndexBuffers()
+            {
+                var groups = new List<KeyValuePair<int, string>>(_matToIndices.Count);
+                foreach (var kv in _matToIndices)
+                    groups.Add(new KeyValuePair<int, string>(kv.Key, PackedMeshBuffers.PackIndices(kv.Value)));
+                return groups;
+            }
+
+            public int IndexCount(int matKey) => _matToIndices.TryGetValue(matKey, out var list) ? list.Count : 0;
+
             public object BuildMaterialArray(Document doc)
             {
                 var list = new List<object>();
@@ -24,6 +24,8 @@ namespace RevitMCPAddin.Commands.ElementOps.StructuralColumn
             int count = p.Value<int?>("count") ?? int.MaxValue;
             bool namesOnly = p.Value<bool?>("namesOnly") ?? false;
             bool withParameters = p.Value<bool?>("withParameters") ?? false;
+            string cursor = p.Value<string>("cursor");
+            bool useCursor = p.Value<bool?>("useCursor") ?? false;
 
             // single targets / filters（元実装どおり）
             int targetEid = p.Value<int?>("elementId") ?? p.Value<int?>("columnId") ?? 0;
@@ -36,6 +38,15 @@ namespace RevitMCPAddin.Commands.ElementOps.StructuralColumn
             string nameContains = p.Value<string>("nameContains");
             bool? pinned = p.Value<bool?>("pinned");
 
+            // cursor: 初回スナップショットから次ページ（コレクタ再実行・skip なし）
+            if (!string.IsNullOrWhiteSpace(cursor))
+            {
+                if (!ListCursorService.TryNextPage(cursor, CommandName, doc, count, out var pageIds, out var snapTotal, out var snapNext, out var cursorErr))
+                    return new { ok = false, code = "CURSOR_EXPIRED", msg = cursorErr };
+                var cursorPage = ListCursorService.Resolve<FamilyInstance>(doc, pageIds);
+                return new { ok = true, totalCount = snapTotal, structuralColumns = Project(doc, cursorPage, withParameters), nextCursor = snapNext, inputUnits = new { Length = "mm" }, internalUnits = new { Length = "ft" } };
+            }
+
             var all = new FilteredElementCollector(doc)
                 .OfCategory(BuiltInCategory.OST_StructuralColumns)
                 .WhereElementIsNotElementType()
@@ -43,10 +54,8 @@ namespace RevitMCPAddin.Commands.ElementOps.StructuralColumn
                 .ToList();
 
             // caches
-            var typeMap = all.Select(c => c.GetTypeId().IntValue())
-                             .Distinct().ToDictionary(id => id, id => doc.GetElement(Autodesk.Revit.DB.ElementIdCompat.From(id)) as FamilySymbol);
-            var levelMap = all.Select(c => c.LevelId.IntValue())
-                              .Distinct().ToDictionary(id => id, id => doc.GetElement(Autodesk.Revit.DB.ElementIdCompat.From(id)) as Level);
+            var typeMap = TypeMap(doc, all);
+            var levelMap = LevelMap(doc, all);
 
             IEnumerable<FamilyInstance> q = all;
 
@@ -108,9 +117,23 @@ namespace RevitMCPAddin.Commands.ElementOps.StructuralColumn
                 return new { ok = true, totalCount, names, inputUnits = new { Length = "mm" }, internalUnits = new { Length = "ft" } };
             }
 
-            var page = ordered.Skip(skip).Take(count).ToList();
+            string nextCursor = null;
+            var page = useCursor
+                ? ListCursorService.Resolve<FamilyInstance>(doc, ListCursorService.FirstPage(CommandName, doc, ordered.Select(c => c.Id.IntValue()).ToList(), skip, count, out nextCursor))
+                : ordered.Skip(skip).Take(count).ToList();
+            var cols = Project(doc, page, withParameters, typeMap, levelMap);
+
+            if (useCursor)
+                return new { ok = true, totalCount, structuralColumns = cols, nextCursor, inputUnits = new { Length = "mm" }, internalUnits = new { Length = "ft" } };
+            return new { ok = true, totalCount, structuralColumns = cols, inputUnits = new { Length = "mm" }, internalUnits = new { Length = "ft" } };
+        }
 
-            var cols = page.Select(col =>
+        private static List<object> Project(Document doc, List<FamilyInstance> page, bool withParameters,
+            Dictionary<int, FamilySymbol> typeMap = null, Dictionary<int, Level> levelMap = null)
+        {
+            typeMap = typeMap ?? TypeMap(doc, page);
+            levelMap = levelMap ?? LevelMap(doc, page);
+            return page.Select(col =>
             {
                 // 位置（mm）
                 var lp = col.Location as LocationPoint;
@@ -146,10 +169,16 @@ namespace RevitMCPAddin.Commands.ElementOps.StructuralColumn
                     location,
                     parameters
                 };
-            }).ToList();
-
-            return new { ok = true, totalCount, structuralColumns = cols, inputUnits = new { Length = "mm" }, internalUnits = new { Length = "ft" } };
+            }).ToList<object>();
         }
+
+        private static Dictionary<int, FamilySymbol> TypeMap(Document doc, IEnumerable<FamilyInstance> cols)
+            => cols.Select(c => c.GetTypeId().IntValue())
+                   .Distinct().ToDictionary(id => id, id => doc.GetElement(Autodesk.Revit.DB.ElementIdCompat.From(id)) as FamilySymbol);
+
+        private static Dictionary<int, Level> LevelMap(Document doc, IEnumerable<FamilyInstance> cols)
+            => cols.Select(c => c.LevelId.IntValue())
+                   .Distinct().ToDictionary(id => id, id => doc.GetElement(Autodesk.Revit.DB.ElementIdCompat.From(id)) as Level);
     }
 }
 
@@ -157,6 +157,25 @@ namespace RevitMCPAddin.Commands.ElementOps.StructuralFrame
             int skip = p.Value<int?>("skip") ?? 0;
             int count = p.Value<int?>("count") ?? int.MaxValue;
             bool namesOnly = p.Value<bool?>("namesOnly") ?? false;
+            string cursor = p.Value<string>("cursor");
+            bool useCursor = p.Value<bool?>("useCursor") ?? false;
+
+            // cursor: 初回スナップショットから次ページ（コレクタ再実行・skip なし）
+            if (!string.IsNullOrWhiteSpace(cursor))
+            {
+                if (!ListCursorService.TryNextPage(cursor, CommandName, doc, count, out var pageIds, out var snapTotal, out var snapNext, out var cursorErr))
+                    return new { ok = false, code = "CURSOR_EXPIRED", msg = cursorErr };
+                var cursorPage = ListCursorService.Resolve<FamilyInstance>(doc, pageIds);
+                return new
+                {
+                    ok = true,
+                    totalCount = snapTotal,
+                    structuralFrames = Project(doc, cursorPage, TypeMap(doc, cursorPage), LevelMap(doc, cursorPage)),
+                    nextCursor = snapNext,
+                    inputUnits = UnitHelper.DefaultUnitsMeta(),
+                    internalUnits = new { Length = "ft", Area = "ft2", Volume = "ft3", Angle = "rad" }
+                };
+            }
 
             // 単一指定
             int targetEid = p.Value<int?>("elementId") ?? 0;
@@ -177,15 +196,8 @@ namespace RevitMCPAddin.Commands.ElementOps.StructuralFrame
                 .ToList();
 
             // type/level 辞書
-            var typeIds = all.Select(x => x.GetTypeId().IntValue()).Distinct().ToList();
-            var typeMap = new Dictionary<int, FamilySymbol>(typeIds.Count);
-            foreach (var id in typeIds)
-                typeMap[id] = doc.GetElement(Autodesk.Revit.DB.ElementIdCompat.From(id)) as FamilySymbol;
-
-            var levelIds = all.Select(x => x.LevelId.IntValue()).Distinct().ToList();
-            var levelMap = new Dictionary<int, Level>(levelIds.Count);
-            foreach (var id in levelIds)
-                levelMap[id] = doc.GetElement(Autodesk.Revit.DB.ElementIdCompat.From(id)) as Level;
+            var typeMap = TypeMap(doc, all);
+            var levelMap = LevelMap(doc, all);
 
             IEnumerable<FamilyInstance> q = all;
 
@@ -291,9 +303,38 @@ namespace RevitMCPAddin.Commands.ElementOps.StructuralFrame
                 };
             }
 
-            // フル明細（XYZ → mm へ）
-            var page = ordered.Skip(skip).Take(count).ToList();
-            var frames = page.Select(e =>
+            string nextCursor = null;
+            var page = useCursor
+                ? ListCursorService.Resolve<FamilyInstance>(doc, ListCursorService.FirstPage(CommandName, doc, ordered.Select(x => x.Id.IntValue()).ToList(), skip, count, out nextCursor))
+                : ordered.Skip(skip).Take(count).ToList();
+            var frames = Project(doc, page, typeMap, levelMap);
+
+            if (useCursor)
+            {
+                return new
+                {
+                    ok = true,
+                    totalCount,
+                    structuralFrames = frames,
+                    nextCursor,
+                    inputUnits = UnitHelper.DefaultUnitsMeta(),
+                    internalUnits = new { Length = "ft", Area = "ft2", Volume = "ft3", Angle = "rad" }
+                };
+            }
+            return new
+            {
+                ok = true,
+                totalCount,
+                structuralFrames = frames,
+                inputUnits = UnitHelper.DefaultUnitsMeta(),
+                internalUnits = new { Length = "ft", Area = "ft2", Volume = "ft3", Angle = "rad" }
+            };
+        }
+
+        // フル明細（XYZ → mm へ）
+        private static List<object> Project(Document doc, List<FamilyInstance> page, Dictionary<int, FamilySymbol> typeMap, Dictionary<int, Level> levelMap)
+        {
+            return page.Select(e =>
             {
                 FamilySymbol sym; typeMap.TryGetValue(e.GetTypeId().IntValue(), out sym);
                 string typeName = sym?.Name ?? string.Empty;
@@ -331,16 +372,25 @@ namespace RevitMCPAddin.Commands.ElementOps.StructuralFrame
                     start = sMm != null ? new { x = sMm.Value.x, y = sMm.Value.y, z = sMm.Value.z } : null,
                     end = eMm != null ? new { x = eMm.Value.x, y = eMm.Value.y, z = eMm.Value.z } : null
                 };
-            }).ToList();
+            }).ToList<object>();
+        }
 
-            return new
-            {
-                ok = true,
-                totalCount,
-                structuralFrames = frames,
-                inputUnits = UnitHelper.DefaultUnitsMeta(),
-                internalUnits = new { Length = "ft", Area = "ft2", Volume = "ft3", Angle = "rad" }
-            };
+        private static Dictionary<int, FamilySymbol> TypeMap(Document doc, IEnumerable<FamilyInstance> items)
+        {
+            var typeIds = items.Select(x => x.GetTypeId().IntValue()).Distinct().ToList();
+            var typeMap = new Dictionary<int, FamilySymbol>(typeIds.Count);
+            foreach (var id in typeIds)
+                typeMap[id] = doc.GetElement(Autodesk.Revit.DB.ElementIdCompat.From(id)) as FamilySymbol;
+            return typeMap;
+        }
+
+        private static Dictionary<int, Level> LevelMap(Document doc, IEnumerable<FamilyInstance> items)
+        {
+            var levelIds = items.Select(x => x.LevelId.IntValue()).Distinct().ToList();
+            var levelMap = new Dictionary<int, Level>(levelIds.Count);
+            foreach (var id in levelIds)
+                levelMap[id] = doc.GetElement(Autodesk.Revit.DB.ElementIdCompat.From(id)) as Level;
+            return levelMap;
         }
     }
 
@@ -1,5 +1,7 @@
 #nullable enable
 using System;
+using System.Collections.Generic;
+using System.Linq;
 using Autodesk.Revit.DB;
 using Autodesk.Revit.UI;
 using Newtonsoft.Json.Linq;
@@ -11,6 +13,7 @@ namespace RevitMCPAddin.Commands.ElementOps.Wall
     /// 壁の基準線（LocationCurve）を mm 単位で返す。
     /// - C# 8 対応（is not を使わない）
     /// - 例外時は { ok:false, msg:"..." } を返す
+    /// - elementIds[] 指定時は複数壁をページ単位で返す（page.startIndex / page.batchSize）
     /// </summary>
     [RpcCommand("element.get_wall_baseline",
         Aliases = new[] { "get_wall_baseline" },
@@ -18,8 +21,8 @@ namespace RevitMCPAddin.Commands.ElementOps.Wall
         Tags = new[] { "ElementOps", "Wall" },
         Risk = RiskLevel.Low,
         Summary = "Get a wall LocationCurve baseline (mm).",
-        Requires = new[] { "elementId|uniqueId" },
-        Constraints = new[] { "Provide elementId (recommended) or uniqueId." },
+        Requires = new[] { "elementId|uniqueId|elementIds" },
+        Constraints = new[] { "Provide elementId (recommended) or uniqueId, or elementIds[] with optional page { startIndex, batchSize } for bulk reads." },
         ExampleJsonRpc =
             "{ \"jsonrpc\":\"2.0\", \"id\":1, \"method\":\"element.get_wall_baseline\", \"params\":{ \"elementId\":123456 } }")]
     public class GetWallBaselineCommand : IRevitCommandHandler
@@ -34,6 +37,9 @@ namespace RevitMCPAddin.Commands.ElementOps.Wall
 
             var p = cmd?.Params as JObject ?? new JObject();
 
+            if (p["elementIds"] is JArray idsArr && idsArr.Count > 0)
+                return ExecuteBulk(doc, p, idsArr);
+
             try
             {
                 Element elem = CmdUtils.GetElementByIdOrUniqueId(doc, p);
@@ -64,6 +70,58 @@ namespace RevitMCPAddin.Commands.ElementOps.Wall
                 return new { ok = false, msg = "get_wall_baseline 実行中に例外: " + ex.Message };
             }
         }
+
+        private static object ExecuteBulk(Document doc, JObject p, JArray idsArr)
+        {
+            var ids = new List<int>(idsArr.Count);
+            foreach (var t in idsArr) { try { ids.Add(Convert.ToInt32(t)); } catch { } }
+
+            int total = ids.Count;
+            int start = Math.Max(0, p.SelectToken("page.startIndex")?.Value<int?>() ?? 0);
+            int batch = Math.Max(1, p.SelectToken("page.batchSize")?.Value<int?>() ?? Math.Min(1000, Math.Max(1, total)));
+            var slice = ids.Skip(start).Take(batch).ToList();
+
+            var items = new JArray();
+            foreach (var id in slice)
+            {
+                try
+                {
+                    var wall = doc.GetElement(Autodesk.Revit.DB.ElementIdCompat.From(id)) as Autodesk.Revit.DB.Wall;
+                    if (wall == null)
+                    {
+                        items.Add(new JObject { ["ok"] = false, ["elementId"] = id, ["msg"] = "Wall が見つかりません。" });
+                        continue;
+                    }
+                    var lc = wall.Location as LocationCurve;
+                    if (lc == null || lc.Curve == null)
+                    {
+                        items.Add(new JObject { ["ok"] = false, ["elementId"] = id, ["msg"] = "Wall に LocationCurve がありません。" });
+                        continue;
+                    }
+                    items.Add(new JObject
+                    {
+                        ["ok"] = true,
+                        ["elementId"] = id,
+                        ["baseline"] = GeometryJsonHelper.CurveToJson(lc.Curve)
+                    });
+                }
+                catch (Exception ex)
+                {
+                    items.Add(new JObject { ["ok"] = false, ["elementId"] = id, ["msg"] = ex.Message });
+                }
+            }
+
+            int next = start + slice.Count;
+            bool completed = next >= total;
+            return new JObject
+            {
+                ["ok"] = true,
+                ["items"] = items,
+                ["nextIndex"] = completed ? null : (JToken)next,
+                ["completed"] = completed,
+                ["totalCount"] = total
+            };
+        }
     }
 }
 
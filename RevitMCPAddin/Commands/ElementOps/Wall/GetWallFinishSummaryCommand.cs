@@ -5,6 +5,7 @@ using System.Collections.Generic;
 using System.Linq;
 using Autodesk.Revit.DB;
 using Autodesk.Revit.UI;
+using Newtonsoft.Json.Linq;
 using RevitMCPAddin.Core;
 
 namespace RevitMCPAddin.Commands.ElementOps
@@ -164,9 +165,80 @@ namespace RevitMCPAddin.Commands.ElementOps
             if (doc == null)
                 return new { ok = false, msg = "アクティブドキュメントがありません。", summary = new List<object>() };
 
+            if (cmd.Params?["elementIds"] is JArray idsArr && idsArr.Count > 0)
+                return ExecuteBulk(doc, cmd.Params, idsArr);
+
             if (!WallLookupUtil.TryGetWall(doc, cmd, out var wall, out int wallId, out string uniqueId, out var err))
                 return new { ok = false, msg = err, summary = new List<object>() };
 
+            return new
+            {
+                ok = true,
+                wallId,
+                elementId = wallId,
+                uniqueId,
+                summary = BuildSummary(doc, wall),
+                inputUnits = UnitHelper.DefaultUnitsMeta(),
+                internalUnits = UnitHelper.InternalUnitsMeta()
+            };
+        }
+
+        /// <summary>
+        /// elementIds[] 指定時の一括版。page.startIndex / page.batchSize でページングし、
+        /// 壁ごとの結果を items[] に返す（個別の失敗は ok:false で継続）。
+        /// </summary>
+        private static object ExecuteBulk(Document doc, JObject p, JArray idsArr)
+        {
+            var ids = new List<int>(idsArr.Count);
+            foreach (var t in idsArr) { try { ids.Add(Convert.ToInt32(t)); } catch { } }
+
+            int total = ids.Count;
+            int start = Math.Max(0, p.SelectToken("page.startIndex")?.Value<int?>() ?? 0);
+            int batch = Math.Max(1, p.SelectToken("page.batchSize")?.Value<int?>() ?? Math.Min(200, Math.Max(1, total)));
+            var slice = ids.Skip(start).Take(batch).ToList();
+
+            var items = new List<object>(slice.Count);
+            foreach (var id in slice)
+            {
+                try
+                {
+                    var wall = doc.GetElement(Autodesk.Revit.DB.ElementIdCompat.From(id)) as Autodesk.Revit.DB.Wall;
+                    if (wall == null)
+                    {
+                        items.Add(new { ok = false, elementId = id, msg = "Wall element not found." });
+                        continue;
+                    }
+                    items.Add(new
+                    {
+                        ok = true,
+                        wallId = id,
+                        elementId = id,
+                        uniqueId = wall.UniqueId ?? string.Empty,
+                        summary = BuildSummary(doc, wall)
+                    });
+                }
+                catch (Exception ex)
+                {
+                    items.Add(new { ok = false, elementId = id, msg = ex.Message });
+                }
+            }
+
+            int next = start + slice.Count;
+            bool completed = next >= total;
+            return new
+            {
+                ok = true,
+                items,
+                nextIndex = completed ? (int?)null : next,
+                completed,
+                totalCount = total,
+                inputUnits = UnitHelper.DefaultUnitsMeta(),
+                internalUnits = UnitHelper.InternalUnitsMeta()
+            };
+        }
+
+        private static List<object> BuildSummary(Document doc, Autodesk.Revit.DB.Wall wall)
+        {
             var allFaces = FaceHostHelper.GetPlanarFaces(wall) ?? new List<PlanarFace>();
             var stats = new Dictionary<string, (double orig, double paint, bool hasRegions, bool isRegion, HashSet<int> indices)>();
 
@@ -241,7 +313,7 @@ namespace RevitMCPAddin.Commands.ElementOps
                 }
             }
 
-            var summary = stats.Select(kv => new
+            var summary = stats.Select(kv => (object)new
             {
                 material = kv.Key,
                 originalArea = Math.Round(kv.Value.orig, 4),
@@ -252,16 +324,7 @@ namespace RevitMCPAddin.Commands.ElementOps
                 faceIndices = kv.Value.indices.OrderBy(i => i).ToList()
             }).ToList();
 
-            return new
-            {
-                ok = true,
-                wallId,
-                elementId = wallId,
-                uniqueId,
-                summary,
-                inputUnits = UnitHelper.DefaultUnitsMeta(),
-                internalUnits = UnitHelper.InternalUnitsMeta()
-            };
+            return summary;
         }
     }
 }
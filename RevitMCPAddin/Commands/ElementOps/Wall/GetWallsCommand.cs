@@ -23,6 +23,27 @@ namespace RevitMCPAddin.Commands.ElementOps.Wall
 
             int skip = p.Value<int?>("skip") ?? 0;
             int count = p.Value<int?>("count") ?? int.MaxValue;
+            string cursor = p.Value<string>("cursor");
+            bool useCursor = p.Value<bool?>("useCursor") ?? false;
+
+            // cursor: serve the next page from the first call's snapshot (no collector re-run, no skip)
+            if (!string.IsNullOrWhiteSpace(cursor))
+            {
+                if (!ListCursorService.TryNextPage(cursor, CommandName, doc, count, out var pageIds, out var snapTotal, out var snapNext, out var cursorErr))
+                    return new { ok = false, code = "CURSOR_EXPIRED", msg = cursorErr };
+                var cursorSlice = ListCursorService.Resolve<Autodesk.Revit.DB.Wall>(doc, pageIds);
+                var cursorWalls = Project(cursorSlice, TypeNameMap(doc, cursorSlice));
+                return new
+                {
+                    ok = true,
+                    totalCount = snapTotal,
+                    inputUnits = new { Length = "mm" },
+                    internalUnits = new { Length = "ft" },
+                    walls = cursorWalls,
+                    wallsById = ById(cursorSlice, cursorWalls),
+                    nextCursor = snapNext
+                };
+            }
 
             // Optional view filter to reduce payload and speed up: viewId param
             View view = null;
@@ -52,14 +73,51 @@ namespace RevitMCPAddin.Commands.ElementOps.Wall
                     internalUnits = new { Length = "ft" }
                 };
 
-            var typeIds = allWalls.Select(w => w.GetTypeId().IntValue()).Distinct();
-            var typeNameMap = typeIds.ToDictionary(
+            var typeNameMap = TypeNameMap(doc, allWalls);
+
+            string nextCursor = null;
+            var slice = useCursor
+                ? ListCursorService.Resolve<Autodesk.Revit.DB.Wall>(doc, ListCursorService.FirstPage(CommandName, doc, allWalls.Select(w => w.Id.IntValue()).ToList(), skip, count, out nextCursor))
+                : allWalls.Skip(skip).Take(count).ToList();
+            var walls = Project(slice, typeNameMap);
+            var wallsById = ById(slice, walls);
+
+            if (useCursor)
+            {
+                return new
+                {
+                    ok = true,
+                    totalCount,
+                    inputUnits = new { Length = "mm" },
+                    internalUnits = new { Length = "ft" },
+                    walls,
+                    wallsById,
+                    nextCursor
+                };
+            }
+            return new
+            {
+                ok = true,
+                totalCount,
+                inputUnits = new { Length = "mm" },
+                internalUnits = new { Length = "ft" },
+                walls,
+                wallsById
+            };
+        }
+
+        private static Dictionary<int, string> TypeNameMap(Document doc, IEnumerable<Autodesk.Revit.DB.Wall> walls)
+        {
+            var typeIds = walls.Select(w => w.GetTypeId().IntValue()).Distinct();
+            return typeIds.ToDictionary(
                 id => id,
                 id => doc.GetElement(Autodesk.Revit.DB.ElementIdCompat.From(id))?.Name ?? string.Empty
             );
+        }
 
-            var slice = allWalls.Skip(skip).Take(count).ToList();
-            var walls = slice.Select(wall =>
+        private static List<object> Project(List<Autodesk.Revit.DB.Wall> slice, Dictionary<int, string> typeNameMap)
+        {
+            return slice.Select(wall =>
             {
                 var loc = wall.Location as LocationCurve;
                 var curve = loc?.Curve;
@@ -101,20 +159,11 @@ namespace RevitMCPAddin.Commands.ElementOps.Wall
                     start,
                     end
                 };
-            }).ToList();
-
-            var wallsById = walls.ToDictionary(x => x.elementId, x => (object)x);
-
-            return new
-            {
-                ok = true,
-                totalCount,
-                inputUnits = new { Length = "mm" },
-                internalUnits = new { Length = "ft" },
-                walls,
-                wallsById
-            };
+            }).ToList<object>();
         }
+
+        private static Dictionary<int, object> ById(List<Autodesk.Revit.DB.Wall> slice, List<object> walls)
+            => slice.Select((w, i) => new { id = w.Id.IntValue(), item = walls[i] }).ToDictionary(x => x.id, x => x.item);
     }
 }
 
@@ -0,0 +1,392 @@
+// File: Commands/ElementOps/Wall/TransformWallsCommand.cs
+// Purpose: 壁の基準線を平面アフィン変換（原点まわりの拡縮・回転＋平行移動）でその場移動する
+//   - 削除→再作成ではないので elementId / ホストされた建具 / パラメータはそのまま
+//   - page.startIndex / page.batchSize 単位で 1 トランザクション（壁ごとに SubTransaction）
+//   - 変換元はページ内の全壁を動かす前に確定（originals 指定時はその端点）。移動中は端部結合を外す
+//   - 旧→新の端点座標（mm）を items で返す
+#nullable enable
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using Autodesk.Revit.DB;
+using Autodesk.Revit.UI;
+using Newtonsoft.Json.Linq;
+using RevitMCPAddin.Core;
+
+namespace RevitMCPAddin.Commands.ElementOps.Wall
+{
+    /// <summary>
+    /// p' = origin + scale * R(rotateDeg) * (p - origin) + translate（XY のみ、Z は維持）。
+    /// snapMm &gt; 0 なら変換後の XY をその格子に丸める。
+    /// elementIds 省略時はドキュメント内の全壁（elementId 昇順）が対象。
+    /// originals: [{ elementId, start, end, mid? }]（mm）があれば、その壁は現在の基準線ではなく指定端点から変換する。
+    /// </summary>
+    [RpcCommand("element.transform_walls",
+        Aliases = new[] { "transform_walls" },
+        Category = "ElementOps/Wall",
+        Tags = new[] { "ElementOps", "Wall" },
+        Risk = RiskLevel.Medium,
+        Kind = "write",
+        Summary = "Move wall baselines in place by a plan affine transform (scale/rotate/translate), paged.",
+        Constraints = new[] { "XY only. Lines and arcs are supported. Loop page.startIndex with nextIndex until completed. Pass originals (get_walls start/end) so every page transforms the pre-move baselines." },
+        ExampleJsonRpc =
+            "{ \"jsonrpc\":\"2.0\", \"id\":1, \"method\":\"element.transform_walls\", \"params\":{ \"origin\":{\"x\":0,\"y\":0}, \"scale\":1.25, \"snapMm\":10, \"page\":{\"startIndex\":0,\"batchSize\":200} } }")]
+    public class TransformWallsCommand : IRevitCommandHandler
+    {
+        public string CommandName => "transform_walls";
+
+        public object Execute(UIApplication uiapp, RequestCommand cmd)
+        {
+            var doc = uiapp?.ActiveUIDocument?.Document;
+            if (doc == null) return new { ok = false, msg = "アクティブドキュメントがありません。" };
+
+            var p = cmd?.Params as JObject ?? new JObject();
+
+            var ids = new List<int>();
+            if (p["elementIds"] is JArray arr && arr.Count > 0)
+            {
+                foreach (var t in arr) { try { ids.Add(Convert.ToInt32(t)); } catch { } }
+            }
+            else
+            {
+                ids = new FilteredElementCollector(doc)
+                    .OfClass(typeof(Autodesk.Revit.DB.Wall))
+                    .WhereElementIsNotElementType()
+                    .Select(e => e.Id.IntValue())
+                    .OrderBy(i => i)
+                    .ToList();
+            }
+
+            var xf = PlanTransform.FromParams(p);
+            if (xf.Scale <= 0)
+                return new { ok = false, msg = "scale は正の値を指定してください。" };
+
+            bool includeHosted = p.Value<bool?>("includeHosted") ?? true;
+            bool dryRun = p.Value<bool?>("dryRun") ?? false;
+
+            int total = ids.Count;
+            int start = Math.Max(0, p.SelectToken("page.startIndex")?.Value<int?>() ?? 0);
+            int batch = Math.Max(1, p.SelectToken("page.batchSize")?.Value<int?>() ?? 200);
+            var slice = ids.Skip(start).Take(batch).ToList();
+
+            double shortTol = 1.0 / 256.0;
+            try { shortTol = doc.Application.ShortCurveTolerance; } catch { }
+
+            // 元の基準線: クライアント指定（get_walls の start/end）を優先、無ければ下でページ内の全壁を動かす前に控える
+            var originals = ReadOriginals(p);
+
+            var items = new JArray();
+            int moved = 0, failed = 0;
+
+            // 動かす前にページ内の全壁の変換元・変換先・建具位置を確定する
+            var entries = new List<(WallPlan? plan, JObject? error)>(slice.Count);
+            foreach (var id in slice)
+            {
+                var plan = PlanOne(doc, id, xf, includeHosted, shortTol, originals, out var error);
+                entries.Add((plan, plan == null ? error : null));
+            }
+            var plans = entries.Where(x => x.plan != null).Select(x => x.plan!).ToList();
+            var results = new Dictionary<WallPlan, JObject>();
+
+            if (dryRun)
+            {
+                foreach (var plan in plans)
+                {
+                    var item = plan.ToJson();
+                    var hostedOut = new JArray();
+                    foreach (var h in plan.Hosted)
+                        hostedOut.Add(new JObject { ["elementId"] = h.fi.Id.IntValue(), ["old"] = PointMm(h.old), ["new"] = PointMm(xf.Apply(h.old)) });
+                    if (hostedOut.Count > 0) item["hosted"] = hostedOut;
+                    results[plan] = item;
+                }
+            }
+            else if (plans.Count > 0)
+            {
+                using (var tx = new Transaction(doc, "Transform Walls (bulk)"))
+                {
+                    TxnUtil.ConfigureProceedWithWarnings(tx);
+                    tx.Start();
+                    try
+                    {
+                        // 結合したままだと、動かした壁に引っ張られて隣の壁の端点も動く（二重変換になる）。
+                        // 移動中は対象壁の端部結合を外し、全件動かしてから元どおり許可する。
+                        var disallowed = new List<(Autodesk.Revit.DB.Wall wall, int end)>();
+                        foreach (var plan in plans)
+                        {
+                            for (int end = 0; end < 2; end++)
+                            {
+                                try
+                                {
+                                    if (!WallUtils.IsWallJoinAllowedAtEnd(plan.Wall, end)) continue;
+                                    WallUtils.DisallowWallJoinAtEnd(plan.Wall, end);
+                                    disallowed.Add((plan.Wall, end));
+                                }
+                                catch { /* 結合を外せない壁はそのまま */ }
+                            }
+                        }
+
+                        foreach (var plan in plans)
+                            results[plan] = ApplyOne(doc, plan, xf);
+
+                        foreach (var (wall, end) in disallowed)
+                        {
+                            try { WallUtils.AllowWallJoinAtEnd(wall, end); }
+                            catch { /* ignore */ }
+                        }
+
+                        var status = tx.Commit();
+                        if (status != TransactionStatus.Committed)
+                            return new { ok = false, msg = "トランザクションをコミットできませんでした: " + status };
+                    }
+                    catch (Exception ex)
+                    {
+                        if (tx.HasStarted() && !tx.HasEnded()) tx.RollBack();
+                        return new { ok = false, msg = "transform_walls 実行中に例外: " + ex.Message };
+                    }
+                }
+            }
+
+            foreach (var (plan, error) in entries)
+            {
+                var item = plan != null ? results[plan] : error!;
+                if (item.Value<bool>("ok")) moved++; else failed++;
+                items.Add(item);
+            }
+
+            int next = start + slice.Count;
+            bool completed = next >= total;
+            return new JObject
+            {
+                ["ok"] = true,
+                ["dryRun"] = dryRun,
+                ["items"] = items,
+                ["movedCount"] = moved,
+                ["failedCount"] = failed,
+                ["nextIndex"] = completed ? null : (JToken)next,
+                ["completed"] = completed,
+                ["totalCount"] = total,
+                ["transform"] = xf.ToJson(),
+                ["units"] = JObject.FromObject(new { Length = "mm", Angle = "deg" })
+            };
+        }
+
+        /// <summary>移動前に確定した 1 壁分の変換内容。</summary>
+        private sealed class WallPlan
+        {
+            public int Id;
+            public Autodesk.Revit.DB.Wall Wall = null!;
+            public LocationCurve Location = null!;
+            public string Kind = "";
+            public Curve Old = null!;
+            public Curve New = null!;
+            public List<(FamilyInstance fi, XYZ old)> Hosted = new List<(FamilyInstance fi, XYZ old)>();
+
+            public JObject ToJson()
+            {
+                return new JObject
+                {
+                    ["ok"] = true,
+                    ["elementId"] = Id,
+                    ["kind"] = Kind,
+                    ["old"] = CurveEnds(Old),
+                    ["new"] = CurveEnds(New)
+                };
+            }
+        }
+
+        /// <summary>originals: [{ elementId, start:{x,y,z}, end:{x,y,z}, mid?:{x,y,z} }]（mm, get_walls の start/end）</summary>
+        private static Dictionary<int, JObject> ReadOriginals(JObject p)
+        {
+            var map = new Dictionary<int, JObject>();
+            if (!(p["originals"] is JArray arr)) return map;
+            foreach (var o in arr.OfType<JObject>())
+            {
+                int id = o.Value<int?>("elementId") ?? o.Value<int?>("id") ?? 0;
+                if (id > 0 && o["start"] is JObject && o["end"] is JObject) map[id] = o;
+            }
+            return map;
+        }
+
+        private static XYZ ReadPointMm(JToken? t, double zFtDefault)
+        {
+            double x = t?.Value<double?>("x") ?? 0.0, y = t?.Value<double?>("y") ?? 0.0;
+            double? z = t?.Value<double?>("z");
+            return new XYZ(UnitHelper.MmToFt(x), UnitHelper.MmToFt(y), z.HasValue ? UnitHelper.MmToFt(z.Value) : zFtDefault);
+        }
+
+        private static WallPlan? PlanOne(Document doc, int id, PlanTransform xf, bool includeHosted, double shortTol,
+            Dictionary<int, JObject> originals, out JObject error)
+        {
+            error = null!;
+            var wall = doc.GetElement(Autodesk.Revit.DB.ElementIdCompat.From(id)) as Autodesk.Revit.DB.Wall;
+            if (wall == null)
+            {
+                error = new JObject { ["ok"] = false, ["elementId"] = id, ["msg"] = "Wall が見つかりません。" };
+                return null;
+            }
+            var lc = wall.Location as LocationCurve;
+            if (lc == null || lc.Curve == null || !lc.Curve.IsBound)
+            {
+                error = new JObject { ["ok"] = false, ["elementId"] = id, ["msg"] = "Wall に LocationCurve がありません。" };
+                return null;
+            }
+
+            var curve = lc.Curve;
+            Curve oldCurve, newCurve;
+            string kind;
+            try
+            {
+                var s = curve.GetEndPoint(0);
+                var e = curve.GetEndPoint(1);
+                var mid = curve is Arc ? curve.Evaluate(0.5, true) : null;
+                if (originals.TryGetValue(id, out var o))
+                {
+                    s = ReadPointMm(o["start"], s.Z);
+                    e = ReadPointMm(o["end"], e.Z);
+                    if (mid != null && o["mid"] is JObject) mid = ReadPointMm(o["mid"], mid.Z);
+                }
+                if (curve is Line)
+                {
+                    kind = "line";
+                    oldCurve = Line.CreateBound(s, e);
+                    newCurve = Line.CreateBound(xf.Apply(s), xf.Apply(e));
+                }
+                else if (curve is Arc)
+                {
+                    kind = "arc";
+                    oldCurve = Arc.Create(s, e, mid!);
+                    newCurve = Arc.Create(xf.Apply(s), xf.Apply(e), xf.Apply(mid!));
+                }
+                else
+                {
+                    error = new JObject { ["ok"] = false, ["elementId"] = id, ["msg"] = "直線・円弧以外の壁は未対応です: " + curve.GetType().Name };
+                    return null;
+                }
+            }
+            catch (Exception ex)
+            {
+                error = new JObject { ["ok"] = false, ["elementId"] = id, ["msg"] = "変換後の基準線を作成できません: " + ex.Message };
+                return null;
+            }
+            if (newCurve.Length < shortTol)
+            {
+                error = new JObject { ["ok"] = false, ["elementId"] = id, ["msg"] = "変換後の壁が短すぎます（スナップで潰れた可能性）。" };
+                return null;
+            }
+
+            var plan = new WallPlan { Id = id, Wall = wall, Location = lc, Kind = kind, Old = oldCurve, New = newCurve };
+
+            // 壁を動かすと建具も追従して動くので、元位置は先に控えておく
+            if (includeHosted)
+            {
+                foreach (var hid in wall.FindInserts(true, false, false, false))
+                {
+                    if (doc.GetElement(hid) is FamilyInstance fi && fi.Location is LocationPoint lp && lp.Point != null)
+                        plan.Hosted.Add((fi, lp.Point));
+                }
+            }
+            return plan;
+        }
+
+        private static JObject ApplyOne(Document doc, WallPlan plan, PlanTransform xf)
+        {
+            var item = plan.ToJson();
+            var hostedOut = new JArray();
+            using (var st = new SubTransaction(doc))
+            {
+                st.Start();
+                try
+                {
+                    plan.Location.Curve = plan.New;
+                }
+                catch (Exception ex)
+                {
+                    st.RollBack();
+                    return new JObject { ["ok"] = false, ["elementId"] = plan.Id, ["msg"] = "基準線の更新に失敗: " + ex.Message };
+                }
+
+                foreach (var h in plan.Hosted)
+                {
+                    var target = xf.Apply(h.old);
+                    var entry = new JObject { ["elementId"] = h.fi.Id.IntValue(), ["old"] = PointMm(h.old), ["new"] = PointMm(target) };
+                    try
+                    {
+                        if (h.fi.Location is LocationPoint lp) lp.Point = target;
+                    }
+                    catch (Exception ex)
+                    {
+                        entry["ok"] = false;
+                        entry["msg"] = ex.Message;
+                    }
+                    hostedOut.Add(entry);
+                }
+                st.Commit();
+            }
+
+            if (hostedOut.Count > 0) item["hosted"] = hostedOut;
+            return item;
+        }
+
+        private static JObject CurveEnds(Curve c)
+        {
+            return new JObject { ["start"] = PointMm(c.GetEndPoint(0)), ["end"] = PointMm(c.GetEndPoint(1)) };
+        }
+
+        private static JObject PointMm(XYZ pt)
+        {
+            var mm = UnitHelper.XyzToMm(pt);
+            return new JObject { ["x"] = Math.Round(mm.x, 3), ["y"] = Math.Round(mm.y, 3), ["z"] = Math.Round(mm.z, 3) };
+        }
+
+        /// <summary>平面アフィン変換（mm 指定、内部は ft）。</summary>
+        private sealed class PlanTransform
+        {
+            public double OriginXmm, OriginYmm, Scale = 1.0, RotateDeg, TranslateXmm, TranslateYmm, SnapMm;
+            private double _cos = 1.0, _sin;
+
+            public static PlanTransform FromParams(JObject p)
+            {
+                var xf = new PlanTransform
+                {
+                    OriginXmm = p.SelectToken("origin.x")?.Value<double?>() ?? 0.0,
+                    OriginYmm = p.SelectToken("origin.y")?.Value<double?>() ?? 0.0,
+                    Scale = p.Value<double?>("scale") ?? 1.0,
+                    RotateDeg = p.Value<double?>("rotateDeg") ?? 0.0,
+                    TranslateXmm = p.SelectToken("translate.x")?.Value<double?>() ?? 0.0,
+                    TranslateYmm = p.SelectToken("translate.y")?.Value<double?>() ?? 0.0,
+                    SnapMm = Math.Max(0.0, p.Value<double?>("snapMm") ?? 0.0)
+                };
+                var rad = UnitHelper.DegToInternal(xf.RotateDeg);
+                xf._cos = Math.Cos(rad);
+                xf._sin = Math.Sin(rad);
+                return xf;
+            }
+
+            public XYZ Apply(XYZ ptFt)
+            {
+                var mm = UnitHelper.XyzToMm(ptFt);
+                double dx = mm.x - OriginXmm, dy = mm.y - OriginYmm;
+                double x = OriginXmm + Scale * (_cos * dx - _sin * dy) + TranslateXmm;
+                double y = OriginYmm + Scale * (_sin * dx + _cos * dy) + TranslateYmm;
+                if (SnapMm > 0)
+                {
+                    x = Math.Round(x / SnapMm) * SnapMm;
+                    y = Math.Round(y / SnapMm) * SnapMm;
+                }
+                return new XYZ(UnitHelper.MmToFt(x), UnitHelper.MmToFt(y), ptFt.Z);
+            }
+
+            public JObject ToJson()
+            {
+                return new JObject
+                {
+                    ["origin"] = new JObject { ["x"] = OriginXmm, ["y"] = OriginYmm },
+                    ["scale"] = Scale,
+                    ["rotateDeg"] = RotateDeg,
+                    ["translate"] = new JObject { ["x"] = TranslateXmm, ["y"] = TranslateYmm },
+                    ["snapMm"] = SnapMm
+                };
+            }
+        }
+    }
+}
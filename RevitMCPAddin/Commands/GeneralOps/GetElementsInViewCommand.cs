@@ -16,6 +16,8 @@ namespace RevitMCPAddin.Commands.GeneralOps
     ///   ok, totalCount,
     ///   levels: [{ levelId, levelName, categories: [{ categoryId, categoryName, elementIds: [..] }] }]
     /// }
+    /// idsOnly + _shape.idsEncoding ("ranges" | "delta-varint" | "auto") returns
+    /// elementIdsEncoded (see IdSetCodec) instead of the plain elementIds array.
     /// </summary>
     public class GetElementsInViewCommand : IRevitCommandHandler
     {
@@ -50,6 +52,9 @@ namespace RevitMCPAddin.Commands.GeneralOps
             // shape / options
             var shape = p["_shape"] as JObject;
             bool idsOnly = shape?.Value<bool?>("idsOnly") ?? false;
+            string idsEncoding = shape?.Value<string>("idsEncoding");
+            if (!string.IsNullOrWhiteSpace(idsEncoding) && !IdSetCodec.IsSupported(idsEncoding))
+                return new { ok = false, msg = $"Unsupported _shape.idsEncoding: {idsEncoding} (ranges | delta-varint | auto)" };
             var page = shape?["page"] as JObject;
             int limit = page?.Value<int?>("limit")
                         ?? p.Value<int?>("count")
@@ -314,6 +319,8 @@ namespace RevitMCPAddin.Commands.GeneralOps
                     idList.Add(e.Id.IntValue());
                     if (idList.Count >= limit) break;
                 }
+                if (!string.IsNullOrWhiteSpace(idsEncoding))
+                    return new { ok = true, totalCount, count = idList.Count, elementIdsEncoded = IdSetCodec.Encode(idList, idsEncoding), viewId, usedActiveView };
                 return new { ok = true, totalCount, elementIds = idList, viewId, usedActiveView };
             }
 
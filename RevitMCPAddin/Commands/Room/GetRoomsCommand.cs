@@ -30,12 +30,8 @@ namespace RevitMCPAddin.Commands.Room
             string levelFilter = p.Value<string>("level");
             string nameContains = p.Value<string>("nameContains");
             bool compat = p.Value<bool?>("compat") ?? false;
-
-            var collector = new FilteredElementCollector(doc)
-                .OfCategory(BuiltInCategory.OST_Rooms)
-                .WhereElementIsNotElementType();
-
-            var allRooms = collector.OfType<Autodesk.Revit.DB.Architecture.Room>().ToList();
+            string cursor = p.Value<string>("cursor");
+            bool useCursor = p.Value<bool?>("useCursor") ?? false;
 
             string GetLevelName(ElementId levelId)
             {
@@ -43,37 +39,59 @@ namespace RevitMCPAddin.Commands.Room
                 return (doc.GetElement(levelId) as Level)?.Name ?? string.Empty;
             }
 
-            IEnumerable<Autodesk.Revit.DB.Architecture.Room> filtered = allRooms;
+            int totalCount;
+            string nextCursor = null;
+            List<Autodesk.Revit.DB.Architecture.Room> page;
+            if (!string.IsNullOrWhiteSpace(cursor))
+            {
+                // cursor: 初回スナップショットから次ページ（コレクタ再実行・skip なし）
+                if (!ListCursorService.TryNextPage(cursor, CommandName, doc, count, out var pageIds, out totalCount, out nextCursor, out var cursorErr))
+                    return new { ok = false, code = "CURSOR_EXPIRED", msg = cursorErr };
+                page = ListCursorService.Resolve<Autodesk.Revit.DB.Architecture.Room>(doc, pageIds);
+                useCursor = true;
+            }
+            else
+            {
+                var collector = new FilteredElementCollector(doc)
+                    .OfCategory(BuiltInCategory.OST_Rooms)
+                    .WhereElementIsNotElementType();
 
-            if (!string.IsNullOrEmpty(levelFilter))
-                filtered = filtered.Where(r => string.Equals(GetLevelName(r.LevelId), levelFilter, StringComparison.OrdinalIgnoreCase));
+                var allRooms = collector.OfType<Autodesk.Revit.DB.Architecture.Room>().ToList();
 
-            if (!string.IsNullOrEmpty(nameContains))
-                filtered = filtered.Where(r =>
-                {
-                    var n = r.get_Parameter(BuiltInParameter.ROOM_NAME)?.AsString() ?? string.Empty;
-                    return n.IndexOf(nameContains, StringComparison.OrdinalIgnoreCase) >= 0;
-                });
+                IEnumerable<Autodesk.Revit.DB.Architecture.Room> filtered = allRooms;
 
-            var filteredList = filtered.ToList();
-            int totalCount = filteredList.Count;
+                if (!string.IsNullOrEmpty(levelFilter))
+                    filtered = filtered.Where(r => string.Equals(GetLevelName(r.LevelId), levelFilter, StringComparison.OrdinalIgnoreCase));
 
-            if (skip == 0 && p.ContainsKey("count") && count == 0)
-            {
-                return new
+                if (!string.IsNullOrEmpty(nameContains))
+                    filtered = filtered.Where(r =>
+                    {
+                        var n = r.get_Parameter(BuiltInParameter.ROOM_NAME)?.AsString() ?? string.Empty;
+                        return n.IndexOf(nameContains, StringComparison.OrdinalIgnoreCase) >= 0;
+                    });
+
+                var filteredList = filtered.ToList();
+                totalCount = filteredList.Count;
+
+                if (skip == 0 && p.ContainsKey("count") && count == 0)
                 {
-                    ok = true,
-                    totalCount,
-                    units = UnitHelper.DefaultUnitsMeta(),
-                    internalUnits = new { length = "ft", area = "ft2" }
-                };
-            }
+                    return new
+                    {
+                        ok = true,
+                        totalCount,
+                        units = UnitHelper.DefaultUnitsMeta(),
+                        internalUnits = new { length = "ft", area = "ft2" }
+                    };
+                }
 
-            if (skip >= totalCount)
-                return new { ok = true, totalCount, rooms = Array.Empty<object>(), units = UnitHelper.DefaultUnitsMeta() };
+                if (skip >= totalCount)
+                    return new { ok = true, totalCount, rooms = Array.Empty<object>(), units = UnitHelper.DefaultUnitsMeta() };
 
-            int take = Math.Max(0, Math.Min(count, totalCount - skip));
-            var page = filteredList.Skip(skip).Take(take).ToList();
+                int take = Math.Max(0, Math.Min(count, totalCount - skip));
+                page = useCursor
+                    ? ListCursorService.Resolve<Autodesk.Revit.DB.Architecture.Room>(doc, ListCursorService.FirstPage(CommandName, doc, filteredList.Select(r => r.Id.IntValue()).ToList(), skip, take, out nextCursor))
+                    : filteredList.Skip(skip).Take(take).ToList();
+            }
 
             var rooms = new List<object>(page.Count);
             var roomsById = compat ? new Dictionary<int, object>(page.Count) : null;
@@ -166,6 +184,20 @@ namespace RevitMCPAddin.Commands.Room
                 issues = new { failures = Array.Empty<string>(), dialogs = Array.Empty<string>(), itemErrors = errors }
             };
 
+            if (useCursor)
+            {
+                return new
+                {
+                    baseResp.ok,
+                    baseResp.totalCount,
+                    baseResp.rooms,
+                    roomsById,
+                    baseResp.units,
+                    baseResp.internalUnits,
+                    baseResp.issues,
+                    nextCursor
+                };
+            }
             if (compat)
             {
                 return new
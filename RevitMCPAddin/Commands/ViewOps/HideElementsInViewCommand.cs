@@ -53,7 +53,7 @@ namespace RevitMCPAddin.Commands.ViewOps
                 });
             }
 
-            // ---- 2) 要素解決（elementId / elementIds / uniqueIds）
+            // ---- 2) 要素解決（elementId / elementIds / elementIdsEncoded / uniqueIds）
             var targetIds = new HashSet<int>();
             var singleId = p.Value<int?>("elementId");
             if (singleId.HasValue && singleId.Value > 0) targetIds.Add(singleId.Value);
@@ -71,6 +71,22 @@ namespace RevitMCPAddin.Commands.ViewOps
                 }
             }
 
+            // 大量 id 用の圧縮表現（IdSetCodec: ranges / delta-varint）
+            if (p["elementIdsEncoded"] is JObject encoded)
+            {
+                try
+                {
+                    foreach (var id in IdSetCodec.Decode(encoded))
+                    {
+                        if (id > 0) targetIds.Add(id);
+                    }
+                }
+                catch (Exception ex)
+                {
+                    return ResultUtil.Err("elementIdsEncoded を解釈できません: " + ex.Message);
+                }
+            }
+
             var uniques = p["uniqueIds"] as JArray;
             if (uniques != null)
             {
@@ -83,7 +99,7 @@ namespace RevitMCPAddin.Commands.ViewOps
             }
 
             if (targetIds.Count == 0)
-                return ResultUtil.Err("非表示にする要素が指定されていません。'elementId' または 'elementIds' を指定してください。");
+                return ResultUtil.Err("非表示にする要素が指定されていません。'elementId' / 'elementIds' / 'elementIdsEncoded' を指定してください。");
 
             // ---- 3) パラメータ（バッチ・タイム・リフレッシュ）
             int batchSize = Math.Max(50, Math.Min(5000, p.Value<int?>("batchSize") ?? 800));
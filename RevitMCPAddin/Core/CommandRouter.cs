@@ -1641,6 +1641,7 @@ namespace RevitMCPAddin.Core
                 case "set_railing_parameter":
                 case "set_railing_type_parameter":
                 case "update_parameters_batch":
+                case "duplicate_family_types_bulk":
                 case "set_stair_parameter":
                 case "set_stair_type_parameter":
                 case "set_stair_flight_parameters":
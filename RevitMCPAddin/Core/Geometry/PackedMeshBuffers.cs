@@ -0,0 +1,110 @@
+// ================================================================
+// File: Core/Geometry/PackedMeshBuffers.cs
+// Purpose:
+//   get_instance_geometry / get_instances_geometry の encoding:"packed" 用。
+//   - 頂点: vertexOrigin(double) からの相対座標を float32 LE で base64 化
+//   - インデックス: int32 LE で base64 化（submesh ごと）
+//   JSON 数値配列に比べてペイロードが約 1/3、エンコード/デコードもほぼ memcpy。
+// Target: .NET Framework 4.8 / Revit 2023+
+// ================================================================
+using System;
+using System.Collections.Generic;
+using System.Globalization;
+using System.Security.Cryptography;
+using System.Text;
+using Autodesk.Revit.DB;
+
+namespace RevitMCPAddin.Core.Geometry
+{
+    internal static class PackedMeshBuffers
+    {
+        public const string Encoding = "packed";
+
+        public static bool IsPacked(string encoding)
+        {
+            return string.Equals((encoding ?? "").Trim(), Encoding, StringComparison.OrdinalIgnoreCase);
+        }
+
+        /// <summary>
+        /// 頂点群の最小点を原点とし、相対座標を float32 で詰める。
+        /// ワールド座標のまま float32 にすると大きな座標で精度が落ちるため。
+        /// </summary>
+        public static string PackPositions(IList<XYZ> positions, out double[] origin)
+        {
+            origin = new double[] { 0.0, 0.0, 0.0 };
+            if (positions == null || positions.Count == 0) return string.Empty;
+
+            double ox = double.MaxValue, oy = double.MaxValue, oz = double.MaxValue;
+            foreach (var p in positions)
+            {
+                if (p.X < ox) ox = p.X;
+                if (p.Y < oy) oy = p.Y;
+                if (p.Z < oz) oz = p.Z;
+            }
+            origin = new[] { ox, oy, oz };
+
+            var bytes = new byte[positions.Count * 12];
+            int o = 0;
+            foreach (var p in positions)
+            {
+                WriteSingle(bytes, o, (float)(p.X - ox)); o += 4;
+                WriteSingle(bytes, o, (float)(p.Y - oy)); o += 4;
+                WriteSingle(bytes, o, (float)(p.Z - oz)); o += 4;
+            }
+            return Convert.ToBase64String(bytes);
+        }
+
+        public static string PackIndices(IList<int> indices)
+        {
+            if (indices == null || indices.Count == 0) return string.Empty;
+            var bytes = new byte[indices.Count * 4];
+            int o = 0;
+            foreach (var i in indices)
+            {
+                WriteInt32(bytes, o, i); o += 4;
+            }
+            return Convert.ToBase64String(bytes);
+        }
+
+        /// <summary>
+        /// 形状ハッシュ（SHA1 hex）。パック済みバッファ・原点・マテリアル別インデックスから算出。
+        /// 同一タイプの同一形状インスタンスは local 空間で同じ値になる（Rhino 側ブロック共有用）。
+        /// </summary>
+        public static string ComputeHash(string vertexBuffer, double[] origin, IEnumerable<KeyValuePair<int, string>> indexBuffers)
+        {
+            var sb = new StringBuilder();
+            sb.Append(vertexBuffer ?? string.Empty).Append('|');
+            if (origin != null)
+            {
+                foreach (var d in origin) sb.Append(d.ToString("R", CultureInfo.InvariantCulture)).Append(',');
+            }
+            if (indexBuffers != null)
+            {
+                foreach (var kv in indexBuffers) sb.Append('|').Append(kv.Key).Append(':').Append(kv.Value);
+            }
+
+            using (var sha = SHA1.Create())
+            {
+                var hash = sha.ComputeHash(System.Text.Encoding.UTF8.GetBytes(sb.ToString()));
+                var hex = new StringBuilder(hash.Length * 2);
+                foreach (var b in hash) hex.Append(b.ToString("x2"));
+                return hex.ToString();
+            }
+        }
+
+        private static void WriteSingle(byte[] buf, int offset, float v)
+        {
+            var b = BitConverter.GetBytes(v);
+            if (!BitConverter.IsLittleEndian) Array.Reverse(b);
+            Buffer.BlockCopy(b, 0, buf, offset, 4);
+        }
+
+        private static void WriteInt32(byte[] buf, int offset, int v)
+        {
+            buf[offset] = (byte)v;
+            buf[offset + 1] = (byte)(v >> 8);
+            buf[offset + 2] = (byte)(v >> 16);
+            buf[offset + 3] = (byte)(v >> 24);
+        }
+    }
+}
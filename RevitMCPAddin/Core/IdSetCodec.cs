@@ -0,0 +1,153 @@
+// ================================================================
+// File: Core/IdSetCodec.cs
+// Purpose:
+//   大きな elementId 集合の圧縮表現（idsOnly 応答・スナップショット・一括非表示の入力用）。
+//   { "encoding": "ranges" | "delta-varint", "count": n, "data": ... }
+//   - ranges       : data = [start0, length0, start1, length1, ...]（昇順・連番をまとめる）
+//   - delta-varint : data = base64( 昇順 id の差分を unsigned LEB128 で連結 )（先頭は 0 からの差分）
+//   - auto (Encode のみ): 上の 2 つのうち小さい方
+//   id は重複除去・昇順化してから符号化する（負の id は不可）。
+//   Python 側: Codex/PythonRunnerScripts/id_set_codec.py
+// Target: .NET Framework 4.8 / Revit 2023+
+// ================================================================
+using System;
+using System.Collections.Generic;
+using System.Linq;
+using Newtonsoft.Json.Linq;
+
+namespace RevitMCPAddin.Core
+{
+    internal static class IdSetCodec
+    {
+        public const string Ranges = "ranges";
+        public const string DeltaVarint = "delta-varint";
+        public const string Auto = "auto";
+
+        public static bool IsSupported(string encoding)
+        {
+            var e = (encoding ?? "").Trim().ToLowerInvariant();
+            return e == Ranges || e == DeltaVarint || e == Auto;
+        }
+
+        public static JObject Encode(IEnumerable<int> ids, string encoding)
+        {
+            var sorted = (ids ?? Enumerable.Empty<int>()).Distinct().OrderBy(i => i).ToList();
+            if (sorted.Count > 0 && sorted[0] < 0)
+                throw new ArgumentException("IdSetCodec: negative ids are not supported.");
+
+            var e = (encoding ?? Auto).Trim().ToLowerInvariant();
+            if (e == Auto)
+            {
+                // JSON 上のおおよそのサイズ: ranges は 1 区間 ~16 文字、varint は base64 で 4/3 倍
+                long rangeChars = (long)CountRuns(sorted) * 16;
+                long varintChars = (VarintByteCount(sorted) + 2) / 3 * 4;
+                e = rangeChars <= varintChars ? Ranges : DeltaVarint;
+            }
+
+            var result = new JObject { ["encoding"] = e, ["count"] = sorted.Count };
+            if (e == Ranges)
+            {
+                var data = new JArray();
+                int i = 0;
+                while (i < sorted.Count)
+                {
+                    int start = sorted[i], len = 1;
+                    while (i + len < sorted.Count && sorted[i + len] == start + len) len++;
+                    data.Add(start);
+                    data.Add(len);
+                    i += len;
+                }
+                result["data"] = data;
+            }
+            else if (e == DeltaVarint)
+            {
+                var bytes = new List<byte>(sorted.Count * 2);
+                long prev = 0;
+                foreach (var id in sorted)
+                {
+                    ulong v = (ulong)(id - prev);
+                    prev = id;
+                    while (v >= 0x80)
+                    {
+                        bytes.Add((byte)(v | 0x80));
+                        v >>= 7;
+                    }
+                    bytes.Add((byte)v);
+                }
+                result["data"] = Convert.ToBase64String(bytes.ToArray());
+            }
+            else
+            {
+                throw new ArgumentException("IdSetCodec: unsupported encoding: " + encoding);
+            }
+            return result;
+        }
+
+        /// <summary>{ encoding, data } を昇順の id 列に戻す。</summary>
+        public static List<int> Decode(JToken token)
+        {
+            var obj = token as JObject;
+            if (obj == null) throw new ArgumentException("IdSetCodec: encoded id set must be an object.");
+            var e = (obj.Value<string>("encoding") ?? "").Trim().ToLowerInvariant();
+            var ids = new List<int>(obj.Value<int?>("count") ?? 0);
+
+            if (e == Ranges)
+            {
+                var data = obj["data"] as JArray ?? new JArray();
+                for (int i = 0; i + 1 < data.Count; i += 2)
+                {
+                    int start = data[i].Value<int>();
+                    int len = data[i + 1].Value<int>();
+                    for (int k = 0; k < len; k++) ids.Add(start + k);
+                }
+            }
+            else if (e == DeltaVarint)
+            {
+                var bytes = Convert.FromBase64String(obj.Value<string>("data") ?? string.Empty);
+                long prev = 0;
+                ulong v = 0;
+                int shift = 0;
+                foreach (var b in bytes)
+                {
+                    v |= (ulong)(b & 0x7F) << shift;
+                    if ((b & 0x80) != 0)
+                    {
+                        shift += 7;
+                        continue;
+                    }
+                    prev += (long)v;
+                    ids.Add(checked((int)prev));
+                    v = 0;
+                    shift = 0;
+                }
+            }
+            else
+            {
+                throw new ArgumentException("IdSetCodec: unsupported encoding: " + e);
+            }
+            return ids;
+        }
+
+        private static int CountRuns(List<int> sorted)
+        {
+            int runs = 0;
+            for (int i = 0; i < sorted.Count; i++)
+            {
+                if (i == 0 || sorted[i] != sorted[i - 1] + 1) runs++;
+            }
+            return runs;
+        }
+
+        private static long VarintByteCount(List<int> sorted)
+        {
+            long n = 0, prev = 0;
+            foreach (var id in sorted)
+            {
+                ulong v = (ulong)(id - prev);
+                prev = id;
+                do { n++; v >>= 7; } while (v != 0);
+            }
+            return n;
+        }
+    }
+}
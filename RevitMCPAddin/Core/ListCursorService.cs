@@ -0,0 +1,152 @@
+#nullable enable
+using System;
+using System.Collections.Concurrent;
+using System.Collections.Generic;
+using System.Globalization;
+using System.Linq;
+using Autodesk.Revit.DB;
+
+namespace RevitMCPAddin.Core
+{
+    /// <summary>
+    /// Server-side cursors for large element listings (get_structural_columns, get_walls, ...).
+    /// - The first call (useCursor=true) snapshots the ordered, filtered element ids and returns the
+    ///   first page plus an opaque nextCursor.
+    /// - Follow-up calls pass { cursor, count } and are served from the snapshot: no collector re-run,
+    ///   no skip over N elements, and no duplicates/misses when the model changes between pages
+    ///   (ids deleted since the snapshot are dropped from their page).
+    /// - Snapshots are bound to the command and document and expire after a sliding TTL.
+    ///   The same cursor can be read again until then (pages are idempotent).
+    /// </summary>
+    internal static class ListCursorService
+    {
+        private sealed class Snapshot
+        {
+            public string Method = string.Empty;
+            public string DocKey = string.Empty;
+            public int[] Ids = Array.Empty<int>();
+            public DateTimeOffset ExpiresAtUtc;
+        }
+
+        private static readonly ConcurrentDictionary<string, Snapshot> _snapshots =
+            new ConcurrentDictionary<string, Snapshot>(StringComparer.OrdinalIgnoreCase);
+
+        private static readonly TimeSpan DefaultTtl = TimeSpan.FromMinutes(10);
+        private const int MaxSnapshots = 32;
+
+        /// <summary>
+        /// First page (skip/count) of orderedIds. When more remain, the ids are kept as a snapshot and
+        /// nextCursor points past this page; otherwise nextCursor is null and nothing is stored.
+        /// </summary>
+        public static List<int> FirstPage(string method, Document doc, IReadOnlyList<int> orderedIds, int skip, int count, out string? nextCursor)
+        {
+            nextCursor = null;
+            int start = Math.Max(0, Math.Min(skip, orderedIds.Count));
+            int take = Math.Max(0, Math.Min(count, orderedIds.Count - start));
+            var page = orderedIds.Skip(start).Take(take).ToList();
+            int next = start + take;
+            if (next >= orderedIds.Count || take == 0) return page;
+
+            SweepExpired();
+            var id = "lc-" + Guid.NewGuid().ToString("N");
+            _snapshots[id] = new Snapshot
+            {
+                Method = (method ?? string.Empty).Trim(),
+                DocKey = DocumentKeyUtil.GetStableDocKey(doc, out _),
+                Ids = orderedIds.ToArray(),
+                ExpiresAtUtc = DateTimeOffset.UtcNow.Add(DefaultTtl)
+            };
+            nextCursor = Format(id, next);
+            return page;
+        }
+
+        /// <summary>
+        /// Page of up to count ids at cursor. totalCount is the snapshot size.
+        /// </summary>
+        public static bool TryNextPage(string cursor, string method, Document doc, int count,
+            out List<int> pageIds, out int totalCount, out string? nextCursor, out string error)
+        {
+            pageIds = new List<int>();
+            totalCount = 0;
+            nextCursor = null;
+            error = string.Empty;
+            SweepExpired();
+
+            if (!TryParse(cursor, out var id, out var offset))
+            {
+                error = "Invalid cursor.";
+                return false;
+            }
+            if (!_snapshots.TryGetValue(id, out var snap) || snap == null || DateTimeOffset.UtcNow > snap.ExpiresAtUtc)
+            {
+                error = "Unknown or expired cursor. Restart the listing without cursor.";
+                return false;
+            }
+            if (!string.Equals(snap.Method, (method ?? string.Empty).Trim(), StringComparison.OrdinalIgnoreCase))
+            {
+                error = "cursor method mismatch.";
+                return false;
+            }
+            if (!string.Equals(snap.DocKey, DocumentKeyUtil.GetStableDocKey(doc, out _), StringComparison.OrdinalIgnoreCase))
+            {
+                error = "cursor document mismatch.";
+                return false;
+            }
+
+            snap.ExpiresAtUtc = DateTimeOffset.UtcNow.Add(DefaultTtl);
+            totalCount = snap.Ids.Length;
+            int start = Math.Max(0, Math.Min(offset, totalCount));
+            int take = Math.Max(0, Math.Min(count, totalCount - start));
+            pageIds = new List<int>(take);
+            for (int i = start; i < start + take; i++) pageIds.Add(snap.Ids[i]);
+            if (start + take < totalCount && take > 0) nextCursor = Format(id, start + take);
+            return true;
+        }
+
+        /// <summary>Elements of pageIds that still exist and are T, in page order.</summary>
+        public static List<T> Resolve<T>(Document doc, IEnumerable<int> pageIds) where T : Element
+        {
+            var list = new List<T>();
+            foreach (var i in pageIds)
+            {
+                if (doc.GetElement(Autodesk.Revit.DB.ElementIdCompat.From(i)) is T e) list.Add(e);
+            }
+            return list;
+        }
+
+        private static string Format(string id, int offset)
+            => id + "." + offset.ToString(CultureInfo.InvariantCulture);
+
+        private static bool TryParse(string cursor, out string id, out int offset)
+        {
+            id = string.Empty;
+            offset = 0;
+            var s = (cursor ?? string.Empty).Trim();
+            int dot = s.LastIndexOf('.');
+            if (dot <= 0) return false;
+            id = s.Substring(0, dot);
+            return int.TryParse(s.Substring(dot + 1), NumberStyles.Integer, CultureInfo.InvariantCulture, out offset) && offset >= 0;
+        }
+
+        private static void SweepExpired()
+        {
+            try
+            {
+                var now = DateTimeOffset.UtcNow;
+                foreach (var kv in _snapshots)
+                {
+                    if (kv.Value == null || kv.Value.ExpiresAtUtc <= now)
+                        _snapshots.TryRemove(kv.Key, out _);
+                }
+                // Over capacity: drop the snapshots closest to expiry
+                int over = _snapshots.Count - (MaxSnapshots - 1);
+                if (over > 0)
+                {
+                    foreach (var key in _snapshots.OrderBy(kv => kv.Value.ExpiresAtUtc).Take(over).Select(kv => kv.Key).ToList())
+                        _snapshots.TryRemove(key, out _);
+                }
+            }
+            catch { /* best-effort */ }
+        }
+    }
+}
@@ -1052,6 +1052,7 @@ namespace RevitMCPAddin
                 new CreateWallsCommand(),
                 new CreateFlushWallsCommand(),
                 new UpdateWallGeometryCommand(),
+                new TransformWallsCommand(),
                 new ChangeWallTypeCommand(),
                 new UpdateWallParameterCommand(),
                 new DuplicateWallTypeCommand(),
@@ -1254,6 +1255,7 @@ namespace RevitMCPAddin
                 new GetFamilyTypeParametersCommand(),
                 new SetFamilyTypeParameterCommand(),
                 new DuplicateFamilyTypeCommand(),
+                new DuplicateFamilyTypesBulkCommand(),
                 new ChangeFamilyInstanceTypeCommand(),
                 new FlipFamilyInstanceOrientationCommand(),
 
@@ -0,0 +1,179 @@
+using System;
+using System.Collections.Generic;
+using System.IO;
+using System.Net.Sockets;
+using System.Text;
+using System.Threading;
+using System.Threading.Tasks;
+using Newtonsoft.Json;
+using Newtonsoft.Json.Linq;
+
+namespace RevitMCPAddin.UI.PythonRunner
+{
+    internal sealed class PythonRunnerDaemonConnection : IDisposable
+    {
+        public TcpClient Client { get; set; } = null!;
+        public string Token { get; set; } = string.Empty;
+        public string Endpoint { get; set; } = string.Empty;
+
+        public void Dispose()
+        {
+            try { Client?.Close(); } catch { }
+        }
+    }
+
+    /// <summary>
+    /// Client for Codex/PythonRunnerScripts/runner_daemon.py (warm interpreter).
+    /// The daemon writes host/port/token to %LOCALAPPDATA%\RevitMCP\runner_daemon.json;
+    /// scripts then run without starting python.exe. Set REVIT_MCP_PY_DAEMON=0 to always spawn a process.
+    /// A daemon is only used when it runs the python.exe selected in the runner (same interpreter and prefix);
+    /// otherwise the script is started as a process.
+    /// </summary>
+    internal static class PythonRunnerDaemonClient
+    {
+        private const int ConnectTimeoutMs = 500;
+
+        public static string GetStatePath()
+        {
+            var env = Environment.GetEnvironmentVariable("REVIT_MCP_RUNNER_DAEMON_FILE");
+            if (!string.IsNullOrWhiteSpace(env)) return env;
+            return Path.Combine(Environment.GetFolderPath(Environment.SpecialFolder.LocalApplicationData), "RevitMCP", "runner_daemon.json");
+        }
+
+        public static bool IsDisabled()
+        {
+            var v = (Environment.GetEnvironmentVariable("REVIT_MCP_PY_DAEMON") ?? string.Empty).Trim().ToLowerInvariant();
+            return v == "0" || v == "false" || v == "off" || v == "no";
+        }
+
+        /// <summary>
+        /// Connects to a running daemon of pythonExe; null when none is listening, it runs another
+        /// interpreter, or the daemon is disabled.
+        /// </summary>
+        public static async Task<PythonRunnerDaemonConnection?> TryConnectAsync(string pythonExe)
+        {
+            if (IsDisabled()) return null;
+            JObject state;
+            try
+            {
+                var path = GetStatePath();
+                if (!File.Exists(path)) return null;
+                state = JObject.Parse(File.ReadAllText(path, Encoding.UTF8));
+            }
+            catch
+            {
+                return null;
+            }
+
+            if (!SamePath(state.Value<string>("python"), pythonExe)) return null;
+            var prefix = state.Value<string>("prefix");
+            if (!string.IsNullOrWhiteSpace(prefix) && !SamePath(prefix, Path.GetDirectoryName(pythonExe))) return null;
+
+            var host = state.Value<string>("host") ?? "127.0.0.1";
+            var port = state.Value<int?>("port") ?? 0;
+            if (port <= 0) return null;
+
+            var client = new TcpClient();
+            try
+            {
+                var connect = client.ConnectAsync(host, port);
+                if (await Task.WhenAny(connect, Task.Delay(ConnectTimeoutMs)).ConfigureAwait(false) != connect || !client.Connected)
+                {
+                    client.Close();
+                    return null;
+                }
+                await connect.ConfigureAwait(false);
+            }
+            catch
+            {
+                client.Close();
+                return null;
+            }
+
+            return new PythonRunnerDaemonConnection
+            {
+                Client = client,
+                Token = state.Value<string>("token") ?? string.Empty,
+                Endpoint = host + ":" + port
+            };
+        }
+
+        private static bool SamePath(string? a, string? b)
+        {
+            if (string.IsNullOrWhiteSpace(a) || string.IsNullOrWhiteSpace(b)) return false;
+            try
+            {
+                var fa = Path.GetFullPath(a!.Trim()).TrimEnd(Path.DirectorySeparatorChar, Path.AltDirectorySeparatorChar);
+                var fb = Path.GetFullPath(b!.Trim()).TrimEnd(Path.DirectorySeparatorChar, Path.AltDirectorySeparatorChar);
+                return string.Equals(fa, fb, StringComparison.OrdinalIgnoreCase);
+            }
+            catch
+            {
+                return false;
+            }
+        }
+
+        /// <summary>
+        /// Runs one script and streams its output. env is applied to os.environ for the run and
+        /// paths are put in front of sys.path (both restored afterwards). Cancelling closes the connection, which
+        /// interrupts the script on the daemon. Returns the exit code (-2 when cancelled).
+        /// </summary>
+        public static async Task<int> RunAsync(PythonRunnerDaemonConnection conn, string scriptPath, string argsText,
+            string workingDirectory, IDictionary<string, string> env, IList<string> paths, Action<string> onOut, Action<string> onErr,
+            CancellationToken ct)
+        {
+            var request = new JObject
+            {
+                ["token"] = conn.Token,
+                ["script"] = scriptPath,
+                ["argsLine"] = argsText ?? string.Empty,
+                ["cwd"] = workingDirectory,
+                ["env"] = JObject.FromObject(env),
+                ["paths"] = JArray.FromObject(paths ?? new List<string>())
+            };
+
+            var utf8 = new UTF8Encoding(false);
+            var stream = conn.Client.GetStream();
+            using (ct.Register(conn.Dispose))
+            {
+                try
+                {
+                    var bytes = utf8.GetBytes(request.ToString(Formatting.None) + "\n");
+                    await stream.WriteAsync(bytes, 0, bytes.Length, ct).ConfigureAwait(false);
+
+                    using (var reader = new StreamReader(stream, utf8, false, 8192, leaveOpen: true))
+                    {
+                        string? line;
+                        while ((line = await reader.ReadLineAsync().ConfigureAwait(false)) != null)
+                        {
+                            JObject msg;
+                            try { msg = JObject.Parse(line); }
+                            catch { onOut(line); continue; }
+
+                            if (msg.TryGetValue("out", out var o)) onOut(o.ToString());
+                            else if (msg.TryGetValue("err", out var e)) onErr(e.ToString());
+                            if (msg.TryGetValue("exit", out var code))
+                            {
+                                var error = msg.Value<string>("error");
+                                if (!string.IsNullOrEmpty(error)) onErr("runner daemon: " + error);
+                                return code.Value<int>();
+                            }
+                        }
+                    }
+                }
+                catch (Exception) when (ct.IsCancellationRequested)
+                {
+                    return -2;
+                }
+                finally
+                {
+                    conn.Dispose();
+                }
+            }
+
+            if (ct.IsCancellationRequested) return -2;
+            onErr("runner daemon closed the connection");
+            return -1;
+        }
+    }
+}
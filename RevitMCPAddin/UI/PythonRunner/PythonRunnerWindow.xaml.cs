@@ -37,6 +37,7 @@ namespace RevitMCPAddin.UI.PythonRunner
         private bool _isDirty;
         private Process? _proc;
         private TaskCompletionSource<int>? _exitTcs;
+        private System.Threading.CancellationTokenSource? _daemonCts;
         private string _lastAutoPolledJobId = "";
         private bool _suppressTextChange;
         private bool _needsOutputHeader = true;
@@ -418,6 +419,16 @@ namespace RevitMCPAddin.UI.PythonRunner
         private async Task StartProcessAsync(string pythonExe, string scriptPath, int port, string argsText)
         {
             var scriptDir = Path.GetDirectoryName(scriptPath) ?? GetDefaultFolder();
+            var env = BuildScriptEnvironment(pythonExe, port, out var extraPaths);
+
+            // 常駐ランナーは選択中の python.exe（同じ PYTHONHOME）で動いているときだけ使う
+            var daemon = await PythonRunnerDaemonClient.TryConnectAsync(pythonExe).ConfigureAwait(false);
+            if (daemon != null)
+            {
+                await RunOnDaemonAsync(daemon, scriptPath, scriptDir, argsText, env, extraPaths).ConfigureAwait(false);
+                return;
+            }
+
             var extraArgs = string.IsNullOrWhiteSpace(argsText) ? "" : (" " + argsText);
             var psi = new ProcessStartInfo
             {
@@ -432,24 +443,9 @@ namespace RevitMCPAddin.UI.PythonRunner
                 StandardErrorEncoding = new UTF8Encoding(false)
             };
 
-            var pythonHome = Path.GetDirectoryName(pythonExe);
-            if (!string.IsNullOrWhiteSpace(pythonHome))
+            foreach (var kv in env)
             {
-                psi.EnvironmentVariables["PYTHONHOME"] = pythonHome;
-            }
-            psi.EnvironmentVariables["REVIT_MCP_PORT"] = port.ToString(CultureInfo.InvariantCulture);
-            psi.EnvironmentVariables["PYTHONUTF8"] = "1";
-            psi.EnvironmentVariables["PYTHONIOENCODING"] = "utf-8";
-            var baseDir = Path.GetDirectoryName(Assembly.GetExecutingAssembly().Location) ?? Environment.CurrentDirectory;
-            var sitePackages = Path.Combine(baseDir, "python", "Lib", "site-packages");
-            if (Directory.Exists(sitePackages))
-            {
-                var existing = psi.EnvironmentVariables.ContainsKey("PYTHONPATH")
-                    ? psi.EnvironmentVariables["PYTHONPATH"]
-                    : null;
-                psi.EnvironmentVariables["PYTHONPATH"] = string.IsNullOrWhiteSpace(existing)
-                    ? sitePackages
-                    : sitePackages + Path.PathSeparator + existing;
+                psi.EnvironmentVariables[kv.Key] = kv.Value;
             }
 
             var proc = new Process { StartInfo = psi, EnableRaisingEvents = true };
@@ -498,6 +494,69 @@ namespace RevitMCPAddin.UI.PythonRunner
             if (ReferenceEquals(_exitTcs, exitTcs)) _exitTcs = null;
         }
 
+        /// <summary>
+        /// Environment for a script run (process or runner daemon): PYTHONHOME of the selected
+        /// python.exe, port, UTF-8 I/O and the bundled python/Lib/site-packages on PYTHONPATH.
+        /// extraPaths lists the bundled paths so the daemon can put them on sys.path as well.
+        /// </summary>
+        private static Dictionary<string, string> BuildScriptEnvironment(string pythonExe, int port, out List<string> extraPaths)
+        {
+            var env = new Dictionary<string, string>(StringComparer.OrdinalIgnoreCase);
+            extraPaths = new List<string>();
+            var pythonHome = Path.GetDirectoryName(pythonExe);
+            if (!string.IsNullOrWhiteSpace(pythonHome))
+            {
+                env["PYTHONHOME"] = pythonHome;
+            }
+            env["REVIT_MCP_PORT"] = port.ToString(CultureInfo.InvariantCulture);
+            env["PYTHONUTF8"] = "1";
+            env["PYTHONIOENCODING"] = "utf-8";
+            var baseDir = Path.GetDirectoryName(Assembly.GetExecutingAssembly().Location) ?? Environment.CurrentDirectory;
+            var sitePackages = Path.Combine(baseDir, "python", "Lib", "site-packages");
+            if (Directory.Exists(sitePackages))
+            {
+                var existing = Environment.GetEnvironmentVariable("PYTHONPATH");
+                env["PYTHONPATH"] = string.IsNullOrWhiteSpace(existing)
+                    ? sitePackages
+                    : sitePackages + Path.PathSeparator + existing;
+                extraPaths.Add(sitePackages);
+            }
+            return env;
+        }
+
+        private async Task RunOnDaemonAsync(PythonRunnerDaemonConnection daemon, string scriptPath, string scriptDir, string argsText,
+            Dictionary<string, string> env, List<string> extraPaths)
+        {
+            var cts = new System.Threading.CancellationTokenSource();
+            _daemonCts = cts;
+
+            AppendOutput("Runner daemon: " + daemon.Endpoint);
+            int exitCode;
+            try
+            {
+                exitCode = await PythonRunnerDaemonClient.RunAsync(daemon, scriptPath, argsText, scriptDir, env, extraPaths,
+                    AppendOutput, line => AppendOutput("ERR: " + line), cts.Token).ConfigureAwait(false);
+            }
+            catch (Exception ex)
+            {
+                AppendOutput("Runner daemon error: " + ex.Message);
+                exitCode = -1;
+            }
+            finally
+            {
+                if (ReferenceEquals(_daemonCts, cts)) _daemonCts = null;
+                cts.Dispose();
+            }
+
+            var stopped = _stopRequested || exitCode == -2;
+            AppendOutput(stopped ? "Process stopped." : ("Process exit: " + exitCode));
+
+            if (!stopped && !_isClosing)
+            {
+                await TryAutoPollQueuedJobAsync().ConfigureAwait(false);
+            }
+        }
+
         private void StopProcess()
         {
             StopProcess(addOutput: true);
@@ -506,6 +565,15 @@ namespace RevitMCPAddin.UI.PythonRunner
         private void StopProcess(bool addOutput)
         {
             if (addOutput) StartOutputGroup();
+            var daemonCts = _daemonCts;
+            if (daemonCts != null)
+            {
+                _stopRequested = true;
+                try { daemonCts.Cancel(); } catch (ObjectDisposedException) { }
+                if (addOutput) AppendOutput("Stop requested (runner daemon).");
+                return;
+            }
+
             var proc = _proc;
             var exitTcs = _exitTcs;
             if (proc == null) return;
@@ -1,30 +1,70 @@
 #!/usr/bin/env python3
-import argparse, json, time, sys
-from typing import Any, Dict, Optional
+import argparse, json, time, sys, threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 import requests
 
 HEADERS = {"Content-Type": "application/json; charset=utf-8", "Accept": "application/json"}
 
+# One keep-alive session per worker thread (requests.Session is not thread-safe).
+_tls = threading.local()
+
+def _session() -> requests.Session:
+    s = getattr(_tls, "session", None)
+    if s is None:
+        s = requests.Session()
+        s.headers.update(HEADERS)
+        _tls.session = s
+    return s
+
 def post_json(url: str, body: Dict[str, Any], timeout=(5, 60)) -> Dict[str, Any]:
-    r = requests.post(url, data=json.dumps(body), headers=HEADERS, timeout=timeout)
+    r = _session().post(url, data=json.dumps(body), timeout=timeout)
     r.raise_for_status()
     return r.json()
 
+def _retry_after(resp: requests.Response, default: float) -> float:
+    try:
+        return max(0.05, float(resp.headers.get("Retry-After", default)))
+    except Exception:
+        return default
+
 def send_revit(port: int, method: str, params: Optional[Dict[str, Any]] = None, wait_s: float = 60.0) -> Dict[str, Any]:
+    """Enqueue without force and wait on this job's own /job/{id} (safe with several jobs in flight)."""
     if params is None:
         params = {}
     base = f"http://127.0.0.1:{port}"
+    sess = _session()
     call = {"jsonrpc":"2.0","id":int(time.time()*1000),"method":method,"params":params}
-    requests.post(base + "/enqueue?force=1", data=json.dumps(call), headers=HEADERS, timeout=(5,60)).raise_for_status()
+    er = sess.post(base + "/enqueue", data=json.dumps(call), timeout=(5,60))
+    er.raise_for_status()
+    enq = er.json()
+    if isinstance(enq, dict) and enq.get("ok") is False:
+        raise RuntimeError(f"{method}: {enq.get('error') or enq.get('msg') or 'enqueue failed'}")
+    job_id = (enq.get("jobId") or enq.get("job_id")) if isinstance(enq, dict) else None
+    if not job_id:
+        # immediate result (no job row)
+        return enq
+
     t0 = time.time()
+    delay = 0.1
+    etag = None
     while True:
-        gr = requests.get(base + "/get_result", timeout=(5,60))
-        if gr.status_code in (202,204):
-            if time.time() - t0 > wait_s:
-                raise TimeoutError(f"Timed out waiting for {method}")
-            time.sleep(0.2)
-            continue
-        return gr.json()
+        h = {"If-None-Match": etag} if etag else {}
+        gr = sess.get(f"{base}/job/{job_id}", headers=h, timeout=(5,60))
+        if gr.status_code not in (202, 204, 304):
+            gr.raise_for_status()
+            etag = gr.headers.get("ETag") or etag
+            row = gr.json()
+            st = row.get("state")
+            if st == "SUCCEEDED":
+                rjson = row.get("result_json")
+                return json.loads(rjson) if isinstance(rjson, str) and rjson.strip() else {"ok": True}
+            if st in ("FAILED", "TIMEOUT", "DEAD"):
+                raise RuntimeError(f"{method}: {row.get('error_msg') or st}")
+        if time.time() - t0 > wait_s:
+            raise TimeoutError(f"Timed out waiting for {method}")
+        time.sleep(_retry_after(gr, delay))
+        delay = min(1.0, delay * 1.5)
 
 def get_result_leaf(obj: Dict[str, Any]) -> Dict[str, Any]:
     cur = obj
@@ -40,19 +80,214 @@ def rhino_server_rpc(base: str, method: str, params: Dict[str, Any]) -> Dict[str
     body = {"jsonrpc":"2.0","id":int(time.time()*1000),"method":method,"params":params}
     return post_json(url, body)
 
-def plugin_ipc_snapshot(plugin_url: str, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+def plugin_ipc(plugin_url: str, method: str, params: Dict[str, Any]) -> Dict[str, Any]:
     url = plugin_url.rstrip('/') + "/rpc"
-    body = {"jsonrpc":"2.0","id":int(time.time()*1000),"method":"rhino_import_snapshot","params":snapshot}
-    return post_json(url, body)
+    body = {"jsonrpc":"2.0","id":int(time.time()*1000),"method":method,"params":params}
+    return post_json(url, body, timeout=(5, 300))
+
+def plugin_ipc_snapshot(plugin_url: str, snapshot: Dict[str, Any]) -> Dict[str, Any]:
+    return plugin_ipc(plugin_url, "rhino_import_snapshot", snapshot)
 
 def mm_to_ft(v: float) -> float:
     return v / 304.8
 
+def to_snapshot(item: Dict[str, Any]) -> Dict[str, Any]:
+    """get_instances_geometry item -> plugin snapshot. Packed buffers are passed through untouched."""
+    snap = dict(item)
+    subs = []
+    for sm in snap.get("submeshes") or []:
+        sm = dict(sm)
+        sm.setdefault("materialKey", sm.get("materialId"))
+        if "indexBuffer" not in sm and "intIndices" not in sm and "indices" in sm:
+            sm["intIndices"] = sm["indices"]
+        subs.append(sm)
+    snap["submeshes"] = subs
+    verts = snap.get("vertices")
+    if "vertexBuffer" not in snap and verts and not isinstance(verts[0], (list, tuple)):
+        # add-in without encoding:"packed" returns a flat [x,y,z,...] list
+        snap["vertices"] = [verts[i:i+3] for i in range(0, len(verts) - 2, 3)]
+    snap.setdefault("snapshotStamp", time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()))
+    return snap
+
+def bbox_snapshot(uid: str, el: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    bbox = el.get("bboxMm") or {}
+    mn = bbox.get("min"); mx = bbox.get("max")
+    if not mn or not mx:
+        return None
+    minx, miny, minz = mm_to_ft(mn["x"]), mm_to_ft(mn["y"]), mm_to_ft(mn["z"])
+    maxx, maxy, maxz = mm_to_ft(mx["x"]), mm_to_ft(mx["y"]), mm_to_ft(mx["z"])
+    verts = [
+        [minx,miny,minz],[maxx,miny,minz],[maxx,maxy,minz],[minx,maxy,minz],
+        [minx,miny,maxz],[maxx,miny,maxz],[maxx,maxy,maxz],[minx,maxy,maxz]
+    ]
+    idx = [0,1,2,0,2,3, 4,5,6,4,6,7, 0,1,5,0,5,4, 1,2,6,1,6,5, 2,3,7,2,7,6, 3,0,4,3,4,7]
+    # Use stable uniqueId (without timestamp) so repeated runs update instead of duplicating
+    return {
+        "uniqueId": uid,
+        "units": "feet",
+        "vertices": verts,
+        "submeshes": [{"materialKey": "bbox", "intIndices": idx}],
+        "snapshotStamp": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    }
+
+def fetch_geometry(port: int, uids: List[str], page_size: int, in_flight: int, wait_s: float,
+                   extra: Optional[Dict[str, Any]] = None) -> Iterator[Tuple[List[str], List[Dict[str, Any]], Optional[Exception]]]:
+    """
+    Pull get_instances_geometry (encoding:packed) one page of uniqueIds per job,
+    keeping up to `in_flight` jobs queued so transfer overlaps Revit-side work.
+    Yields (pageUids, items, error) as each page completes.
+    """
+    pages = [uids[i:i+page_size] for i in range(0, len(uids), page_size)]
+
+    def one(page: List[str]) -> List[Dict[str, Any]]:
+        params = {
+            "uniqueIds": page,
+            "encoding": "packed",
+            "page": {"startIndex": 0, "batchSize": len(page)}
+        }
+        params.update(extra or {})
+        res = send_revit(port, "get_instances_geometry", params, wait_s=wait_s)
+        return get_result_leaf(res).get("items") or []
+
+    with ThreadPoolExecutor(max_workers=max(1, in_flight)) as ex:
+        futs = {ex.submit(one, page): page for page in pages}
+        for fut in as_completed(futs):
+            try:
+                yield futs[fut], fut.result(), None
+            except Exception as e:
+                yield futs[fut], [], e
+
+class SnapshotPusher:
+    """Buffers snapshots and sends them to the plugin with rhino_import_snapshots."""
+
+    def __init__(self, plugin_url: str, batch: int):
+        self.plugin_url = plugin_url
+        self.batch = max(1, batch)
+        self.buf: List[Dict[str, Any]] = []
+        self.batch_supported = True
+        self.imported = 0
+        self.failed: List[str] = []
+
+    def add(self, snap: Dict[str, Any]) -> None:
+        self.buf.append(snap)
+        if len(self.buf) >= self.batch:
+            self.flush()
+
+    def _push_one(self, snap: Dict[str, Any]) -> None:
+        try:
+            out = plugin_ipc_snapshot(self.plugin_url, snap)
+            if out.get("result",{}).get("ok"):
+                self.imported += 1
+                return
+        except Exception:
+            pass
+        self.failed.append(snap.get("uniqueId"))
+
+    def flush(self) -> None:
+        buf, self.buf = self.buf, []
+        if not buf:
+            return
+        if self.batch_supported:
+            try:
+                out = plugin_ipc(self.plugin_url, "rhino_import_snapshots", {"snapshots": buf})
+            except Exception:
+                out = None
+            err = (out or {}).get("error") or {}
+            if out is not None and "Unknown method" not in str(err.get("message", "")):
+                res = out.get("result") or {}
+                items = res.get("items") or []
+                for snap, r in zip(buf, items):
+                    if r.get("ok"):
+                        self.imported += 1
+                    else:
+                        self.failed.append(snap.get("uniqueId"))
+                self.failed.extend(s.get("uniqueId") for s in buf[len(items):])
+                return
+            if out is not None:
+                # older plugin: one snapshot per call
+                self.batch_supported = False
+        for snap in buf:
+            self._push_one(snap)
+
+def _plugin_result(out: Dict[str, Any], method: str) -> Dict[str, Any]:
+    err = out.get("error")
+    if err:
+        raise RuntimeError(f"{method}: {err.get('message') if isinstance(err, dict) else err}")
+    return out.get("result") or {}
+
+def mirror_instanced(args, uids: List[str]) -> Tuple[int, List[str]]:
+    """
+    Geometry instancing: one block definition per (typeId, geomHash), then per-instance transforms.
+      1) get_instances_geometry useOriginalGeometry + includeMesh:false -> typeId/geomHash/transform
+      2) rhino_list_geom_blocks -> hashes the plugin already has (re-runs skip them)
+      3) fetch one representative mesh per missing key -> rhino_define_geom_blocks
+      4) rhino_place_geom_instances
+    Returns (placed, uniqueIds that still need a fallback).
+    """
+    page_size = max(1, args.page_size)
+    batch = max(1, args.push_batch)
+    local = {"useOriginalGeometry": True}
+
+    placements: Dict[str, Dict[str, Any]] = {}
+    missing: List[str] = []
+    for page, items, err in fetch_geometry(args.revit_port, uids, page_size, args.in_flight, args.wait_s,
+                                           dict(local, includeMesh=False)):
+        if err is not None:
+            missing.extend(page)
+            continue
+        for it in items:
+            if it.get("ok") and it.get("uniqueId") and it.get("geomHash"):
+                placements[it["uniqueId"]] = it
+        missing.extend(u for u in page if u not in placements)
+
+    reps: Dict[Tuple[str, str], str] = {}
+    for uid, it in placements.items():
+        reps.setdefault((str(it.get("typeId")), it["geomHash"]), uid)
+
+    keys = [{"typeId": t, "geomHash": h} for t, h in reps]
+    existing = _plugin_result(plugin_ipc(args.plugin_url, "rhino_list_geom_blocks", {"keys": keys}), "rhino_list_geom_blocks")
+    have = {(str(k.get("typeId")), k.get("geomHash")) for k in existing.get("existing") or []}
+    need = [uid for key, uid in reps.items() if key not in have]
+
+    defs: List[Dict[str, Any]] = []
+    def flush_defs() -> None:
+        if defs:
+            _plugin_result(plugin_ipc(args.plugin_url, "rhino_define_geom_blocks", {"definitions": defs}), "rhino_define_geom_blocks")
+            defs.clear()
+
+    for page, items, err in fetch_geometry(args.revit_port, need, page_size, args.in_flight, args.wait_s, local):
+        for it in items:
+            if it.get("ok") and it.get("geomHash") and it.get("vertexBuffer"):
+                defs.append({k: it.get(k) for k in ("typeId", "geomHash", "vertexBuffer", "vertexOrigin", "submeshes")})
+                if len(defs) >= batch:
+                    flush_defs()
+    flush_defs()
+
+    stamp = time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
+    placed = 0
+    rows = [{"uniqueId": uid, "typeId": it.get("typeId"), "geomHash": it["geomHash"],
+             "transform": it.get("transform"), "snapshotStamp": stamp} for uid, it in placements.items()]
+    place_batch = max(1, args.place_batch)
+    for i in range(0, len(rows), place_batch):
+        chunk = rows[i:i+place_batch]
+        res = _plugin_result(plugin_ipc(args.plugin_url, "rhino_place_geom_instances", {"instances": chunk}), "rhino_place_geom_instances")
+        ok_uids = {r.get("uniqueId") for r in res.get("items") or [] if r.get("ok")}
+        placed += len(ok_uids)
+        missing.extend(r["uniqueId"] for r in chunk if r["uniqueId"] not in ok_uids)
+    return placed, missing
+
 def main():
     ap = argparse.ArgumentParser(description="Mirror Revit selection to Rhino via RhinoMCP, with fallbacks")
     ap.add_argument("--revit-port", type=int, required=True)
     ap.add_argument("--rhino-url", type=str, required=True, help="RhinoMcpServer base URL, e.g. http://127.0.0.1:5200")
     ap.add_argument("--plugin-url", type=str, default="http://127.0.0.1:5201", help="Rhino plugin IPC URL")
+    ap.add_argument("--direct", action="store_true", help="Skip rhino_import_by_ids and push packed meshes to the plugin directly")
+    ap.add_argument("--page-size", type=int, default=25, help="Elements per get_instances_geometry job")
+    ap.add_argument("--in-flight", type=int, default=3, help="Geometry jobs kept in flight")
+    ap.add_argument("--push-batch", type=int, default=20, help="Snapshots per rhino_import_snapshots call")
+    ap.add_argument("--wait-s", type=float, default=300.0, help="Max wait per Revit job (seconds)")
+    ap.add_argument("--instancing", action="store_true", help="Share one block per (typeId, geomHash); send only transforms per instance")
+    ap.add_argument("--place-batch", type=int, default=500, help="Instances per rhino_place_geom_instances call")
     args = ap.parse_args()
 
     sel = send_revit(args.revit_port, "get_selected_element_ids", {})
@@ -71,80 +306,61 @@ def main():
         sys.exit(1)
 
     # Try server path first. Treat any ok:true as success to avoid double import.
-    try:
-        res = rhino_server_rpc(
-            args.rhino_url,
-            "rhino_import_by_ids",
-            {"uniqueIds": uids, "revitBaseUrl": f"http://127.0.0.1:{args.revit_port}"}
-        )
-        res_leaf = get_result_leaf(res)
-        if res_leaf.get("ok") is True:
-            # Do not fall back if server reports ok, regardless of imported count.
-            print(json.dumps({"ok": True, "path": "server", "result": res_leaf}, ensure_ascii=False))
-            return
-    except Exception:
-        # Proceed to fallback only on transport/protocol failure
-        pass
+    if not args.direct:
+        try:
+            res = rhino_server_rpc(
+                args.rhino_url,
+                "rhino_import_by_ids",
+                {"uniqueIds": uids, "revitBaseUrl": f"http://127.0.0.1:{args.revit_port}"}
+            )
+            res_leaf = get_result_leaf(res)
+            if res_leaf.get("ok") is True:
+                # Do not fall back if server reports ok, regardless of imported count.
+                print(json.dumps({"ok": True, "path": "server", "result": res_leaf}, ensure_ascii=False))
+                return
+        except Exception:
+            # Proceed to fallback only on transport/protocol failure
+            pass
 
-    imported = 0; errors = 0
-    for uid in uids:
+    pusher = SnapshotPusher(args.plugin_url, args.push_batch)
+    missing: List[str] = []
+    placed = 0
+    todo = uids
+    if args.instancing:
         try:
-            geom = send_revit(args.revit_port, "get_instance_geometry", {"uniqueId": uid})
-            gleaf = get_result_leaf(geom)
-            if not gleaf.get("ok"):
-                raise RuntimeError("get_instance_geometry not ok")
-            snap = gleaf
-            subs = snap.get("submeshes") or []
-            for sm in subs:
-                if "intIndices" not in sm and "indices" in sm:
-                    sm["intIndices"] = sm["indices"]
-            # Ensure stable uniqueId to prevent duplicate blocks on re-run
-            if isinstance(snap, dict) and "uniqueId" in snap and isinstance(snap["uniqueId"], str):
-                snap["uniqueId"] = snap["uniqueId"]
-            out = plugin_ipc_snapshot(args.plugin_url, snap)
-            if out.get("result",{}).get("ok"):
-                imported += 1
-            else:
-                errors += 1
+            placed, todo = mirror_instanced(args, uids)
         except Exception:
-            # final fallback: bbox proxy
-            try:
-                info_one = send_revit(args.revit_port, "get_element_info", {"uniqueIds": [uid], "rich": True})
-                e_leaf = get_result_leaf(info_one)
-                arr = e_leaf.get("elements") or []
-                if not arr:
-                    errors += 1
-                    continue
-                el = arr[0]
-                bbox = el.get("bboxMm") or {}
-                mn = bbox.get("min"); mx = bbox.get("max")
-                if not mn or not mx:
-                    errors += 1
-                    continue
-                minx, miny, minz = mn["x"]/304.8, mn["y"]/304.8, mn["z"]/304.8
-                maxx, maxy, maxz = mx["x"]/304.8, mx["y"]/304.8, mx["z"]/304.8
-                verts = [
-                    [minx,miny,minz],[maxx,miny,minz],[maxx,maxy,minz],[minx,maxy,minz],
-                    [minx,miny,maxz],[maxx,miny,maxz],[maxx,maxy,maxz],[minx,maxy,maxz]
-                ]
-                idx = [0,1,2,0,2,3, 4,5,6,4,6,7, 0,1,5,0,5,4, 1,2,6,1,6,5, 2,3,7,2,7,6, 3,0,4,3,4,7]
-                # Use stable uniqueId (without timestamp) so repeated runs update instead of duplicating
-                bbox_snap = {
-                    "uniqueId": uid,
-                    "units": "feet",
-                    "vertices": verts,
-                    "submeshes": [{"materialKey": "bbox", "intIndices": idx}],
-                    "snapshotStamp": time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime())
-                }
-                out = plugin_ipc_snapshot(args.plugin_url, bbox_snap)
-                if out.get("result",{}).get("ok"):
-                    imported += 1
-                else:
-                    errors += 1
-            except Exception:
-                errors += 1
+            # plugin without instancing support: mirror every element as its own mesh
+            placed, todo = 0, uids
+    for page, items, err in fetch_geometry(args.revit_port, todo, max(1, args.page_size), args.in_flight, args.wait_s):
+        if err is not None:
+            missing.extend(page)
+            continue
+        got = set()
+        for it in items:
+            uid = it.get("uniqueId")
+            if it.get("ok") and uid and (it.get("vertexBuffer") or it.get("vertices")):
+                pusher.add(to_snapshot(it))
+                got.add(uid)
+        missing.extend(u for u in page if u not in got)
+    pusher.flush()
+    mesh_imported = pusher.imported
+
+    # final fallback: bbox proxy (bboxMm from the rich get_element_info above)
+    by_uid = {e.get("uniqueId"): e for e in elements}
+    errors = 0
+    retry, pusher.failed = missing + pusher.failed, []
+    for uid in retry:
+        snap = bbox_snapshot(uid, by_uid.get(uid) or {})
+        if snap is None:
+            errors += 1
+            continue
+        pusher.add(snap)
+    pusher.flush()
+    errors += len(pusher.failed)
+    bbox_imported = pusher.imported - mesh_imported
 
-    print(json.dumps({"ok": errors == 0, "path": "fallback", "imported": imported, "errors": errors}, ensure_ascii=False))
+    print(json.dumps({"ok": errors == 0, "path": "fallback", "imported": pusher.imported + placed, "instanced": placed, "bboxProxies": bbox_imported, "errors": errors}, ensure_ascii=False))
 
 if __name__ == "__main__":
     main()
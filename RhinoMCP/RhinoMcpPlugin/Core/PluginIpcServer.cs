@@ -123,6 +123,14 @@ namespace RhinoMcpPlugin.Core
             {
                 case "rhino_import_snapshot":
                     return RhinoImportSnapshot(p);
+                case "rhino_import_snapshots":
+                    return RhinoImportSnapshots(p);
+                case "rhino_list_geom_blocks":
+                    return RhinoListGeomBlocks(p);
+                case "rhino_define_geom_blocks":
+                    return RhinoDefineGeomBlocks(p);
+                case "rhino_place_geom_instances":
+                    return RhinoPlaceGeomInstances(p);
                 case "rhino_get_selection":
                     return RhinoGetSelection(p);
                 case "rhino_commit_transform":
@@ -313,12 +321,78 @@ namespace RhinoMcpPlugin.Core
             var doc = RhinoDoc.ActiveDoc;
             if (doc == null) return new JObject { ["ok"] = false, ["msg"] = "No active doc" };
 
-            try
+            var res = ImportSnapshotCore(doc, root);
+            if ((bool?)res["ok"] == true) doc.Views.Redraw();
+            return res;
+        }
+
+        // params: { snapshots: [ <rhino_import_snapshot params>, ... ] }
+        // One IPC round-trip and one redraw for the whole batch.
+        private static JObject RhinoImportSnapshots(JObject p)
+        {
+            var doc = RhinoDoc.ActiveDoc;
+            if (doc == null) return new JObject { ["ok"] = false, ["msg"] = "No active doc" };
+
+            var snaps = p["snapshots"] as JArray;
+            if (snaps == null) return new JObject { ["ok"] = false, ["msg"] = "snapshots[] required" };
+
+            var items = new JArray();
+            int okCount = 0;
+            foreach (var t in snaps)
+            {
+                var snap = t as JObject;
+                var r = snap != null ? ImportSnapshotCore(doc, snap) : new JObject { ["ok"] = false, ["msg"] = "Invalid snapshot" };
+                r["uniqueId"] = snap?["uniqueId"];
+                if ((bool?)r["ok"] == true) okCount++;
+                items.Add(r);
+            }
+            if (okCount > 0) doc.Views.Redraw();
+            return new JObject { ["ok"] = okCount == snaps.Count, ["imported"] = okCount, ["errors"] = snaps.Count - okCount, ["items"] = items };
+        }
+
+        // encoding:"packed" (Revit get_instance(s)_geometry):
+        //   vertexBuffer = base64 float32 LE xyz relative to vertexOrigin (feet)
+        //   submeshes[].indexBuffer = base64 int32 LE
+        private static bool AddPackedVertices(Mesh mesh, JObject root, double s)
+        {
+            var b64 = root["vertexBuffer"] as JValue;
+            if (b64 == null || b64.Type != JTokenType.String) return false;
+            var bytes = Convert.FromBase64String((string)b64);
+            var origin = root["vertexOrigin"] as JArray;
+            double ox = origin != null && origin.Count >= 3 ? (double)origin[0] : 0.0;
+            double oy = origin != null && origin.Count >= 3 ? (double)origin[1] : 0.0;
+            double oz = origin != null && origin.Count >= 3 ? (double)origin[2] : 0.0;
+            for (int o = 0; o + 11 < bytes.Length; o += 12)
+            {
+                double x = ox + BitConverter.ToSingle(bytes, o);
+                double y = oy + BitConverter.ToSingle(bytes, o + 4);
+                double z = oz + BitConverter.ToSingle(bytes, o + 8);
+                mesh.Vertices.Add((float)(x * s), (float)(y * s), (float)(z * s));
+            }
+            return true;
+        }
+
+        private static void AddPackedFaces(Mesh mesh, string b64)
+        {
+            var bytes = Convert.FromBase64String(b64);
+            for (int o = 0; o + 11 < bytes.Length; o += 12)
+            {
+                mesh.Faces.AddFace(
+                    BitConverter.ToInt32(bytes, o),
+                    BitConverter.ToInt32(bytes, o + 4),
+                    BitConverter.ToInt32(bytes, o + 8));
+            }
+        }
+
+        private static Mesh BuildSnapshotMesh(JObject root, out string error)
+        {
+            error = null;
+            var mesh = new Mesh();
+            double s = UnitUtil.FeetToMm(1.0);
+            if (!AddPackedVertices(mesh, root, s))
             {
-                var mesh = new Mesh();
                 var vertices = root["vertices"] as JArray;
-                if (vertices == null) return new JObject { ["ok"] = false, ["msg"] = "No vertices" };
-                double s = UnitUtil.FeetToMm(1.0);
+                if (vertices == null) { error = "No vertices"; return null; }
                 foreach (var v in vertices)
                 {
                     var x = (double)v[0];
@@ -326,24 +400,40 @@ namespace RhinoMcpPlugin.Core
                     var z = (double)v[2];
                     mesh.Vertices.Add((float)(x * s), (float)(y * s), (float)(z * s));
                 }
-                var submeshes = root["submeshes"] as JArray;
-                if (submeshes != null)
+            }
+            var submeshes = root["submeshes"] as JArray;
+            if (submeshes != null)
+            {
+                foreach (var sm in submeshes)
                 {
-                    foreach (var sm in submeshes)
+                    var packedIdx = sm["indexBuffer"] as JValue;
+                    if (packedIdx != null && packedIdx.Type == JTokenType.String)
                     {
-                        var idx = sm["intIndices"] as JArray ?? sm["indices"] as JArray; // tolerate naming
-                        if (idx == null) continue;
-                        for (int i = 0; i + 2 < idx.Count; i += 3)
-                        {
-                            int a = (int)idx[i + 0];
-                            int b = (int)idx[i + 1];
-                            int c = (int)idx[i + 2];
-                            mesh.Faces.AddFace(a, b, c);
-                        }
+                        AddPackedFaces(mesh, (string)packedIdx);
+                        continue;
+                    }
+                    var idx = sm["intIndices"] as JArray ?? sm["indices"] as JArray; // tolerate naming
+                    if (idx == null) continue;
+                    for (int i = 0; i + 2 < idx.Count; i += 3)
+                    {
+                        int a = (int)idx[i + 0];
+                        int b = (int)idx[i + 1];
+                        int c = (int)idx[i + 2];
+                        mesh.Faces.AddFace(a, b, c);
                     }
                 }
-                mesh.Normals.ComputeNormals();
-                mesh.Compact();
+            }
+            mesh.Normals.ComputeNormals();
+            mesh.Compact();
+            return mesh;
+        }
+
+        private static JObject ImportSnapshotCore(RhinoDoc doc, JObject root)
+        {
+            try
+            {
+                var mesh = BuildSnapshotMesh(root, out var meshError);
+                if (mesh == null) return new JObject { ["ok"] = false, ["msg"] = meshError };
 
                 var defName = "RevitRef_" + (string)(root["uniqueId"] ?? Guid.NewGuid().ToString());
                 var defId = doc.InstanceDefinitions.Add(defName, "Revit reference", Point3d.Origin, new System.Collections.Generic.List<GeometryBase> { mesh });
@@ -373,7 +463,6 @@ namespace RhinoMcpPlugin.Core
                 attr.UserData.Add(ud);
                 doc.Objects.ModifyAttributes(iobj, attr, true);
 
-                doc.Views.Redraw();
                 return new JObject { ["ok"] = true, ["msg"] = "imported" };
             }
             catch (Exception ex)
@@ -382,6 +471,155 @@ namespace RhinoMcpPlugin.Core
             }
         }
 
+        // ---- Geometry instancing (one block definition per (typeId, geomHash)) ----
+
+        private static string GeomBlockName(JToken typeId, string geomHash)
+        {
+            return "RevitGeom_" + ((string)typeId ?? "0") + "_" + geomHash;
+        }
+
+        // params: { keys: [{ typeId, geomHash }] } -> { ok, existing: [{ typeId, geomHash }] }
+        private static JObject RhinoListGeomBlocks(JObject p)
+        {
+            var doc = RhinoDoc.ActiveDoc;
+            if (doc == null) return new JObject { ["ok"] = false, ["msg"] = "No active doc" };
+
+            var existing = new JArray();
+            foreach (var k in p["keys"] as JArray ?? new JArray())
+            {
+                var hash = (string)k["geomHash"];
+                if (string.IsNullOrWhiteSpace(hash)) continue;
+                var def = doc.InstanceDefinitions.Find(GeomBlockName(k["typeId"], hash), true);
+                if (def != null && !def.IsDeleted)
+                    existing.Add(new JObject { ["typeId"] = k["typeId"], ["geomHash"] = hash });
+            }
+            return new JObject { ["ok"] = true, ["existing"] = existing };
+        }
+
+        // params: { definitions: [{ typeId, geomHash, vertexBuffer|vertices, vertexOrigin, submeshes }] }
+        // Geometry is in element-local feet (get_instances_geometry useOriginalGeometry:true).
+        private static JObject RhinoDefineGeomBlocks(JObject p)
+        {
+            var doc = RhinoDoc.ActiveDoc;
+            if (doc == null) return new JObject { ["ok"] = false, ["msg"] = "No active doc" };
+
+            var items = new JArray();
+            int created = 0, skipped = 0, errors = 0;
+            foreach (var t in p["definitions"] as JArray ?? new JArray())
+            {
+                var d = t as JObject;
+                var hash = (string)d?["geomHash"];
+                if (string.IsNullOrWhiteSpace(hash)) { errors++; continue; }
+                var name = GeomBlockName(d["typeId"], hash);
+                try
+                {
+                    var existing = doc.InstanceDefinitions.Find(name, true);
+                    if (existing != null && !existing.IsDeleted)
+                    {
+                        skipped++;
+                        items.Add(new JObject { ["geomHash"] = hash, ["ok"] = true, ["msg"] = "exists" });
+                        continue;
+                    }
+                    var mesh = BuildSnapshotMesh(d, out var err);
+                    if (mesh == null) { errors++; items.Add(new JObject { ["geomHash"] = hash, ["ok"] = false, ["msg"] = err }); continue; }
+                    var idx = doc.InstanceDefinitions.Add(name, "Revit geometry " + hash, Point3d.Origin, new System.Collections.Generic.List<GeometryBase> { mesh });
+                    if (idx < 0) { errors++; items.Add(new JObject { ["geomHash"] = hash, ["ok"] = false, ["msg"] = "Failed to create block definition" }); continue; }
+                    created++;
+                    items.Add(new JObject { ["geomHash"] = hash, ["ok"] = true, ["msg"] = "created" });
+                }
+                catch (Exception ex)
+                {
+                    errors++;
+                    items.Add(new JObject { ["geomHash"] = hash, ["ok"] = false, ["msg"] = ex.Message });
+                }
+            }
+            return new JObject { ["ok"] = errors == 0, ["created"] = created, ["skipped"] = skipped, ["errors"] = errors, ["items"] = items };
+        }
+
+        // Revit 4x4 (feet): rows hold BasisX/BasisY/BasisZ with Origin in column 3.
+        private static Transform RevitTransformToRhino(JArray m, double s)
+        {
+            var xf = Transform.Identity;
+            if (m == null || m.Count < 3) return xf;
+            for (int axis = 0; axis < 3; axis++)
+            {
+                var row = m[axis] as JArray;
+                if (row == null || row.Count < 4) return Transform.Identity;
+                xf[0, axis] = (double)row[0];
+                xf[1, axis] = (double)row[1];
+                xf[2, axis] = (double)row[2];
+                xf[axis, 3] = (double)row[3] * s;
+            }
+            return xf;
+        }
+
+        // params: { instances: [{ uniqueId, typeId, geomHash, transform, snapshotStamp }], replaceExisting?: true }
+        private static JObject RhinoPlaceGeomInstances(JObject p)
+        {
+            var doc = RhinoDoc.ActiveDoc;
+            if (doc == null) return new JObject { ["ok"] = false, ["msg"] = "No active doc" };
+
+            var list = p["instances"] as JArray ?? new JArray();
+            bool replace = (bool?)p["replaceExisting"] ?? true;
+            double s = UnitUtil.FeetToMm(1.0);
+
+            // Existing mirrors by uniqueId (one scan per call)
+            var byUid = new System.Collections.Generic.Dictionary<string, System.Collections.Generic.List<Guid>>();
+            if (replace)
+            {
+                foreach (var obj in doc.Objects)
+                {
+                    var uid = UserData.RevitRefUserData.From(obj)?.RevitUniqueId;
+                    if (string.IsNullOrWhiteSpace(uid)) continue;
+                    if (!byUid.TryGetValue(uid, out var ids)) byUid[uid] = ids = new System.Collections.Generic.List<Guid>();
+                    ids.Add(obj.Id);
+                }
+            }
+
+            var items = new JArray();
+            int placed = 0, errors = 0;
+            foreach (var t in list)
+            {
+                var uid = (string)t["uniqueId"] ?? "";
+                var hash = (string)t["geomHash"] ?? "";
+                var def = doc.InstanceDefinitions.Find(GeomBlockName(t["typeId"], hash), true);
+                if (def == null || def.IsDeleted)
+                {
+                    errors++;
+                    items.Add(new JObject { ["uniqueId"] = uid, ["ok"] = false, ["msg"] = "Block definition not found" });
+                    continue;
+                }
+                if (replace && byUid.TryGetValue(uid, out var old))
+                {
+                    foreach (var g in old) doc.Objects.Delete(g, true);
+                    byUid.Remove(uid);
+                }
+
+                var xf = RevitTransformToRhino(t["transform"] as JArray, s);
+                var attr = new ObjectAttributes();
+                attr.UserData.Add(new UserData.RevitRefUserData
+                {
+                    RevitUniqueId = uid,
+                    BaselineWorldXform = xf,
+                    Units = "feet",
+                    ScaleToRhino = s,
+                    SnapshotStamp = (string)t["snapshotStamp"] ?? "",
+                    GeomHash = hash
+                });
+                var iid = doc.Objects.AddInstanceObject(def.Index, xf, attr);
+                if (iid == Guid.Empty)
+                {
+                    errors++;
+                    items.Add(new JObject { ["uniqueId"] = uid, ["ok"] = false, ["msg"] = "Failed to place instance" });
+                    continue;
+                }
+                placed++;
+                items.Add(new JObject { ["uniqueId"] = uid, ["ok"] = true, ["rhinoId"] = iid.ToString() });
+            }
+            if (placed > 0) doc.Views.Redraw();
+            return new JObject { ["ok"] = errors == 0, ["placed"] = placed, ["errors"] = errors, ["items"] = items };
+        }
+
         private static JObject RhinoGetSelection(JObject p)
         {
             var doc = RhinoDoc.ActiveDoc;